@@ -1,11 +1,21 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.routes import kundali, matchmaking
+from app.routes import candidates, kundali, matchmaking, places
+from app.services.chart_executor import shutdown_chart_executor
+
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    shutdown_chart_executor()
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(kundali.router)
 app.include_router(matchmaking.router)
+app.include_router(places.router)
+app.include_router(candidates.router)
 
 @app.get("/")
 async def read_root():
     return {"Hello": "World"}
-
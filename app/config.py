@@ -1,10 +1,34 @@
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 API_URL = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={GEMINI_API_KEY}"
 
+# Swiss Ephemeris data files (sepl_18.se1 covers 1800-2399)
+EPHE_PATH = os.getenv("EPHE_PATH", str(Path(__file__).parent.parent / "eph"))
+
+# Worker processes used by the API to compute charts off the event loop
+CHART_WORKERS = int(os.getenv("CHART_WORKERS", os.cpu_count() or 1))
+
+# Worker processes used for sharded bulk matching
+MATCH_WORKERS = int(os.getenv("MATCH_WORKERS", os.cpu_count() or 1))
+
+# Query Nominatim for places missing from the offline gazetteer (set to 0 to stay fully offline)
+GEOCODER_ONLINE_FALLBACK = os.getenv("GEOCODER_ONLINE_FALLBACK", "1") == "1"
+
+# Persistent cache of online geocoding results; unknown places expire sooner
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", str(Path(__file__).parent / "data" / "geocode_cache.sqlite"))
+GEOCODE_CACHE_TTL_DAYS = float(os.getenv("GEOCODE_CACHE_TTL_DAYS", 90))
+GEOCODE_NEGATIVE_TTL_DAYS = float(os.getenv("GEOCODE_NEGATIVE_TTL_DAYS", 1))
+
+# Matches must score strictly above this Ashtakoota total (out of 36)
+MATCH_SCORE_THRESHOLD = float(os.getenv("MATCH_SCORE_THRESHOLD", 22))
+
+# Persistent pool of matchmaking candidates searched by /candidates/search
+CANDIDATE_POOL_PATH = os.getenv("CANDIDATE_POOL_PATH", str(Path(__file__).parent / "data" / "candidate_pool.sqlite"))
+
 ZODIACS = {
     1: {"id": 1,
     "name": "Aries"},
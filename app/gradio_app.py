@@ -9,6 +9,8 @@ from gradio import ChatMessage
 from typing import Optional, Tuple, List, Dict, Any
 from app.services.agent.astrology_agent import AstrologyAgent
 from app.services.agent.config import AGENT_MODEL, SUPPORTED_MODELS, get_all_model_configs
+from app.services.gazetteer import get_gazetteer
+from app.services.place_autocomplete import get_place_autocomplete
 from langchain_core.messages import HumanMessage, AIMessage
 
 
@@ -40,7 +42,9 @@ class GradioAgentInterface:
         except Exception as e:
             return f"Error initializing agent: {str(e)}"
     
-    def set_birth_details(self, day: int, month: int, year: int, hour: int, minute: int, birth_place: str) -> str:
+    def set_birth_details(
+        self, day: int, month: int, year: int, hour: int, minute: int, birth_place: str, place_id: Optional[int] = None
+    ) -> str:
         """
         Store birth details for kundali generation.
         
@@ -51,6 +55,8 @@ class GradioAgentInterface:
             hour: Hour of birth
             minute: Minute of birth
             birth_place: Birth place
+            place_id: Gazetteer place picked from the suggestions, used for the
+                chart instead of geocoding birth_place
         
         Returns:
             Status message
@@ -62,7 +68,8 @@ class GradioAgentInterface:
                 "year": year,
                 "hour": hour,
                 "minute": minute,
-                "birth_place": birth_place
+                "birth_place": birth_place,
+                "place_id": place_id
             }
             return f"Birth details saved: {day}/{month}/{year} at {hour:02d}:{minute:02d} in {birth_place}"
         except Exception as e:
@@ -110,15 +117,23 @@ class GradioAgentInterface:
             # If birth details are available, add context to the message
             enhanced_message = message
             if self.birth_details:
+                place = self.birth_details['birth_place']
+                if self.birth_details.get("place_id") is not None:
+                    # Lets the agent pass the exact place to generate_kundali_chart
+                    place += f" (place_id {self.birth_details['place_id']})"
                 birth_info = (
                     f"Note: My birth details are - Date: {self.birth_details['day']}/{self.birth_details['month']}/"
                     f"{self.birth_details['year']}, Time: {self.birth_details['hour']:02d}:{self.birth_details['minute']:02d}, "
-                    f"Place: {self.birth_details['birth_place']}. "
+                    f"Place: {place}. "
                 )
                 enhanced_message = birth_info + message
             
             # Invoke agent
-            response = self.agent.invoke(enhanced_message, conversation_history=langchain_messages)
+            response = self.agent.invoke(
+                enhanced_message,
+                conversation_history=langchain_messages,
+                birth_details=self.birth_details
+            )
             
             # Update history with ChatMessage objects (Gradio 6.0 format)
             history.append(ChatMessage(role="user", content=message))
@@ -153,6 +168,25 @@ class GradioAgentInterface:
         return [], "Conversation history cleared."
 
 
+def place_name(place_id: int) -> str:
+    """Name of a gazetteer place as "Name, Country", the label autocomplete shows for it."""
+    gazetteer = get_gazetteer()
+    try:
+        place = gazetteer.place(place_id) if gazetteer is not None else None
+    except ValueError:
+        place = None
+    return f"{place['name']}, {place['country']}" if place else str(place_id)
+
+
+def default_place_choice() -> Tuple[str, Any]:
+    """Initial birth place dropdown choice: Ahmedabad by place_id, or by name without a gazetteer."""
+    gazetteer = get_gazetteer()
+    place = gazetteer.lookup("Ahmedabad, India") if gazetteer is not None else None
+    if place is None:
+        return ("Ahmedabad, India", "Ahmedabad, India")
+    return (f"{place['name']}, {place['country']}", place["place_id"])
+
+
 def create_gradio_interface():
     """Create and return the Gradio interface."""
     # Ensure both API keys are loaded and validated at startup
@@ -229,11 +263,14 @@ def create_gradio_interface():
                     precision=0,
                     info="Minute of birth (0-59)"
                 )
-            birth_place = gr.Textbox(
+            default_place = default_place_choice()
+            birth_place = gr.Dropdown(
                 label="Birth Place",
-                value="Ahmedabad, Gujarat, India",
-                placeholder="Enter city, state, country",
-                info="Your place of birth"
+                value=default_place[1],
+                choices=[default_place],
+                allow_custom_value=True,
+                filterable=True,
+                info="Start typing your place of birth and pick it from the suggestions"
             )
             save_birth_details_btn = gr.Button("Save Birth Details", variant="primary")
             birth_details_status = gr.Textbox(
@@ -277,9 +314,21 @@ def create_gradio_interface():
         # Event handlers
         def save_birth_details(day, month, year, hour, minute, place):
             """Save birth details."""
-            status = interface.set_birth_details(int(day), int(month), int(year), int(hour), int(minute), place)
+            # A picked suggestion's value is its place_id, typed text stays a name
+            place_id = None
+            if isinstance(place, int):
+                place_id, place = place, place_name(place)
+            status = interface.set_birth_details(int(day), int(month), int(year), int(hour), int(minute), place, place_id)
             return status
         
+        def suggest_places(key_up_data: gr.KeyUpData):
+            """Refresh birth place suggestions as the user types."""
+            autocomplete = get_place_autocomplete()
+            if autocomplete is None or not key_up_data.input_value.strip():
+                return gr.Dropdown()
+            choices = [(place["label"], place["place_id"]) for place in autocomplete.suggest(key_up_data.input_value)]
+            return gr.Dropdown(choices=choices)
+        
         def update_model(model_name: str):
             """Update the model."""
             status = interface.initialize_agent(model_name)
@@ -300,6 +349,14 @@ def create_gradio_interface():
             outputs=[birth_details_status]
         )
         
+        birth_place.key_up(
+            fn=suggest_places,
+            inputs=None,
+            outputs=[birth_place],
+            queue=False,
+            show_progress="hidden"
+        )
+        
         model_dropdown.change(
             fn=update_model,
             inputs=[model_dropdown],
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Dict
+from typing import Dict, List, Literal, Optional
 
 class APIBirthDetails(BaseModel):
     day: int
@@ -9,6 +9,7 @@ class APIBirthDetails(BaseModel):
     minute: int
     second: int
     birth_place: str = "Ahmedabad, Gujarat, India"
+    place_id: Optional[int] = None # gazetteer place from /places/autocomplete, takes precedence over birth_place
 
 class BirthChart(BaseModel):
     day: int
@@ -23,10 +24,10 @@ class BirthChart(BaseModel):
 
 class PlanetData(BaseModel):
     name: str
-    position: float
+    position: Optional[float] = None # None for sign-level charts
     house: int
     zodiac: str
-    deviation: float
+    deviation: Optional[float] = None # None for sign-level charts
     retrograde: bool
 
 class KundaliChart(BaseModel):
@@ -34,7 +35,7 @@ class KundaliChart(BaseModel):
     ascendant_sign: str
     planets: Dict[str, PlanetData]
     moon_zodiac: str
-    moon_deviate: float
+    moon_deviate: Optional[float] = None # None for sign-level charts
     nakshatra: str
 
 class AshtakootaProfile(BaseModel):
@@ -59,3 +60,19 @@ class AshtakootaMatchScore(BaseModel):
     bhakoota: float = 0
     nadi: float = 0
     total: float = 0
+
+DoshaAction = Literal["ignore", "penalize", "reject"]
+
+class DoshaPolicy(BaseModel):
+    # What an uncancelled dosha does to a pair: nothing, subtract its penalty (points) from the total, or drop the pair
+    manglik: DoshaAction = "reject"
+    nadi: DoshaAction = "ignore"
+    bhakoota: DoshaAction = "ignore"
+    manglik_penalty: float = 6
+    nadi_penalty: float = 4
+    bhakoota_penalty: float = 4
+    manglik_references: List[Literal["lagna", "moon", "venus"]] = ["lagna", "moon", "venus"]
+    mars_dignity_cancels: bool = True # Mars in own or exaltation sign cancels Mangal dosha
+    nadi_exceptions: Optional[List[str]] = None # rule names from dosha.PAIR_RULES, None for dosha.NADI_EXCEPTIONS
+    bhakoota_exceptions: Optional[List[str]] = None # None for dosha.BHAKOOTA_EXCEPTIONS
+    restore_cancelled_points: bool = True # a cancelled Nadi/Bhakoota dosha scores that koota's full points
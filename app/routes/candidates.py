@@ -0,0 +1,84 @@
+from typing import Optional
+
+from fastapi import Body, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRouter
+
+from app.config import MATCH_SCORE_THRESHOLD
+from app.models import APIBirthDetails
+from app.services.ashtakoota_services.compact_profile import CompactProfile, segment_profile
+from app.services.birth_details import birth_chart_from_details
+from app.services.candidate_pool import DEFAULT_LIMIT, SIDES, CandidatePool, get_candidate_pool
+from app.services.chart_executor import get_chart_executor, moon_segment_task
+from app.services.match_lists import MatchLists, get_match_lists
+
+router = APIRouter()
+
+
+def _pool() -> CandidatePool:
+    pool = get_candidate_pool()
+    if pool is None:
+        raise HTTPException(status_code=503, detail="Candidate pool unavailable")
+    return pool
+
+
+def _match_lists() -> MatchLists:
+    match_lists = get_match_lists()
+    if match_lists is None:
+        raise HTTPException(status_code=503, detail="Candidate pool unavailable")
+    return match_lists
+
+
+def _check_side(side: str) -> None:
+    if side not in SIDES:
+        raise HTTPException(status_code=422, detail=f"side must be one of {SIDES}")
+
+
+async def _profile(birth_details: APIBirthDetails) -> CompactProfile:
+    # Geocoding is blocking network I/O, chart math runs in the process pool
+    birth_chart = await run_in_threadpool(birth_chart_from_details, birth_details)
+    return segment_profile(await get_chart_executor().run(moon_segment_task, birth_chart))
+
+
+@router.post("/candidates")
+async def add_candidate(
+    birth_details: APIBirthDetails = Body(...),
+    side: str = Body(...),
+    candidate_id: Optional[int] = Body(None),
+):
+    _check_side(side)
+    # Adds go through the match lists so members' top matches stay current
+    match_lists = _match_lists()
+    profile = await _profile(birth_details)
+    candidate_id = await run_in_threadpool(match_lists.add, side, profile, candidate_id)
+    return {"candidate_id": candidate_id, "side": side, "profile": profile.to_model()}
+
+
+@router.delete("/candidates/{candidate_id}")
+async def remove_candidate(candidate_id: int):
+    if not await run_in_threadpool(_match_lists().remove, candidate_id):
+        raise HTTPException(status_code=404, detail=f"Unknown candidate: {candidate_id}")
+    return {"removed": candidate_id}
+
+
+@router.get("/candidates/{candidate_id}/matches")
+async def candidate_matches(candidate_id: int):
+    matches = _match_lists().matches(candidate_id)
+    if matches is None:
+        raise HTTPException(status_code=404, detail=f"Unknown candidate: {candidate_id}")
+    return {"candidate_id": candidate_id, "matches": matches}
+
+
+@router.post("/candidates/search")
+async def search_candidates(
+    birth_details: APIBirthDetails = Body(...),
+    side: str = Body(...),
+    threshold: float = Body(MATCH_SCORE_THRESHOLD),
+    limit: int = Body(DEFAULT_LIMIT, ge=1, le=1000),
+    offset: int = Body(0, ge=0),
+):
+    _check_side(side)
+    pool = _pool()
+    profile = await _profile(birth_details)
+    # side is the searching person's; candidates come from the other side
+    return pool.search(profile, side, threshold, limit, offset)
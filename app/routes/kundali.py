@@ -1,66 +1,76 @@
+from typing import List, Optional
+
 from fastapi import Body, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.routing import APIRouter
 
-from app.services.coord_utils import get_coordinates
-from app.services.kundali_chart import planets_calculation
-from app.services.ashtakoota_services.generate_profile import generate_ashtakoota_profile
+from app.config import MATCH_SCORE_THRESHOLD
+from app.services.ashtakoota_services.compact_profile import segment_profile
+from app.services.birth_details import birth_chart_from_details
+from app.services.chart_executor import get_chart_executor, kundali_task, moon_segment_task
+from app.services.geocode_cache import get_geocode_cache
 from app.services.match_finder import find_perfect_match
-from app.models import APIBirthDetails, BirthChart, KundaliChart
+from app.services.name_syllables import get_name_syllable_index
+from app.models import APIBirthDetails, KundaliChart
 
 router = APIRouter()
 
 
 @router.post("/kundali")
-def get_my_kundali(
+async def get_my_kundali(
     birth_details: APIBirthDetails = Body(...),
 ) -> KundaliChart:
-    coords = get_coordinates(birth_details.birth_place)
-    if not coords:
-        print("Invalid birth place name, using default coordinates")
-    
-    birth_chart = BirthChart(
-        day=birth_details.day,
-        month=birth_details.month,
-        year=birth_details.year,
-        hour=birth_details.hour,
-        minute=birth_details.minute,
-        second=birth_details.second,
-        latitude=coords.get("latitude", 23.03),
-        longitude=coords.get("longitude", 72.62),
-    )
+    # Geocoding is blocking network I/O, chart math runs in the process pool
+    birth_chart = await run_in_threadpool(birth_chart_from_details, birth_details)
     
-    kundali_chart = planets_calculation(birth_chart)
+    kundali_chart = await get_chart_executor().run(kundali_task, birth_chart)
     return kundali_chart
 
 @router.post("/perfect-match")
-def get_perfect_match(
+async def get_perfect_match(
     birth_details: APIBirthDetails = Body(...),
     type: str = Body(...),
+    threshold: float = Body(MATCH_SCORE_THRESHOLD),
+    limit: Optional[int] = Body(None, ge=1),
+    offset: int = Body(0, ge=0),
 ):
-    coords = get_coordinates(birth_details.birth_place)
-    if not coords:
-        print("Invalid birth place name, using default coordinates")
-    
-    birth_chart = BirthChart(
-        day=birth_details.day,
-        month=birth_details.month,
-        year=birth_details.year,
-        hour=birth_details.hour,
-        minute=birth_details.minute,
-        second=birth_details.second,
-        latitude=coords.get("latitude", 23.03),
-        longitude=coords.get("longitude", 72.62),
-    )
+    if type not in ("groom", "bride"):
+        raise HTTPException(status_code=422, detail="type must be 'groom' or 'bride'")
+    birth_chart = await run_in_threadpool(birth_chart_from_details, birth_details)
     
-    kundali_chart = planets_calculation(birth_chart)
-    ashtakoota_profile = generate_ashtakoota_profile(
-        kundali_chart.planets["moon"].zodiac, 
-        kundali_chart.planets["moon"].deviation,
-        kundali_chart.nakshatra
-    )
+    ashtakoota_profile = segment_profile(await get_chart_executor().run(moon_segment_task, birth_chart))
+
+    # Ranked rows come straight from the precomputed pada-level table
+    return find_perfect_match(ashtakoota_profile, type, threshold, limit, offset)
+
+@router.post("/name-match")
+async def get_name_match(
+    birth_details: APIBirthDetails = Body(...),
+    type: str = Body(...),
+    names: List[str] = Body(..., max_length=100000),
+    threshold: float = Body(MATCH_SCORE_THRESHOLD),
+):
+    if type not in ("groom", "bride"):
+        raise HTTPException(status_code=422, detail="type must be 'groom' or 'bride'")
+    birth_chart = await run_in_threadpool(birth_chart_from_details, birth_details)
+    ashtakoota_profile = segment_profile(await get_chart_executor().run(moon_segment_task, birth_chart))
+
+    # Names resolve to rashi/nakshatra classes by their starting syllable
+    index = get_name_syllable_index()
+    scores = await run_in_threadpool(index.score_names, names, ashtakoota_profile, type)
+    result = []
+    for name, syllable, min_score, max_score in zip(names, scores["syllable"].tolist(), scores["min_score"].tolist(), scores["max_score"].tolist()):
+        if syllable < 0:
+            result.append({"name": name, "syllable": None, "min_score": None, "max_score": None, "compatible": False})
+        else:
+            result.append({"name": name, "syllable": index.syllables[syllable], "min_score": min_score,
+                           "max_score": max_score, "compatible": max_score > threshold})
+    return {"result": result}
 
-    result = find_perfect_match(ashtakoota_profile, type)
+@router.get("/chart-executor/stats")
+async def get_chart_executor_stats():
+    return get_chart_executor().stats()
 
-    return {
-        "result": result
-    }
+@router.get("/geocoder/stats")
+async def get_geocoder_stats():
+    return get_geocode_cache().stats()
@@ -1,67 +1,41 @@
+import asyncio
+import json
+from typing import List, Optional
+
 from fastapi import Body, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.routing import APIRouter
-from app.services.coord_utils import get_coordinates
-from app.services.kundali_chart import planets_calculation
-from app.services.ashtakoota_services.generate_profile import generate_ashtakoota_profile
-from app.services.ashtakoota_services.calculate_score import calculate_ashtakoota
+from app.config import MATCH_SCORE_THRESHOLD
+from app.services.birth_details import birth_chart_from_details
+from app.services.chart_executor import get_chart_executor, moon_segment_task
+from app.services.ashtakoota_services.dosha import pair_table
+from app.services.ashtakoota_services.compact_profile import CompactProfile, segment_profile
+from app.services.ashtakoota_services.score_tensor import match_score
+from app.services.bulk_matching import DEFAULT_TOP_K, SIDES, cohort_from_details, top_match_arrays, top_matches
+from app.services.columnar_export import arrow_stream_chunks, match_columns, pa
 from app.services.explanation_pipeline import ashtakoota_explanation_pipeline
-from app.models import APIBirthDetails, BirthChart, AshtakootaMatchScore
+from app.models import APIBirthDetails, AshtakootaMatchScore, DoshaPolicy
 
 router = APIRouter()
 
+
+async def _ashtakoota_profile(birth_details: APIBirthDetails, role: str) -> CompactProfile:
+    # Geocoding is blocking network I/O, chart math runs in the process pool
+    birth_chart = await run_in_threadpool(birth_chart_from_details, birth_details, role)
+    return segment_profile(await get_chart_executor().run(moon_segment_task, birth_chart))
+
 @router.post("/ashtakoota-score")
 async def ashtakoota_score(
     groom_birth_details: APIBirthDetails = Body(...),
     bride_birth_details: APIBirthDetails = Body(...)
 ) -> AshtakootaMatchScore:
-    groom_coords = get_coordinates(groom_birth_details.birth_place)
-    if not groom_coords:
-        print("Invalid groom birth place name, using default coordinates")
-    
-    groom_birth_chart = BirthChart(
-        day=groom_birth_details.day,
-        month=groom_birth_details.month,
-        year=groom_birth_details.year,
-        hour=groom_birth_details.hour,
-        minute=groom_birth_details.minute,
-        second=groom_birth_details.second,
-        latitude=groom_coords.get("latitude", 23.03),
-        longitude=groom_coords.get("longitude", 72.62),
-    )
-
-    groom_kundali_chart = planets_calculation(groom_birth_chart)
-
-    bride_coords = get_coordinates(bride_birth_details.birth_place)
-    if not bride_coords:
-        print("Invalid bride birth place name, using default coordinates")
-    
-    bride_birth_chart = BirthChart(
-        day=bride_birth_details.day,
-        month=bride_birth_details.month,
-        year=bride_birth_details.year,
-        hour=bride_birth_details.hour,
-        minute=bride_birth_details.minute,
-        second=bride_birth_details.second,
-        latitude=bride_coords.get("latitude", 23.03),
-        longitude=bride_coords.get("longitude", 72.62),
-    )
-
-    bride_kundali_chart = planets_calculation(bride_birth_chart)
-
-    groom_ashtakoota_profile = generate_ashtakoota_profile(
-        groom_kundali_chart.planets["moon"].zodiac, 
-        groom_kundali_chart.planets["moon"].deviation,
-        groom_kundali_chart.nakshatra
-    )
-    
-    bride_ashtakoota_profile = generate_ashtakoota_profile(
-        bride_kundali_chart.planets["moon"].zodiac, 
-        bride_kundali_chart.planets["moon"].deviation,
-        bride_kundali_chart.nakshatra
+    groom_ashtakoota_profile, bride_ashtakoota_profile = await asyncio.gather(
+        _ashtakoota_profile(groom_birth_details, "groom"),
+        _ashtakoota_profile(bride_birth_details, "bride"),
     )
 
-    score = calculate_ashtakoota(groom_profile=groom_ashtakoota_profile,
-                                bride_profile=bride_ashtakoota_profile)
+    score = match_score(groom_ashtakoota_profile.code, bride_ashtakoota_profile.code)
     return score
 
 @router.post("/ashtakoota-score-explain")
@@ -69,55 +43,61 @@ async def ashtakoota_score(
     groom_birth_details: APIBirthDetails = Body(...),
     bride_birth_details: APIBirthDetails = Body(...)
 ):
-    groom_coords = get_coordinates(groom_birth_details.birth_place)
-    if not groom_coords:
-        print("Invalid birth place name, using default coordinates")
-    
-    groom_birth_chart = BirthChart(
-        day=groom_birth_details.day,
-        month=groom_birth_details.month,
-        year=groom_birth_details.year,
-        hour=groom_birth_details.hour,
-        minute=groom_birth_details.minute,
-        second=groom_birth_details.second,
-        latitude=groom_coords.get("latitude", 23.03),
-        longitude=groom_coords.get("longitude", 72.62),
+    groom_ashtakoota_profile, bride_ashtakoota_profile = await asyncio.gather(
+        _ashtakoota_profile(groom_birth_details, "groom"),
+        _ashtakoota_profile(bride_birth_details, "bride"),
     )
 
-    groom_kundali_chart = planets_calculation(groom_birth_chart)
-
-    bride_coords = get_coordinates(bride_birth_details.birth_place)
-    if not bride_coords:
-        print("Invalid bride birth place name, using default coordinates")
+    score = match_score(groom_ashtakoota_profile.code, bride_ashtakoota_profile.code)
     
-    bride_birth_chart = BirthChart(
-        day=bride_birth_details.day,
-        month=bride_birth_details.month,
-        year=bride_birth_details.year,
-        hour=bride_birth_details.hour,
-        minute=bride_birth_details.minute,
-        second=bride_birth_details.second,
-        latitude=bride_coords.get("latitude", 23.03),
-        longitude=bride_coords.get("longitude", 72.62),
+    response = await ashtakoota_explanation_pipeline(score, groom_ashtakoota_profile.to_model(), bride_ashtakoota_profile.to_model())
+    ashtakoota_score_explain = {"ashtakoota_score_explain": response}
+    return ashtakoota_score_explain
+
+@router.post("/bulk-match")
+async def bulk_match(
+    grooms: List[APIBirthDetails] = Body(...),
+    brides: List[APIBirthDetails] = Body(...),
+    side: str = Body("groom"),
+    top_k: int = Body(DEFAULT_TOP_K, ge=1, le=100),
+    threshold: float = Body(MATCH_SCORE_THRESHOLD),
+    dosha_policy: Optional[DoshaPolicy] = Body(None),
+    format: str = Body("ndjson"),
+):
+    if side not in SIDES:
+        raise HTTPException(status_code=422, detail=f"side must be one of {SIDES}")
+    if format not in ("ndjson", "arrow"):
+        raise HTTPException(status_code=422, detail="format must be 'ndjson' or 'arrow'")
+    doshas = dosha_policy is not None
+    if doshas:
+        try:
+            pair_table(dosha_policy)
+        except ValueError as e:
+            # e.g. an unknown exception rule, before any chart is computed
+            raise HTTPException(status_code=422, detail=str(e))
+    (groom_codes, groom_flags), (bride_codes, bride_flags) = await asyncio.gather(
+        run_in_threadpool(cohort_from_details, grooms, doshas),
+        run_in_threadpool(cohort_from_details, brides, doshas),
     )
+    if side == "groom":
+        people, partners, people_flags, partner_flags = groom_codes, bride_codes, groom_flags, bride_flags
+    else:
+        people, partners, people_flags, partner_flags = bride_codes, groom_codes, bride_flags, groom_flags
 
-    bride_kundali_chart = planets_calculation(bride_birth_chart)
+    # Arrow IPC stream with one row per match, coded columns dictionary-encoded (NDJSON without pyarrow)
+    if format == "arrow" and pa is not None:
+        partner_rows, half_points = await run_in_threadpool(
+            top_match_arrays, people, partners, side, top_k, threshold,
+            person_flags=people_flags, partner_flags=partner_flags, dosha_policy=dosha_policy,
+        )
+        columns = match_columns(people, partners, partner_rows, half_points, side)
+        return StreamingResponse(arrow_stream_chunks(columns), media_type="application/vnd.apache.arrow.stream")
 
-    groom_ashtakoota_profile = generate_ashtakoota_profile(
-        groom_kundali_chart.planets["moon"].zodiac, 
-        groom_kundali_chart.planets["moon"].deviation,
-        groom_kundali_chart.nakshatra
-    )
-    
-    bride_ashtakoota_profile = generate_ashtakoota_profile(
-        bride_kundali_chart.planets["moon"].zodiac, 
-        bride_kundali_chart.planets["moon"].deviation,
-        bride_kundali_chart.nakshatra
-    )
+    # One JSON line per person, indices refer to the request's grooms/brides lists
+    def lines():
+        matches = top_matches(people, partners, side, top_k, threshold, person_flags=people_flags,
+                              partner_flags=partner_flags, dosha_policy=dosha_policy)
+        for person, partner_rows, scores in matches:
+            yield json.dumps({"person": person, "partners": partner_rows.tolist(), "scores": scores.tolist()}) + "\n"
 
-    score = calculate_ashtakoota(groom_profile=groom_ashtakoota_profile,
-                                bride_profile=bride_ashtakoota_profile)
-    
-    response = await ashtakoota_explanation_pipeline(score, groom_ashtakoota_profile, bride_ashtakoota_profile)
-    ashtakoota_score_explain = {"ashtakoota_score_explain": response}
-    return ashtakoota_score_explain
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -0,0 +1,21 @@
+from fastapi import HTTPException, Query
+from fastapi.routing import APIRouter
+
+from app.services.place_autocomplete import get_place_autocomplete
+
+router = APIRouter()
+
+
+@router.get("/places/autocomplete")
+async def autocomplete_places(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+):
+    autocomplete = get_place_autocomplete()
+    if autocomplete is None:
+        raise HTTPException(status_code=503, detail="Place index unavailable")
+
+    # Suggestions carry a place_id to send back in the birth details
+    return {
+        "suggestions": autocomplete.suggest(q, limit)
+    }
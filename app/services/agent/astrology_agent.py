@@ -5,7 +5,9 @@ Main agent class that initializes and manages the LangGraph agent
 for astrological queries.
 """
 
-from typing import Optional, List
+import logging
+from collections import deque
+from typing import Optional, List, Dict, Any, Deque
 from langchain_core.messages import HumanMessage, AIMessage
 from langchain_litellm import ChatLiteLLM
 from app.services.agent.config import (
@@ -14,7 +16,17 @@ from app.services.agent.config import (
     validate_model_config
 )
 from app.services.agent.graph import create_agent_graph, AgentState
-from app.services.agent.tools import generate_kundali_chart, query_knowledge_base
+from app.services.agent.tools import (
+    generate_kundali_chart,
+    query_knowledge_base,
+    query_knowledge_base_batch,
+    search_knowledge_base
+)
+
+logger = logging.getLogger(__name__)
+
+# Most recent queries whose LLM call counts and intents are kept
+QUERY_STATS_WINDOW = 1000
 
 
 class AstrologyAgent:
@@ -42,18 +54,38 @@ class AstrologyAgent:
         )
         
         # Get tools
-        self.tools = [generate_kundali_chart, query_knowledge_base]
+        self.tools = [generate_kundali_chart, query_knowledge_base_batch, search_knowledge_base, query_knowledge_base]
         
         # Create and compile graph
         self.graph = create_agent_graph(self.llm, self.tools)
+        
+        # LLM calls and classified intent of the most recent answered queries, in order
+        self.llm_call_counts: Deque[int] = deque(maxlen=QUERY_STATS_WINDOW)
+        self.intents: Deque[List[str]] = deque(maxlen=QUERY_STATS_WINDOW)
     
-    def invoke(self, query: str, conversation_history: Optional[List] = None) -> str:
+    def _record_query(self, llm_calls: int, intent: List[str]) -> None:
+        """Keep and log the LLM call count and intent of an answered query."""
+        self.llm_call_counts.append(llm_calls)
+        self.intents.append(intent)
+        logger.info("Agent query answered with %d LLM call(s), intent: %s", llm_calls, intent or "none")
+    
+    def invoke(
+        self,
+        query: str,
+        conversation_history: Optional[List] = None,
+        birth_details: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
         Invoke the agent with a query.
         
+        The number of LLM calls the query took is appended to llm_call_counts
+        (the last QUERY_STATS_WINDOW queries are kept) and logged.
+        
         Args:
             query: User query string
             conversation_history: Optional list of previous messages (should not include ToolMessages)
+            birth_details: Optional generate_kundali_chart arguments (day, month, year, hour,
+                minute, birth_place), used to prefetch the chart and its interpretations
         
         Returns:
             Agent response string
@@ -82,12 +114,17 @@ class AstrologyAgent:
         # Create initial state
         initial_state: AgentState = {
             "messages": messages,
-            "kundali_data": None
+            "kundali_data": None,
+            "birth_details": birth_details,
+            "llm_calls": 0
         }
         
         # Invoke graph
         result = self.graph.invoke(initial_state)
         
+        # Record how many LLM calls the query took
+        self._record_query(result.get("llm_calls", 0), result.get("intent", []))
+        
         # Extract final response
         final_messages = result.get("messages", [])
         
@@ -109,13 +146,21 @@ class AstrologyAgent:
         
         return "I apologize, but I couldn't generate a response. Please try again."
     
-    def stream(self, query: str, conversation_history: Optional[List] = None):
+    def stream(
+        self,
+        query: str,
+        conversation_history: Optional[List] = None,
+        birth_details: Optional[Dict[str, Any]] = None
+    ):
         """
         Stream agent responses.
         
+        Once the stream is exhausted, the query's LLM calls are recorded as in invoke.
+        
         Args:
             query: User query string
             conversation_history: Optional list of previous messages (should not include ToolMessages)
+            birth_details: Optional generate_kundali_chart arguments, used to prefetch the chart
         
         Yields:
             Response chunks
@@ -142,10 +187,18 @@ class AstrologyAgent:
         
         initial_state: AgentState = {
             "messages": messages,
-            "kundali_data": None
+            "kundali_data": None,
+            "birth_details": birth_details,
+            "llm_calls": 0
         }
         
-        # Stream from graph
+        # Stream from graph; each chunk maps the node that ran to its state update
+        llm_calls, intent = 0, []
         for chunk in self.graph.stream(initial_state):
+            for update in chunk.values():
+                if isinstance(update, dict):
+                    llm_calls += update.get("llm_calls", 0)
+                    intent = update.get("intent", intent)
             yield chunk
+        self._record_query(llm_calls, intent)
 
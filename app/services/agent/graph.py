@@ -2,8 +2,17 @@
 LangGraph Agent Graph Definition
 
 Defines the state schema and agent graph for the astrology agent.
+
+Before the first LLM call, a prefetch node classifies the question's intent
+(see intent) and, when birth details are known, computes the chart and
+fetches the topic's interpretations. They are added to the conversation as
+generate_kundali_chart and query_knowledge_base_batch results, so most
+readings are answered in one LLM call; the tools stay available for
+anything the prefetch missed.
 """
 
+import json
+import operator
 from typing import TypedDict, List, Optional, Dict, Any, Annotated
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage, SystemMessage
 from langgraph.graph import StateGraph, END
@@ -21,15 +30,86 @@ except ImportError:
         return left + right
 
 
+# Tools whose results the prefetch node adds to the conversation
+PREFETCH_TOOLS = ("generate_kundali_chart", "query_knowledge_base_batch")
+
+
 class AgentState(TypedDict):
     """State schema for the astrology agent."""
     messages: Annotated[List[BaseMessage], add_messages]
     kundali_data: Optional[Dict[str, Any]]
+    # generate_kundali_chart arguments, if known before the question is asked
+    birth_details: Optional[Dict[str, Any]]
+    # Topics the question was classified into by the prefetch node
+    intent: List[str]
+    # LLM calls made while answering (summed across agent node runs)
+    llm_calls: Annotated[int, operator.add]
+
+
+def prefetch_messages(
+    question: str,
+    birth_details: Optional[Dict[str, Any]] = None,
+    kundali_data: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Prefetch the chart and the interpretations a question needs.
+    
+    Args:
+        question: The user's message
+        birth_details: generate_kundali_chart arguments; read from the
+            message's birth details note if not given
+        kundali_data: Chart computed earlier, used instead of birth details
+    
+    Returns:
+        State update: intent (the classified topics) and, if there is a topic
+        and a chart, messages (an AIMessage calling the prefetch tools and
+        their ToolMessages) and kundali_data
+    """
+    from app.services.agent.intent import classify_intent, parse_birth_details
+    from app.services.agent.tools.knowledge_base_batch_tool import chart_queries, run_queries
+    from app.services.agent.tools.kundali_tool import generate_kundali_chart
+    
+    topics = classify_intent(question)
+    birth_details = birth_details or parse_birth_details(question)
+    if not topics or (kundali_data is None and birth_details is None):
+        return {"intent": topics}
+    
+    tool_calls, results = [], []
+    chart = kundali_data
+    if chart is None:
+        try:
+            chart = generate_kundali_chart.invoke(birth_details)
+        except Exception as e:
+            print(f"Warning: Prefetch skipped, could not generate the chart: {e}")
+            return {"intent": topics}
+        tool_calls.append({"name": "generate_kundali_chart", "args": birth_details, "id": "prefetch_chart", "type": "tool_call"})
+        results.append(chart)
+    
+    # The first topic by name, further topics as explicit queries, exactly as the tool would run them
+    queries = chart_queries(chart, topics[0])
+    extra = []
+    for topic in topics[1:]:
+        extra.extend(query for query in chart_queries(chart, topic) if query not in queries + extra)
+    args: Dict[str, Any] = {"topic": topics[0]}
+    if extra:
+        args["queries"] = extra
+    tool_calls.append({"name": "query_knowledge_base_batch", "args": args, "id": "prefetch_knowledge_base", "type": "tool_call"})
+    results.append({"topic": topics[0], "results": run_queries(queries + extra)})
+    
+    messages: List[BaseMessage] = [AIMessage(content="", tool_calls=tool_calls)]
+    for tool_call, result in zip(tool_calls, results):
+        messages.append(ToolMessage(
+            content=json.dumps(result, ensure_ascii=False),
+            tool_call_id=tool_call["id"],
+            name=tool_call["name"],
+        ))
+    return {"messages": messages, "kundali_data": chart, "intent": topics}
 
 
 def create_agent_graph(
     llm: BaseChatModel,
-    tools: List
+    tools: List,
+    prefetch: bool = True
 ) -> StateGraph:
     """
     Create and compile the LangGraph agent graph.
@@ -37,6 +117,8 @@ def create_agent_graph(
     Args:
         llm: The language model to use (via LiteLLM)
         tools: List of tools available to the agent
+        prefetch: Whether to prefetch the chart and interpretations before
+            the first LLM call (only if the PREFETCH_TOOLS are among tools)
     
     Returns:
         Compiled LangGraph graph
@@ -47,6 +129,18 @@ def create_agent_graph(
     # Create tool node
     tool_node = ToolNode(tools)
     
+    # Prefetched results must look like calls of tools the model has
+    tool_names = {getattr(tool, "name", None) for tool in tools}
+    prefetch = prefetch and all(name in tool_names for name in PREFETCH_TOOLS)
+    
+    # Define prefetch node
+    def prefetch_node(state: AgentState) -> AgentState:
+        """Prefetch node that adds the chart and relevant interpretations before the first LLM call."""
+        questions = [message for message in state["messages"] if isinstance(message, HumanMessage)]
+        if not questions:
+            return {"intent": []}
+        return prefetch_messages(str(questions[-1].content), state.get("birth_details"), state.get("kundali_data"))
+    
     # Define agent node
     def agent_node(state: AgentState) -> AgentState:
         """Agent node that processes messages and decides on tool calls."""
@@ -67,7 +161,7 @@ def create_agent_graph(
         response = llm_with_tools.invoke(messages_with_system)
         
         # Return new message to be added to state (reducer will handle merging)
-        return {"messages": [response]}
+        return {"messages": [response], "llm_calls": 1}
     
     # Define conditional edge function
     def should_continue(state: AgentState) -> str:
@@ -89,7 +183,12 @@ def create_agent_graph(
     workflow.add_node("tools", tool_node)
     
     # Set entry point
-    workflow.set_entry_point("agent")
+    if prefetch:
+        workflow.add_node("prefetch", prefetch_node)
+        workflow.set_entry_point("prefetch")
+        workflow.add_edge("prefetch", "agent")
+    else:
+        workflow.set_entry_point("agent")
     
     # Add conditional edges
     workflow.add_conditional_edges(
@@ -112,6 +211,12 @@ def extract_kundali_data(state: AgentState) -> Optional[Dict[str, Any]]:
     """
     Extract kundali data from tool messages in the state.
     
+    Tool results reach the state as ToolMessages whose content is the JSON
+    serialization of the tool's return value, so the content is parsed. The
+    most recent generate_kundali_chart result wins, so a chart generated later
+    in the run (corrected details, a partner's chart) replaces the prefetched
+    one in state["kundali_data"], which is only the fallback.
+    
     Args:
         state: Current agent state
     
@@ -122,12 +227,14 @@ def extract_kundali_data(state: AgentState) -> Optional[Dict[str, Any]]:
     
     for message in reversed(messages):
         if isinstance(message, ToolMessage):
-            try:
-                # Check if this is a kundali chart generation result
-                if isinstance(message.content, dict) and "ascendant" in message.content:
-                    return message.content
-            except (AttributeError, TypeError):
-                continue
-    
-    return None
-
+            content = message.content
+            if isinstance(content, str) and message.name == "generate_kundali_chart":
+                try:
+                    content = json.loads(content)
+                except json.JSONDecodeError:
+                    continue
+            # Check if this is a kundali chart generation result
+            if isinstance(content, dict) and "ascendant" in content:
+                return content
+    
+    return state.get("kundali_data") or None
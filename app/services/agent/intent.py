@@ -0,0 +1,187 @@
+"""
+Intent Classification
+
+Maps a user's question to the reading topics of the batch knowledge base
+tool (see knowledge_base_batch_tool.TOPICS) with a local keyword classifier,
+so the agent graph can prefetch the chart and its relevant interpretations
+before the first LLM call. No network or model is involved.
+
+    keywords:  each topic has a list of whole words, inflections spelled out
+               ("married", "marriage"), so "workout" is not work and
+               "Richard" is not rich; ambiguous words are phrases instead
+               ("love life", "in love", not "love", which "I love my job"
+               would also match)
+    scores:    a topic scores one point per matching word or phrase, phrases
+               two, and topics are ranked by score; questions without any
+               match classify to no topic and are left to the agent's tools
+
+Also parses the birth details note the Gradio interface prepends to
+messages ("Note: My birth details are - Date: 15/6/1990, Time: 10:30,
+Place: Mumbai, India (place_id 2541). ...", the place_id only when the
+place was picked from the suggestions).
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+# Words per topic, matched against whole words of the question
+TOPIC_KEYWORDS = {
+    "personality": frozenset((
+        "personality", "personalities", "nature", "character", "temperament", "myself", "strength", "strengths",
+        "weakness", "weaknesses", "ascendant", "lagna", "nakshatra", "chart", "kundali", "horoscope", "trait", "traits",
+    )),
+    "career": frozenset((
+        "career", "careers", "job", "jobs", "work", "works", "working", "profession", "professional", "business",
+        "promotion", "promoted", "boss", "office", "employer", "employment", "employed", "unemployed", "occupation",
+        "ambition", "ambitions", "startup", "colleague", "colleagues",
+    )),
+    "relationships": frozenset((
+        "marry", "married", "marrying", "marriage", "marriages", "relationship", "relationships", "partner",
+        "partners", "spouse", "husband", "wife", "romance", "romantic", "dating", "boyfriend", "girlfriend",
+        "compatible", "compatibility", "divorce", "divorced", "wedding",
+    )),
+    "finance": frozenset((
+        "money", "finance", "finances", "financial", "financially", "wealth", "wealthy", "income", "salary",
+        "saving", "savings", "invest", "investing", "investment", "investments", "rich", "property", "debt", "debts",
+        "loan", "loans", "earn", "earning", "earnings",
+    )),
+    "health": frozenset((
+        "health", "healthy", "ill", "illness", "disease", "diseases", "sick", "sickness", "fitness", "stress",
+        "stressed", "anxiety", "anxious", "diet", "sleep", "injury", "injuries", "injured", "surgery",
+    )),
+    "education": frozenset((
+        "education", "educational", "study", "studies", "studying", "exam", "exams", "examination", "school",
+        "college", "university", "universities", "degree", "learning", "student", "students",
+    )),
+    "family": frozenset((
+        "family", "families", "mother", "father", "parent", "parents", "child", "children", "kids", "home",
+        "sibling", "siblings", "brother", "brothers", "sister", "sisters", "son", "sons", "daughter", "daughters",
+    )),
+    "spirituality": frozenset((
+        "spiritual", "spirituality", "meditation", "meditate", "meditating", "religion", "religious", "karma",
+        "moksha", "dharma", "god", "soul", "purpose", "enlightenment",
+    )),
+}
+
+# Phrases per topic, matched in the lowercased question
+TOPIC_PHRASES = {
+    "personality": ("who am i", "about me", "my moon sign", "my rising sign"),
+    "career": ("line of work", "what should i do for a living"),
+    "relationships": ("life partner", "soul mate", "soulmate", "love life", "in love", "my love", "find love"),
+    "spirituality": ("life purpose", "meaning of life", "past life"),
+    "all": ("full reading", "complete reading", "whole chart", "entire chart", "everything about my chart"),
+}
+
+_WORDS = re.compile(r"[a-z]+")
+
+# Abbreviations ending in a period inside place names ("St. Louis"); single
+# letters ("Washington, D.C.") are abbreviations too
+PLACE_ABBREVIATIONS = ("St", "Ste", "Mt", "Ft", "Pt")
+
+# Birth details note written by the Gradio interface: the place ends at its
+# "(place_id N)" if it has one, otherwise at the first period that does not
+# end an abbreviation, and the note's period is followed by a space or the end
+_BIRTH_NOTE = re.compile(
+    r"birth details are\s*-\s*Date:\s*(\d{1,2})/(\d{1,2})/(\d{4}),\s*Time:\s*(\d{1,2}):(\d{2}),\s*Place:\s*"
+    r"(?:(.+?)\s*\(place_id\s*(\d+)\)|(.+?))"
+    + "".join(rf"(?<!\b{abbreviation})" for abbreviation in PLACE_ABBREVIATIONS)
+    + r"(?<!\b[a-z])\.(?:\s|$)",
+    re.IGNORECASE,
+)
+
+
+def topic_scores(question: str) -> Dict[str, int]:
+    """
+    Score every topic against a question.
+
+    Args:
+        question: The user's message
+
+    Returns:
+        Score per topic with at least one match
+    """
+    text = _BIRTH_NOTE.sub(" ", question).lower()
+    words = _WORDS.findall(text)
+    scores: Dict[str, int] = {}
+    for topic, keywords in TOPIC_KEYWORDS.items():
+        score = sum(word in keywords for word in words)
+        if score:
+            scores[topic] = score
+    for topic, phrases in TOPIC_PHRASES.items():
+        score = 2 * sum(phrase in text for phrase in phrases)
+        if score:
+            scores[topic] = scores.get(topic, 0) + score
+    return scores
+
+
+def classify_intent(question: str, max_topics: int = 2) -> List[str]:
+    """
+    Classify a question into reading topics.
+
+    Args:
+        question: The user's message
+        max_topics: Most topics to return
+
+    Returns:
+        Matching topics, best first (ties in TOPIC_KEYWORDS order); empty if
+        nothing matches. "all" on its own when a full reading is asked for.
+    """
+    scores = topic_scores(question)
+    if "all" in scores:
+        return ["all"]
+    order = list(TOPIC_KEYWORDS)
+    return sorted(scores, key=lambda topic: (-scores[topic], order.index(topic)))[:max_topics]
+
+
+def parse_birth_details(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the birth details note the Gradio interface prepends to messages.
+
+    Args:
+        text: The user's message
+
+    Returns:
+        generate_kundali_chart arguments (day, month, year, hour, minute,
+        birth_place and place_id if the note has one), or None if the message
+        has no such note
+    """
+    match = _BIRTH_NOTE.search(text)
+    if match is None:
+        return None
+    day, month, year, hour, minute, place, place_id, place_without_id = match.groups()
+    details = {
+        "day": int(day),
+        "month": int(month),
+        "year": int(year),
+        "hour": int(hour),
+        "minute": int(minute),
+        "birth_place": (place or place_without_id).strip(),
+    }
+    if place_id is not None:
+        details["place_id"] = int(place_id)
+    return details
+
+
+if __name__ == "__main__":
+    questions = {
+        "How will my career develop, should I change my job?": ["career"],
+        "When will I get married and what will my wife be like?": ["relationships"],
+        "Tell me about my personality": ["personality"],
+        "Will I have money problems? My salary is low.": ["finance"],
+        "Give me a full reading": ["all"],
+        "What does Rahu mean in astrology?": [],
+        "Is my love life or my job going to improve?": ["career", "relationships"],
+        "I love my job": ["career"],
+        "Should I start a workout routine?": [],
+        "Is Richard a good match for my sister?": ["family"],
+        "What kind of partner suits me in love?": ["relationships"],
+    }
+    failures = 0
+    for question, expected in questions.items():
+        topics = classify_intent(question)
+        failures += sorted(topics) != sorted(expected)
+        print(f"{topics!s:32s} {question}")
+    note = "Note: My birth details are - Date: 15/6/1990, Time: 10:30, Place: Mumbai, Maharashtra, India. How is my career?"
+    print(parse_birth_details(note), classify_intent(note))
+    print(parse_birth_details("Note: My birth details are - Date: 2/1/1985, Time: 06:05, Place: Jodhpur, India (place_id 3740). Hi"))
+    print(f"Misclassified: {failures} of {len(questions)}")
@@ -0,0 +1,87 @@
+"""
+Scripted Chat Model
+
+A stub chat model that plays a fixed tool-calling policy through the real
+agent graph and counts its calls, so LLM round trips per reading can be
+measured and tested without an API key or network. Used by
+scripts/benchmark_agent_round_trips.py and tests/test_agent_round_trips.py.
+
+    single:    one query_knowledge_base call per LLM turn
+    parallel:  all query_knowledge_base calls in one LLM turn
+    batch / prefetch:  one query_knowledge_base_batch call with the topic,
+               only if the conversation lacks a placement the topic needs
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from app.services.agent.graph import extract_kundali_data
+from app.services.agent.tools.knowledge_base_batch_tool import chart_queries
+
+STRATEGIES = ("single", "parallel", "batch", "prefetch")
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Stub chat model that plays a fixed tool-calling policy and counts its calls."""
+
+    strategy: str
+    topic: str
+    birth: Dict[str, Any]
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _tool_calls(self, name: str, calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [{"name": name, "args": args, "id": f"call_{self.calls}_{index}", "type": "tool_call"}
+                for index, args in enumerate(calls)]
+
+    def _next_message(self, messages: List[BaseMessage]) -> AIMessage:
+        chart = extract_kundali_data({"messages": messages})
+        if chart is None:
+            return AIMessage(content="", tool_calls=self._tool_calls("generate_kundali_chart", [self.birth]))
+
+        if self.strategy in ("batch", "prefetch"):
+            retrieved = batch_queries(messages)
+            if any(query not in retrieved for query in chart_queries(chart, self.topic)):
+                return AIMessage(content="", tool_calls=self._tool_calls("query_knowledge_base_batch", [{"topic": self.topic}]))
+        else:
+            answered = sum(isinstance(message, ToolMessage) and message.name != "generate_kundali_chart" for message in messages)
+            pending = chart_queries(chart, self.topic)[answered:]
+            if pending:
+                batch = pending if self.strategy == "parallel" else pending[:1]
+                return AIMessage(content="", tool_calls=self._tool_calls("query_knowledge_base", batch))
+        return AIMessage(content="Reading")
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        self.calls += 1
+        return ChatResult(generations=[ChatGeneration(message=self._next_message(messages))])
+
+
+def batch_queries(messages: List[BaseMessage]) -> List[Dict[str, Any]]:
+    """Queries answered so far by query_knowledge_base_batch results."""
+    queries = []
+    for message in messages:
+        if isinstance(message, ToolMessage) and message.name == "query_knowledge_base_batch":
+            for result in json.loads(message.content).get("results", []):
+                queries.append({name: value for name, value in result.items() if name not in ("interpretation", "error")})
+    return queries
+
+
+def interpretations(messages: List[BaseMessage]) -> List[str]:
+    """Every interpretation the tools returned, serialized and sorted."""
+    found = []
+    for message in messages:
+        if not isinstance(message, ToolMessage) or message.name == "generate_kundali_chart":
+            continue
+        content = json.loads(message.content)
+        entries = [result.get("interpretation") for result in content.get("results", [])] if "results" in content else [content]
+        found.extend(json.dumps(entry, sort_keys=True) for entry in entries if entry and "error" not in entry)
+    return sorted(found)
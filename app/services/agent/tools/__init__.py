@@ -2,6 +2,8 @@
 
 from app.services.agent.tools.kundali_tool import generate_kundali_chart
 from app.services.agent.tools.knowledge_base_tool import query_knowledge_base
+from app.services.agent.tools.knowledge_base_batch_tool import query_knowledge_base_batch
+from app.services.agent.tools.knowledge_base_search_tool import search_knowledge_base
 
-__all__ = ["generate_kundali_chart", "query_knowledge_base"]
+__all__ = ["generate_kundali_chart", "query_knowledge_base", "query_knowledge_base_batch", "search_knowledge_base"]
 
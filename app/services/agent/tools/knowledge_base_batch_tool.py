@@ -0,0 +1,216 @@
+"""
+Batch Knowledge Base Query Tool
+
+Answers many knowledge base queries in one tool call, so a reading costs one
+agent -> tools -> agent round trip instead of one per placement. The agent
+either passes an explicit list of queries (same fields as
+query_knowledge_base) or names a topic, in which case the placements relevant
+to that topic are read off the chart from the generate_kundali_chart result
+already in the conversation.
+"""
+
+from typing import Annotated, Any, Dict, List, Optional
+
+from langchain_core.tools import tool
+from langgraph.prebuilt import InjectedState
+from pydantic import BaseModel
+
+from app.config import PLANETS
+from app.services.agent.graph import extract_kundali_data
+from app.services.knowledge_base_service import get_knowledge_base_service
+
+# Houses and planets read for each topic; the ascendant is always included
+TOPICS = {
+    "personality": {"houses": (1,), "planets": ("sun", "moon"), "nakshatra": True},
+    "career": {"houses": (10, 6), "planets": ("sun", "saturn", "mercury"), "nakshatra": False},
+    "relationships": {"houses": (7, 5), "planets": ("venus", "mars", "moon"), "nakshatra": True},
+    "finance": {"houses": (2, 11), "planets": ("jupiter", "venus"), "nakshatra": False},
+    "health": {"houses": (1, 6, 8), "planets": ("sun", "moon", "mars"), "nakshatra": False},
+    "education": {"houses": (4, 5, 9), "planets": ("mercury", "jupiter"), "nakshatra": False},
+    "family": {"houses": (4, 2), "planets": ("moon",), "nakshatra": False},
+    "spirituality": {"houses": (9, 12), "planets": ("jupiter", "ketu"), "nakshatra": True},
+    "all": {"houses": tuple(range(1, 13)), "planets": tuple(PLANETS), "nakshatra": True},
+}
+
+TOPIC_ALIASES = {
+    "general": "personality",
+    "self": "personality",
+    "work": "career",
+    "job": "career",
+    "profession": "career",
+    "marriage": "relationships",
+    "love": "relationships",
+    "relationship": "relationships",
+    "money": "finance",
+    "wealth": "finance",
+    "children": "family",
+    "home": "family",
+    "study": "education",
+    "spiritual": "spirituality",
+    "everything": "all",
+    "full": "all",
+}
+
+# Arguments of each query type, in the order KnowledgeBaseService.lookup_many takes them
+QUERY_ARGUMENTS = {
+    "planet_in_house": ("planet", "house"),
+    "planet_in_sign": ("planet", "sign"),
+    "ascendant_sign": ("sign",),
+    "nakshatra": ("nakshatra",),
+    "conjunction": ("planet1", "planet2"),
+}
+
+
+class KnowledgeBaseQuery(BaseModel):
+    """One query, with the same fields as the query_knowledge_base tool."""
+    query_type: str
+    planet: Optional[str] = None
+    sign: Optional[str] = None
+    house: Optional[int] = None
+    nakshatra: Optional[str] = None
+    planet1: Optional[str] = None
+    planet2: Optional[str] = None
+
+
+def resolve_topic(topic: str) -> Optional[str]:
+    """Canonical topic name for a topic or alias, None if unknown."""
+    topic = topic.lower().strip()
+    topic = TOPIC_ALIASES.get(topic, topic)
+    return topic if topic in TOPICS else None
+
+
+def chart_queries(chart: Dict[str, Any], topic: str) -> List[Dict[str, Any]]:
+    """
+    List the knowledge base queries relevant to a topic for a chart.
+
+    Selected planets are the topic's planets plus every planet occupying one
+    of its houses. For each, its house and sign are queried, as well as its
+    conjunction with every other planet in the same house.
+
+    Args:
+        chart: Chart as returned by generate_kundali_chart
+        topic: One of TOPICS (or TOPIC_ALIASES)
+
+    Returns:
+        Query dictionaries (query_type plus arguments), without duplicates
+
+    Raises:
+        ValueError: If the topic is unknown
+    """
+    canonical = resolve_topic(topic)
+    if canonical is None:
+        raise ValueError(f"Unknown topic: {topic}. Must be one of: {', '.join(TOPICS)}")
+    spec = TOPICS[canonical]
+    planets = chart.get("planets", {})
+    houses = {name: data.get("house") for name, data in planets.items()}
+
+    selected = [name for name in planets if name in spec["planets"] or houses[name] in spec["houses"]]
+    queries = [{"query_type": "ascendant_sign", "sign": chart.get("ascendant_sign")}]
+    if spec["nakshatra"] and chart.get("nakshatra"):
+        queries.append({"query_type": "nakshatra", "nakshatra": chart["nakshatra"]})
+    for name in selected:
+        queries.append({"query_type": "planet_in_house", "planet": name, "house": houses[name]})
+        queries.append({"query_type": "planet_in_sign", "planet": name, "sign": planets[name].get("zodiac")})
+
+    pairs = set()
+    for name in selected:
+        for other in planets:
+            if other != name and houses[other] == houses[name]:
+                pairs.add(tuple(sorted((name, other), key=PLANETS.index)))
+    for planet1, planet2 in sorted(pairs, key=lambda pair: (PLANETS.index(pair[0]), PLANETS.index(pair[1]))):
+        queries.append({"query_type": "conjunction", "planet1": planet1, "planet2": planet2})
+    return queries
+
+
+def run_queries(queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Answer a list of queries with one batch lookup per query type.
+
+    Args:
+        queries: Query dictionaries (query_type plus arguments)
+
+    Returns:
+        One result per query, in order: the query's fields plus either
+        "interpretation" or "error"
+    """
+    kb_service = get_knowledge_base_service()
+    results: List[Dict[str, Any]] = [dict(query) for query in queries]
+    batches: Dict[str, List[int]] = {}
+    for position, result in enumerate(results):
+        query_type = str(result.get("query_type") or "").lower().strip()
+        arguments = QUERY_ARGUMENTS.get(query_type)
+        if arguments is None:
+            result["error"] = f"Invalid query_type: {query_type}. Must be one of: {', '.join(QUERY_ARGUMENTS)}"
+        elif any(result.get(argument) is None for argument in arguments):
+            result["error"] = f"{' and '.join(arguments)} are required for {query_type} query"
+        else:
+            result["query_type"] = query_type
+            batches.setdefault(query_type, []).append(position)
+
+    for query_type, positions in batches.items():
+        arguments = QUERY_ARGUMENTS[query_type]
+        columns = [[results[position][argument] for position in positions] for argument in arguments]
+        for position, interpretation in zip(positions, kb_service.lookup_many(query_type, *columns)):
+            if interpretation is None:
+                results[position]["error"] = "No interpretation found for the given parameters"
+            else:
+                results[position]["interpretation"] = interpretation
+    return results
+
+
+@tool
+def query_knowledge_base_batch(
+    queries: Optional[List[KnowledgeBaseQuery]] = None,
+    topic: Optional[str] = None,
+    state: Annotated[Optional[Dict[str, Any]], InjectedState] = None,
+) -> Dict[str, Any]:
+    """
+    Query the Vedic astrology knowledge base for many interpretations at once.
+
+    Prefer this tool over repeated query_knowledge_base calls: everything
+    needed for an answer is returned in one call.
+
+    Args:
+        queries: List of queries, each with query_type ("planet_in_house",
+            "planet_in_sign", "ascendant_sign", "nakshatra" or "conjunction")
+            and the same fields as query_knowledge_base (planet, house, sign,
+            nakshatra, planet1, planet2)
+        topic: Instead of (or in addition to) queries, fetch every placement
+            of the generated chart relevant to a topic: personality, career,
+            relationships, finance, health, education, family, spirituality
+            or all. Requires generate_kundali_chart to have been called.
+
+    Returns:
+        Dictionary with:
+        - topic: The resolved topic, if one was given
+        - results: One entry per query with its fields plus "interpretation"
+          (archetype, strengths, challenges, behavioral_advice, vedic_concepts)
+          or "error"
+
+    Example:
+        query_knowledge_base_batch(topic="career")
+
+        query_knowledge_base_batch(queries=[
+            {"query_type": "planet_in_house", "planet": "saturn", "house": 10},
+            {"query_type": "conjunction", "planet1": "sun", "planet2": "mercury"}
+        ])
+    """
+    all_queries = [
+        query.model_dump(exclude_none=True) if isinstance(query, KnowledgeBaseQuery) else dict(query)
+        for query in queries or []
+    ]
+    response: Dict[str, Any] = {}
+    if topic:
+        canonical = resolve_topic(topic)
+        if canonical is None:
+            return {"error": f"Unknown topic: {topic}. Must be one of: {', '.join(TOPICS)}"}
+        chart = extract_kundali_data(state) if state else None
+        if chart is None:
+            return {"error": "No chart found for the topic query; call generate_kundali_chart first"}
+        response["topic"] = canonical
+        all_queries = chart_queries(chart, canonical) + all_queries
+    if not all_queries:
+        return {"error": "queries or topic is required"}
+
+    response["results"] = run_queries(all_queries)
+    return response
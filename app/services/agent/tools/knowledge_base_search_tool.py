@@ -0,0 +1,97 @@
+"""
+Knowledge Base Search Tool
+
+This tool searches the Vedic astrology knowledge base by free text (BM25, see
+knowledge_base_search), for questions that do not name a placement, such as
+"why do I procrastinate?". Results can be limited to the placements of the
+chart generated earlier in the conversation.
+"""
+
+from typing import Annotated, Any, Dict, Optional, Set
+
+from langchain_core.tools import tool
+from langgraph.prebuilt import InjectedState
+
+from app.services.agent.graph import extract_kundali_data
+from app.services.agent.tools.knowledge_base_batch_tool import QUERY_ARGUMENTS, chart_queries
+from app.services.knowledge_base_search import get_knowledge_base_search
+from app.services.knowledge_base_service import get_knowledge_base_service
+
+MAX_RESULTS = 10
+
+
+def chart_keys(chart: Dict[str, Any]) -> Set[str]:
+    """
+    Knowledge base keys of every placement of a chart.
+
+    Args:
+        chart: Chart as returned by generate_kundali_chart
+
+    Returns:
+        Keys of the ascendant, nakshatra, every planet's house and sign, and
+        every conjunction in the chart that the knowledge base has
+    """
+    index = get_knowledge_base_service().index
+    keys = set()
+    for query in chart_queries(chart, "all"):
+        key = index.key(query["query_type"], *(query[argument] for argument in QUERY_ARGUMENTS[query["query_type"]]))
+        if key is not None:
+            keys.add(key)
+    return keys
+
+
+@tool
+def search_knowledge_base(
+    query: str,
+    chart_only: bool = True,
+    top_k: int = 5,
+    state: Annotated[Optional[Dict[str, Any]], InjectedState] = None,
+) -> Dict[str, Any]:
+    """
+    Search the Vedic astrology knowledge base by free text.
+
+    Use this tool for questions that do not map to a specific placement
+    (e.g. "why do I procrastinate?", "how do I handle conflict?"). It matches
+    the question against the archetypes, strengths, challenges and advice of
+    every interpretation.
+
+    Args:
+        query: The question or keywords to search for
+        chart_only: Only return interpretations of placements in the chart
+            generated earlier in the conversation (ignored if there is none,
+            or if none of its placements match)
+        top_k: Number of results (1-10), defaults to 5
+
+    Returns:
+        Dictionary with:
+        - filtered_to_chart: Whether results were limited to the chart's placements
+        - results: Best matches first, each with key (e.g. "saturn_3_house"),
+          score and interpretation
+
+    Example:
+        search_knowledge_base(query="why do I procrastinate?")
+    """
+    search = get_knowledge_base_search()
+    kb_service = get_knowledge_base_service()
+
+    allowed = None
+    chart = extract_kundali_data(state) if state and chart_only else None
+    if chart is not None:
+        allowed = search.mask(chart_keys(chart))
+
+    top_k = min(max(int(top_k), 1), MAX_RESULTS)
+    matches = search.search(query, top_k=top_k, allowed=allowed)
+    if not matches and allowed is not None:
+        # Nothing in the chart matches; the closest interpretations elsewhere are still context
+        allowed = None
+        matches = search.search(query, top_k=top_k)
+    if not matches:
+        return {"error": "No interpretation matches the query"}
+
+    return {
+        "filtered_to_chart": allowed is not None,
+        "results": [
+            {"key": key, "score": round(score, 2), "interpretation": kb_service.get_by_key(key)}
+            for key, score in matches
+        ],
+    }
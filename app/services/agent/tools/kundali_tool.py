@@ -8,8 +8,10 @@ It's designed to be used with LangGraph agents.
 from langchain_core.tools import tool
 from app.models import BirthChart
 from app.services.kundali_chart import planets_calculation
+from app.services.birth_details import place_coordinates
 from app.services.coord_utils import get_coordinates
-from typing import Dict, Any
+from app.services.timezones import resolve_utc_offset
+from typing import Dict, Any, Optional
 
 
 @tool
@@ -20,7 +22,8 @@ def generate_kundali_chart(
     hour: int,
     minute: int,
     second: int = 0,
-    birth_place: str = "Ahmedabad, Gujarat, India"
+    birth_place: str = "Ahmedabad, Gujarat, India",
+    place_id: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Generate a kundali (natal chart) based on birth details.
@@ -36,6 +39,8 @@ def generate_kundali_chart(
         minute: Minute of birth (0-59)
         second: Second of birth (0-59), defaults to 0
         birth_place: Birth place name (e.g., "Ahmedabad, Gujarat, India"), defaults to "Ahmedabad, Gujarat, India"
+        place_id: Place id from the birth details note (e.g. "Place: Mumbai, India (place_id 2541)");
+            takes precedence over birth_place, which is then only used if the id is unknown
     
     Returns:
         Dictionary containing:
@@ -62,13 +67,23 @@ def generate_kundali_chart(
             birth_place="Mumbai, Maharashtra, India"
         )
     """
+    # A place picked from the autocomplete suggestions needs no geocoding
+    coords = {}
+    if place_id is not None:
+        coords = place_coordinates(place_id)
+        if not coords:
+            print(f"Unknown place_id {place_id}, geocoding the birth place name instead")
+    
     # Get coordinates for birth place
-    coords = get_coordinates(birth_place)
+    if not coords:
+        coords = get_coordinates(birth_place)
     if not coords:
         # Use default coordinates if geocoding fails
         coords = {"latitude": 23.03, "longitude": 72.62}
     
-    # Create birth chart
+    # Create birth chart with the UTC offset in force at the place and time of birth
+    latitude = coords.get("latitude", 23.03)
+    longitude = coords.get("longitude", 72.62)
     birth_chart = BirthChart(
         day=day,
         month=month,
@@ -76,8 +91,9 @@ def generate_kundali_chart(
         hour=hour,
         minute=minute,
         second=second,
-        latitude=coords.get("latitude", 23.03),
-        longitude=coords.get("longitude", 72.62),
+        timezone=resolve_utc_offset(latitude, longitude, year, month, day, hour, minute, second, zone=coords.get("timezone")),
+        latitude=latitude,
+        longitude=longitude,
     )
     
     # Calculate kundali
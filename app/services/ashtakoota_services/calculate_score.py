@@ -1,28 +1,96 @@
 from app.models import AshtakootaMatchScore, AshtakootaProfile
 
-def calculate_varna_koota(groom_varna, bride_varna):
-    varna_map = {
-        "Brahmin": 1, "Kshatriya": 2, "Vaishya": 3, "Shudra": 4
+# Koota tables, built once at import rather than on every call
+
+VARNA_MAP = {
+    "Brahmin": 1, "Kshatriya": 2, "Vaishya": 3, "Shudra": 4
+}
+
+VASHYA_TABLE = [
+    [2, 0, 0, 0.5, 0],
+    [1, 2, 1, 0.5, 1],
+    [0.5, 1, 2, 1, 1],
+    [0, 0, 0, 2, 0],
+    [1, 1, 1, 0, 2]
+]
+
+VASHYA_MAP = {
+    "Dwipada": 1, "Chatushpada": 2, "Jalachara": 3, "Vanachara": 4, "Keeta": 5
+}
+
+YONI_TABLE = [
+    [4, 2, 2, 3, 2, 2, 2, 1, 0, 1, 1, 3, 2, 1],
+    [2, 4, 3, 3, 2, 2, 2, 2, 3, 1, 2, 3, 2, 0],
+    [2, 3, 4, 2, 1, 2, 1, 3, 3, 1, 2, 0, 3, 1],
+    [3, 3, 2, 4, 2, 1, 1, 1, 1, 2, 2, 2, 0, 2],
+    [2, 2, 1, 2, 4, 2, 1, 2, 2, 1, 0, 2, 1, 1],
+    [2, 2, 2, 1, 2, 4, 0, 2, 2, 1, 3, 3, 2, 1],
+    [2, 2, 1, 1, 1, 0, 4, 2, 2, 2, 2, 2, 1, 2],
+    [1, 2, 3, 1, 2, 2, 2, 4, 3, 0, 3, 2, 2, 1],
+    [0, 3, 3, 1, 2, 2, 2, 3, 4, 1, 2, 2, 2, 2],
+    [1, 1, 1, 2, 1, 1, 2, 0, 1, 4, 1, 1, 2, 1],
+    [1, 2, 2, 2, 0, 3, 2, 3, 2, 1, 4, 2, 2, 1],
+    [3, 3, 0, 2, 2, 3, 2, 2, 2, 1, 2, 4, 3, 2],
+    [2, 2, 3, 0, 1, 2, 1, 2, 2, 2, 2, 3, 4, 2],
+    [1, 0, 1, 2, 1, 1, 2, 1, 2, 1, 1, 2, 2, 4]
+]
+
+YONI_MAP = {
+    "Ashwa": 1, "Gaja": 2, "Mesha": 3, "Sarpa": 4, "Shwana": 5, "Marjar": 6, "Mushaka": 7,
+    "Gau": 8, "Mahisha": 9, "Vyaghra": 10, "Mriga": 11, "Vanara": 12, "Nakula": 13, "Simha": 14
+}
+
+FRIENDSHIP_CHART = {
+    "Sun":{
+        "Friend": ["Sun", "Moon", "Mars", "Jupiter"],
+        "Neutral": ["Mercury"],
+        "Enemy": ["Venus", "Saturn"]
+    },
+    "Moon":{
+        "Friend": ["Moon", "Sun", "Mercury"],
+        "Neutral": ["Jupiter", "Venus", "Saturn", "Mars"],
+        "Enemy": []
+    },
+    "Mars":{
+        "Friend": ["Mars", "Sun", "Moon", "Jupiter"],
+        "Neutral": ["Saturn", "Venus"],
+        "Enemy": ["Mercury"]
+    },
+    "Mercury":{
+        "Friend": ["Mercury", "Sun", "Venus"],
+        "Neutral": ["Mars", "Jupiter", "Saturn"],
+        "Enemy": ["Moon"]
+    },
+    "Jupiter":{
+        "Friend": ["Jupiter", "Sun", "Moon", "Mars"],
+        "Neutral": ["Saturn"],
+        "Enemy": ["Mercury", "Venus"]
+    },
+    "Venus":{
+        "Friend": ["Venus", "Mercury", "Saturn"],
+        "Neutral": ["Mars", "Jupiter"],
+        "Enemy": ["Sun", "Moon"]
+    },
+    "Saturn":{
+        "Friend": ["Saturn", "Mercury", "Venus"],
+        "Neutral": ["Jupiter"],
+        "Enemy": ["Sun", "Moon", "Mars"]
     }
-    if varna_map[groom_varna] >= varna_map[bride_varna]:
+}
+
+ZODIAC_MAP = {
+    'Aries': 1, 'Taurus': 2, 'Gemini': 3, 'Cancer': 4, 'Leo': 5, 'Virgo': 6, 
+    'Libra': 7, 'Scorpio': 8, 'Sagittarius': 9, 'Capricorn': 10, 'Aquarius': 11, 'Pisces': 12
+}
+
+def calculate_varna_koota(groom_varna, bride_varna):
+    if VARNA_MAP[groom_varna] >= VARNA_MAP[bride_varna]:
         return 1
     else:
         return 0
 
 def calculate_vashya_koota(groom_vashya, bride_vashya):
-    table = [
-        [2, 0, 0, 0.5, 0],
-        [1, 2, 1, 0.5, 1],
-        [0.5, 1, 2, 1, 1],
-        [0, 0, 0, 2, 0],
-        [1, 1, 1, 0, 2]
-    ]
-
-    vashya_map = {
-        "Dwipada": 1, "Chatushpada": 2, "Jalachara": 3, "Vanachara": 4, "Keeta": 5
-    }
-
-    return table[vashya_map[groom_vashya] - 1][vashya_map[bride_vashya] - 1]
+    return VASHYA_TABLE[VASHYA_MAP[groom_vashya] - 1][VASHYA_MAP[bride_vashya] - 1]
 
 def calculate_tara_koota(groom_tara, bride_tara):
 
@@ -38,81 +106,21 @@ def calculate_tara_koota(groom_tara, bride_tara):
             return 3
 
 def calculate_yoni_koota(groom_yoni, bride_yoni):
-    table = [
-        [4, 2, 2, 3, 2, 2, 2, 1, 0, 1, 1, 3, 2, 1],
-        [2, 4, 3, 3, 2, 2, 2, 2, 3, 1, 2, 3, 2, 0],
-        [2, 3, 4, 2, 1, 2, 1, 3, 3, 1, 2, 0, 3, 1],
-        [3, 3, 2, 4, 2, 1, 1, 1, 1, 2, 2, 2, 0, 2],
-        [2, 2, 1, 2, 4, 2, 1, 2, 2, 1, 0, 2, 1, 1],
-        [2, 2, 2, 1, 2, 4, 0, 2, 2, 1, 3, 3, 2, 1],
-        [2, 2, 1, 1, 1, 0, 4, 2, 2, 2, 2, 2, 1, 2],
-        [1, 2, 3, 1, 2, 2, 2, 4, 3, 0, 3, 2, 2, 1],
-        [0, 3, 3, 1, 2, 2, 2, 3, 4, 1, 2, 2, 2, 2],
-        [1, 1, 1, 2, 1, 1, 2, 0, 1, 4, 1, 1, 2, 1],
-        [1, 2, 2, 2, 0, 3, 2, 3, 2, 1, 4, 2, 2, 1],
-        [3, 3, 0, 2, 2, 3, 2, 2, 2, 1, 2, 4, 3, 2],
-        [2, 2, 3, 0, 1, 2, 1, 2, 2, 2, 2, 3, 4, 2],
-        [1, 0, 1, 2, 1, 1, 2, 1, 2, 1, 1, 2, 2, 4]
-    ]
-
-    yoni_map = {
-        "Ashwa": 1, "Gaja": 2, "Mesha": 3, "Sarpa": 4, "Shwana": 5, "Marjar": 6, "Mushaka": 7,
-        "Gau": 8, "Mahisha": 9, "Vyaghra": 10, "Mriga": 11, "Vanara": 12, "Nakula": 13, "Simha": 14
-    }
-
-    return table[yoni_map[groom_yoni] - 1][yoni_map[bride_yoni] - 1]
+    return YONI_TABLE[YONI_MAP[groom_yoni] - 1][YONI_MAP[bride_yoni] - 1]
 
 def calculate_graha_maitri_koota(groom_graha_maitri, bride_graha_maitri):
-    friendship_chart = {
-        "Sun":{
-            "Friend": ["Sun", "Moon", "Mars", "Jupiter"],
-            "Neutral": ["Mercury"],
-            "Enemy": ["Venus", "Saturn"]
-        },
-        "Moon":{
-            "Friend": ["Moon", "Sun", "Mercury"],
-            "Neutral": ["Jupiter", "Venus", "Saturn", "Mars"],
-            "Enemy": []
-        },
-        "Mars":{
-            "Friend": ["Mars", "Sun", "Moon", "Jupiter"],
-            "Neutral": ["Saturn", "Venus"],
-            "Enemy": ["Mercury"]
-        },
-        "Mercury":{
-            "Friend": ["Mercury", "Sun", "Venus"],
-            "Neutral": ["Mars", "Jupiter", "Saturn"],
-            "Enemy": ["Moon"]
-        },
-        "Jupiter":{
-            "Friend": ["Jupiter", "Sun", "Moon", "Mars"],
-            "Neutral": ["Saturn"],
-            "Enemy": ["Mercury", "Venus"]
-        },
-        "Venus":{
-            "Friend": ["Venus", "Mercury", "Saturn"],
-            "Neutral": ["Mars", "Jupiter"],
-            "Enemy": ["Sun", "Moon"]
-        },
-        "Saturn":{
-            "Friend": ["Saturn", "Mercury", "Venus"],
-            "Neutral": ["Jupiter"],
-            "Enemy": ["Sun", "Moon", "Mars"]
-        }
-    }
-
     relation_1 = ""
     relation_2 = ""
-    if bride_graha_maitri in friendship_chart[groom_graha_maitri]["Friend"]:
+    if bride_graha_maitri in FRIENDSHIP_CHART[groom_graha_maitri]["Friend"]:
         relation_1 = "Friend"
-    elif bride_graha_maitri in friendship_chart[groom_graha_maitri]["Neutral"]:
+    elif bride_graha_maitri in FRIENDSHIP_CHART[groom_graha_maitri]["Neutral"]:
         relation_1 = "Neutral"
     else:
         relation_1 = "Enemy"
     
-    if groom_graha_maitri in friendship_chart[bride_graha_maitri]["Friend"]:
+    if groom_graha_maitri in FRIENDSHIP_CHART[bride_graha_maitri]["Friend"]:
         relation_2 = "Friend"
-    elif groom_graha_maitri in friendship_chart[bride_graha_maitri]["Neutral"]:
+    elif groom_graha_maitri in FRIENDSHIP_CHART[bride_graha_maitri]["Neutral"]:
         relation_2 = "Neutral"
     else:
         relation_2 = "Enemy"
@@ -142,11 +150,7 @@ def calculate_gana_koota(groom_gana, bride_gana):
         return 0
 
 def calculate_bhakoota_koota(groom_bhakoota, bride_bhakoota):
-    zodiac_map = {
-        'Aries': 1, 'Taurus': 2, 'Gemini': 3, 'Cancer': 4, 'Leo': 5, 'Virgo': 6, 
-        'Libra': 7, 'Scorpio': 8, 'Sagittarius': 9, 'Capricorn': 10, 'Aquarius': 11, 'Pisces': 12
-    }
-    diff = abs(zodiac_map[groom_bhakoota] - zodiac_map[bride_bhakoota]) + 1
+    diff = abs(ZODIAC_MAP[groom_bhakoota] - ZODIAC_MAP[bride_bhakoota]) + 1
     if diff in [1, 3, 4, 7, 10, 11]:
         return 7
     else:
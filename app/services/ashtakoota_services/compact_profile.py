@@ -0,0 +1,220 @@
+"""
+Compact Ashtakoota Profiles
+
+An integer-coded alternative to the AshtakootaProfile model for high-volume
+matching. Every attribute is a small int indexing a name tuple (VARNAS,
+VASHYAS, ...), derived in O(1) from lookup tables keyed by sign and
+nakshatra id instead of the string comparisons in generate_profile.py.
+
+A profile is fixed by the Moon's lunar segment (rashi, nakshatra and pada,
+with the padas at 15° of Sagittarius and Capricorn split in half), so one
+CompactProfile instance is interned per segment and shared: building a
+profile is a table lookup and holding millions of them costs one reference
+each. Each profile also carries its score tensor code, so a pair is scored
+with score_tensor.score_codes(groom.code, bride.code).
+
+Convert to and from the Pydantic model (to_model, from_model) only at the
+API boundary.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from app.config import NAKSHATRAS, ZODIACS
+from app.models import AshtakootaProfile
+from app.services.ashtakoota_services.calculate_score import FRIENDSHIP_CHART, VARNA_MAP, VASHYA_MAP, YONI_MAP
+from app.services.ashtakoota_services.generate_profile import (
+    calculate_gana,
+    calculate_graha_maitri,
+    calculate_nadi,
+    calculate_tara,
+    calculate_varna,
+    calculate_vashya,
+    calculate_yoni,
+)
+from app.services.ashtakoota_services.score_tensor import SEGMENT_PROFILE_CODE
+from app.services.lunar_segments import NUM_SEGMENTS, SEGMENT_DEVIATION, SEGMENT_NAKSHATRA, SEGMENT_PADA, SEGMENT_SIGN
+
+# Attribute names; a profile's varna is VARNAS[profile.varna], and so on
+VARNAS = tuple(VARNA_MAP)
+VASHYAS = tuple(VASHYA_MAP)
+YONIS = tuple(YONI_MAP)
+GANAS = ("Deva", "Manushya", "Rakshasa")
+NADIS = ("Adi", "Madhya", "Antya")
+PLANETS = tuple(FRIENDSHIP_CHART)
+
+SIGN_IDS = {sign["name"]: sign_id for sign_id, sign in ZODIACS.items()}
+NAKSHATRA_IDS = {nakshatra["name"]: nakshatra_id for nakshatra_id, nakshatra in NAKSHATRAS.items()}
+
+
+def _table(ids: Dict[str, int], derive, names: tuple) -> np.ndarray:
+    """Index of derive(name) in names for every 1-based id (slot 0 unused)."""
+    table = np.full(len(ids) + 1, -1, dtype=np.int8)
+    for name, id_ in ids.items():
+        table[id_] = names.index(derive(name))
+    return table
+
+
+# Derivation tables, built once from the rules in generate_profile.py.
+# Indexed by sign id (1-12) or nakshatra id (1-27); SIGN_VASHYA also by
+# half (0: up to 15° of the sign, 1: past 15°)
+SIGN_VARNA = _table(SIGN_IDS, calculate_varna, VARNAS)
+SIGN_LORD = _table(SIGN_IDS, calculate_graha_maitri, PLANETS)
+SIGN_VASHYA = np.stack([
+    _table(SIGN_IDS, lambda sign: calculate_vashya(sign, 0), VASHYAS),
+    _table(SIGN_IDS, lambda sign: calculate_vashya(sign, 30), VASHYAS),
+], axis=1)
+NAKSHATRA_YONI = _table(NAKSHATRA_IDS, calculate_yoni, YONIS)
+NAKSHATRA_GANA = _table(NAKSHATRA_IDS, calculate_gana, GANAS)
+NAKSHATRA_NADI = _table(NAKSHATRA_IDS, calculate_nadi, NADIS)
+NAKSHATRA_TARA = np.array([0] + [calculate_tara(NAKSHATRAS[i]["name"]) for i in range(1, 28)], dtype=np.int8)
+
+# The same attributes as a NumPy record per lunar segment, for vectorized use
+PROFILE_DTYPE = np.dtype([
+    ("sign", np.int8), ("nakshatra", np.int8), ("pada", np.int8), ("half", np.int8),
+    ("varna", np.int8), ("vashya", np.int8), ("tara", np.int8), ("yoni", np.int8),
+    ("lord", np.int8), ("gana", np.int8), ("nadi", np.int8), ("code", np.int8),
+])
+
+
+class CompactProfile:
+    """Integer-coded Ashtakoota profile of one lunar segment; interned, treat as immutable."""
+
+    __slots__ = (
+        "segment", "sign", "nakshatra", "pada", "half",
+        "varna", "vashya", "tara", "yoni", "lord", "gana", "nadi", "code",
+    )
+
+    def __init__(self, segment: int):
+        """
+        Derive the profile of a lunar segment. Use segment_profile() instead,
+        which returns the shared instance.
+
+        Args:
+            segment: Lunar segment id (0-109)
+        """
+        self.segment = segment
+        self.sign = int(SEGMENT_SIGN[segment])
+        self.nakshatra = int(SEGMENT_NAKSHATRA[segment])
+        self.pada = int(SEGMENT_PADA[segment])
+        self.half = int(SEGMENT_DEVIATION[segment] > 15)
+        self.varna = int(SIGN_VARNA[self.sign])
+        self.vashya = int(SIGN_VASHYA[self.sign, self.half])
+        self.tara = int(NAKSHATRA_TARA[self.nakshatra])
+        self.yoni = int(NAKSHATRA_YONI[self.nakshatra])
+        self.lord = int(SIGN_LORD[self.sign])
+        self.gana = int(NAKSHATRA_GANA[self.nakshatra])
+        self.nadi = int(NAKSHATRA_NADI[self.nakshatra])
+        self.code = int(SEGMENT_PROFILE_CODE[segment])
+
+    def __repr__(self) -> str:
+        return (f"CompactProfile(segment={self.segment}, {ZODIACS[self.sign]['name']}, "
+                f"{NAKSHATRAS[self.nakshatra]['name']} pada {self.pada})")
+
+    def __reduce__(self):
+        # Unpickle (e.g. from a worker process) to the interned instance
+        return segment_profile, (self.segment,)
+
+    def record(self) -> tuple:
+        """Attributes as a tuple in PROFILE_DTYPE field order."""
+        return (self.sign, self.nakshatra, self.pada, self.half, self.varna, self.vashya,
+                self.tara, self.yoni, self.lord, self.gana, self.nadi, self.code)
+
+    def to_model(self) -> AshtakootaProfile:
+        """Convert to the AshtakootaProfile model (same values as generate_ashtakoota_profile)."""
+        sign = ZODIACS[self.sign]["name"]
+        return AshtakootaProfile(
+            moon_zodiac=sign,
+            nakshatra=NAKSHATRAS[self.nakshatra]["name"],
+            varna=VARNAS[self.varna],
+            vashya=VASHYAS[self.vashya],
+            tara=self.tara,
+            yoni=YONIS[self.yoni],
+            graha_maitri=PLANETS[self.lord],
+            gana=GANAS[self.gana],
+            bhakoota=sign,
+            nadi=NADIS[self.nadi]
+        )
+
+
+# Interned instances, one per lunar segment
+SEGMENT_PROFILES: List[CompactProfile] = [CompactProfile(segment) for segment in range(NUM_SEGMENTS)]
+SEGMENT_RECORDS = np.array([profile.record() for profile in SEGMENT_PROFILES], dtype=PROFILE_DTYPE)
+
+# (sign, nakshatra, pada) -> segment ids, two for the padas split at 15°
+_PADA_SEGMENTS: Dict[Tuple[int, int, int], List[int]] = {}
+for _profile in SEGMENT_PROFILES:
+    _PADA_SEGMENTS.setdefault((_profile.sign, _profile.nakshatra, _profile.pada), []).append(_profile.segment)
+
+
+def segment_profile(segment: int) -> CompactProfile:
+    """
+    Get the interned profile of a lunar segment.
+
+    Args:
+        segment: Lunar segment id (0-109), e.g. from moon_table.moon_segment
+
+    Returns:
+        Shared CompactProfile instance
+    """
+    return SEGMENT_PROFILES[segment]
+
+
+def compact_profile(sign: int, nakshatra: int, pada: int, deviation: float = 0.0) -> CompactProfile:
+    """
+    Get the interned profile for a Moon sign, nakshatra and pada.
+
+    Args:
+        sign: Sign id (1-12)
+        nakshatra: Nakshatra id (1-27)
+        pada: Pada (1-4)
+        deviation: Degrees of the Moon within the sign; only used for the
+            two padas split at 15° of Sagittarius and Capricorn
+
+    Returns:
+        Shared CompactProfile instance
+    """
+    segments = _PADA_SEGMENTS.get((sign, nakshatra, pada))
+    if segments is None:
+        raise ValueError(f"Nakshatra {nakshatra} pada {pada} does not fall in sign {sign}")
+    return SEGMENT_PROFILES[segments[-1] if deviation > 15 else segments[0]]
+
+
+def from_model(profile: AshtakootaProfile, pada: Optional[int] = None) -> CompactProfile:
+    """
+    Convert an AshtakootaProfile model to its interned compact profile.
+
+    The model does not record the pada; without one, the first pada
+    consistent with the model is used (scores do not depend on the pada).
+
+    Args:
+        profile: Profile from generate_ashtakoota_profile
+        pada: Pada of the Moon (1-4), if known
+
+    Returns:
+        Shared CompactProfile instance
+    """
+    sign = SIGN_IDS.get(profile.moon_zodiac)
+    nakshatra = NAKSHATRA_IDS.get(profile.nakshatra)
+    vashya = VASHYAS.index(profile.vashya) if profile.vashya in VASHYAS else None
+    for candidate in range(1, 5) if pada is None else (pada,):
+        for segment in _PADA_SEGMENTS.get((sign, nakshatra, candidate), ()):
+            if SEGMENT_PROFILES[segment].vashya == vashya:
+                return SEGMENT_PROFILES[segment]
+    raise ValueError(f"No lunar segment matches {profile.moon_zodiac}/{profile.nakshatra}/{profile.vashya}")
+
+
+if __name__ == "__main__":
+    import sys
+    import timeit
+
+    from app.services.ashtakoota_services.generate_profile import generate_ashtakoota_profile
+
+    # Correctness (parity with generate_ashtakoota_profile, interning, pickling) is tested in tests/test_compact_profile.py
+    model = SEGMENT_PROFILES[80].to_model()
+    print(f"Size: CompactProfile {sys.getsizeof(SEGMENT_PROFILES[80])} bytes, "
+          f"AshtakootaProfile {sys.getsizeof(model) + sys.getsizeof(model.__dict__)} bytes (+ strings)")
+    number = 100000
+    compact = timeit.timeit(lambda: compact_profile(9, 20, 2, 16.0), number=number) / number
+    generated = timeit.timeit(lambda: generate_ashtakoota_profile("Sagittarius", 16.0, "Purva Ashadha"), number=number) / number
+    print(f"Derivation: compact_profile {1e6 * compact:.2f} us, generate_ashtakoota_profile {1e6 * generated:.2f} us")
@@ -0,0 +1,232 @@
+"""
+Dosha Screening
+
+Mangal (Manglik), Nadi and Bhakoota dosha checks applied alongside the
+36-point Ashtakoota score, in a form the bulk matching path can apply to
+whole blocks of pairs at once.
+
+    per chart:  Manglik flags are computed once from the chart's signs (Mars
+                in houses 1, 2, 4, 7, 8 or 12 counted from the lagna, the
+                Moon and Venus) and stored as a small bitmask
+    per pair:   Nadi and Bhakoota doshas and their exceptions depend only on
+                the two profile codes, so they are 42 x 42 boolean tables
+
+The exception rules are data: MARS_CANCELLATION_SIGNS for charts and named
+pair rules (PAIR_RULES) listed in NADI_EXCEPTIONS / BHAKOOTA_EXCEPTIONS, which
+a DoshaPolicy can override. pair_table() folds a policy into one integer table
+indexed by (profile code, Manglik) keys, so screening a block of pairs is the
+same single lookup as scoring it.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from app.config import PLANETS, ZODIACS
+from app.models import AshtakootaProfile, DoshaPolicy, KundaliChart
+from app.services.ashtakoota_services.calculate_score import FRIENDSHIP_CHART
+from app.services.ashtakoota_services.score_tensor import KOOTAS, NUM_PROFILES, PROFILES, SCORE_TENSOR, TOTAL
+
+# Chart flag bits
+MANGLIK_FROM_LAGNA = 1
+MANGLIK_FROM_MOON = 2
+MANGLIK_FROM_VENUS = 4
+MARS_DIGNIFIED = 8  # Mars in a sign of MARS_CANCELLATION_SIGNS
+
+MANGLIK_REFERENCES = {"lagna": MANGLIK_FROM_LAGNA, "moon": MANGLIK_FROM_MOON, "venus": MANGLIK_FROM_VENUS}
+
+# Houses (counted from a reference) in which Mars causes Mangal dosha
+MANGLIK_HOUSES = (1, 2, 4, 7, 8, 12)
+
+# Mars in its own or exaltation sign cancels its Mangal dosha
+MARS_CANCELLATION_SIGNS = ("Aries", "Scorpio", "Capricorn")
+
+
+def _mutual_friends(groom: AshtakootaProfile, bride: AshtakootaProfile) -> bool:
+    return (bride.graha_maitri in FRIENDSHIP_CHART[groom.graha_maitri]["Friend"]
+            and groom.graha_maitri in FRIENDSHIP_CHART[bride.graha_maitri]["Friend"])
+
+
+# Named pair rules used as dosha exceptions
+PAIR_RULES: Dict[str, Callable[[AshtakootaProfile, AshtakootaProfile], bool]] = {
+    "same_rashi_different_nakshatra": lambda g, b: g.moon_zodiac == b.moon_zodiac and g.nakshatra != b.nakshatra,
+    "same_nakshatra_different_rashi": lambda g, b: g.nakshatra == b.nakshatra and g.moon_zodiac != b.moon_zodiac,
+    "same_rashi_lord": lambda g, b: g.graha_maitri == b.graha_maitri,
+    "friendly_rashi_lords": _mutual_friends,
+}
+
+# Default exceptions: a Nadi or Bhakoota dosha is cancelled if any listed rule holds
+NADI_EXCEPTIONS = ("same_rashi_different_nakshatra", "same_nakshatra_different_rashi", "same_rashi_lord")
+BHAKOOTA_EXCEPTIONS = ("same_rashi_lord", "friendly_rashi_lords")
+
+# Score of a rejected pair in pair_table (below any threshold)
+REJECTED = np.iinfo(np.int16).min
+
+_SIGN_IDS = {sign["name"]: sign_id for sign_id, sign in ZODIACS.items()}
+
+# _MANGLIK_HOUSE[house]: whether Mars in that house (1-12) causes the dosha
+_MANGLIK_HOUSE = np.zeros(13, dtype=bool)
+_MANGLIK_HOUSE[list(MANGLIK_HOUSES)] = True
+_MARS_DIGNIFIED_SIGN = np.zeros(13, dtype=bool)
+_MARS_DIGNIFIED_SIGN[[_SIGN_IDS[sign] for sign in MARS_CANCELLATION_SIGNS]] = True
+
+
+def _pair_rule_table(rule: Callable) -> np.ndarray:
+    return np.array([[rule(groom, bride) for bride in PROFILES] for groom in PROFILES], dtype=bool)
+
+
+# [groom_code, bride_code] tables
+NADI_DOSHA = SCORE_TENSOR[:, :, KOOTAS.index("nadi")] == 0
+BHAKOOTA_DOSHA = SCORE_TENSOR[:, :, KOOTAS.index("bhakoota")] == 0
+_RULE_TABLES = {name: _pair_rule_table(rule) for name, rule in PAIR_RULES.items()}
+
+
+def dosha_flags(mars_signs, reference_signs: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Compute chart flag bitmasks from sign ids, vectorized.
+
+    Args:
+        mars_signs: Sign id (1-12) of Mars per chart
+        reference_signs: Sign ids per chart for "lagna", "moon" and "venus"
+
+    Returns:
+        Uint8 array of flags (MANGLIK_FROM_* and MARS_DIGNIFIED bits)
+    """
+    mars_signs = np.asarray(mars_signs, dtype=np.int64)
+    flags = np.where(_MARS_DIGNIFIED_SIGN[mars_signs], MARS_DIGNIFIED, 0).astype(np.uint8)
+    for reference, bit in MANGLIK_REFERENCES.items():
+        house = (mars_signs - np.asarray(reference_signs[reference], dtype=np.int64)) % 12 + 1
+        flags |= np.where(_MANGLIK_HOUSE[house], bit, 0).astype(np.uint8)
+    return flags
+
+
+def chart_dosha_flags(kundali_chart: KundaliChart) -> int:
+    """
+    Compute the flag bitmask of one chart from planets_calculation output.
+
+    Args:
+        kundali_chart: Chart (sign-level charts are enough)
+
+    Returns:
+        Flags (MANGLIK_FROM_* and MARS_DIGNIFIED bits)
+    """
+    planets = kundali_chart.planets
+    return int(dosha_flags(
+        [_SIGN_IDS[planets["mars"].zodiac]],
+        {
+            "lagna": [_SIGN_IDS[kundali_chart.ascendant_sign]],
+            "moon": [_SIGN_IDS[planets["moon"].zodiac]],
+            "venus": [_SIGN_IDS[planets["venus"].zodiac]],
+        },
+    )[0])
+
+
+def chart_array_dosha_flags(charts: np.ndarray) -> np.ndarray:
+    """
+    Compute the flag bitmasks of a batch_kundali chart array, vectorized.
+
+    Args:
+        charts: Structured array with batch_kundali.CHART_DTYPE
+
+    Returns:
+        Uint8 array of flags, one per chart
+    """
+    signs = charts["sign"]
+    return dosha_flags(
+        signs[:, PLANETS.index("mars")],
+        {
+            "lagna": charts["ascendant_sign"],
+            "moon": signs[:, PLANETS.index("moon")],
+            "venus": signs[:, PLANETS.index("venus")],
+        },
+    )
+
+
+def is_manglik(flags, policy: DoshaPolicy) -> np.ndarray:
+    """
+    Whether charts have an uncancelled Mangal dosha under a policy.
+
+    Args:
+        flags: Chart flag bitmask(s)
+        policy: Dosha policy (which references count, whether dignified Mars cancels)
+
+    Returns:
+        Bool array, same shape as flags
+    """
+    flags = np.asarray(flags, dtype=np.uint8)
+    mask = 0
+    for reference in policy.manglik_references:
+        mask |= MANGLIK_REFERENCES[reference]
+    manglik = (flags & mask) != 0
+    if policy.mars_dignity_cancels:
+        manglik &= (flags & MARS_DIGNIFIED) == 0
+    return manglik
+
+
+def _exceptions(rules: Optional[List[str]], default: Tuple[str, ...]) -> np.ndarray:
+    """Pairs for which any of the named rules (default if None) holds."""
+    table = np.zeros((NUM_PROFILES, NUM_PROFILES), dtype=bool)
+    for rule in default if rules is None else rules:
+        if rule not in _RULE_TABLES:
+            raise ValueError(f"Unknown exception rule: {rule}, expected one of {tuple(PAIR_RULES)}")
+        table |= _RULE_TABLES[rule]
+    return table
+
+
+def _apply(table: np.ndarray, dosha: np.ndarray, action: str, penalty: float) -> None:
+    """Apply one dosha's action to the pairs where it is present, in place."""
+    if action == "reject":
+        table[dosha] = REJECTED
+    elif action == "penalize":
+        table[dosha & (table != REJECTED)] -= int(round(penalty * 2))
+    elif action != "ignore":
+        raise ValueError(f"Unknown dosha action: {action}, expected 'ignore', 'penalize' or 'reject'")
+
+
+def pair_table(policy: DoshaPolicy) -> np.ndarray:
+    """
+    Fold a dosha policy into the score table.
+
+    Args:
+        policy: Dosha policy
+
+    Returns:
+        Int16 array indexed [groom_key, bride_key] with key = profile code * 2 +
+        Manglik (see is_manglik): the adjusted total in half-points, or REJECTED
+    """
+    totals = SCORE_TENSOR[:, :, TOTAL].astype(np.int16)
+    nadi_cancelled = NADI_DOSHA & _exceptions(policy.nadi_exceptions, NADI_EXCEPTIONS)
+    bhakoota_cancelled = BHAKOOTA_DOSHA & _exceptions(policy.bhakoota_exceptions, BHAKOOTA_EXCEPTIONS)
+    if policy.restore_cancelled_points:
+        totals += nadi_cancelled * 16 + bhakoota_cancelled * 14
+
+    # Keys: [groom_code, groom_manglik, bride_code, bride_manglik]
+    table = np.repeat(np.repeat(totals[:, None, :, None], 2, axis=1), 2, axis=3)
+    _apply(table, np.broadcast_to((NADI_DOSHA & ~nadi_cancelled)[:, None, :, None], table.shape), policy.nadi, policy.nadi_penalty)
+    _apply(table, np.broadcast_to((BHAKOOTA_DOSHA & ~bhakoota_cancelled)[:, None, :, None], table.shape), policy.bhakoota, policy.bhakoota_penalty)
+    # Mangal dosha: exactly one partner is Manglik (two Manglik charts cancel out)
+    mismatch = np.array([[False, True], [True, False]])
+    _apply(table, np.broadcast_to(mismatch[None, :, None, :], table.shape), policy.manglik, policy.manglik_penalty)
+    return table.reshape(NUM_PROFILES * 2, NUM_PROFILES * 2)
+
+
+def dosha_keys(codes, flags, policy: DoshaPolicy) -> np.ndarray:
+    """
+    Keys into pair_table for people with the given profile codes and chart flags.
+
+    Args:
+        codes: Profile codes
+        flags: Chart flag bitmasks
+        policy: Dosha policy
+
+    Returns:
+        Int array of keys
+    """
+    return np.asarray(codes, dtype=np.intp) * 2 + is_manglik(flags, policy)
+
+
+if __name__ == "__main__":
+    # Correctness (pair_table against the per-pair rules) is tested in tests/test_dosha.py
+    table = pair_table(DoshaPolicy(nadi="penalize", bhakoota="penalize"))
+    print(f"Pairs with Nadi dosha {NADI_DOSHA.sum()}, cancelled {(NADI_DOSHA & _exceptions(None, NADI_EXCEPTIONS)).sum()}; "
+          f"Bhakoota dosha {BHAKOOTA_DOSHA.sum()}, cancelled {(BHAKOOTA_DOSHA & _exceptions(None, BHAKOOTA_EXCEPTIONS)).sum()}; "
+          f"rejected keys {np.count_nonzero(table == REJECTED)} of {table.size}")
@@ -0,0 +1,169 @@
+"""
+Ashtakoota Score Tensor
+
+An Ashtakoota profile is fixed by the Moon's rashi, nakshatra and, in
+Sagittarius and Capricorn, whether the Moon is past 15° of the sign (the
+Vashya changes there). That leaves only 42 distinct profiles: the 36
+rashi/nakshatra combinations, with both Vashya variants of the six
+combinations in those two signs. (profile_code accepts any deviation for
+any combination, so all variants get codes, not only those a real Moon
+position can produce.) Each profile gets an integer
+code, and the eight koota scores and the total for every (groom, bride)
+pair of codes are precomputed at import into a small tensor. Scoring a pair
+is then a single array lookup, and scoring many pairs is one
+fancy-indexing operation.
+
+Scores are stored as int8 half-points (every koota score is a multiple of
+0.5); the lookup functions convert back to points.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+from app.config import NAKSHATRAS, ZODIACS
+from app.models import AshtakootaMatchScore, AshtakootaProfile
+from app.services.ashtakoota_services.calculate_score import calculate_ashtakoota
+from app.services.ashtakoota_services.generate_profile import generate_ashtakoota_profile
+from app.services.lunar_segments import NUM_SEGMENTS, SEGMENT_DEVIATION, SEGMENT_NAKSHATRA, SEGMENT_SIGN
+
+# Last axis of the tensor: the eight kootas, then the total
+KOOTAS = ("varna", "vashya", "tara", "yoni", "graha_maitri", "gana", "bhakoota", "nadi")
+TOTAL = len(KOOTAS)
+
+
+def _enumerate_profiles():
+    """Distinct profiles in longitude order, and the profile code of every lunar segment."""
+    profiles = []
+    codes: Dict[Tuple[str, str, str], int] = {}
+
+    def code_of(zodiac: str, deviation: float, nakshatra: str) -> int:
+        profile = generate_ashtakoota_profile(zodiac, deviation, nakshatra)
+        key = (profile.moon_zodiac, profile.nakshatra, profile.vashya)
+        if key not in codes:
+            codes[key] = len(profiles)
+            profiles.append(profile)
+        return codes[key]
+
+    segment_codes = np.empty(NUM_SEGMENTS, dtype=np.int8)
+    for segment in range(NUM_SEGMENTS):
+        zodiac = ZODIACS[int(SEGMENT_SIGN[segment])]["name"]
+        nakshatra = NAKSHATRAS[int(SEGMENT_NAKSHATRA[segment])]["name"]
+        # Both Vashya variants (deviation up to / past 15°) of the combination
+        for deviation in (0.0, 30.0):
+            code_of(zodiac, deviation, nakshatra)
+        segment_codes[segment] = code_of(zodiac, float(SEGMENT_DEVIATION[segment]), nakshatra)
+    return profiles, codes, segment_codes
+
+
+# PROFILES[code] is a representative AshtakootaProfile for the code;
+# SEGMENT_PROFILE_CODE[segment] maps lunar segment ids to codes
+PROFILES, _PROFILE_CODES, SEGMENT_PROFILE_CODE = _enumerate_profiles()
+NUM_PROFILES = len(PROFILES)
+
+
+def _build_tensor() -> np.ndarray:
+    tensor = np.empty((NUM_PROFILES, NUM_PROFILES, TOTAL + 1), dtype=np.int8)
+    for groom_code, groom in enumerate(PROFILES):
+        for bride_code, bride in enumerate(PROFILES):
+            score = calculate_ashtakoota(groom_profile=groom, bride_profile=bride)
+            points = [getattr(score, koota) for koota in KOOTAS] + [score.total]
+            tensor[groom_code, bride_code] = np.rint(np.array(points) * 2)
+    tensor.setflags(write=False)
+    return tensor
+
+
+# SCORE_TENSOR[groom_code, bride_code, k] is koota k (KOOTAS order, TOTAL for the total) in half-points
+SCORE_TENSOR = _build_tensor()
+
+
+def profile_code(zodiac: str, deviation: float, nakshatra: str) -> int:
+    """
+    Get the profile code of a Moon position.
+
+    Args:
+        zodiac: Moon sign name (e.g. 'Sagittarius')
+        deviation: Degrees of the Moon within the sign
+        nakshatra: Nakshatra name (e.g. 'Purva Ashadha')
+
+    Returns:
+        Profile code (0 to NUM_PROFILES - 1)
+    """
+    return profile_code_of(generate_ashtakoota_profile(zodiac, deviation, nakshatra))
+
+
+def profile_code_of(profile: AshtakootaProfile) -> int:
+    """
+    Get the profile code of an Ashtakoota profile.
+
+    Args:
+        profile: Profile from generate_ashtakoota_profile
+
+    Returns:
+        Profile code (0 to NUM_PROFILES - 1)
+    """
+    key = (profile.moon_zodiac, profile.nakshatra, profile.vashya)
+    if key not in _PROFILE_CODES:
+        raise ValueError(f"No profile code for {profile.moon_zodiac}/{profile.nakshatra}/{profile.vashya}")
+    return _PROFILE_CODES[key]
+
+
+def score_codes(groom_codes, bride_codes) -> np.ndarray:
+    """
+    Look up the scores of groom/bride profile code pairs.
+
+    Args:
+        groom_codes: Groom profile codes (scalar or array)
+        bride_codes: Bride profile codes, broadcastable against groom_codes
+
+    Returns:
+        Float array of shape broadcast(groom_codes, bride_codes) + (9,) holding
+        the koota scores in KOOTAS order followed by the total
+    """
+    return SCORE_TENSOR[groom_codes, bride_codes] / 2
+
+
+def ashtakoota_score(groom_profile: AshtakootaProfile, bride_profile: AshtakootaProfile) -> AshtakootaMatchScore:
+    """
+    Score a couple by tensor lookup; same result as calculate_ashtakoota.
+
+    Args:
+        groom_profile: Groom's Ashtakoota profile
+        bride_profile: Bride's Ashtakoota profile
+
+    Returns:
+        AshtakootaMatchScore with each koota and the total
+    """
+    return match_score(profile_code_of(groom_profile), profile_code_of(bride_profile))
+
+
+def match_score(groom_code: int, bride_code: int) -> AshtakootaMatchScore:
+    """
+    Score a couple given their profile codes (e.g. CompactProfile.code).
+
+    Args:
+        groom_code: Groom's profile code
+        bride_code: Bride's profile code
+
+    Returns:
+        AshtakootaMatchScore with each koota and the total
+    """
+    points = score_codes(groom_code, bride_code).tolist()
+    return AshtakootaMatchScore(**dict(zip(KOOTAS, points)), total=points[TOTAL])
+
+
+if __name__ == "__main__":
+    from app.services.lunar_segments import describe_segment
+
+    # Parity check: the tensor against the scalar koota functions for every
+    # pair of lunar segments, including both Vashya halves of the split padas
+    segment_profiles = []
+    for segment in range(NUM_SEGMENTS):
+        details = describe_segment(segment)
+        segment_profiles.append(generate_ashtakoota_profile(details["zodiac"], details["deviation"], details["nakshatra"]))
+    mismatches = 0
+    for groom in segment_profiles:
+        for bride in segment_profiles:
+            if ashtakoota_score(groom, bride) != calculate_ashtakoota(groom_profile=groom, bride_profile=bride):
+                mismatches += 1
+    print(f"{NUM_PROFILES} profiles, tensor {SCORE_TENSOR.shape}, {SCORE_TENSOR.nbytes} bytes")
+    print(f"Mismatches over {NUM_SEGMENTS ** 2} segment pairs: {mismatches}")
@@ -0,0 +1,198 @@
+"""
+Batch Kundali Engine
+
+Computes many natal charts in one call and returns them as a NumPy
+structured array instead of one Pydantic KundaliChart per chart.
+Swiss Ephemeris is still queried per chart (unless planet positions come from
+the Chebyshev cache in "fast" mode), but the Julian day conversion and every
+sign/house/nakshatra derivation is vectorized over the batch.
+"""
+
+import numpy as np
+import swisseph as swe
+from typing import List, Sequence, Union
+from app.models import BirthChart, KundaliChart, PlanetData
+from app.config import ZODIACS, PLANETS, NAKSHATRAS
+from app.services.chebyshev_ephemeris import planetary_longitudes
+from app.services.ephemeris import get_ephemeris_session
+from app.services.lunar_segments import NAKSHATRA_SPAN, PADA_SPAN
+
+NUM_PLANETS = len(PLANETS)
+RAHU_INDEX = PLANETS.index("rahu")
+KETU_INDEX = PLANETS.index("ketu")
+MOON_INDEX = PLANETS.index("moon")
+
+UNIX_EPOCH_JD = 2440587.5
+
+# One record per chart. Per-planet fields are sub-arrays ordered like app.config.PLANETS,
+# signs and nakshatras are 1-based ids into ZODIACS / NAKSHATRAS.
+CHART_DTYPE = np.dtype([
+    ("jd", "f8"),
+    ("ascendant", "f8"),
+    ("ascendant_sign", "i1"),
+    ("nakshatra", "i1"),
+    ("nakshatra_pada", "i1"),
+    ("longitude", "f8", (NUM_PLANETS,)),
+    ("speed", "f8", (NUM_PLANETS,)),
+    ("sign", "i1", (NUM_PLANETS,)),
+    ("house", "i1", (NUM_PLANETS,)),
+    ("deviation", "f8", (NUM_PLANETS,)),
+    ("retrograde", "?", (NUM_PLANETS,)),
+])
+
+ArrayLike = Union[Sequence[float], np.ndarray, float]
+
+
+def julian_days(birth_datetimes: np.ndarray, tz_offsets: ArrayLike = 5.5) -> np.ndarray:
+    """
+    Convert local birth datetimes to Julian days (UT), vectorized.
+
+    Args:
+        birth_datetimes: Array of local birth times (anything np.datetime64 accepts)
+        tz_offsets: UTC offset in hours, scalar or one per chart
+
+    Returns:
+        Float64 array of Julian days, identical to swe.julday for Gregorian dates
+    """
+    local = np.asarray(birth_datetimes, dtype="datetime64[s]")
+    offsets = np.asarray(tz_offsets, dtype=np.float64)
+    seconds = (local - np.datetime64("1970-01-01T00:00:00", "s")).astype(np.float64)
+    return UNIX_EPOCH_JD + (seconds - offsets * 3600.0) / 86400.0
+
+
+def _compute_ascendants(jds: np.ndarray, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Query Swiss Ephemeris for every chart's sidereal ascendant."""
+    ascendants = np.empty(jds.shape[0], dtype=np.float64)
+    # Hold the session for the whole batch and call swisseph directly inside it
+    with get_ephemeris_session():
+        for row in range(jds.shape[0]):
+            ascendants[row] = swe.houses_ex(float(jds[row]), float(latitudes[row]), float(longitudes[row]), b'W', swe.FLG_SIDEREAL)[1][0]
+    return ascendants
+
+
+def derive_chart_fields(charts: np.ndarray) -> np.ndarray:
+    """
+    Fill the sign, house, deviation, retrograde and nakshatra fields of a chart array
+    from its longitude, speed and ascendant fields.
+
+    Args:
+        charts: Array with CHART_DTYPE whose jd/ascendant/longitude/speed are populated
+
+    Returns:
+        The same array, updated in place
+    """
+    longitude = charts["longitude"]
+    ascendant_sign = (charts["ascendant"] // 30).astype(np.int8)
+    sign = (longitude // 30).astype(np.int8)
+
+    charts["ascendant_sign"] = ascendant_sign + 1
+    charts["sign"] = sign + 1
+    charts["house"] = (sign - ascendant_sign[:, None] + 12) % 12 + 1
+    charts["deviation"] = longitude % 30
+
+    retrograde = charts["speed"] < 0
+    # Rahu and Ketu are always treated as retrograde
+    retrograde[:, RAHU_INDEX] = True
+    retrograde[:, KETU_INDEX] = True
+    charts["retrograde"] = retrograde
+
+    moon = longitude[:, MOON_INDEX]
+    charts["nakshatra"] = (moon // NAKSHATRA_SPAN).astype(np.int8) % 27 + 1
+    charts["nakshatra_pada"] = (moon // PADA_SPAN).astype(np.int8) % 4 + 1
+    return charts
+
+
+def batch_planets_calculation(
+    birth_datetimes: np.ndarray,
+    latitudes: ArrayLike,
+    longitudes: ArrayLike,
+    tz_offsets: ArrayLike = 5.5,
+    mode: str = "exact",
+) -> np.ndarray:
+    """
+    Compute natal charts for arrays of birth details.
+
+    Args:
+        birth_datetimes: Local birth times, one per chart
+        latitudes: Birth latitudes in degrees (scalar or one per chart)
+        longitudes: Birth longitudes in degrees (scalar or one per chart)
+        tz_offsets: UTC offsets in hours (scalar or one per chart)
+        mode: Planet positions from "exact" (Swiss Ephemeris) or "fast" (Chebyshev cache);
+            the ascendant always comes from Swiss Ephemeris
+
+    Returns:
+        Structured array with CHART_DTYPE, one record per chart
+    """
+    jds = np.atleast_1d(julian_days(birth_datetimes, tz_offsets))
+    count = jds.shape[0]
+    latitudes = np.broadcast_to(np.asarray(latitudes, dtype=np.float64), (count,))
+    longitudes = np.broadcast_to(np.asarray(longitudes, dtype=np.float64), (count,))
+
+    charts = np.zeros(count, dtype=CHART_DTYPE)
+    charts["jd"] = jds
+    charts["longitude"], charts["speed"] = planetary_longitudes(jds, mode)
+    charts["ascendant"] = _compute_ascendants(jds, latitudes, longitudes)
+    return derive_chart_fields(charts)
+
+
+def batch_from_birth_charts(birth_charts: List[BirthChart]) -> np.ndarray:
+    """
+    Compute a chart array for a list of BirthChart models.
+
+    Args:
+        birth_charts: Birth details as used by planets_calculation
+
+    Returns:
+        Structured array with CHART_DTYPE, in the same order as birth_charts
+    """
+    birth_datetimes = np.array([
+        np.datetime64(f"{bc.year:04d}-{bc.month:02d}-{bc.day:02d}T{bc.hour:02d}:{bc.minute:02d}:{bc.second:02d}")
+        for bc in birth_charts
+    ], dtype="datetime64[s]")
+    return batch_planets_calculation(
+        birth_datetimes,
+        latitudes=[bc.latitude for bc in birth_charts],
+        longitudes=[bc.longitude for bc in birth_charts],
+        tz_offsets=[bc.timezone for bc in birth_charts],
+    )
+
+
+def to_kundali_chart(record: np.void) -> KundaliChart:
+    """
+    Convert one record of a chart array into the KundaliChart API model.
+
+    Args:
+        record: A single element of a CHART_DTYPE array
+
+    Returns:
+        KundaliChart equivalent to what planets_calculation returns
+    """
+    planets_data = {}
+    for index, planet in enumerate(PLANETS):
+        planets_data[planet] = PlanetData(
+            name=planet,
+            position=float(record["longitude"][index]),
+            house=int(record["house"][index]),
+            zodiac=ZODIACS[int(record["sign"][index])]["name"],
+            deviation=float(record["deviation"][index]),
+            retrograde=bool(record["retrograde"][index]),
+        )
+
+    return KundaliChart(
+        ascendant=float(record["ascendant"]),
+        ascendant_sign=ZODIACS[int(record["ascendant_sign"])]["name"],
+        nakshatra=NAKSHATRAS[int(record["nakshatra"])]["name"],
+        planets=planets_data,
+        moon_zodiac=planets_data["moon"].zodiac,
+        moon_deviate=planets_data["moon"].deviation,
+    )
+
+
+if __name__ == "__main__":
+    charts = batch_planets_calculation(
+        np.array(["2025-11-23T14:04:00", "1990-06-15T10:30:00"], dtype="datetime64[s]"),
+        latitudes=23.03,
+        longitudes=72.62,
+    )
+    print(charts[["jd", "ascendant_sign", "nakshatra", "nakshatra_pada"]])
+    print(to_kundali_chart(charts[0]))
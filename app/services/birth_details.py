@@ -0,0 +1,71 @@
+"""
+Birth Details Resolution
+
+Turns the API's birth details (gazetteer place_id or free-text place) into the BirthChart used by
+the chart calculations.
+"""
+
+from typing import Dict
+
+from app.models import APIBirthDetails, BirthChart
+from app.services.coord_utils import get_coordinates
+from app.services.gazetteer import get_gazetteer
+from app.services.timezones import resolve_utc_offset
+
+
+def place_coordinates(place_id: int) -> Dict:
+    """Coordinates and timezone of a gazetteer place chosen through autocomplete, {} if the id is unknown."""
+    gazetteer = get_gazetteer()
+    try:
+        place = gazetteer.place(place_id) if gazetteer is not None else None
+    except ValueError:
+        place = None
+    if not place:
+        return {}
+    return {"latitude": place["latitude"], "longitude": place["longitude"], "timezone": place["timezone"]}
+
+
+def birth_chart_from_details(birth_details: APIBirthDetails, role: str = "") -> BirthChart:
+    """
+    Resolve the birth place and build a BirthChart.
+
+    A place_id picked through autocomplete is used directly; otherwise the
+    free-text birth_place is geocoded.
+
+    Args:
+        birth_details: Birth details as received by the API
+        role: Optional label used in log messages (e.g. "groom", "bride")
+
+    Returns:
+        BirthChart with the UTC offset in force at the place and time of birth,
+        using the default (Ahmedabad) coordinates if the place cannot be resolved
+    """
+    coords = {}
+    if birth_details.place_id is not None:
+        coords = place_coordinates(birth_details.place_id)
+        if not coords:
+            print(f"Unknown place_id {birth_details.place_id}, geocoding the birth place name instead")
+    if not coords:
+        coords = get_coordinates(birth_details.birth_place)
+    if not coords:
+        label = f"{role} " if role else ""
+        print(f"Invalid {label}birth place name, using default coordinates")
+
+    latitude = coords.get("latitude", 23.03)
+    longitude = coords.get("longitude", 72.62)
+    return BirthChart(
+        day=birth_details.day,
+        month=birth_details.month,
+        year=birth_details.year,
+        hour=birth_details.hour,
+        minute=birth_details.minute,
+        second=birth_details.second,
+        timezone=resolve_utc_offset(
+            latitude, longitude,
+            birth_details.year, birth_details.month, birth_details.day,
+            birth_details.hour, birth_details.minute, birth_details.second,
+            zone=coords.get("timezone"),
+        ),
+        latitude=latitude,
+        longitude=longitude,
+    )
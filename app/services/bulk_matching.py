@@ -0,0 +1,326 @@
+"""
+Bulk Matchmaking
+
+All-pairs Ashtakoota matching between two cohorts (e.g. 50k grooms x 50k
+brides) without scoring pairs one by one. Each person is reduced to a
+profile code (see score_tensor), so a block of the N x M compatibility
+matrix is a single fancy-indexing lookup into the precomputed tensor.
+
+Two ways to consume the matrix, neither of which materializes it:
+
+    score_blocks:  row blocks of the full total-score matrix, for callers
+                   that need every pair
+    top_matches:   each person's best k partners scoring above a threshold,
+                   streamed person by person (top_match_arrays returns the
+                   same as two N x k arrays)
+
+A person's row of the matrix depends only on their profile code, so
+top_matches ranks each distinct code's row once (at most 42 rows of M
+scores) and shares the result between everyone with that code. Ranking is
+deterministic: higher total first, then the lower partner index.
+
+With a DoshaPolicy, people are keyed by (profile code, Manglik) instead and
+the lookup goes into dosha.pair_table, which already holds the Mangal, Nadi
+and Bhakoota penalties and rejections, so screening costs nothing per pair.
+"""
+
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from app.config import MATCH_SCORE_THRESHOLD
+from app.models import APIBirthDetails, BirthChart, DoshaPolicy
+from app.services.ashtakoota_services.dosha import REJECTED, chart_array_dosha_flags, dosha_keys, pair_table
+from app.services.ashtakoota_services.score_tensor import SCORE_TENSOR, SEGMENT_PROFILE_CODE, TOTAL
+from app.services.batch_kundali import batch_from_birth_charts, julian_days
+from app.services.birth_details import birth_chart_from_details
+from app.services.moon_table import moon_segments
+
+# Sides of a match: whose partners are ranked
+SIDES = ("groom", "bride")
+
+DEFAULT_TOP_K = 10
+
+# Scores per block of the matrix (int8 totals, so ~4 MB per block)
+DEFAULT_BLOCK_ELEMENTS = 1 << 22
+
+# TOTALS[groom_code, bride_code]: Ashtakoota total in half-points
+TOTALS = np.ascontiguousarray(SCORE_TENSOR[:, :, TOTAL])
+
+
+def profile_codes_from_charts(birth_charts: List[BirthChart]) -> np.ndarray:
+    """
+    Compute the profile code of every birth chart, vectorized.
+
+    Args:
+        birth_charts: Birth details with resolved UTC offsets
+
+    Returns:
+        Int8 array of profile codes, in the same order as birth_charts
+    """
+    birth_datetimes = np.array([
+        np.datetime64(f"{bc.year:04d}-{bc.month:02d}-{bc.day:02d}T{bc.hour:02d}:{bc.minute:02d}:{bc.second:02d}")
+        for bc in birth_charts
+    ], dtype="datetime64[s]")
+    jds = julian_days(birth_datetimes, [bc.timezone for bc in birth_charts])
+    return SEGMENT_PROFILE_CODE[moon_segments(jds)]
+
+
+def profile_codes_from_details(birth_details: List[APIBirthDetails]) -> np.ndarray:
+    """
+    Resolve birth places and compute the profile code of every person.
+
+    Args:
+        birth_details: Birth details as received by the API
+
+    Returns:
+        Int8 array of profile codes, in the same order as birth_details
+    """
+    return profile_codes_from_charts([birth_chart_from_details(details) for details in birth_details])
+
+
+def dosha_flags_from_charts(birth_charts: List[BirthChart]) -> np.ndarray:
+    """
+    Compute the dosha flags of every birth chart (see dosha.dosha_flags).
+
+    Args:
+        birth_charts: Birth details with resolved UTC offsets
+
+    Returns:
+        Uint8 array of flags, in the same order as birth_charts
+    """
+    return chart_array_dosha_flags(batch_from_birth_charts(birth_charts))
+
+
+def cohort_from_details(
+    birth_details: List[APIBirthDetails], dosha_flags: bool = False
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Resolve birth places once and compute profile codes and, optionally, dosha flags.
+
+    Args:
+        birth_details: Birth details as received by the API
+        dosha_flags: Whether to compute dosha flags (needs full charts)
+
+    Returns:
+        (profile codes, dosha flags or None), in the same order as birth_details
+    """
+    birth_charts = [birth_chart_from_details(details) for details in birth_details]
+    flags = dosha_flags_from_charts(birth_charts) if dosha_flags else None
+    return profile_codes_from_charts(birth_charts), flags
+
+
+def _keys_and_table(
+    groom_codes: Sequence[int],
+    bride_codes: Sequence[int],
+    groom_flags: Optional[Sequence[int]],
+    bride_flags: Optional[Sequence[int]],
+    dosha_policy: Optional[DoshaPolicy],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row/column keys and the [groom_key, bride_key] table to look them up in."""
+    groom_codes = np.asarray(groom_codes, dtype=np.intp)
+    bride_codes = np.asarray(bride_codes, dtype=np.intp)
+    if dosha_policy is None:
+        return groom_codes, bride_codes, TOTALS
+    if groom_flags is None or bride_flags is None:
+        raise ValueError("Dosha screening needs the dosha flags of both cohorts")
+    return (
+        dosha_keys(groom_codes, groom_flags, dosha_policy),
+        dosha_keys(bride_codes, bride_flags, dosha_policy),
+        pair_table(dosha_policy),
+    )
+
+
+def score_blocks(
+    groom_codes: Sequence[int],
+    bride_codes: Sequence[int],
+    block_elements: int = DEFAULT_BLOCK_ELEMENTS,
+    groom_flags: Optional[Sequence[int]] = None,
+    bride_flags: Optional[Sequence[int]] = None,
+    dosha_policy: Optional[DoshaPolicy] = None,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Stream the N x M total-score matrix in row blocks.
+
+    Args:
+        groom_codes: Profile codes of the N grooms
+        bride_codes: Profile codes of the M brides
+        block_elements: Approximate number of scores per block
+        groom_flags: Dosha flags of the grooms (needed with dosha_policy)
+        bride_flags: Dosha flags of the brides (needed with dosha_policy)
+        dosha_policy: Dosha screening to apply, None for plain totals
+
+    Yields:
+        (first_groom, totals) where totals[i, j] is the total of groom
+        first_groom + i with bride j, as int8 half-points (int16 with a
+        dosha_policy, dosha.REJECTED for rejected pairs)
+    """
+    groom_keys, bride_keys, table = _keys_and_table(groom_codes, bride_codes, groom_flags, bride_flags, dosha_policy)
+    rows = max(1, block_elements // max(1, bride_keys.shape[0]))
+    for start in range(0, groom_keys.shape[0], rows):
+        yield start, table[groom_keys[start:start + rows, None], bride_keys[None, :]]
+
+
+def _rank_row(totals: np.ndarray, k: int, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices and scores of the k best entries of one row above threshold (half-points)."""
+    candidates = np.flatnonzero(totals > threshold)
+    count = candidates.shape[0]
+    if count == 0:
+        return candidates, totals[candidates]
+    # One int64 key per candidate: score first, then the lower index
+    keys = totals[candidates].astype(np.int64) * totals.shape[0] + (totals.shape[0] - 1 - candidates)
+    if count > k:
+        best = np.argpartition(-keys, k - 1)[:k]
+        candidates, keys = candidates[best], keys[best]
+    order = np.argsort(-keys)
+    return candidates[order], totals[candidates[order]]
+
+
+def _ranked_rows(
+    person_codes: Sequence[int],
+    partner_codes: Sequence[int],
+    side: str,
+    k: int,
+    threshold: float,
+    block_elements: int,
+    person_flags: Optional[Sequence[int]],
+    partner_flags: Optional[Sequence[int]],
+    dosha_policy: Optional[DoshaPolicy],
+) -> Tuple[np.ndarray, List[Tuple[np.ndarray, np.ndarray]]]:
+    """Rank each distinct person key's row once: (row of every person, [(partners, half-points)] per row)."""
+    if side not in SIDES:
+        raise ValueError(f"Unknown side: {side}, expected one of {SIDES}")
+    if side == "groom":
+        person_keys, partner_keys, table = _keys_and_table(person_codes, partner_codes, person_flags, partner_flags, dosha_policy)
+    else:
+        partner_keys, person_keys, table = _keys_and_table(partner_codes, person_codes, partner_flags, person_flags, dosha_policy)
+        table = np.ascontiguousarray(table.T)
+    threshold_half_points = max(int(np.floor(threshold * 2)), int(REJECTED))
+
+    # A block of keys at a time
+    keys, person_rows = np.unique(person_keys, return_inverse=True)
+    ranked: List[Tuple[np.ndarray, np.ndarray]] = []
+    rows = max(1, block_elements // max(1, partner_keys.shape[0]))
+    for start in range(0, keys.shape[0], rows):
+        block = table[keys[start:start + rows, None], partner_keys[None, :]]
+        for row in block:
+            ranked.append(_rank_row(row, k, threshold_half_points))
+    return person_rows, ranked
+
+
+def top_matches(
+    person_codes: Sequence[int],
+    partner_codes: Sequence[int],
+    side: str = "groom",
+    k: int = DEFAULT_TOP_K,
+    threshold: float = MATCH_SCORE_THRESHOLD,
+    block_elements: int = DEFAULT_BLOCK_ELEMENTS,
+    person_flags: Optional[Sequence[int]] = None,
+    partner_flags: Optional[Sequence[int]] = None,
+    dosha_policy: Optional[DoshaPolicy] = None,
+) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Stream each person's top-k partners.
+
+    Args:
+        person_codes: Profile codes of the people to find partners for
+        partner_codes: Profile codes of the candidate partners
+        side: "groom" if the people are grooms (partners are brides), "bride" otherwise
+        k: Maximum partners per person
+        threshold: Partners must score strictly above this total
+        block_elements: Approximate number of scores held per block
+        person_flags: Dosha flags of the people (needed with dosha_policy)
+        partner_flags: Dosha flags of the partners (needed with dosha_policy)
+        dosha_policy: Dosha screening to apply; totals are then the penalized
+            ones and rejected pairs are never returned
+
+    Yields:
+        (person, partners, scores) for every person in order: partner indices
+        best first and their totals in points (possibly fewer than k, or none)
+    """
+    person_rows, ranked = _ranked_rows(person_codes, partner_codes, side, k, threshold, block_elements,
+                                       person_flags, partner_flags, dosha_policy)
+    ranked = [(partners, half_points / 2) for partners, half_points in ranked]
+    for person, row in enumerate(person_rows.tolist()):
+        yield person, ranked[row][0], ranked[row][1]
+
+
+def top_match_arrays(
+    person_codes: Sequence[int],
+    partner_codes: Sequence[int],
+    side: str = "groom",
+    k: int = DEFAULT_TOP_K,
+    threshold: float = MATCH_SCORE_THRESHOLD,
+    block_elements: int = DEFAULT_BLOCK_ELEMENTS,
+    person_flags: Optional[Sequence[int]] = None,
+    partner_flags: Optional[Sequence[int]] = None,
+    dosha_policy: Optional[DoshaPolicy] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Everyone's top-k partners as two N x k arrays, without a Python loop over people.
+
+    Args:
+        Same as top_matches
+
+    Returns:
+        (partners, half_points): int64 partner indices best first, padded with
+        -1, and int16 totals in half-points, padded with dosha.REJECTED
+    """
+    person_rows, ranked = _ranked_rows(person_codes, partner_codes, side, k, threshold, block_elements,
+                                       person_flags, partner_flags, dosha_policy)
+    row_partners = np.full((len(ranked), k), -1, dtype=np.int64)
+    row_scores = np.full((len(ranked), k), REJECTED, dtype=np.int16)
+    for row, (partners, half_points) in enumerate(ranked):
+        row_partners[row, :partners.shape[0]] = partners
+        row_scores[row, :partners.shape[0]] = half_points
+    return row_partners[person_rows], row_scores[person_rows]
+
+
+def top_matches_brute_force(
+    groom_codes: Sequence[int],
+    bride_codes: Sequence[int],
+    k: int = DEFAULT_TOP_K,
+    threshold: float = MATCH_SCORE_THRESHOLD,
+    block_elements: int = DEFAULT_BLOCK_ELEMENTS,
+    groom_flags: Optional[Sequence[int]] = None,
+    bride_flags: Optional[Sequence[int]] = None,
+    dosha_policy: Optional[DoshaPolicy] = None,
+) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Reference implementation of top_matches(side="groom") that ranks every
+    groom's full row of the matrix; used to check and benchmark top_matches.
+    """
+    threshold_half_points = max(int(np.floor(threshold * 2)), int(REJECTED))
+    blocks = score_blocks(groom_codes, bride_codes, block_elements, groom_flags, bride_flags, dosha_policy)
+    for start, block in blocks:
+        for offset, row in enumerate(block):
+            partners, scores = _rank_row(row, k, threshold_half_points)
+            yield start + offset, partners, scores / 2
+
+
+if __name__ == "__main__":
+    import time
+
+    # Correctness (brute-force parity, dosha screening, padding) is tested in tests/test_bulk_matching.py
+    rng = np.random.default_rng(0)
+    grooms = SEGMENT_PROFILE_CODE[rng.integers(0, SEGMENT_PROFILE_CODE.shape[0], 5000)]
+    brides = SEGMENT_PROFILE_CODE[rng.integers(0, SEGMENT_PROFILE_CODE.shape[0], 5000)]
+    pairs = grooms.shape[0] * brides.shape[0]
+
+    start = time.perf_counter()
+    fast = list(top_matches(grooms, brides, "groom", k=5))
+    fast_time = time.perf_counter() - start
+    start = time.perf_counter()
+    list(top_matches_brute_force(grooms, brides, k=5))
+    reference_time = time.perf_counter() - start
+    print(f"{pairs:,} pairs: top_matches {pairs / fast_time:,.0f} pairs/sec, "
+          f"brute force {pairs / reference_time:,.0f} pairs/sec")
+    print("Groom 0:", fast[0][1].tolist(), fast[0][2].tolist())
+
+    # Dosha screening: random chart flags, penalties for Nadi/Bhakoota and Manglik rejection
+    policy = DoshaPolicy(nadi="penalize", bhakoota="penalize")
+    groom_flags = rng.integers(0, 16, grooms.shape[0]).astype(np.uint8)
+    bride_flags = rng.integers(0, 16, brides.shape[0]).astype(np.uint8)
+    start = time.perf_counter()
+    list(top_matches(brides, grooms, "bride", k=5, person_flags=bride_flags, partner_flags=groom_flags, dosha_policy=policy))
+    screened_time = time.perf_counter() - start
+    print(f"{pairs:,} pairs with dosha screening: top_matches {pairs / screened_time:,.0f} pairs/sec")
@@ -0,0 +1,350 @@
+"""
+Candidate Pool
+
+A persistent pool of groom and bride candidates answering "who is compatible
+with this person?" online. Ashtakoota scores depend only on the profile code
+(see score_tensor), so the pool is an inverted index from profile code to
+the candidate ids in that bucket, one index per side. A query looks up the
+person's precomputed row of scores, skips every bucket that does not clear
+the threshold and merges only the qualifying buckets, best score first, so
+its cost does not grow with the size of the pool.
+
+Buckets keep their ids in a sorted array; inserts and deletes are recorded
+next to it and merged in on the next read, so neither needs a rebuild.
+Candidates are stored in SQLite (lunar segment per id) and the index is
+rebuilt from it on startup.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+from app.config import CANDIDATE_POOL_PATH, MATCH_SCORE_THRESHOLD
+from app.models import AshtakootaProfile
+from app.services.ashtakoota_services.compact_profile import CompactProfile, from_model, segment_profile
+from app.services.ashtakoota_services.score_tensor import NUM_PROFILES, SCORE_TENSOR, SEGMENT_PROFILE_CODE, TOTAL
+from app.services.lunar_segments import NUM_SEGMENTS
+
+# Sides of the pool; a groom's partners are brides and vice versa
+SIDES = ("groom", "bride")
+
+DEFAULT_LIMIT = 20
+
+Profile = Union[CompactProfile, AshtakootaProfile]
+
+
+def _score_tiers(totals: np.ndarray) -> List[List[Tuple[int, np.ndarray]]]:
+    """Per person code: (score, partner codes) groups, highest score first (half-points)."""
+    tiers = []
+    for row in totals:
+        scores = np.unique(row)[::-1]
+        tiers.append([(int(score), np.flatnonzero(row == score)) for score in scores])
+    return tiers
+
+
+# _TIERS[side][person_code]: partner codes grouped by total score, best first
+_TIERS = {
+    "groom": _score_tiers(SCORE_TENSOR[:, :, TOTAL]),
+    "bride": _score_tiers(SCORE_TENSOR[:, :, TOTAL].T),
+}
+
+
+class _Bucket:
+    """Candidate ids of one profile code: a sorted array plus pending changes, merged on read."""
+
+    __slots__ = ("_ids", "_added", "_removed")
+
+    def __init__(self, ids: Optional[np.ndarray] = None):
+        self._ids = ids if ids is not None else np.empty(0, dtype=np.int64)
+        self._added = set()
+        self._removed = set()
+
+    def __len__(self) -> int:
+        return self._ids.shape[0] + len(self._added) - len(self._removed)
+
+    def add(self, candidate_id: int) -> None:
+        if candidate_id in self._removed:
+            self._removed.discard(candidate_id)
+        else:
+            self._added.add(candidate_id)
+
+    def remove(self, candidate_id: int) -> None:
+        if candidate_id in self._added:
+            self._added.discard(candidate_id)
+        else:
+            self._removed.add(candidate_id)
+
+    def ids(self) -> np.ndarray:
+        """All ids in ascending order."""
+        if self._added or self._removed:
+            ids = self._ids
+            if self._removed:
+                ids = ids[~np.isin(ids, np.fromiter(self._removed, dtype=np.int64))]
+            if self._added:
+                added = np.sort(np.fromiter(self._added, dtype=np.int64))
+                ids = np.insert(ids, np.searchsorted(ids, added), added)
+            self._ids = ids
+            self._added.clear()
+            self._removed.clear()
+        return self._ids
+
+
+class CandidatePool:
+    """Inverted index from profile code to candidate ids, backed by SQLite."""
+
+    def __init__(self, db_path: Optional[Path] = CANDIDATE_POOL_PATH):
+        """
+        Open the pool and index the stored candidates.
+
+        Args:
+            db_path: SQLite file, or None for an in-memory pool
+        """
+        self._lock = threading.RLock()
+        self._buckets = {side: [_Bucket() for _ in range(NUM_PROFILES)] for side in SIDES}
+        # candidate id -> side index * NUM_SEGMENTS + segment
+        self._members: Dict[int, int] = {}
+        self._next_id = 1
+
+        self._db = None
+        if db_path is not None:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS candidates ("
+                "candidate_id INTEGER PRIMARY KEY, side TEXT NOT NULL, segment INTEGER NOT NULL)"
+            )
+            self._db.commit()
+            for side in SIDES:
+                rows = self._db.execute("SELECT candidate_id, segment FROM candidates WHERE side = ?", (side,)).fetchall()
+                if rows:
+                    ids, segments = np.array(rows, dtype=np.int64).T
+                    self._index(side, ids, segments)
+
+    def _index(self, side: str, ids: np.ndarray, segments: np.ndarray) -> None:
+        """Add many new candidates of one side to the in-memory index."""
+        if ids.shape[0] == 0:
+            return
+        side_offset = SIDES.index(side) * NUM_SEGMENTS
+        self._members.update(zip(ids.tolist(), (segments + side_offset).tolist()))
+        self._next_id = max(self._next_id, int(ids.max()) + 1)
+        codes = SEGMENT_PROFILE_CODE[segments]
+        order = np.lexsort((ids, codes))
+        bounds = np.searchsorted(codes[order], np.arange(NUM_PROFILES + 1))
+        for code in range(NUM_PROFILES):
+            if bounds[code] < bounds[code + 1]:
+                bucket = self._buckets[side][code]
+                bucket._ids = np.union1d(bucket.ids(), ids[order[bounds[code]:bounds[code + 1]]])
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def count(self, side: str) -> int:
+        """Number of candidates on one side."""
+        return sum(len(bucket) for bucket in self._buckets[side])
+
+    def get(self, candidate_id: int) -> Optional[Tuple[str, CompactProfile]]:
+        """
+        Get a stored candidate.
+
+        Args:
+            candidate_id: Candidate id
+
+        Returns:
+            (side, profile), or None if the id is not in the pool
+        """
+        with self._lock:
+            packed = self._members.get(candidate_id)
+        if packed is None:
+            return None
+        return SIDES[packed // NUM_SEGMENTS], segment_profile(packed % NUM_SEGMENTS)
+
+    def add(self, side: str, profile: Profile, candidate_id: Optional[int] = None) -> int:
+        """
+        Add a candidate, or replace the candidate with the same id.
+
+        Args:
+            side: "groom" or "bride"
+            profile: Candidate's profile (an AshtakootaProfile is converted with from_model)
+            candidate_id: Id to store the candidate under; next free id if None
+
+        Returns:
+            The candidate id
+        """
+        if side not in SIDES:
+            raise ValueError(f"Unknown side: {side}, expected one of {SIDES}")
+        if isinstance(profile, AshtakootaProfile):
+            profile = from_model(profile)
+        with self._lock:
+            if candidate_id is None:
+                candidate_id = self._next_id
+            elif candidate_id in self._members:
+                self._unindex(candidate_id)
+            self._next_id = max(self._next_id, candidate_id + 1)
+            self._members[candidate_id] = SIDES.index(side) * NUM_SEGMENTS + profile.segment
+            self._buckets[side][profile.code].add(candidate_id)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO candidates (candidate_id, side, segment) VALUES (?, ?, ?)",
+                    (candidate_id, side, profile.segment),
+                )
+                self._db.commit()
+        return candidate_id
+
+    def add_many(self, side: str, segments: Iterable[int], candidate_ids: Optional[Iterable[int]] = None) -> np.ndarray:
+        """
+        Bulk-load new candidates of one side.
+
+        Args:
+            side: "groom" or "bride"
+            segments: Each candidate's lunar segment (CompactProfile.segment)
+            candidate_ids: Ids not yet in the pool; consecutive new ids if None
+
+        Returns:
+            Array of the candidate ids
+        """
+        if side not in SIDES:
+            raise ValueError(f"Unknown side: {side}, expected one of {SIDES}")
+        segments = np.asarray(segments, dtype=np.int64)
+        with self._lock:
+            if candidate_ids is None:
+                ids = np.arange(self._next_id, self._next_id + segments.shape[0], dtype=np.int64)
+            else:
+                ids = np.asarray(candidate_ids, dtype=np.int64)
+                if any(candidate_id in self._members for candidate_id in ids.tolist()):
+                    raise ValueError("add_many only accepts ids not already in the pool")
+            self._index(side, ids, segments)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT INTO candidates (candidate_id, side, segment) VALUES (?, ?, ?)",
+                    zip(ids.tolist(), [side] * ids.shape[0], segments.tolist()),
+                )
+                self._db.commit()
+        return ids
+
+    def _unindex(self, candidate_id: int) -> None:
+        packed = self._members.pop(candidate_id)
+        side = SIDES[packed // NUM_SEGMENTS]
+        self._buckets[side][SEGMENT_PROFILE_CODE[packed % NUM_SEGMENTS]].remove(candidate_id)
+
+    def remove(self, candidate_id: int) -> bool:
+        """
+        Remove a candidate.
+
+        Args:
+            candidate_id: Candidate id
+
+        Returns:
+            True if the candidate was in the pool
+        """
+        with self._lock:
+            if candidate_id not in self._members:
+                return False
+            self._unindex(candidate_id)
+            if self._db is not None:
+                self._db.execute("DELETE FROM candidates WHERE candidate_id = ?", (candidate_id,))
+                self._db.commit()
+        return True
+
+    def search(
+        self,
+        profile: Profile,
+        side: str,
+        threshold: float = MATCH_SCORE_THRESHOLD,
+        limit: int = DEFAULT_LIMIT,
+        offset: int = 0,
+    ) -> Dict:
+        """
+        Find compatible candidates for a person.
+
+        Args:
+            profile: The person's profile (an AshtakootaProfile is converted with from_model)
+            side: The person's side; candidates come from the other side
+            threshold: Candidates must score strictly above this total
+            limit: Maximum candidates returned
+            offset: Number of best candidates to skip (pagination)
+
+        Returns:
+            Dictionary with total (number of compatible candidates) and matches,
+            a list of {"candidate_id", "score"} ordered by score, then candidate id
+        """
+        if isinstance(profile, AshtakootaProfile):
+            profile = from_model(profile)
+        return self.search_code(profile.code, side, threshold, limit, offset)
+
+    def search_code(
+        self,
+        code: int,
+        side: str,
+        threshold: float = MATCH_SCORE_THRESHOLD,
+        limit: int = DEFAULT_LIMIT,
+        offset: int = 0,
+    ) -> Dict:
+        """Same as search, for a person given by profile code."""
+        if side not in SIDES:
+            raise ValueError(f"Unknown side: {side}, expected one of {SIDES}")
+        partner_side = SIDES[1 - SIDES.index(side)]
+        threshold_half_points = int(np.floor(threshold * 2))
+        needed = offset + limit
+
+        matches = []
+        total = 0
+        with self._lock:
+            buckets = self._buckets[partner_side]
+            for score, partner_codes in _TIERS[side][code]:
+                if score <= threshold_half_points:
+                    break
+                total += sum(len(buckets[partner_code]) for partner_code in partner_codes)
+                remaining = needed - len(matches)
+                if remaining <= 0:
+                    continue
+                # Lowest ids of every bucket in the tier, merged
+                ids = np.sort(np.concatenate([buckets[partner_code].ids()[:remaining] for partner_code in partner_codes]))[:remaining]
+                matches.extend((candidate_id, score / 2) for candidate_id in ids.tolist())
+
+        return {
+            "total": total,
+            "matches": [{"candidate_id": candidate_id, "score": score} for candidate_id, score in matches[offset:needed]],
+        }
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# Global instance (False once a load has been attempted and failed)
+_candidate_pool = None
+
+
+def get_candidate_pool() -> Optional[CandidatePool]:
+    """Get the global candidate pool, or None if its database cannot be opened."""
+    global _candidate_pool
+    if _candidate_pool is None:
+        try:
+            _candidate_pool = CandidatePool()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Candidate pool unavailable: {e}")
+            _candidate_pool = False
+    # An empty pool is falsy (len 0), so compare with False explicitly
+    return _candidate_pool if _candidate_pool is not False else None
+
+
+if __name__ == "__main__":
+    import time
+
+    # Correctness (parity with calculate_ashtakoota, pagination, reloading) is tested in tests/test_candidate_pool.py
+    rng = np.random.default_rng(0)
+    pool = CandidatePool(db_path=None)
+    pool.add_many("bride", rng.integers(0, NUM_SEGMENTS, 200000))
+    groom = segment_profile(40)
+    number = 1000
+    start = time.perf_counter()
+    for _ in range(number):
+        result = pool.search(groom, "groom", limit=20)
+    print(f"{len(pool)} candidates, {result['total']} compatible with {groom}: "
+          f"search {1e6 * (time.perf_counter() - start) / number:.1f} us")
+    print("Top 5:", pool.search(groom, "groom", limit=5)["matches"])
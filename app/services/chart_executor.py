@@ -0,0 +1,189 @@
+"""
+Chart Executor
+
+Runs Swiss Ephemeris chart computations in a pool of worker processes so the
+async API routes never block the event loop. Each worker opens its own
+ephemeris session once at startup (swisseph state is process-global, so
+processes rather than threads are what let one uvicorn process use every core).
+
+The executor keeps simple counters for monitoring: tasks currently queued or
+running, and recent per-task latencies split into queue wait and run time.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config import CHART_WORKERS
+from app.models import BirthChart, KundaliChart
+from app.services.ephemeris import get_ephemeris_session
+from app.services.kundali_chart import julian_day, planets_calculation
+from app.services.moon_table import get_moon_table, moon_segment
+
+# Number of recent tasks kept for latency statistics
+LATENCY_WINDOW = 1000
+
+
+def _init_worker() -> None:
+    """Per-worker initialization: open the ephemeris and map the Moon table once for the life of the process."""
+    get_ephemeris_session().open()
+    get_moon_table()
+
+
+def _timed_call(fn: Callable, args: tuple) -> Tuple[Any, float]:
+    """Run fn(*args) in the worker and report how long it took there."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def kundali_task(birth_chart: BirthChart) -> KundaliChart:
+    """Worker task: compute a full kundali chart."""
+    return planets_calculation(birth_chart)
+
+
+def moon_segment_task(birth_chart: BirthChart) -> int:
+    """Worker task: find the lunar segment of a chart's Moon (no full chart needed)."""
+    jd = julian_day(
+        birth_chart.year,
+        birth_chart.month,
+        birth_chart.day,
+        birth_chart.hour,
+        birth_chart.minute,
+        birth_chart.second,
+        birth_chart.timezone
+    )
+    return moon_segment(jd)
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class ChartExecutor:
+    """Process pool for chart computations, awaitable from async routes."""
+
+    def __init__(self, max_workers: int = CHART_WORKERS):
+        """
+        Initialize the executor. Worker processes are started on first use.
+
+        Args:
+            max_workers: Number of worker processes
+        """
+        self.max_workers = max(1, max_workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_times: deque = deque(maxlen=LATENCY_WINDOW)
+        self._run_times: deque = deque(maxlen=LATENCY_WINDOW)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn (not fork) so workers never inherit the parent's event loop,
+                # threads or open ephemeris file handles
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._pool
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """
+        Run a picklable top-level function in a worker process.
+
+        Args:
+            fn: Function to run (e.g. kundali_task)
+            *args: Picklable arguments
+
+        Returns:
+            The function's result
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        with self._lock:
+            self._pending += 1
+        submitted = time.perf_counter()
+        try:
+            result, run_time = await loop.run_in_executor(pool, _timed_call, fn, args)
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+        total_time = time.perf_counter() - submitted
+        with self._lock:
+            self._completed += 1
+            self._run_times.append(run_time)
+            self._wait_times.append(max(0.0, total_time - run_time))
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth and latency statistics.
+
+        Returns:
+            Dictionary with worker count, queued/running task counts, totals and
+            latency percentiles (milliseconds) over the last LATENCY_WINDOW tasks
+        """
+        with self._lock:
+            pending = self._pending
+            wait_times = sorted(self._wait_times)
+            run_times = sorted(self._run_times)
+            completed = self._completed
+            failed = self._failed
+
+        def summary(values: list) -> Dict[str, float]:
+            if not values:
+                return {"mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+            return {
+                "mean_ms": 1000 * sum(values) / len(values),
+                "p50_ms": 1000 * _percentile(values, 0.50),
+                "p95_ms": 1000 * _percentile(values, 0.95),
+                "max_ms": 1000 * values[-1],
+            }
+
+        return {
+            "workers": self.max_workers,
+            "queue_depth": max(0, pending - self.max_workers),
+            "in_flight": pending,
+            "completed": completed,
+            "failed": failed,
+            "queue_wait": summary(wait_times),
+            "run_time": summary(run_times),
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+
+# Global instance
+_chart_executor: Optional[ChartExecutor] = None
+
+
+def get_chart_executor() -> ChartExecutor:
+    """Get or create the global chart executor."""
+    global _chart_executor
+    if _chart_executor is None:
+        _chart_executor = ChartExecutor()
+    return _chart_executor
+
+
+def shutdown_chart_executor() -> None:
+    """Stop the global chart executor's workers, if any were started."""
+    if _chart_executor is not None:
+        _chart_executor.shutdown()
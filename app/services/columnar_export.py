@@ -0,0 +1,286 @@
+"""
+Columnar Export
+
+Writes bulk chart and matching results as Apache Arrow / Parquet tables
+instead of JSON lists of dicts, so analysts can load millions of rows into a
+dataframe (or memory-map them) without parsing.
+
+    columns:  results are first flattened into plain NumPy columns (no
+              pyarrow needed): integer ids, half-point scores as int8/int16,
+              and rashi/nakshatra/sign fields as small integer codes
+    labels:   coded columns carry their labels (LABELS), so Arrow writes
+              them as dictionary-encoded columns: readers see strings, files
+              store one byte per row
+    formats:  "arrow" (Arrow IPC file, memory-mappable with read_arrow),
+              "parquet", or "ndjson", which decodes the labels and needs
+              nothing beyond the standard library
+
+pyarrow is optional; without it only "ndjson" is available.
+"""
+
+import io
+import json
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Union
+
+import numpy as np
+from app.config import NAKSHATRAS, PLANETS, ZODIACS
+from app.services.ashtakoota_services.compact_profile import NAKSHATRA_IDS, SIGN_IDS
+from app.services.ashtakoota_services.score_tensor import KOOTAS, PROFILES, SCORE_TENSOR
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+FORMATS = ("arrow", "parquet", "ndjson")
+
+# Rows per record batch of an Arrow IPC stream
+STREAM_BATCH_ROWS = 1 << 16
+
+RASHIS = tuple(ZODIACS[sign_id]["name"] for sign_id in sorted(ZODIACS))
+NAKSHATRA_NAMES = tuple(NAKSHATRAS[nakshatra_id]["name"] for nakshatra_id in sorted(NAKSHATRAS))
+SIDES = ("groom", "bride")
+
+# Profile code -> 0-based index into RASHIS / NAKSHATRA_NAMES
+_CODE_RASHI = np.array([SIGN_IDS[profile.moon_zodiac] - 1 for profile in PROFILES], dtype=np.int8)
+_CODE_NAKSHATRA = np.array([NAKSHATRA_IDS[profile.nakshatra] - 1 for profile in PROFILES], dtype=np.int8)
+
+# Labels of the integer-coded columns; each column holds 0-based indices into its labels
+LABELS = {
+    "side": SIDES,
+    "person_rashi": RASHIS,
+    "person_nakshatra": NAKSHATRA_NAMES,
+    "partner_rashi": RASHIS,
+    "partner_nakshatra": NAKSHATRA_NAMES,
+    "ascendant_sign": RASHIS,
+    "nakshatra": NAKSHATRA_NAMES,
+    **{f"{planet}_sign": RASHIS for planet in PLANETS},
+}
+
+Columns = Dict[str, np.ndarray]
+
+
+def match_columns(
+    person_codes: Sequence[int],
+    partner_codes: Sequence[int],
+    partners: np.ndarray,
+    half_points: np.ndarray,
+    side: str = "groom",
+    person_ids: Optional[Sequence] = None,
+    partner_ids: Optional[Sequence] = None,
+) -> Columns:
+    """
+    Flatten top-k results into one row per (person, partner) match.
+
+    Args:
+        person_codes: Profile codes of the people
+        partner_codes: Profile codes of the partners
+        partners: N x k partner indices, padded with -1 (as from top_match_arrays)
+        half_points: N x k totals in half-points (possibly dosha-adjusted)
+        side: Side of the people ("groom" ranks brides)
+        person_ids: Optional external ids of the people, stored instead of indices
+        partner_ids: Optional external ids of the partners
+
+    Returns:
+        Columns: side, person, rank, partner, total_half_points, one
+        <koota>_half_points column per koota (unadjusted) and the coded rashi
+        and nakshatra of both sides
+    """
+    person_codes = np.asarray(person_codes, dtype=np.intp)
+    partner_codes = np.asarray(partner_codes, dtype=np.intp)
+    rows, ranks = np.nonzero(partners >= 0)
+    matched = partners[rows, ranks]
+    row_codes, matched_codes = person_codes[rows], partner_codes[matched]
+    groom_codes, bride_codes = (row_codes, matched_codes) if side == "groom" else (matched_codes, row_codes)
+
+    columns: Columns = {
+        "side": np.full(rows.shape[0], SIDES.index(side), dtype=np.int8),
+        "person": rows.astype(np.int64) if person_ids is None else np.asarray(person_ids)[rows],
+        "rank": (ranks + 1).astype(np.int16),
+        "partner": matched.astype(np.int64) if partner_ids is None else np.asarray(partner_ids)[matched],
+        "total_half_points": half_points[rows, ranks].astype(np.int16),
+    }
+    kootas = SCORE_TENSOR[groom_codes, bride_codes]
+    for index, koota in enumerate(KOOTAS):
+        columns[f"{koota}_half_points"] = kootas[:, index]
+    columns.update({
+        "person_rashi": _CODE_RASHI[row_codes],
+        "person_nakshatra": _CODE_NAKSHATRA[row_codes],
+        "partner_rashi": _CODE_RASHI[matched_codes],
+        "partner_nakshatra": _CODE_NAKSHATRA[matched_codes],
+    })
+    return columns
+
+
+def chart_columns(charts: np.ndarray, ids: Optional[Sequence] = None) -> Columns:
+    """
+    Flatten a batch_kundali chart array into one row per chart.
+
+    Args:
+        charts: Structured array with batch_kundali.CHART_DTYPE
+        ids: Optional external ids of the charts
+
+    Returns:
+        Columns: id, jd, ascendant, coded ascendant_sign, nakshatra and
+        nakshatra_pada of the Moon, and per planet <planet>_longitude,
+        coded <planet>_sign, <planet>_house and <planet>_retrograde
+    """
+    columns: Columns = {
+        "id": np.arange(charts.shape[0], dtype=np.int64) if ids is None else np.asarray(ids),
+        "jd": charts["jd"],
+        "ascendant": charts["ascendant"],
+        "ascendant_sign": charts["ascendant_sign"] - 1,
+        "nakshatra": charts["nakshatra"] - 1,
+        "nakshatra_pada": charts["nakshatra_pada"],
+    }
+    for index, planet in enumerate(PLANETS):
+        columns[f"{planet}_longitude"] = np.ascontiguousarray(charts["longitude"][:, index])
+        columns[f"{planet}_sign"] = np.ascontiguousarray(charts["sign"][:, index]) - 1
+        columns[f"{planet}_house"] = np.ascontiguousarray(charts["house"][:, index])
+        columns[f"{planet}_retrograde"] = np.ascontiguousarray(charts["retrograde"][:, index])
+    return columns
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("pyarrow is required for Arrow/Parquet output (pip install pyarrow); use the ndjson format instead")
+
+
+def to_table(columns: Columns) -> "pa.Table":
+    """
+    Build an Arrow table, dictionary-encoding the columns listed in LABELS.
+
+    Args:
+        columns: Columns from match_columns or chart_columns
+
+    Returns:
+        pyarrow Table (numeric columns are wrapped without copying)
+    """
+    _require_pyarrow()
+    arrays = {}
+    for name, values in columns.items():
+        if name in LABELS:
+            arrays[name] = pa.DictionaryArray.from_arrays(pa.array(values.astype(np.int8)), pa.array(LABELS[name]))
+        else:
+            arrays[name] = pa.array(values)
+    return pa.table(arrays)
+
+
+def ndjson_lines(columns: Columns) -> Iterator[str]:
+    """
+    Yield one JSON line per row, with coded columns decoded to their labels.
+
+    Args:
+        columns: Columns from match_columns or chart_columns
+
+    Yields:
+        JSON lines ending in a newline
+    """
+    names = list(columns)
+    decoded = [
+        [LABELS[name][value] for value in columns[name].tolist()] if name in LABELS else columns[name].tolist()
+        for name in names
+    ]
+    for row in zip(*decoded):
+        yield json.dumps(dict(zip(names, row))) + "\n"
+
+
+def arrow_stream_chunks(columns: Columns) -> Iterator[bytes]:
+    """
+    Serialize columns as an Arrow IPC stream, one record batch at a time.
+
+    Args:
+        columns: Columns from match_columns or chart_columns
+
+    Yields:
+        Bytes of the stream (schema, record batches, end marker)
+    """
+    table = to_table(columns)
+    sink = io.BytesIO()
+    with ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=STREAM_BATCH_ROWS):
+            writer.write_batch(batch)
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    yield sink.getvalue()
+
+
+def write_columns(columns: Columns, path: Union[str, Path], format: str = "arrow") -> None:
+    """
+    Write columns to a file.
+
+    Args:
+        columns: Columns from match_columns or chart_columns
+        path: Output file
+        format: "arrow" (IPC file), "parquet" or "ndjson"
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format: {format}, expected one of {FORMATS}")
+    if format == "ndjson":
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(ndjson_lines(columns))
+        return
+    table = to_table(columns)
+    if format == "parquet":
+        pq.write_table(table, str(path))
+    else:
+        with ipc.new_file(str(path), table.schema) as writer:
+            writer.write_table(table)
+
+
+def read_arrow(path: Union[str, Path]) -> "pa.Table":
+    """
+    Memory-map an Arrow IPC file written by write_columns, without copying.
+
+    Args:
+        path: File written with format="arrow"
+
+    Returns:
+        pyarrow Table backed by the mapped file
+    """
+    _require_pyarrow()
+    return ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from app.services.ashtakoota_services.score_tensor import SEGMENT_PROFILE_CODE
+    from app.services.bulk_matching import top_match_arrays
+
+    rng = np.random.default_rng(0)
+    grooms = SEGMENT_PROFILE_CODE[rng.integers(0, SEGMENT_PROFILE_CODE.shape[0], 100000)]
+    brides = SEGMENT_PROFILE_CODE[rng.integers(0, SEGMENT_PROFILE_CODE.shape[0], 100000)]
+    partners, half_points = top_match_arrays(grooms, brides, "groom", k=10)
+    columns = match_columns(grooms, brides, partners, half_points, "groom")
+    rows = columns["person"].shape[0]
+
+    with tempfile.TemporaryDirectory() as directory:
+        sizes, timings = {}, {}
+        for format in FORMATS if pa is not None else ("ndjson",):
+            path = Path(directory) / f"matches.{format}"
+            start = time.perf_counter()
+            write_columns(columns, path, format)
+            timings[format] = time.perf_counter() - start
+            sizes[format] = path.stat().st_size
+        for format in sizes:
+            print(f"{format:8s} {rows:,} rows written in {timings[format]:.2f}s, {sizes[format] / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        with open(Path(directory) / "matches.ndjson", "r", encoding="utf-8") as f:
+            parsed = [json.loads(line) for line in f]
+        print(f"ndjson parsed in {time.perf_counter() - start:.2f}s")
+        if pa is not None:
+            start = time.perf_counter()
+            table = read_arrow(Path(directory) / "matches.arrow")
+            print(f"arrow memory-mapped in {(time.perf_counter() - start) * 1000:.1f} ms")
+            same = (table.column("partner").to_numpy().tolist() == [row["partner"] for row in parsed]
+                    and table.column("person_rashi").to_pylist() == [row["person_rashi"] for row in parsed])
+            print(f"Arrow and NDJSON rows identical: {same}")
+            stream = b"".join(arrow_stream_chunks(columns))
+            print(f"Arrow IPC stream round trip equal: {ipc.open_stream(stream).read_all().equals(to_table(columns))}")
@@ -0,0 +1,174 @@
+"""
+Compiled Knowledge Base
+
+A binary form of vedic_knowledge_base.json that a process can open without
+parsing the whole file. scripts/build_knowledge_base.py compiles the JSON
+into one file laid out as:
+
+    header:   magic b"VKB1", entry count, keys blob length (little-endian u32s)
+    keys:     the entry keys, UTF-8, newline separated, sorted
+    index:    one (offset, length, codec) record per key (INDEX_DTYPE)
+    records:  per entry a u32 length prefix and the entry's JSON, compressed
+              with zlib when that makes it smaller (codec 1) or raw (codec 0)
+
+CompiledKnowledgeBase memory-maps the file and decodes an entry only on first
+access, so every worker shares the same pages and a cold start only reads the
+header, keys and index. It is a read-only Mapping, a drop-in for the dict
+KnowledgeBaseService used to load.
+
+The file is written to a temporary file next to it and moved into place with
+os.replace, so a process opening it while it is rebuilt sees either the old
+or the new file, never a partial one.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, Union
+
+import numpy as np
+
+# Compiled file next to the JSON it is built from
+COMPILED_KNOWLEDGE_BASE_PATH = Path(__file__).parent.parent / "data" / "vedic_knowledge_base.kbc"
+
+MAGIC = b"VKB1"
+_HEADER = struct.Struct("<4sII")
+_LENGTH = struct.Struct("<I")
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+
+INDEX_DTYPE = np.dtype([("offset", "<u8"), ("length", "<u4"), ("codec", "u1")])
+
+
+def compile_knowledge_base(knowledge_base: Dict[str, Any], output: Union[str, Path] = COMPILED_KNOWLEDGE_BASE_PATH, compress: bool = True) -> Dict[str, int]:
+    """
+    Write a knowledge base dict in the compiled format.
+
+    Args:
+        knowledge_base: Entries by key, as loaded from vedic_knowledge_base.json
+        output: Compiled file to write
+        compress: Whether to zlib-compress records (kept raw if that is not smaller)
+
+    Returns:
+        Statistics: entries, raw_bytes (JSON of all records) and file_bytes
+    """
+    keys = sorted(knowledge_base)
+    if any("\n" in key for key in keys):
+        raise ValueError("Knowledge base keys must not contain newlines")
+    keys_blob = "\n".join(keys).encode("utf-8")
+    index = np.zeros(len(keys), dtype=INDEX_DTYPE)
+
+    records = bytearray()
+    records_start = _HEADER.size + len(keys_blob) + index.nbytes
+    raw_bytes = 0
+    for position, key in enumerate(keys):
+        payload = json.dumps(knowledge_base[key], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        raw_bytes += len(payload)
+        codec = CODEC_RAW
+        if compress:
+            compressed = zlib.compress(payload, 9)
+            if len(compressed) < len(payload):
+                payload, codec = compressed, CODEC_ZLIB
+        index[position] = (records_start + len(records) + _LENGTH.size, len(payload), codec)
+        records += _LENGTH.pack(len(payload)) + payload
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fd, staging = tempfile.mkstemp(prefix=f".{output.name}-", dir=output.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(keys), len(keys_blob)))
+            f.write(keys_blob)
+            f.write(index.tobytes())
+            f.write(records)
+        # mkstemp creates the file private to its owner; other workers must be able to read it
+        os.chmod(staging, 0o644)
+        os.replace(staging, output)
+    except BaseException:
+        os.unlink(staging)
+        raise
+    return {"entries": len(keys), "raw_bytes": raw_bytes, "file_bytes": output.stat().st_size}
+
+
+class CompiledKnowledgeBase(Mapping):
+    """Read-only, lazily decoded view of a compiled knowledge base file."""
+
+    def __init__(self, path: Union[str, Path] = COMPILED_KNOWLEDGE_BASE_PATH):
+        """
+        Map the file and read its keys and index.
+
+        Args:
+            path: Compiled knowledge base file
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file is not a compiled knowledge base
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap.size() < _HEADER.size:
+            raise ValueError(f"Not a compiled knowledge base: {self.path}")
+        magic, count, keys_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a compiled knowledge base: {self.path}")
+        keys = self._mmap[_HEADER.size:_HEADER.size + keys_length].decode("utf-8").split("\n") if count else []
+        self._positions = {key: position for position, key in enumerate(keys)}
+        self._index = np.frombuffer(self._mmap, dtype=INDEX_DTYPE, count=count, offset=_HEADER.size + keys_length)
+        self._cache: Dict[str, Any] = {}
+
+    def _decode(self, position: int) -> Any:
+        offset, length, codec = self._index[position].tolist()
+        payload = self._mmap[offset:offset + length]
+        if codec == CODEC_ZLIB:
+            payload = zlib.decompress(payload)
+        return json.loads(payload)
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self._cache.get(key)
+        if entry is None:
+            entry = self._decode(self._positions[key])
+            self._cache[key] = entry
+        return entry
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def decoded(self) -> int:
+        """Number of entries decoded so far."""
+        return len(self._cache)
+
+
+if __name__ == "__main__":
+    import time
+
+    from app.services.knowledge_base_service import KNOWLEDGE_BASE_PATH
+
+    # Correctness (round trip against the JSON, atomic rebuilds) is tested in tests/test_compiled_knowledge_base.py
+    with open(KNOWLEDGE_BASE_PATH, "r", encoding="utf-8") as f:
+        source = json.load(f)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "kb.kbc"
+        stats = compile_knowledge_base(source, path)
+        print(f"{stats['entries']} entries, {stats['raw_bytes'] / 1000:.0f} KB of JSON -> {stats['file_bytes'] / 1000:.0f} KB compiled")
+
+        start = time.perf_counter()
+        compiled = CompiledKnowledgeBase(path)
+        open_time = time.perf_counter() - start
+        start = time.perf_counter()
+        with open(KNOWLEDGE_BASE_PATH, "r", encoding="utf-8") as f:
+            json.load(f)
+        load_time = time.perf_counter() - start
+        print(f"open {open_time * 1000:.2f} ms vs json.load {load_time * 1000:.2f} ms, {len(compiled)} keys")
@@ -1,15 +1,59 @@
+import threading
+from typing import Optional
+
 from geopy.geocoders import Nominatim
+from app.config import GEOCODER_ONLINE_FALLBACK
+from app.services.gazetteer import get_gazetteer
+from app.services.geocode_cache import get_geocode_cache
 
-def get_coordinates(place_name: str):
-    try:
-        geolocator = Nominatim(user_agent="kundali_app")
-        location = geolocator.geocode(place_name)
-    except Exception as e:
-        print(f"Error while getting coordinates: {e}")
-        return {}
+# Created on first online lookup and reused afterwards
+_geolocator: Optional[Nominatim] = None
+_geolocator_lock = threading.Lock()
+
+
+def nominatim_geocode(place_name: str):
+    """
+    Resolve a place name with Nominatim (network call).
+
+    Args:
+        place_name: Free-text place name
+
+    Returns:
+        Dictionary with latitude and longitude, or {} if Nominatim does not know the place.
+        Network and service errors are raised, so callers can tell them apart from unknown places.
+    """
+    global _geolocator
+    with _geolocator_lock:
+        if _geolocator is None:
+            _geolocator = Nominatim(user_agent="kundali_app")
+    location = _geolocator.geocode(place_name)
     if location:
         return {"latitude": location.latitude, "longitude": location.longitude}
     return {}
 
+
+def get_coordinates(place_name: str):
+    """
+    Resolve a place name to coordinates.
+
+    The offline gazetteer is tried first; places it does not know go through
+    the geocoding cache to Nominatim, if GEOCODER_ONLINE_FALLBACK is enabled.
+
+    Args:
+        place_name: Free-text place name, e.g. "Ahmedabad, India"
+
+    Returns:
+        Dictionary with latitude and longitude (plus the IANA timezone when the
+        gazetteer resolved the place), or {} if the place could not be resolved
+    """
+    gazetteer = get_gazetteer()
+    place = gazetteer.lookup(place_name) if gazetteer is not None else None
+    if place:
+        return {"latitude": place["latitude"], "longitude": place["longitude"], "timezone": place["timezone"]}
+    if GEOCODER_ONLINE_FALLBACK:
+        return get_geocode_cache().get(place_name)
+    return {}
+
+
 if __name__ == "__main__":
-    print(get_coordinates("Ahmedabad, India"))
\ No newline at end of file
+    print(get_coordinates("Ahmedabad, India"))
@@ -0,0 +1,101 @@
+"""
+Ephemeris Session
+
+Swiss Ephemeris keeps its file handles and sidereal mode in global state,
+which pyswisseph makes thread-local: a thread that never set the sidereal
+mode computes with the default (Fagan/Bradley) ayanamsa. This module owns
+that state: the ephemeris is opened once per thread that uses it, kept warm
+between charts, and every call goes through a lock so concurrent requests
+(threadpool routes, agent tool calls) never interleave with each other.
+
+Code in this app should not call swe.set_ephe_path, swe.set_sid_mode or
+swe.close directly; use get_ephemeris_session() instead.
+"""
+
+import threading
+from typing import Optional, Tuple
+
+import swisseph as swe
+from app.config import EPHE_PATH
+
+
+class EphemerisSession:
+    """Process-wide handle on the Swiss Ephemeris with sidereal (Lahiri) mode set in every thread using it."""
+
+    def __init__(self, ephe_path: str = EPHE_PATH, sid_mode: int = swe.SIDM_LAHIRI):
+        """
+        Initialize the session. The ephemeris is opened lazily on first use.
+
+        Args:
+            ephe_path: Directory containing the Swiss Ephemeris data files
+            sid_mode: Sidereal mode (ayanamsa) to keep set for the lifetime of the session
+        """
+        self.ephe_path = ephe_path
+        self.sid_mode = sid_mode
+        self._lock = threading.RLock()
+        # Whether the ephemeris has been opened in the current thread
+        self._local = threading.local()
+
+    def open(self) -> None:
+        """Point swisseph at the ephemeris files and set the sidereal mode, once per thread."""
+        with self._lock:
+            if getattr(self._local, "is_open", False):
+                return
+            swe.set_ephe_path(self.ephe_path)
+            swe.set_sid_mode(self.sid_mode)
+            self._local.is_open = True
+
+    def close(self) -> None:
+        """Release the current thread's ephemeris file handles."""
+        with self._lock:
+            swe.close()
+            self._local.is_open = False
+
+    def reopen(self) -> None:
+        """
+        Close and reopen the ephemeris.
+
+        Needed in forked worker processes, which would otherwise share the
+        parent's open file handles (and their file offsets).
+        """
+        with self._lock:
+            self.close()
+            self.open()
+
+    def __enter__(self) -> "EphemerisSession":
+        """Hold the session lock for a sequence of calls (e.g. a whole chart)."""
+        self._lock.acquire()
+        try:
+            self.open()
+        except Exception:
+            self._lock.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._lock.release()
+
+    def calc_ut(self, jd: float, planet_id: int, flags: int) -> Tuple[tuple, int]:
+        """Thread-safe swe.calc_ut."""
+        with self:
+            return swe.calc_ut(jd, planet_id, flags)
+
+    def houses_ex(self, jd: float, latitude: float, longitude: float, hsys: bytes, flags: int) -> Tuple[tuple, tuple]:
+        """Thread-safe swe.houses_ex."""
+        with self:
+            return swe.houses_ex(jd, latitude, longitude, hsys, flags)
+
+
+# Global instance
+_ephemeris_session: Optional[EphemerisSession] = None
+_session_lock = threading.Lock()
+
+
+def get_ephemeris_session() -> EphemerisSession:
+    """Get or create the global ephemeris session for this process."""
+    global _ephemeris_session
+    if _ephemeris_session is None:
+        with _session_lock:
+            if _ephemeris_session is None:
+                _ephemeris_session = EphemerisSession()
+    return _ephemeris_session
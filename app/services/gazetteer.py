@@ -0,0 +1,268 @@
+"""
+Offline Gazetteer
+
+Resolves birth place names to coordinates and an IANA timezone without a
+network call. Places come from a bundled CSV (app/data/places.csv: every
+Indian town above 15,000 people and every city worldwide above 100,000,
+taken from GeoNames, CC BY 4.0) and are compiled into a compact index of
+sorted normalized names plus per-place columns, memory-mapped at runtime and
+queried by binary search.
+
+The index is rebuilt automatically when it is missing or older than the CSV,
+or explicitly with scripts/build_gazetteer.py (which also accepts another CSV
+with the same columns, e.g. tests/fixtures/places.csv). Builds write to a
+temporary directory and move each file into place with os.replace, metadata
+last, so a concurrent reader never maps a half-written array.
+"""
+
+import csv
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Bundled source dataset and the directory holding the generated index
+PLACES_CSV = Path(__file__).parent.parent / "data" / "places.csv"
+GAZETTEER_DIR = Path(__file__).parent.parent / "data" / "gazetteer"
+
+# Key kinds: a place's own name outranks an alternate name of another place
+PRIMARY_NAME = 0
+ALTERNATE_NAME = 1
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_place_name(name: str) -> str:
+    """
+    Normalize a place name for lookup: strip accents, lowercase, collapse punctuation and spaces.
+
+    Args:
+        name: Free-text place name (one comma-separated part)
+
+    Returns:
+        Normalized name, e.g. "São Paulo" -> "sao paulo"
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    ascii_name = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", ascii_name.lower()).strip()
+
+
+def build_gazetteer(source: Path = PLACES_CSV, directory: Path = GAZETTEER_DIR) -> int:
+    """
+    Compile a places CSV into the on-disk index.
+
+    The CSV needs the columns name, alternate_names ('|'-separated, may be
+    empty), country_code, country, latitude, longitude, timezone and population.
+
+    Args:
+        source: Places CSV
+        directory: Output directory
+
+    Returns:
+        Number of places indexed
+    """
+    with open(source, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    countries: List[str] = []
+    country_codes: List[str] = []
+    timezones: List[str] = []
+    country_ids: Dict[str, int] = {}
+    timezone_ids: Dict[str, int] = {}
+
+    keys, key_places, key_kinds = [], [], []
+    country = np.empty(len(rows), dtype=np.int16)
+    timezone = np.empty(len(rows), dtype=np.int16)
+    for place, row in enumerate(rows):
+        code = row["country_code"]
+        if code not in country_ids:
+            country_ids[code] = len(countries)
+            countries.append(row["country"])
+            country_codes.append(code)
+        if row["timezone"] not in timezone_ids:
+            timezone_ids[row["timezone"]] = len(timezones)
+            timezones.append(row["timezone"])
+        country[place] = country_ids[code]
+        timezone[place] = timezone_ids[row["timezone"]]
+
+        names = {normalize_place_name(row["name"]): PRIMARY_NAME}
+        for alternate in filter(None, row["alternate_names"].split("|")):
+            names.setdefault(normalize_place_name(alternate), ALTERNATE_NAME)
+        for key, kind in names.items():
+            if key:
+                keys.append(key.encode("ascii"))
+                key_places.append(place)
+                key_kinds.append(kind)
+
+    order = np.argsort(np.array(keys, dtype=object), kind="stable")
+    directory.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".gazetteer-", dir=directory.parent))
+    try:
+        np.save(staging / "keys.npy", np.array(keys)[order])
+        np.save(staging / "key_places.npy", np.array(key_places, dtype=np.int32)[order])
+        np.save(staging / "key_kinds.npy", np.array(key_kinds, dtype=np.int8)[order])
+        np.save(staging / "names.npy", np.array([row["name"].encode("utf-8") for row in rows]))
+        np.save(staging / "latitude.npy", np.array([float(row["latitude"]) for row in rows]))
+        np.save(staging / "longitude.npy", np.array([float(row["longitude"]) for row in rows]))
+        np.save(staging / "population.npy", np.array([int(row["population"] or 0) for row in rows], dtype=np.int64))
+        np.save(staging / "country.npy", country)
+        np.save(staging / "timezone.npy", timezone)
+        with open(staging / "meta.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "source": str(source),
+                "places": len(rows),
+                "countries": countries,
+                "country_codes": country_codes,
+                "timezones": timezones,
+            }, f, indent=2)
+        # meta.json goes last: its presence and mtime mark the index complete
+        for path in sorted(staging.iterdir(), key=lambda path: path.name == "meta.json"):
+            os.replace(path, directory / path.name)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return len(rows)
+
+
+class Gazetteer:
+    """Memory-mapped place name index."""
+
+    def __init__(self, directory: Path = GAZETTEER_DIR):
+        """
+        Load the index.
+
+        Args:
+            directory: Directory written by build_gazetteer
+        """
+        try:
+            with open(directory / "meta.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            columns = ("keys", "key_places", "key_kinds", "names", "latitude", "longitude", "population", "country", "timezone")
+            arrays = {column: np.load(directory / f"{column}.npy", mmap_mode="r") for column in columns}
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Gazetteer not found at {directory}, run scripts/build_gazetteer.py")
+        self.directory = directory
+        self.countries = meta["countries"]
+        self.timezones = meta["timezones"]
+        # Qualifiers such as "India" or "IN" -> country id
+        self._country_names = {}
+        for country_id, (name, code) in enumerate(zip(meta["countries"], meta["country_codes"])):
+            self._country_names[normalize_place_name(name)] = country_id
+            self._country_names[normalize_place_name(code)] = country_id
+        # Sorted normalized names and, per name, its place and kind (PRIMARY_NAME / ALTERNATE_NAME)
+        self.keys = arrays["keys"]
+        self.key_places = arrays["key_places"]
+        self.key_kinds = arrays["key_kinds"]
+        # Per-place columns
+        self.population = arrays["population"]
+        self.country = arrays["country"]
+        self.latitude = arrays["latitude"]
+        self.longitude = arrays["longitude"]
+        self.timezone = arrays["timezone"]
+        self._names = arrays["names"]
+
+    def __len__(self) -> int:
+        return self._names.shape[0]
+
+    def place(self, place_id: int) -> Dict:
+        """
+        Get one place's details.
+
+        Args:
+            place_id: Row of the place in the index (stable for a given places CSV)
+
+        Returns:
+            Dictionary with keys place_id, name, country, latitude, longitude, timezone, population
+        """
+        if not 0 <= place_id < len(self):
+            raise ValueError(f"Unknown place_id: {place_id}")
+        return {
+            "place_id": int(place_id),
+            "name": self._names[place_id].decode("utf-8"),
+            "country": self.countries[self.country[place_id]],
+            "latitude": float(self.latitude[place_id]),
+            "longitude": float(self.longitude[place_id]),
+            "timezone": self.timezones[self.timezone[place_id]],
+            "population": int(self.population[place_id]),
+        }
+
+    def _candidates(self, key: str) -> np.ndarray:
+        """Key rows whose normalized name equals key."""
+        encoded = key.encode("ascii")
+        lo = np.searchsorted(self.keys, encoded, side="left")
+        hi = np.searchsorted(self.keys, encoded, side="right")
+        return np.arange(lo, hi)
+
+    def lookup(self, place_name: str) -> Optional[Dict]:
+        """
+        Resolve a free-text place name such as "Mumbai, Maharashtra, India".
+
+        The first comma-separated part is the place itself; later parts are
+        qualifiers that prefer places in a matching country (unrecognized
+        qualifiers, e.g. states, are ignored). Ties go to a place's own name
+        over an alternate name, then to the larger population.
+
+        Args:
+            place_name: Place name as typed by the user
+
+        Returns:
+            Place dictionary (see place()), or None if the name is not in the index
+        """
+        parts = [normalize_place_name(part) for part in place_name.split(",")]
+        parts = [part for part in parts if part]
+        if not parts:
+            return None
+
+        rows = self._candidates(parts[0])
+        if rows.size == 0 and len(parts) > 1:
+            # e.g. "Navi Mumbai" typed as "Navi, Mumbai"
+            rows = self._candidates(" ".join(parts))
+            parts = parts[:1]
+        if rows.size == 0:
+            return None
+
+        countries = {self._country_names[part] for part in parts[1:] if part in self._country_names}
+        places = self.key_places[rows]
+        in_country = np.isin(self.country[places], list(countries)) if countries else np.ones(rows.size, dtype=bool)
+        # Lexicographic preference: country match, own name, population
+        best = np.lexsort((self.population[places], -self.key_kinds[rows], in_country))[-1]
+        return self.place(int(places[best]))
+
+
+def _index_is_stale(source: Path, directory: Path) -> bool:
+    meta = directory / "meta.json"
+    return not meta.exists() or (source.exists() and source.stat().st_mtime > meta.stat().st_mtime)
+
+
+# Global instance (False once a load has been attempted and failed)
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Optional[Gazetteer]:
+    """Get the global gazetteer, building the index from the bundled CSV if needed; None if unavailable."""
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                try:
+                    if _index_is_stale(PLACES_CSV, GAZETTEER_DIR):
+                        print(f"Building gazetteer index from {PLACES_CSV}")
+                        build_gazetteer(PLACES_CSV, GAZETTEER_DIR)
+                    _gazetteer = Gazetteer()
+                except (FileNotFoundError, OSError) as e:
+                    print(f"Gazetteer unavailable: {e}")
+                    _gazetteer = False
+    return _gazetteer or None
+
+
+if __name__ == "__main__":
+    gazetteer = get_gazetteer()
+    for name in ["Ahmedabad, India", "Mumbai, Maharashtra, India", "Bombay", "Paris, France", "Nowhere Town"]:
+        print(name, "->", gazetteer.lookup(name))
@@ -0,0 +1,255 @@
+"""
+Geocoding Cache
+
+Two-level cache in front of an online geocoder (Nominatim by default): an
+in-process LRU, then a persistent SQLite store whose entries expire after a
+TTL. Places the geocoder does not know are cached too (negative caching, with
+a shorter TTL), while geocoder errors are never cached.
+
+Concurrent lookups of the same normalized place name are coalesced: the first
+caller queries the geocoder and the others wait for its result instead of
+sending duplicate requests.
+"""
+
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from app.config import GEOCODE_CACHE_PATH, GEOCODE_CACHE_TTL_DAYS, GEOCODE_NEGATIVE_TTL_DAYS
+from app.services.gazetteer import normalize_place_name
+
+# Entries kept in the in-process LRU
+LRU_SIZE = 4096
+
+# A geocoder returns {"latitude", "longitude"} or {} for unknown places, and raises on errors
+Geocoder = Callable[[str], Dict]
+
+
+def cache_key(place_name: str) -> str:
+    """
+    Cache key of a place name.
+
+    Args:
+        place_name: Free-text place name
+
+    Returns:
+        normalize_place_name's key ("São Paulo" -> "sao paulo"); names it
+        reduces to nothing (non-Latin scripts such as "मुंबई" or "Москва")
+        are NFKC-normalized and casefolded instead, so they keep distinct keys
+    """
+    key = normalize_place_name(place_name)
+    if not key:
+        key = " ".join(unicodedata.normalize("NFKC", place_name).casefold().split())
+    return key
+
+
+class GeocodeCache:
+    """LRU + SQLite cache with single-flight lookups around a geocoder callable."""
+
+    def __init__(
+        self,
+        geocoder: Geocoder,
+        db_path: Optional[Path] = GEOCODE_CACHE_PATH,
+        ttl_seconds: float = GEOCODE_CACHE_TTL_DAYS * 86400,
+        negative_ttl_seconds: float = GEOCODE_NEGATIVE_TTL_DAYS * 86400,
+        lru_size: int = LRU_SIZE,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            geocoder: Function resolving a place name (see Geocoder)
+            db_path: SQLite file for the persistent level, or None for memory only
+            ttl_seconds: Lifetime of resolved places
+            negative_ttl_seconds: Lifetime of "not found" results
+            lru_size: Entries kept in the in-process LRU
+        """
+        self.geocoder = geocoder
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.lru_size = lru_size
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[str, tuple]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "negative_hits": 0,
+            "errors": 0,
+        }
+
+        self._db = None
+        if db_path is not None:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                "key TEXT PRIMARY KEY, latitude REAL, longitude REAL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def _memory_get(self, key: str, now: float) -> Optional[Dict]:
+        entry = self._lru.get(key)
+        if entry is None:
+            return None
+        result, expires_at = entry
+        if expires_at <= now:
+            del self._lru[key]
+            return None
+        self._lru.move_to_end(key)
+        return result
+
+    def _memory_put(self, key: str, result: Dict, expires_at: float) -> None:
+        self._lru[key] = (result, expires_at)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def _disk_get(self, key: str, now: float) -> Optional[tuple]:
+        row = self._db.execute(
+            "SELECT latitude, longitude, expires_at FROM geocode WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        latitude, longitude, expires_at = row
+        result = {} if latitude is None else {"latitude": latitude, "longitude": longitude}
+        return result, expires_at
+
+    def _disk_put(self, key: str, result: Dict, expires_at: float) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO geocode (key, latitude, longitude, expires_at) VALUES (?, ?, ?, ?)",
+            (key, result.get("latitude"), result.get("longitude"), expires_at),
+        )
+        self._db.commit()
+
+    def _count_hit(self, level: str, result: Dict) -> None:
+        self._counters[level] += 1
+        if not result:
+            self._counters["negative_hits"] += 1
+
+    def get(self, place_name: str) -> Dict:
+        """
+        Resolve a place name through the cache.
+
+        Args:
+            place_name: Free-text place name
+
+        Returns:
+            Dictionary with latitude and longitude, or {} if the place is unknown
+            or the geocoder failed
+        """
+        key = cache_key(place_name)
+        with self._lock:
+            now = time.time()
+            result = self._memory_get(key, now)
+            if result is not None:
+                self._count_hit("memory_hits", result)
+                return dict(result)
+            if self._db is not None:
+                cached = self._disk_get(key, now)
+                if cached is not None:
+                    self._memory_put(key, *cached)
+                    self._count_hit("disk_hits", cached[0])
+                    return dict(cached[0])
+
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+                self._counters["misses"] += 1
+            else:
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            return dict(future.result())
+
+        try:
+            result = self.geocoder(place_name)
+        except Exception as e:
+            print(f"Error while getting coordinates: {e}")
+            with self._lock:
+                self._counters["errors"] += 1
+                del self._in_flight[key]
+            # Waiters get the same empty answer, nothing is cached
+            future.set_result({})
+            return {}
+
+        result = dict(result) if result else {}
+        with self._lock:
+            expires_at = time.time() + (self.ttl_seconds if result else self.negative_ttl_seconds)
+            self._memory_put(key, result, expires_at)
+            if self._db is not None:
+                self._disk_put(key, result, expires_at)
+            del self._in_flight[key]
+        future.set_result(result)
+        return dict(result)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with memory/disk hits, misses (geocoder calls), lookups
+            coalesced onto an in-flight one, negative hits, errors, and the
+            current in-flight and LRU sizes
+        """
+        with self._lock:
+            return {**self._counters, "in_flight": len(self._in_flight), "memory_entries": len(self._lru)}
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# Global instance
+_geocode_cache: Optional[GeocodeCache] = None
+_geocode_cache_lock = threading.Lock()
+
+
+def get_geocode_cache(geocoder: Optional[Geocoder] = None) -> GeocodeCache:
+    """
+    Get or create the global geocoding cache.
+
+    Args:
+        geocoder: Geocoder used when the cache is first created
+            (defaults to Nominatim via coord_utils)
+    """
+    global _geocode_cache
+    if _geocode_cache is None:
+        with _geocode_cache_lock:
+            if _geocode_cache is None:
+                if geocoder is None:
+                    from app.services.coord_utils import nominatim_geocode
+                    geocoder = nominatim_geocode
+                _geocode_cache = GeocodeCache(geocoder)
+    return _geocode_cache
+
+
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    calls = []
+
+    def stand_in_geocoder(place_name: str) -> Dict:
+        """Local stand-in for Nominatim that counts calls and is slow enough for requests to overlap."""
+        calls.append(place_name)
+        time.sleep(0.2)
+        return {} if "nowhere" in place_name.lower() else {"latitude": 1.0, "longitude": 2.0}
+
+    cache = GeocodeCache(stand_in_geocoder, db_path=None)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(cache.get, ["Ahmedabad, India"] * 8 + ["ahmedabad india"] * 4 + ["Nowhere"] * 4))
+    cache.get("Nowhere")
+    print(f"geocoder calls: {len(calls)}")
+    print(cache.stats())
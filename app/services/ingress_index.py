@@ -0,0 +1,256 @@
+"""
+Planetary Sign-Ingress Index
+
+For every planet in app.config.PLANETS, a sorted array of event times over
+1800-2399 at which the planet changes sign or stations (turns retrograde or
+direct), plus the packed state (sign, retrograde) that holds from that event
+until the next one. Questions like "sign of P at T" or "all ingresses between
+T1 and T2" become a binary search instead of an ephemeris call.
+
+The index is generated once with scripts/build_ingress_index.py and
+memory-mapped at runtime.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+from app.config import PLANETS, ZODIACS
+from app.services.ephemeris import get_ephemeris_session
+from app.services.moon_table import RANGE_END_JD, RANGE_START_JD
+
+# Directory holding the generated index
+INGRESS_INDEX_DIR = Path(__file__).parent.parent / "data" / "ingress_index"
+
+# Packed state byte: low nibble is the 0-based sign, then flags
+SIGN_MASK = 0x0F
+RETROGRADE_FLAG = 0x10
+INGRESS_EVENT = 0x20
+STATION_EVENT = 0x40
+
+# Sampling step in days per planet; small enough that no planet can change
+# sign twice or station twice between two samples
+SAMPLE_STEP_DAYS = {
+    "sun": 5.0,
+    "moon": 0.5,
+    "mercury": 1.0,
+    "venus": 2.0,
+    "mars": 2.0,
+    "jupiter": 5.0,
+    "saturn": 5.0,
+    "rahu": 10.0,
+}
+
+_BISECTION_TOLERANCE_DAYS = 1e-7
+
+
+def _swe_id(planet: str) -> int:
+    return swe.MEAN_NODE if planet == "rahu" else getattr(swe, planet.upper())
+
+
+def _state(planet_id: int, jd: float) -> int:
+    """Packed (sign, retrograde) state of a planet at jd."""
+    result = swe.calc_ut(jd, planet_id, swe.FLG_SIDEREAL | swe.FLG_SPEED)[0]
+    state = int(result[0] // 30) % 12
+    if result[3] < 0:
+        state |= RETROGRADE_FLAG
+    return state
+
+
+def _bisect_change(planet_id: int, lo: float, hi: float, mask: int) -> float:
+    """Find the first instant after lo at which the masked state differs from its value at lo."""
+    initial = _state(planet_id, lo) & mask
+    while hi - lo > _BISECTION_TOLERANCE_DAYS:
+        mid = (lo + hi) / 2
+        if _state(planet_id, mid) & mask == initial:
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
+
+def build_planet_index(planet: str, start_jd: float = RANGE_START_JD, end_jd: float = RANGE_END_JD) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find all sign ingresses and stations of one planet.
+
+    Ketu is not computed separately: it is derived from Rahu by build_ingress_index.
+
+    Args:
+        planet: Planet name from PLANETS (not 'ketu')
+        start_jd: First instant covered (UT Julian day)
+        end_jd: Last instant covered (UT Julian day)
+
+    Returns:
+        (times, states): times[0] is start_jd with the initial state; every later
+        entry is an event time and the packed state that holds from it
+    """
+    planet_id = _swe_id(planet)
+    step = SAMPLE_STEP_DAYS[planet]
+
+    with get_ephemeris_session():
+        times = [start_jd]
+        states = [_state(planet_id, start_jd)]
+        previous_jd, previous_state = start_jd, states[0]
+        while previous_jd < end_jd:
+            jd = min(previous_jd + step, end_jd)
+            state = _state(planet_id, jd)
+            events = []
+            # Split the step at a station: a planet turning around close to a sign
+            # boundary can cross it twice, leaving the sign unchanged at both ends
+            brackets = [(previous_jd, previous_state, jd, state)]
+            if (state ^ previous_state) & RETROGRADE_FLAG:
+                station_jd = _bisect_change(planet_id, previous_jd, jd, RETROGRADE_FLAG)
+                station_state = _state(planet_id, station_jd)
+                events.append((station_jd, STATION_EVENT))
+                brackets = [(previous_jd, previous_state, station_jd, station_state), (station_jd, station_state, jd, state)]
+            for lo, lo_state, hi, hi_state in brackets:
+                if (lo_state ^ hi_state) & SIGN_MASK:
+                    events.append((_bisect_change(planet_id, lo, hi, SIGN_MASK), INGRESS_EVENT))
+            for event_jd, kind in sorted(events):
+                times.append(event_jd)
+                states.append(_state(planet_id, event_jd) | kind)
+            previous_jd, previous_state = jd, state
+
+    return np.array(times, dtype=np.float64), np.array(states, dtype=np.uint8)
+
+
+def build_ingress_index(start_jd: float = RANGE_START_JD, end_jd: float = RANGE_END_JD, directory: Path = INGRESS_INDEX_DIR) -> None:
+    """
+    Build and save the index for every planet in PLANETS.
+
+    Args:
+        start_jd: First instant covered (UT Julian day)
+        end_jd: Last instant covered (UT Julian day)
+        directory: Output directory
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    counts = {}
+    for planet in PLANETS:
+        if planet == "ketu":
+            continue
+        times, states = build_planet_index(planet, start_jd, end_jd)
+        np.save(directory / f"{planet}_times.npy", times)
+        np.save(directory / f"{planet}_states.npy", states)
+        counts[planet] = int(times.shape[0])
+        if planet == "rahu":
+            # Ketu is always six signs from Rahu and shares its motion
+            ketu_states = (states & (0xFF ^ SIGN_MASK)) | (((states & SIGN_MASK) + 6) % 12)
+            np.save(directory / "ketu_times.npy", times)
+            np.save(directory / "ketu_states.npy", ketu_states.astype(np.uint8))
+            counts["ketu"] = counts["rahu"]
+
+    with open(directory / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({"start_jd": start_jd, "end_jd": end_jd, "entries": counts}, f, indent=2)
+
+
+class IngressIndex:
+    """Memory-mapped sign-ingress and station index for all planets."""
+
+    def __init__(self, directory: Path = INGRESS_INDEX_DIR):
+        """
+        Load the index.
+
+        Args:
+            directory: Directory written by build_ingress_index
+        """
+        try:
+            with open(directory / "meta.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self._times = {planet: np.load(directory / f"{planet}_times.npy", mmap_mode="r") for planet in PLANETS}
+            self._states = {planet: np.load(directory / f"{planet}_states.npy", mmap_mode="r") for planet in PLANETS}
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Ingress index not found at {directory}, run scripts/build_ingress_index.py")
+        self.start_jd = meta["start_jd"]
+        self.end_jd = meta["end_jd"]
+
+    def covers(self, jd: float) -> bool:
+        """Whether jd falls inside the index's range."""
+        return self.start_jd <= jd <= self.end_jd
+
+    def _state_at(self, planet: str, jds):
+        planet = planet.lower().strip()
+        if planet not in self._times:
+            raise ValueError(f"Unknown planet: {planet}. Must be one of: {', '.join(PLANETS)}")
+        checked = np.asarray(jds, dtype=np.float64)
+        if checked.size and (checked.min() < self.start_jd or checked.max() > self.end_jd):
+            raise ValueError(f"Julian days must be within [{self.start_jd}, {self.end_jd}]")
+        index = np.searchsorted(self._times[planet], jds, side="right") - 1
+        return self._states[planet][index]
+
+    def sign_at(self, planet: str, jds):
+        """
+        Get the sign id (1-12) of a planet at one or many instants.
+
+        Args:
+            planet: Planet name from PLANETS
+            jds: UT Julian day(s) inside the index's range
+
+        Returns:
+            Sign id(s), same shape as the input
+
+        Raises:
+            ValueError: If the planet is unknown or a jd is outside the range
+        """
+        return (self._state_at(planet, jds) & SIGN_MASK) + 1
+
+    def retrograde_at(self, planet: str, jds):
+        """
+        Get whether a planet is retrograde at one or many instants.
+
+        Args:
+            planet: Planet name from PLANETS
+            jds: UT Julian day(s) inside the index's range
+
+        Returns:
+            Boolean(s), same shape as the input
+
+        Raises:
+            ValueError: If the planet is unknown or a jd is outside the range
+        """
+        return (self._state_at(planet, jds) & RETROGRADE_FLAG) != 0
+
+    def ingresses_between(self, start_jd: float, end_jd: float, planets: Optional[List[str]] = None) -> List[Dict]:
+        """
+        List all sign ingresses in [start_jd, end_jd].
+
+        Args:
+            start_jd: Start of the window (UT Julian day)
+            end_jd: End of the window (UT Julian day)
+            planets: Planets to include (defaults to all of PLANETS)
+
+        Returns:
+            List of dictionaries with keys planet, jd, sign, retrograde, sorted by time
+        """
+        ingresses = []
+        for planet in planets or PLANETS:
+            planet = planet.lower().strip()
+            times = self._times[planet]
+            lo = np.searchsorted(times, start_jd, side="left")
+            hi = np.searchsorted(times, end_jd, side="right")
+            states = np.asarray(self._states[planet][lo:hi])
+            for offset in np.nonzero(states & INGRESS_EVENT)[0]:
+                state = int(states[offset])
+                ingresses.append({
+                    "planet": planet,
+                    "jd": float(times[lo + offset]),
+                    "sign": ZODIACS[(state & SIGN_MASK) + 1]["name"],
+                    "retrograde": bool(state & RETROGRADE_FLAG),
+                })
+        return sorted(ingresses, key=lambda x: x["jd"])
+
+
+# Global instance (False once a load has been attempted and failed)
+_ingress_index = None
+
+
+def get_ingress_index() -> Optional[IngressIndex]:
+    """Get the global ingress index, or None if it has not been built."""
+    global _ingress_index
+    if _ingress_index is None:
+        try:
+            _ingress_index = IngressIndex()
+        except FileNotFoundError:
+            _ingress_index = False
+    return _ingress_index or None
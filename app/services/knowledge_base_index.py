@@ -0,0 +1,392 @@
+"""
+Knowledge Base Index
+
+Integer-keyed view of the knowledge base, built once when it is loaded, so a
+lookup is an array index instead of lowercasing, formatting and hashing a
+string key (and, for conjunctions, possibly two dict misses).
+
+    ids:      planets are 1-9 in PLANETS order, signs 1-12 (ZODIACS),
+              nakshatras 1-27 (NAKSHATRAS) and houses 1-12; 0 stands for an
+              unknown or out-of-range value and addresses a row of misses,
+              so batches never need special-casing
+    aliases:  names are reduced to a-z ("Purva Phalguni", "purva_phalguni"
+              and "purvaphalguni" agree) and common spellings and Sanskrit
+              names are mapped onto the same ids, once, in NAME_IDS
+    slots:    per category a dense int16 array of slots into the entry list,
+              -1 where the knowledge base has no entry; conjunctions are
+              stored once per unordered pair (PAIR_IDS[a, b] == PAIR_IDS[b, a])
+    entries:  fetched from the underlying mapping on first use, so a lazily
+              decoded compiled knowledge base stays lazy
+
+Categories use the query_type names of the query_knowledge_base tool.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from app.config import NAKSHATRAS, PLANETS, ZODIACS
+
+CATEGORIES = ("planet_in_house", "planet_in_sign", "ascendant_sign", "nakshatra", "conjunction")
+
+Name = Union[str, int]
+
+# Alternative spellings (already reduced to a-z) of the canonical names
+_PLANET_ALIASES = {
+    "sun": ("surya", "ravi"),
+    "moon": ("chandra", "soma"),
+    "mercury": ("budha", "budh"),
+    "venus": ("shukra", "sukra"),
+    "mars": ("mangal", "mangala", "kuja"),
+    "jupiter": ("guru", "brihaspati"),
+    "saturn": ("shani", "sani"),
+    "rahu": ("northnode",),
+    "ketu": ("southnode",),
+}
+_SIGN_ALIASES = {
+    "aries": ("mesha", "mesh"),
+    "taurus": ("vrishabha", "vrishabh", "vrisha"),
+    "gemini": ("mithuna", "mithun"),
+    "cancer": ("karka", "karkata", "kark"),
+    "leo": ("simha", "singh"),
+    "virgo": ("kanya",),
+    "libra": ("tula",),
+    "scorpio": ("vrishchika", "vrischika", "vrishchik"),
+    "sagittarius": ("dhanu", "dhanus"),
+    "capricorn": ("makara", "makar"),
+    "aquarius": ("kumbha", "kumbh"),
+    "pisces": ("meena", "mina", "meen"),
+}
+_NAKSHATRA_ALIASES = {
+    "ashwini": ("ashvini", "asvini", "aswini"),
+    "krittika": ("kritika", "kruttika"),
+    "mrigashira": ("mrigashirsha", "mrigasira", "mrigasirsha"),
+    "ardra": ("aridra", "arudra"),
+    "pushya": ("pushyami", "pooya", "tishya"),
+    "ashlesha": ("aslesha", "ashlesa", "ayilyam"),
+    "purvaphalguni": ("purvaphalgun", "poorvaphalguni", "pubba"),
+    "uttaraphalguni": ("uttaraphalgun", "uttarphalguni", "uthiram"),
+    "chitra": ("chitta", "chittirai"),
+    "swati": ("svati", "swathi"),
+    "visakha": ("vishakha", "vishaka", "visaka"),
+    "anuradha": ("anusham",),
+    "jyeshtha": ("jyestha", "jyeshta", "kettai"),
+    "mula": ("moola", "moolam"),
+    "purvaashadha": ("purvashadha", "poorvashadha", "purvasadha"),
+    "uttaraashadha": ("uttarashadha", "uttarasadha", "uthiradam"),
+    "shravana": ("sravana", "shravan", "thiruvonam"),
+    "dhanishta": ("dhanishtha", "dhanista", "shravishtha"),
+    "shatabhisha": ("shatabhishak", "satabhisha", "shatataraka"),
+    "purvabhadrapada": ("purvabhadra", "poorvabhadrapada", "purvabhadrapad"),
+    "uttarabhadrapada": ("uttarabhadra", "uttarbhadrapada", "uttarabhadrapad"),
+    "revati": ("revathi",),
+}
+
+
+def normalize_name(name: str) -> str:
+    """Reduce a name to lowercase a-z ("Purva Phalguni" -> "purvaphalguni")."""
+    return "".join(char for char in name.lower() if "a" <= char <= "z")
+
+
+def _name_ids(names: Sequence[str], aliases: Dict[str, tuple]) -> Dict[str, int]:
+    ids = {}
+    for position, name in enumerate(names):
+        canonical = normalize_name(name)
+        for alias in (canonical, *aliases.get(canonical, ())):
+            ids[alias] = position + 1
+    return ids
+
+
+# Reduced name (canonical or alias) -> 1-based id, per kind of name
+NAME_IDS = {
+    "planet": _name_ids(PLANETS, _PLANET_ALIASES),
+    "sign": _name_ids([ZODIACS[sign_id]["name"] for sign_id in sorted(ZODIACS)], _SIGN_ALIASES),
+    "nakshatra": _name_ids([NAKSHATRAS[nakshatra_id]["name"] for nakshatra_id in sorted(NAKSHATRAS)], _NAKSHATRA_ALIASES),
+}
+_SIZES = {"planet": len(PLANETS), "sign": len(ZODIACS), "house": 12, "nakshatra": len(NAKSHATRAS)}
+
+# Values as passed in (names, ids, house numbers) -> id, so repeated spellings
+# skip normalization; bounded because names can come from user or model input
+_RESOLVED: Dict[str, Dict[Name, int]] = {kind: {value: value for value in range(1, size + 1)} for kind, size in _SIZES.items()}
+_RESOLVED_LIMIT = 4096
+
+NUM_PAIRS = len(PLANETS) * (len(PLANETS) - 1) // 2
+
+# PAIR_IDS[a, b]: unordered pair id of two planet ids (0-based, lower triangle
+# order), NUM_PAIRS (a row of misses) for a planet with itself or an unknown planet
+_lower, _upper = np.tril_indices(len(PLANETS), -1)
+PAIR_IDS = np.full((len(PLANETS) + 1, len(PLANETS) + 1), NUM_PAIRS, dtype=np.int16)
+PAIR_IDS[_lower + 1, _upper + 1] = np.arange(NUM_PAIRS)
+PAIR_IDS[_upper + 1, _lower + 1] = np.arange(NUM_PAIRS)
+
+# Kinds of the one or two arguments of each category
+_ARGUMENTS = {
+    "planet_in_house": ("planet", "house"),
+    "planet_in_sign": ("planet", "sign"),
+    "ascendant_sign": ("sign",),
+    "nakshatra": ("nakshatra",),
+    "conjunction": ("planet", "planet"),
+}
+
+
+def resolve_id(kind: str, value: Name) -> int:
+    """
+    Resolve a name or number to its 1-based id.
+
+    Args:
+        kind: "planet", "sign", "house" or "nakshatra"
+        value: Name (any case, spacing or listed alias) or id; houses may
+            also be numeric strings
+
+    Returns:
+        The id, or 0 if the value is unknown or out of range
+    """
+    resolved = _RESOLVED[kind]
+    found = resolved.get(value)
+    if found is not None:
+        return found
+    if isinstance(value, str) and kind != "house":
+        found = NAME_IDS[kind].get(normalize_name(value), 0)
+    else:
+        try:
+            found = int(value)
+        except (TypeError, ValueError):
+            return 0
+        found = found if 1 <= found <= _SIZES[kind] else 0
+    if isinstance(value, str) and len(resolved) < _RESOLVED_LIMIT:
+        resolved[value] = found
+    return found
+
+
+def resolve_ids(kind: str, values: Union[Sequence[Name], np.ndarray]) -> np.ndarray:
+    """
+    Resolve a batch of names or numbers to ids (see resolve_id).
+
+    Args:
+        kind: "planet", "sign", "house" or "nakshatra"
+        values: Names or ids; an integer array is range-checked without a Python loop
+
+    Returns:
+        Int16 array of ids, 0 where unknown
+    """
+    if isinstance(values, np.ndarray) and np.issubdtype(values.dtype, np.integer):
+        return np.where((values >= 1) & (values <= _SIZES[kind]), values, 0).astype(np.int16)
+    return np.fromiter((resolve_id(kind, value) for value in values), dtype=np.int16)
+
+
+class KnowledgeBaseIndex:
+    """Dense, integer-addressed index over a knowledge base mapping."""
+
+    def __init__(self, knowledge_base: Mapping):
+        """
+        Locate every expected entry of the knowledge base by its key.
+
+        Only keys are checked; entries are not read until first looked up.
+
+        Args:
+            knowledge_base: Entries by key (dict or CompiledKnowledgeBase)
+        """
+        self._knowledge_base = knowledge_base
+        self._keys: List[str] = []
+        self._entries: List[Optional[Dict[str, Any]]] = []
+
+        planets = [None, *PLANETS]
+        signs = [None, *(ZODIACS[sign_id]["name"].lower() for sign_id in sorted(ZODIACS))]
+        nakshatras = [None, *(NAKSHATRAS[nakshatra_id]["name"].lower().replace(" ", "_")
+                              for nakshatra_id in sorted(NAKSHATRAS))]
+        planet_ids, house_ids, sign_ids = range(1, 10), range(1, 13), range(1, 13)
+
+        self._slots: Dict[str, np.ndarray] = {
+            "planet_in_house": self._locate((10, 13), {
+                (planet, house): [f"{planets[planet]}_{house}_house"] for planet in planet_ids for house in house_ids
+            }),
+            "planet_in_sign": self._locate((10, 13), {
+                (planet, sign): [f"{planets[planet]}_{signs[sign]}"] for planet in planet_ids for sign in sign_ids
+            }),
+            "ascendant_sign": self._locate((13,), {(sign,): [f"ascendant_{signs[sign]}"] for sign in sign_ids}),
+            "nakshatra": self._locate((28,), {
+                (nakshatra,): [f"nakshatra_{nakshatras[nakshatra]}"] for nakshatra in range(1, 28)
+            }),
+            # Either order may be stored; both resolve to the one pair slot
+            "conjunction": self._locate((NUM_PAIRS + 1,), {
+                (pair,): [f"conjunction_{planets[lower + 1]}_{planets[upper + 1]}",
+                          f"conjunction_{planets[upper + 1]}_{planets[lower + 1]}"]
+                for pair, (lower, upper) in enumerate(zip(_lower.tolist(), _upper.tolist()))
+            }),
+        }
+
+        # Same slots as nested lists: indexing them is cheaper than NumPy for single lookups
+        self._slot_lists = {category: slots.tolist() for category, slots in self._slots.items()}
+        self._pair_ids = PAIR_IDS.tolist()
+
+    def _locate(self, shape: tuple, candidates: Dict[tuple, List[str]]) -> np.ndarray:
+        """Slot array of the given shape with the first candidate key present at each index, -1 elsewhere."""
+        slots = np.full(shape, -1, dtype=np.int16)
+        for index, keys in candidates.items():
+            for key in keys:
+                if key in self._knowledge_base:
+                    slots[index] = len(self._keys)
+                    self._keys.append(key)
+                    self._entries.append(None)
+                    break
+        return slots
+
+    def _entry(self, slot: int) -> Optional[Dict[str, Any]]:
+        if slot < 0:
+            return None
+        entry = self._entries[slot]
+        if entry is None:
+            entry = self._entries[slot] = self._knowledge_base[self._keys[slot]]
+        return entry
+
+    def _slot(self, category: str, first: Name, second: Optional[Name]) -> int:
+        """Slot of one entry, -1 if missing; names and ids must be hashable."""
+        kinds = _ARGUMENTS.get(category)
+        if kinds is None:
+            raise ValueError(f"Unknown category: {category}, expected one of {CATEGORIES}")
+        slots = self._slot_lists[category]
+        # Inlined cache hit of resolve_id, the common case
+        first_id = _RESOLVED[kinds[0]].get(first)
+        if first_id is None:
+            first_id = resolve_id(kinds[0], first)
+        if len(kinds) == 1:
+            return slots[first_id]
+        second_id = _RESOLVED[kinds[1]].get(second)
+        if second_id is None:
+            second_id = resolve_id(kinds[1], second) if second is not None else 0
+        if category == "conjunction":
+            return slots[self._pair_ids[first_id][second_id]]
+        return slots[first_id][second_id]
+
+    def key(self, category: str, first: Name, second: Optional[Name] = None) -> Optional[str]:
+        """
+        Get the knowledge base key an entry is stored under.
+
+        Args:
+            category: One of CATEGORIES
+            first: Planet (planet_in_house, planet_in_sign, conjunction), sign
+                (ascendant_sign) or nakshatra, as a name or id
+            second: House, sign or second planet for the two-argument categories
+
+        Returns:
+            The key, or None if there is no such entry
+        """
+        slot = self._slot(category, first, second)
+        return self._keys[slot] if slot >= 0 else None
+
+    def lookup(self, category: str, first: Name, second: Optional[Name] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up one entry.
+
+        Args:
+            category: One of CATEGORIES
+            first: Planet (planet_in_house, planet_in_sign, conjunction), sign
+                (ascendant_sign) or nakshatra, as a name or id
+            second: House, sign or second planet for the two-argument categories
+
+        Returns:
+            Interpretation dictionary or None if not found
+        """
+        return self._entry(self._slot(category, first, second))
+
+    def lookup_many(
+        self,
+        category: str,
+        firsts: Union[Sequence[Name], np.ndarray],
+        seconds: Optional[Union[Sequence[Name], np.ndarray]] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Look up a batch of entries of one category with one array indexing.
+
+        Args:
+            category: One of CATEGORIES
+            firsts: First arguments (see lookup), names or ids
+            seconds: Second arguments, same length, for the two-argument categories
+
+        Returns:
+            One interpretation dictionary per query, None where not found
+        """
+        kinds = _ARGUMENTS.get(category)
+        if kinds is None:
+            raise ValueError(f"Unknown category: {category}, expected one of {CATEGORIES}")
+        slots = self._slots[category]
+        first = resolve_ids(kinds[0], firsts)
+        if len(kinds) == 1:
+            return [self._entry(slot) for slot in slots[first].tolist()]
+        second = resolve_ids(kinds[1], seconds if seconds is not None else [])
+        if first.shape != second.shape:
+            raise ValueError(f"{category} needs one second argument per first argument")
+        indices = (PAIR_IDS[first, second],) if category == "conjunction" else (first, second)
+        return [self._entry(slot) for slot in slots[indices].tolist()]
+
+    def coverage(self) -> Dict[str, int]:
+        """Number of entries found per category."""
+        return {category: int(np.count_nonzero(slots >= 0)) for category, slots in self._slots.items()}
+
+
+if __name__ == "__main__":
+    import json
+    import time
+
+    from app.services.knowledge_base_service import KNOWLEDGE_BASE_PATH
+
+    with open(KNOWLEDGE_BASE_PATH, "r", encoding="utf-8") as f:
+        source = json.load(f)
+    index = KnowledgeBaseIndex(source)
+    print("Entries per category:", index.coverage())
+
+    # Every lookup must agree with the string-key scheme it replaces
+    mismatches = 0
+    for planet in PLANETS:
+        for house in range(1, 13):
+            mismatches += index.lookup("planet_in_house", planet.title(), house) is not source.get(f"{planet}_{house}_house")
+        for sign_id in ZODIACS:
+            sign = ZODIACS[sign_id]["name"]
+            mismatches += index.lookup("planet_in_sign", planet, sign) is not source.get(f"{planet}_{sign.lower()}")
+        for other in PLANETS:
+            expected = source.get(f"conjunction_{planet}_{other}") or source.get(f"conjunction_{other}_{planet}")
+            mismatches += index.lookup("conjunction", other, planet) is not expected
+    for nakshatra_id in NAKSHATRAS:
+        name = NAKSHATRAS[nakshatra_id]["name"]
+        mismatches += index.lookup("nakshatra", name) is not source.get(f"nakshatra_{name.lower().replace(' ', '_')}")
+    print(f"Lookups differing from string keys: {mismatches}")
+    print("Aliases:", [index.key("nakshatra", name) for name in ("purva phalguni", "Purva_Phalguni", "Pubba", "Vishakha")],
+          index.key("planet_in_sign", "Shani", "Tula"), index.key("conjunction", 9, "rahu"))
+
+    rng = np.random.default_rng(0)
+    planets = [PLANETS[i] for i in rng.integers(0, 9, 100000)]
+    houses = rng.integers(1, 13, 100000)
+
+    def string_key_conjunction(planet1, planet2):
+        planet1, planet2 = planet1.lower().strip(), planet2.lower().strip()
+        result = source.get(f"conjunction_{planet1}_{planet2}")
+        return result if result is not None else source.get(f"conjunction_{planet2}_{planet1}")
+
+    others = [PLANETS[i] for i in rng.integers(0, 9, 100000)]
+    start = time.perf_counter()
+    for planet, house in zip(planets, houses.tolist()):
+        source.get(f"{planet.lower().strip()}_{house}_house")
+    string_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for planet, house in zip(planets, houses.tolist()):
+        index.lookup("planet_in_house", planet, house)
+    lookup_time = time.perf_counter() - start
+    planet_ids = resolve_ids("planet", planets)
+    start = time.perf_counter()
+    index.lookup_many("planet_in_house", planet_ids, houses)
+    batch_time = time.perf_counter() - start
+    print(f"100,000 planet_in_house lookups: string keys {string_time * 1000:.1f} ms, "
+          f"lookup {lookup_time * 1000:.1f} ms, lookup_many by id {batch_time * 1000:.1f} ms")
+    start = time.perf_counter()
+    for planet, other in zip(planets, others):
+        string_key_conjunction(planet, other)
+    string_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for planet, other in zip(planets, others):
+        index.lookup("conjunction", planet, other)
+    lookup_time = time.perf_counter() - start
+    start = time.perf_counter()
+    index.lookup_many("conjunction", planets, others)
+    batch_time = time.perf_counter() - start
+    print(f"100,000 conjunction lookups: string keys {string_time * 1000:.1f} ms, "
+          f"lookup {lookup_time * 1000:.1f} ms, lookup_many by name {batch_time * 1000:.1f} ms")
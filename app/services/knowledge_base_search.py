@@ -0,0 +1,253 @@
+"""
+Knowledge Base Search
+
+Offline BM25 full-text search over the knowledge base, for free-form
+questions ("why do I procrastinate?") that do not name a placement.
+
+    documents:  one per knowledge base entry; every text field is indexed,
+                title fields (archetype, theme, symbol) counted twice
+                (FIELD_WEIGHTS), identifiers (key) skipped
+    terms:      lowercase words minus stopwords, with common suffixes
+                stripped so "procrastinate" and "procrastination" meet
+    index:      postings sorted by term id (offsets, document ids and
+                precomputed BM25 weights as flat arrays), so a query is one
+                array addition per query term and an argpartition for the top k
+    filter:     results can be limited to a set of keys, e.g. the
+                placements of the user's chart
+
+The index is built from the loaded knowledge base on first use.
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from app.services.knowledge_base_service import get_knowledge_base_service
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Times a field's terms are counted; fields not listed count once, 0 skips
+FIELD_WEIGHTS = {
+    "archetype": 2,
+    "theme": 2,
+    "symbol": 2,
+    "key": 0,
+    "activation_age": 0,
+}
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between both
+but by can could did do does doing down during each few for from further had has have having he her here hers
+herself him himself his how i if in into is it its itself just me more most my myself no nor not now of off on
+once only or other our ours ourselves out over own same she should so some such than that the their theirs them
+themselves then there these they this those through to too under until up very was we were what when where which
+while who whom why will with would you your yours yourself yourselves
+""".split())
+
+# (suffix, replacement) pairs tried in order, the first match wins; the stem keeps
+# at least 3 letters. "ies"/"ied" become "y" so "families" meets "family", and
+# "ious"/"iety" both go so "anxious" meets "anxiety". "ly" is left alone: too
+# many nouns end in it ("family", "assembly"). "es" only goes after the endings
+# in _ES_AFTER ("matches", "classes"); elsewhere the "e" belongs to the word
+# and only the "s" goes ("marriages" meets "marriage", "houses" meets "house").
+# Words in "ss" keep it ("stress", "class")
+_SUFFIXES = (
+    ("ational", ""), ("ations", ""), ("ation", ""), ("ness", ""), ("ments", ""), ("ment", ""),
+    ("ities", ""), ("ity", ""), ("iety", ""), ("ious", ""), ("ings", ""), ("ing", ""),
+    ("ies", "y"), ("ied", "y"), ("ive", ""), ("ate", ""), ("ed", ""), ("es", ""), ("ss", "ss"), ("s", ""),
+)
+_ES_AFTER = ("ss", "x", "z", "ch", "sh")
+_MIN_STEM = 3
+
+_WORDS = re.compile(r"[a-z]+")
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Strip one common suffix ("procrastination" -> "procrastin", "families" -> "family")."""
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM:
+            if suffix == "es" and not word[:-2].endswith(_ES_AFTER):
+                continue
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Terms of a text: lowercase words without stopwords, stemmed."""
+    return [stem(word) for word in _WORDS.findall(text.lower()) if word not in STOPWORDS]
+
+
+def _texts(value: Any, field: Optional[str] = None) -> Iterator[Tuple[Optional[str], str]]:
+    """(top-level field, text) of every string inside an entry."""
+    if isinstance(value, str):
+        yield field, value
+    elif isinstance(value, dict):
+        for name, item in value.items():
+            yield from _texts(item, name if field is None else field)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _texts(item, field)
+
+
+class KnowledgeBaseSearch:
+    """BM25 inverted index over knowledge base entries."""
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]]):
+        """
+        Index entries.
+
+        Args:
+            entries: (key, entry) pairs, e.g. a knowledge base mapping's items()
+        """
+        self.keys: List[str] = []
+        counts: List[Counter] = []
+        for key, entry in entries:
+            terms: Counter = Counter()
+            for field, text in _texts(entry):
+                weight = FIELD_WEIGHTS.get(field, 1)
+                if weight:
+                    for term in tokenize(text):
+                        terms[term] += weight
+            self.keys.append(key)
+            counts.append(terms)
+        self._positions = {key: position for position, key in enumerate(self.keys)}
+
+        self.vocabulary: Dict[str, int] = {}
+        for terms in counts:
+            for term in terms:
+                self.vocabulary.setdefault(term, len(self.vocabulary))
+
+        lengths = np.array([sum(terms.values()) for terms in counts], dtype=np.float64)
+        norms = K1 * (1 - B + B * lengths / max(lengths.mean(), 1.0))
+
+        # Postings sorted by term: documents and BM25 weights of term t are [offsets[t]:offsets[t + 1]]
+        term_ids = np.fromiter((self.vocabulary[term] for terms in counts for term in terms), dtype=np.int64)
+        documents = np.repeat(np.arange(len(counts), dtype=np.int32), [len(terms) for terms in counts])
+        term_counts = np.fromiter((count for terms in counts for count in terms.values()), dtype=np.float64)
+        order = np.argsort(term_ids, kind="stable")
+        frequencies = np.bincount(term_ids, minlength=len(self.vocabulary))
+        idf = np.log(1 + (len(counts) - frequencies + 0.5) / (frequencies + 0.5))
+        self._offsets = np.concatenate([[0], np.cumsum(frequencies)])
+        self._documents = documents[order]
+        term_counts = term_counts[order]
+        self._weights = (idf[term_ids[order]] * term_counts * (K1 + 1)
+                         / (term_counts + norms[self._documents])).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def mask(self, keys: Iterable[str]) -> np.ndarray:
+        """
+        Boolean document mask of a set of keys, for search's allowed argument.
+
+        Args:
+            keys: Knowledge base keys; unknown keys are ignored
+
+        Returns:
+            Boolean array, one entry per document
+        """
+        mask = np.zeros(len(self.keys), dtype=bool)
+        mask[[self._positions[key] for key in keys if key in self._positions]] = True
+        return mask
+
+    def search(self, query: str, top_k: int = 10, allowed: Optional[np.ndarray] = None) -> List[Tuple[str, float]]:
+        """
+        Find the entries best matching a free-form query.
+
+        Args:
+            query: Question or keywords
+            top_k: Number of results
+            allowed: Optional boolean mask (see mask) of the documents to consider
+
+        Returns:
+            (key, score) pairs, best first; only documents matching at least
+            one query term
+        """
+        if top_k <= 0:
+            return []
+        scores = np.zeros(len(self.keys), dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self.vocabulary.get(term)
+            if term_id is not None:
+                start, end = self._offsets[term_id], self._offsets[term_id + 1]
+                # A document appears once per term, so plain fancy-index addition is exact
+                scores[self._documents[start:end]] += self._weights[start:end]
+        if allowed is not None:
+            scores[~allowed] = 0
+        matched = np.flatnonzero(scores > 0)
+        if matched.shape[0] > top_k:
+            matched = matched[np.argpartition(-scores[matched], top_k - 1)[:top_k]]
+        order = matched[np.lexsort((matched, -scores[matched]))]
+        return [(self.keys[document], float(scores[document])) for document in order.tolist()]
+
+
+# Global instance
+_knowledge_base_search: Optional[KnowledgeBaseSearch] = None
+
+
+def get_knowledge_base_search() -> KnowledgeBaseSearch:
+    """Get the global search index, building it from the knowledge base on first use."""
+    global _knowledge_base_search
+    if _knowledge_base_search is None:
+        _knowledge_base_search = KnowledgeBaseSearch(get_knowledge_base_service().items())
+    return _knowledge_base_search
+
+
+if __name__ == "__main__":
+    import time
+
+    pairs = (("family", "families"), ("anxious", "anxiety"), ("procrastinate", "procrastination"), ("married", "marry"))
+    print("Stems:", {pair: (stem(pair[0]), stem(pair[1])) for pair in pairs})
+
+    start = time.perf_counter()
+    index = get_knowledge_base_search()
+    print(f"{len(index)} entries, {len(index.vocabulary):,} terms indexed in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for question in ("why do I procrastinate?", "I feel anxious and can't sleep", "conflicts with my boss at work"):
+        print(question, [(key, round(score, 2)) for key, score in index.search(question, top_k=5)])
+
+    # Top-10 latency over queries built from the vocabulary
+    rng = np.random.default_rng(0)
+    vocabulary = list(index.vocabulary)
+    queries = [" ".join(rng.choice(vocabulary, rng.integers(3, 9))) + " why do I feel this way" for _ in range(2000)]
+    allowed = index.mask(key for key in index.keys if key.startswith(("sun_", "moon_", "saturn_")))
+    for label, mask in (("unfiltered", None), ("filtered", allowed)):
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, top_k=10, allowed=mask)
+            timings.append(time.perf_counter() - start)
+        timings = np.array(timings) * 1000
+        print(f"top-10 {label}: mean {timings.mean():.3f} ms, p99 {np.percentile(timings, 99):.3f} ms")
+
+    # Check the sparse scores against a direct BM25 computation for one query
+    query = "impulsive anger and patience in relationships"
+    terms = set(tokenize(query))
+    kb_service = get_knowledge_base_service()
+    documents = []
+    for key in index.keys:
+        counts: Counter = Counter()
+        for field, text in _texts(kb_service.get_by_key(key)):
+            if FIELD_WEIGHTS.get(field, 1):
+                for term in tokenize(text):
+                    counts[term] += FIELD_WEIGHTS.get(field, 1)
+        documents.append(counts)
+    average = np.mean([sum(counts.values()) for counts in documents])
+    expected = []
+    for key, counts in zip(index.keys, documents):
+        score = 0.0
+        for term in terms:
+            frequency = sum(term in other for other in documents)
+            if counts[term]:
+                idf = np.log(1 + (len(documents) - frequency + 0.5) / (frequency + 0.5))
+                score += idf * counts[term] * (K1 + 1) / (counts[term] + K1 * (1 - B + B * sum(counts.values()) / average))
+        expected.append((key, score))
+    expected = sorted((pair for pair in expected if pair[1] > 0), key=lambda pair: (-pair[1], index.keys.index(pair[0])))[:10]
+    found = index.search(query, top_k=10)
+    same = [key for key, _ in found] == [key for key, _ in expected] and np.allclose([s for _, s in found], [s for _, s in expected], rtol=1e-4)
+    print(f"Top 10 equal to direct BM25: {same}")
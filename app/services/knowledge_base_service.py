@@ -4,11 +4,25 @@ Knowledge Base Service for Vedic Astrology Interpretations
 This service loads and queries the vedic_knowledge_base.json file,
 providing normalized access to astrological interpretations.
 All queries are normalized to lowercase for consistent access.
+
+When the compiled form built by scripts/build_knowledge_base.py is present
+and up to date, it is memory-mapped instead of parsing the JSON, and entries
+are decoded on first access (see compiled_knowledge_base).
+
+The typed queries (planet in house or sign, ascendant, nakshatra,
+conjunction) go through a KnowledgeBaseIndex built at load time: names are
+resolved to integer ids, including aliases such as "purva phalguni" vs
+"purva_phalguni", and each lookup is an array index rather than a formatted
+string key. lookup_many answers a batch of one category at once.
 """
 
 import json
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, List, Sequence, Tuple
+
+from app.services.compiled_knowledge_base import COMPILED_KNOWLEDGE_BASE_PATH, CompiledKnowledgeBase
+from app.services.knowledge_base_index import KnowledgeBaseIndex, Name
 
 # Path to knowledge base JSON file
 KNOWLEDGE_BASE_PATH = Path(__file__).parent.parent / "data" / "vedic_knowledge_base.json"
@@ -19,11 +33,18 @@ class KnowledgeBaseService:
     
     def __init__(self):
         """Initialize the service and load the knowledge base."""
-        self._knowledge_base: Optional[Dict[str, Any]] = None
+        self._knowledge_base: Optional[Mapping] = None
         self._load_knowledge_base()
+        self.index = KnowledgeBaseIndex(self._knowledge_base)
     
     def _load_knowledge_base(self) -> None:
-        """Load the knowledge base JSON file."""
+        """Map the compiled knowledge base, or load the JSON file if it is missing or stale."""
+        if COMPILED_KNOWLEDGE_BASE_PATH.exists():
+            if KNOWLEDGE_BASE_PATH.exists() and KNOWLEDGE_BASE_PATH.stat().st_mtime > COMPILED_KNOWLEDGE_BASE_PATH.stat().st_mtime:
+                print(f"Warning: {COMPILED_KNOWLEDGE_BASE_PATH.name} is older than the JSON, run scripts/build_knowledge_base.py")
+            else:
+                self._knowledge_base = CompiledKnowledgeBase(COMPILED_KNOWLEDGE_BASE_PATH)
+                return
         try:
             with open(KNOWLEDGE_BASE_PATH, 'r', encoding='utf-8') as f:
                 self._knowledge_base = json.load(f)
@@ -32,89 +53,91 @@ class KnowledgeBaseService:
         except json.JSONDecodeError as e:
             raise ValueError(f"Error parsing knowledge base JSON: {e}")
     
-    def get_planet_in_house(self, planet: str, house: int) -> Optional[Dict[str, Any]]:
+    def get_planet_in_house(self, planet: Name, house: int) -> Optional[Dict[str, Any]]:
         """
         Get interpretation for a planet in a specific house.
         
         Args:
-            planet: Planet name (e.g., 'sun', 'moon', 'mars')
+            planet: Planet name (e.g., 'sun', 'moon', 'mars') or id (1-9)
             house: House number (1-12)
         
         Returns:
             Interpretation dictionary or None if not found
         """
-        planet = planet.lower().strip()
-        key = f"{planet}_{house}_house"
-        return self._knowledge_base.get(key)
+        return self.index.lookup("planet_in_house", planet, house)
     
-    def get_planet_in_sign(self, planet: str, sign: str) -> Optional[Dict[str, Any]]:
+    def get_planet_in_sign(self, planet: Name, sign: Name) -> Optional[Dict[str, Any]]:
         """
         Get interpretation for a planet in a specific sign.
         
         Args:
-            planet: Planet name (e.g., 'sun', 'moon', 'mars')
-            sign: Zodiac sign (e.g., 'aries', 'taurus', 'gemini')
+            planet: Planet name (e.g., 'sun', 'moon', 'mars') or id (1-9)
+            sign: Zodiac sign (e.g., 'aries', 'taurus', 'gemini') or id (1-12)
         
         Returns:
             Interpretation dictionary or None if not found
         """
-        planet = planet.lower().strip()
-        sign = sign.lower().strip()
-        key = f"{planet}_{sign}"
-        return self._knowledge_base.get(key)
+        return self.index.lookup("planet_in_sign", planet, sign)
     
-    def get_ascendant_sign(self, sign: str) -> Optional[Dict[str, Any]]:
+    def get_ascendant_sign(self, sign: Name) -> Optional[Dict[str, Any]]:
         """
         Get interpretation for an ascendant sign.
         
         Args:
-            sign: Zodiac sign (e.g., 'aries', 'taurus', 'gemini')
+            sign: Zodiac sign (e.g., 'aries', 'taurus', 'gemini') or id (1-12)
         
         Returns:
             Interpretation dictionary or None if not found
         """
-        sign = sign.lower().strip()
-        key = f"ascendant_{sign}"
-        return self._knowledge_base.get(key)
+        return self.index.lookup("ascendant_sign", sign)
     
-    def get_nakshatra(self, nakshatra_name: str) -> Optional[Dict[str, Any]]:
+    def get_nakshatra(self, nakshatra_name: Name) -> Optional[Dict[str, Any]]:
         """
         Get interpretation for a nakshatra.
         
         Args:
-            nakshatra_name: Nakshatra name (e.g., 'ashwini', 'bharani', 'rohini')
+            nakshatra_name: Nakshatra name (e.g., 'ashwini', 'purva phalguni',
+                'purva_phalguni') or id (1-27)
         
         Returns:
             Interpretation dictionary or None if not found
         """
-        nakshatra_name = nakshatra_name.lower().strip()
-        # Handle spaces in nakshatra names (e.g., "purva phalguni" -> "purva_phalguni")
-        nakshatra_name = nakshatra_name.replace(" ", "_")
-        key = f"nakshatra_{nakshatra_name}"
-        return self._knowledge_base.get(key)
+        return self.index.lookup("nakshatra", nakshatra_name)
     
-    def get_conjunction(self, planet1: str, planet2: str) -> Optional[Dict[str, Any]]:
+    def get_conjunction(self, planet1: Name, planet2: Name) -> Optional[Dict[str, Any]]:
         """
         Get interpretation for a conjunction of two planets.
         
+        The pair is unordered: either order finds the entry, however it is stored.
+        
         Args:
-            planet1: First planet name (e.g., 'sun', 'moon')
-            planet2: Second planet name (e.g., 'mars', 'jupiter')
+            planet1: First planet name (e.g., 'sun', 'moon') or id (1-9)
+            planet2: Second planet name (e.g., 'mars', 'jupiter') or id (1-9)
         
         Returns:
             Interpretation dictionary or None if not found
         """
-        planet1 = planet1.lower().strip()
-        planet2 = planet2.lower().strip()
-        # Try both orders since conjunction might be stored as planet1_planet2 or planet2_planet1
-        key1 = f"conjunction_{planet1}_{planet2}"
-        key2 = f"conjunction_{planet2}_{planet1}"
+        return self.index.lookup("conjunction", planet1, planet2)
+    
+    def lookup_many(
+        self,
+        query_type: str,
+        firsts: Sequence[Name],
+        seconds: Optional[Sequence[Name]] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get interpretations for a batch of queries of one type.
         
-        result = self._knowledge_base.get(key1)
-        if result is None:
-            result = self._knowledge_base.get(key2)
+        Args:
+            query_type: "planet_in_house", "planet_in_sign", "ascendant_sign",
+                "nakshatra" or "conjunction"
+            firsts: Planets, or signs/nakshatras for the one-argument types
+            seconds: Houses, signs or second planets, one per first argument
         
-        return result
+        Returns:
+            One interpretation dictionary per query, None where not found
+        """
+        return self.index.lookup_many(query_type, firsts, seconds)
     
     def get_by_key(self, key: str) -> Optional[Dict[str, Any]]:
         """
@@ -128,6 +151,16 @@ class KnowledgeBaseService:
         """
         key = key.lower().strip()
         return self._knowledge_base.get(key)
+    
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Iterate over every knowledge base entry.
+        
+        Returns:
+            (key, interpretation dictionary) pairs; entries of the compiled
+            knowledge base are decoded as they are reached
+        """
+        return iter(self._knowledge_base.items())
 
 
 # Global instance
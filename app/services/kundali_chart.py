@@ -1,40 +1,40 @@
 import swisseph as swe
 from datetime import datetime, timedelta
 from app.models import BirthChart, KundaliChart, PlanetData
-from app.config import ZODIACS, PLANETS, NAKSHATRAS
-
-# Set the ayanamsa to Lahiri (sidereal)
-swe.set_sid_mode(swe.SIDM_LAHIRI)
+from app.config import ZODIACS, PLANETS
+from app.services.ephemeris import get_ephemeris_session
+from app.services.lunar_segments import nakshatra_from_longitude
+from app.services.ingress_index import IngressIndex, get_ingress_index
+from app.services.moon_table import moon_position
+from app.services.timezones import utc_offset_hours
 
 # Function to calculate Julian Day
-def julian_day(year, month, day, hour=0, minute=0, second=0, tz_offset=5.5):
-    swe.set_ephe_path('./eph')
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
+def julian_day(year, month, day, hour=0, minute=0, second=0, tz_offset=5.5, zone=None):
+    # A zone overrides tz_offset with the offset in force at that local time (cached transition table, O(log n))
+    if zone is not None:
+        tz_offset = utc_offset_hours(zone, year, month, day, hour, minute, second)
+    # julday is pure calendar arithmetic and does not touch the ephemeris files
     dt = datetime(year, month, day, hour, minute, second) - timedelta(hours=tz_offset)
     jd = swe.julday(dt.year, dt.month, dt.day, (dt.hour + dt.minute/60 + dt.second/3600), swe.GREG_CAL)
-    swe.close()
     return jd
 
 def calculate_ascendant(jd, latitude, longitude):
-    swe.set_ephe_path('./eph')
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
     flags = swe.FLG_SIDEREAL
-    cusps, ascmc = swe.houses_ex(jd, latitude, longitude, b'W', flags)  # A is for Placidus system, W is for Whole system
-    swe.close()
+    cusps, ascmc = get_ephemeris_session().houses_ex(jd, latitude, longitude, b'W', flags)  # A is for Placidus system, W is for Whole system
     return ascmc[0]
 
 def calculate_planetary_positions(jd):
-    swe.set_ephe_path('./eph')
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    session = get_ephemeris_session()
 
     # List of planets including Rahu and Ketu (mean node for Rahu)
     positions = {}
     retrograde_status = {}
-    flags = swe.FLG_SIDEREAL
+    # FLG_SPEED is required for calc_ut to fill in the daily motion used for retrograde detection
+    flags = swe.FLG_SIDEREAL | swe.FLG_SPEED
     for planet in PLANETS:
         if planet == 'rahu':
             # Calculate Rahu (mean node)
-            node_pos = swe.calc_ut(jd, swe.MEAN_NODE, flags)[0][0]
+            node_pos = session.calc_ut(jd, swe.MEAN_NODE, flags)[0][0]
             positions['rahu'] = node_pos
             # Rahu is always retrograde (moves backwards)
             retrograde_status['rahu'] = True
@@ -47,14 +47,12 @@ def calculate_planetary_positions(jd):
             pass
         else:
             planet_id = getattr(swe, planet.upper())
-            planet_result = swe.calc_ut(jd, planet_id, flags)
+            planet_result = session.calc_ut(jd, planet_id, flags)
             position = planet_result[0][0]
             speed = planet_result[0][3]  # Speed in longitude (degrees per day)
             positions[planet] = position
             # Planet is retrograde if speed is negative
             retrograde_status[planet] = speed < 0
-    
-    swe.close()
 
     return positions, retrograde_status
 
@@ -69,19 +67,39 @@ def determine_zodiac(pos):
 
 # Function to calculate Nakshatra
 def calculate_nakshatra(jd):
-    swe.set_ephe_path('./eph')
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
     flags = swe.FLG_SIDEREAL
 
-    moon_pos = swe.calc_ut(jd, swe.MOON, flags)[0][0]
-    # Nakshatra calculation
-    nakshatra_index = int(moon_pos / 13.33333)  # 360 degrees / 27 Nakshatras
-    nakshatra = NAKSHATRAS[(nakshatra_index % 27) + 1]["name"]
+    moon_pos = get_ephemeris_session().calc_ut(jd, swe.MOON, flags)[0][0]
+    return nakshatra_from_longitude(moon_pos)
+
+def sign_level_chart(jd, latitude, longitude, index: IngressIndex) -> KundaliChart:
+    # Signs and retrograde status come from the ingress index; only the ascendant
+    # (which changes sign every ~2 hours) still needs the ephemeris
+    ascendant = calculate_ascendant(jd, latitude, longitude)
+    asc_house = int(ascendant / 30) + 1
 
-    swe.close()
-    return nakshatra
+    planets_data = {}
+    for planet in PLANETS:
+        pl_sign = int(index.sign_at(planet, jd))
+        planets_data[planet] = PlanetData(
+            name=planet,
+            position=None,
+            house=(pl_sign - asc_house + 12) % 12 + 1,
+            zodiac=ZODIACS[pl_sign]["name"],
+            deviation=None,
+            retrograde=bool(index.retrograde_at(planet, jd))
+        )
+
+    return KundaliChart(
+        ascendant=ascendant,
+        ascendant_sign=determine_zodiac(ascendant),
+        nakshatra=moon_position(jd)["nakshatra"],
+        planets=planets_data,
+        moon_zodiac=planets_data['moon'].zodiac,
+        moon_deviate=None
+    )
 
-def planets_calculation(birth_chart: BirthChart) -> KundaliChart:
+def planets_calculation(birth_chart: BirthChart, sign_only: bool = False) -> KundaliChart:
     jd = julian_day(
         birth_chart.year,
         birth_chart.month,
@@ -92,10 +110,20 @@ def planets_calculation(birth_chart: BirthChart) -> KundaliChart:
         birth_chart.timezone
     )
 
-    positions, retrograde_status = calculate_planetary_positions(jd)
-    ascendant = calculate_ascendant(jd, birth_chart.latitude, birth_chart.longitude)
+    # Fast mode for sign-level charts: no planet longitudes, just signs and houses.
+    # Falls through to the exact calculation if the index has not been built.
+    if sign_only:
+        index = get_ingress_index()
+        if index is not None and index.covers(jd):
+            return sign_level_chart(jd, birth_chart.latitude, birth_chart.longitude, index)
+
+    # Hold the session for the whole chart so concurrent callers cannot interleave
+    with get_ephemeris_session():
+        positions, retrograde_status = calculate_planetary_positions(jd)
+        ascendant = calculate_ascendant(jd, birth_chart.latitude, birth_chart.longitude)
     ascendant_sign = determine_zodiac(ascendant)
-    nakshatra = calculate_nakshatra(jd)
+    # The Moon was already computed with the other planets
+    nakshatra = nakshatra_from_longitude(positions['moon'])
 
     planets_data = {}
 
@@ -140,7 +168,7 @@ if __name__ == "__main__":
 
     details = planets_calculation(birth_chart=birth_chart)
     print(details)
-    swe.close()
+    get_ephemeris_session().close()
     
 # def calculate_ascendant(jd, latitude, longitude):
 #     swe.set_sidm
@@ -0,0 +1,78 @@
+"""
+Lunar Segments
+
+Divides the sidereal zodiac into the 108 nakshatra padas (3°20' each). The two
+padas that straddle 15° of Sagittarius and of Capricorn are split in half,
+because the Vashya of a Moon in those signs changes at 15°. That gives 110
+segments, and everything the Ashtakoota profile depends on (rashi, nakshatra,
+pada, Vashya half) is constant inside each one.
+
+All arrays are indexed by segment id (0-109) and ordered by longitude.
+"""
+
+import numpy as np
+from app.config import ZODIACS, NAKSHATRAS
+
+NAKSHATRA_SPAN = 360.0 / 27
+PADA_SPAN = NAKSHATRA_SPAN / 4
+
+# Moon longitudes where the Vashya changes inside a sign (15° Sagittarius, 15° Capricorn)
+VASHYA_SPLITS = (255.0, 285.0)
+
+SEGMENT_START = np.sort(np.concatenate([np.arange(108) * PADA_SPAN, VASHYA_SPLITS]))
+SEGMENT_END = np.append(SEGMENT_START[1:], 360.0)
+NUM_SEGMENTS = SEGMENT_START.shape[0]
+
+_SEGMENT_MID = (SEGMENT_START + SEGMENT_END) / 2
+
+# 1-based ids into ZODIACS / NAKSHATRAS, pada 1-4
+SEGMENT_SIGN = (_SEGMENT_MID // 30).astype(np.int8) + 1
+SEGMENT_NAKSHATRA = (_SEGMENT_MID // NAKSHATRA_SPAN).astype(np.int8) + 1
+SEGMENT_PADA = (_SEGMENT_MID // PADA_SPAN).astype(np.int8) % 4 + 1
+# Representative degrees within the sign; decides the Vashya half correctly
+SEGMENT_DEVIATION = _SEGMENT_MID % 30
+
+
+def segment_of_longitude(longitude):
+    """
+    Get the segment id of a sidereal Moon longitude.
+
+    Args:
+        longitude: Longitude in degrees (scalar or array)
+
+    Returns:
+        Segment id (0 to NUM_SEGMENTS - 1), same shape as the input
+    """
+    longitude = np.asarray(longitude, dtype=np.float64) % 360
+    return np.searchsorted(SEGMENT_START, longitude, side="right") - 1
+
+
+def nakshatra_from_longitude(longitude: float) -> str:
+    """
+    Get the nakshatra name for a sidereal Moon longitude.
+
+    Args:
+        longitude: Longitude in degrees
+
+    Returns:
+        Nakshatra name (e.g. 'Ashwini')
+    """
+    return NAKSHATRAS[int((longitude % 360) // NAKSHATRA_SPAN) + 1]["name"]
+
+
+def describe_segment(segment: int) -> dict:
+    """
+    Get the rashi, nakshatra, pada and representative deviation of a segment.
+
+    Args:
+        segment: Segment id
+
+    Returns:
+        Dictionary with keys zodiac, nakshatra, pada, deviation
+    """
+    return {
+        "zodiac": ZODIACS[int(SEGMENT_SIGN[segment])]["name"],
+        "nakshatra": NAKSHATRAS[int(SEGMENT_NAKSHATRA[segment])]["name"],
+        "pada": int(SEGMENT_PADA[segment]),
+        "deviation": float(SEGMENT_DEVIATION[segment]),
+    }
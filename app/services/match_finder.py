@@ -1,6 +1,11 @@
+from typing import Dict, Optional, Union
+
+import numpy as np
+from app.config import MATCH_SCORE_THRESHOLD
 from app.models import AshtakootaProfile
-from app.services.ashtakoota_services.generate_profile import generate_ashtakoota_profile
-from app.services.ashtakoota_services.calculate_score import calculate_ashtakoota
+from app.services.ashtakoota_services.compact_profile import CompactProfile, from_model
+from app.services.ashtakoota_services.score_tensor import SCORE_TENSOR, SEGMENT_PROFILE_CODE, TOTAL
+from app.services.lunar_segments import NUM_SEGMENTS, SEGMENT_END, SEGMENT_START, describe_segment
 
 rashi_nakshatra_combinations = [
     ("Aries", "Ashwini", ["Chu", "Che", "Cho", "La"]),
@@ -41,26 +46,94 @@ rashi_nakshatra_combinations = [
     ("Pisces", "Revati", ["De", "Do", "Cha", "Chi"])
 ]
 
-def find_perfect_match(ashtakoota_profile: AshtakootaProfile, type: str):
-    
-    matches = []
-
-    for rashi, nakshatra, letters in rashi_nakshatra_combinations:
-        score = 0
-        spouse_ashtakoota_profile = generate_ashtakoota_profile(rashi, 15, nakshatra)   # deviation is taken as 15
-        if(type=="groom"):
-            score = calculate_ashtakoota(groom_profile=ashtakoota_profile,
-                                bride_profile=spouse_ashtakoota_profile).total
-        else:
-            score = calculate_ashtakoota(groom_profile=spouse_ashtakoota_profile,
-                                bride_profile=ashtakoota_profile).total
-        
-        if score > 22:
-            matches.append({
-                "rashi": rashi,
-                "nakshatra": nakshatra,
-                "letters": letters,
-                "score": score
-            })
-
-    return sorted(matches, key=lambda x: x['score'], reverse=True)
+def _segment_rows():
+    """Spouse row of every lunar segment: the 108 padas, with the two padas at
+    15° of Sagittarius and Capricorn split where the Vashya changes."""
+    letters = {(rashi, nakshatra): letters for rashi, nakshatra, letters in rashi_nakshatra_combinations}
+    rows = []
+    for segment in range(NUM_SEGMENTS):
+        details = describe_segment(segment)
+        nakshatra_letters = letters[(details["zodiac"], details["nakshatra"])]
+        start = float(SEGMENT_START[segment] % 30)
+        rows.append({
+            "rashi": details["zodiac"],
+            "nakshatra": details["nakshatra"],
+            "pada": details["pada"],
+            "letter": nakshatra_letters[details["pada"] - 1],
+            "letters": nakshatra_letters,
+            "start_degree": round(start, 4),
+            "end_degree": round(start + float(SEGMENT_END[segment] - SEGMENT_START[segment]), 4),
+        })
+    return rows
+
+
+SEGMENT_ROWS = _segment_rows()
+
+
+def _ranking_table(totals: np.ndarray):
+    """Per person code: partner segments best first (score, then longitude) and their totals in points."""
+    segment_totals = totals[:, SEGMENT_PROFILE_CODE]
+    order = np.argsort(-segment_totals, axis=1, kind="stable")
+    return order, np.take_along_axis(segment_totals, order, axis=1) / 2
+
+
+# _RANKING[type][code] = (segments, scores): every spouse segment ranked for a
+# person of that type ("groom" ranks brides) with that profile code
+_RANKING = {
+    "groom": _ranking_table(SCORE_TENSOR[:, :, TOTAL]),
+    "bride": _ranking_table(SCORE_TENSOR[:, :, TOTAL].T),
+}
+
+
+def find_perfect_match(
+    ashtakoota_profile: Union[AshtakootaProfile, CompactProfile],
+    type: str,
+    threshold: float = MATCH_SCORE_THRESHOLD,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> Dict:
+    """
+    Rank the spouse padas compatible with a person, from the precomputed table.
+
+    Args:
+        ashtakoota_profile: The person's profile
+        type: "groom" or "bride" (the person's side)
+        threshold: Spouse padas must score strictly above this total
+        limit: Maximum rows returned (all if None)
+        offset: Number of best rows to skip (pagination)
+
+    Returns:
+        Dictionary with total (number of compatible padas) and result, rows of
+        rashi, nakshatra, pada, name letter(s), degree range within the rashi
+        and score, best first
+    """
+    if type not in _RANKING:
+        raise ValueError(f"Unknown type: {type}, expected 'groom' or 'bride'")
+    if isinstance(ashtakoota_profile, AshtakootaProfile):
+        ashtakoota_profile = from_model(ashtakoota_profile)
+    segments, scores = _RANKING[type][0][ashtakoota_profile.code], _RANKING[type][1][ashtakoota_profile.code]
+    # Scores are sorted descending, so the compatible rows are a prefix
+    total = int(np.searchsorted(-scores, -threshold, side="left"))
+    end = total if limit is None else min(total, offset + limit)
+    result = [dict(SEGMENT_ROWS[segment], score=score) for segment, score in zip(segments[offset:end].tolist(), scores[offset:end].tolist())]
+    return {"total": total, "result": result}
+
+
+if __name__ == "__main__":
+    from app.services.ashtakoota_services.calculate_score import calculate_ashtakoota
+    from app.services.ashtakoota_services.compact_profile import SEGMENT_PROFILES
+
+    # Check the table against scoring every spouse segment with calculate_ashtakoota
+    mismatches = 0
+    for person in SEGMENT_PROFILES:
+        for type in ("groom", "bride"):
+            expected = []
+            for spouse in SEGMENT_PROFILES:
+                groom, bride = (person, spouse) if type == "groom" else (spouse, person)
+                score = calculate_ashtakoota(groom.to_model(), bride.to_model()).total
+                if score > MATCH_SCORE_THRESHOLD:
+                    expected.append((-score, spouse.segment))
+            expected = [dict(SEGMENT_ROWS[segment], score=-score) for score, segment in sorted(expected)]
+            mismatches += find_perfect_match(person, type)["result"] != expected
+    print(f"Rankings differing from calculate_ashtakoota: {mismatches} of {2 * NUM_SEGMENTS}")
+    print(find_perfect_match(SEGMENT_PROFILES[82], "groom", limit=3))
@@ -0,0 +1,196 @@
+"""
+Materialized Match Lists
+
+Keeps every candidate's top-k compatible partners up to date as members join,
+change their birth details or leave, without rerunning matching for the pool.
+
+A member's top-k list depends only on their side and profile code, because
+ranking is by Ashtakoota total (from score_tensor) and then partner id. So
+one list is kept per (side, profile code), at most 2 x 42 lists, and every
+member with that code reads the same list. When a member of one side changes,
+only the lists of the other side whose score row includes the member's
+bucket above the threshold can change:
+
+    insert:  the member is placed into each affected list if it ranks in its
+             top k (a bisect into at most k entries)
+    delete:  each affected list that contained the member is refilled from
+             the candidate pool, which only reads the qualifying buckets
+    edit:    a delete of the old profile plus an insert of the new one
+
+Every update therefore touches at most 42 lists of k entries, whatever the
+size of the pool.
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from app.config import MATCH_SCORE_THRESHOLD
+from app.services.ashtakoota_services.score_tensor import NUM_PROFILES, SCORE_TENSOR, TOTAL
+from app.services.candidate_pool import SIDES, CandidatePool, Profile, get_candidate_pool
+
+DEFAULT_TOP_K = 10
+
+# _TOTALS[side][person_code, partner_code]: total in half-points, oriented for ranking side's partners
+_TOTALS = {
+    "groom": SCORE_TENSOR[:, :, TOTAL],
+    "bride": SCORE_TENSOR[:, :, TOTAL].T,
+}
+
+# A list entry: (-score in half-points, partner id), so ascending order is best first
+Entry = Tuple[int, int]
+
+
+class MatchLists:
+    """Top-k partner lists for every member of a CandidatePool, maintained on updates."""
+
+    def __init__(self, pool: CandidatePool, k: int = DEFAULT_TOP_K, threshold: float = MATCH_SCORE_THRESHOLD):
+        """
+        Build the lists from the pool's current members.
+
+        Args:
+            pool: Candidate pool; change it only through this object from now on
+            k: Partners kept per member
+            threshold: Partners must score strictly above this total
+        """
+        self.pool = pool
+        self.k = k
+        self.threshold = threshold
+        self._threshold_half_points = int(np.floor(threshold * 2))
+        self._lock = threading.RLock()
+        # _affected[side][partner_code]: codes of side whose lists can include a partner with partner_code
+        self._affected = {
+            side: [np.flatnonzero(_TOTALS[side][:, code] > self._threshold_half_points).tolist() for code in range(NUM_PROFILES)]
+            for side in SIDES
+        }
+        self._lists: Dict[str, List[List[Entry]]] = {
+            side: [self._ranked(side, code) for code in range(NUM_PROFILES)] for side in SIDES
+        }
+
+    def _ranked(self, side: str, code: int) -> List[Entry]:
+        """Rank a list from scratch with a pool search."""
+        matches = self.pool.search_code(code, side, self.threshold, self.k)["matches"]
+        return [(-int(match["score"] * 2), match["candidate_id"]) for match in matches]
+
+    def _inserted(self, side: str, code: int, candidate_id: int) -> None:
+        """Place a new member of side into the affected lists of the other side."""
+        partner_side = SIDES[1 - SIDES.index(side)]
+        for partner_code in self._affected[partner_side][code]:
+            entries = self._lists[partner_side][partner_code]
+            entry = (-int(_TOTALS[partner_side][partner_code, code]), candidate_id)
+            if len(entries) < self.k or entry < entries[-1]:
+                position = bisect.bisect_left(entries, entry)
+                if position == len(entries) or entries[position] != entry:
+                    entries.insert(position, entry)
+                    del entries[self.k:]
+
+    def _removed(self, side: str, code: int, candidate_id: int) -> None:
+        """Refill the lists of the other side that contained a removed member."""
+        partner_side = SIDES[1 - SIDES.index(side)]
+        for partner_code in self._affected[partner_side][code]:
+            entries = self._lists[partner_side][partner_code]
+            entry = (-int(_TOTALS[partner_side][partner_code, code]), candidate_id)
+            position = bisect.bisect_left(entries, entry)
+            if position < len(entries) and entries[position] == entry:
+                self._lists[partner_side][partner_code] = self._ranked(partner_side, partner_code)
+
+    def add(self, side: str, profile: Profile, candidate_id: Optional[int] = None) -> int:
+        """
+        Add a member, or edit the member with the same id, and update the affected lists.
+
+        Args:
+            side: "groom" or "bride"
+            profile: Member's profile
+            candidate_id: Id of the member; next free id if None
+
+        Returns:
+            The member's id
+        """
+        with self._lock:
+            previous = self.pool.get(candidate_id) if candidate_id is not None else None
+            candidate_id = self.pool.add(side, profile, candidate_id)
+            if previous is not None:
+                self._removed(previous[0], previous[1].code, candidate_id)
+            _, stored = self.pool.get(candidate_id)
+            self._inserted(side, stored.code, candidate_id)
+        return candidate_id
+
+    def remove(self, candidate_id: int) -> bool:
+        """
+        Remove a member and update the affected lists.
+
+        Args:
+            candidate_id: Member's id
+
+        Returns:
+            True if the member was in the pool
+        """
+        with self._lock:
+            previous = self.pool.get(candidate_id)
+            if previous is None:
+                return False
+            self.pool.remove(candidate_id)
+            self._removed(previous[0], previous[1].code, candidate_id)
+        return True
+
+    def matches(self, candidate_id: int) -> Optional[List[Dict]]:
+        """
+        Get a member's top-k partners.
+
+        Args:
+            candidate_id: Member's id
+
+        Returns:
+            List of {"candidate_id", "score"} ordered by score, then candidate id,
+            or None if the member is not in the pool
+        """
+        stored = self.pool.get(candidate_id)
+        if stored is None:
+            return None
+        side, profile = stored
+        with self._lock:
+            entries = list(self._lists[side][profile.code])
+        return [{"candidate_id": partner_id, "score": -score / 2} for score, partner_id in entries]
+
+    def check(self) -> int:
+        """Number of lists that differ from a full re-ranking (0 when consistent)."""
+        with self._lock:
+            return sum(
+                self._lists[side][code] != self._ranked(side, code)
+                for side in SIDES for code in range(NUM_PROFILES)
+            )
+
+
+# Global instance (False once a load has been attempted and failed)
+_match_lists = None
+
+
+def get_match_lists() -> Optional[MatchLists]:
+    """Get the match lists of the global candidate pool, or None if the pool is unavailable."""
+    global _match_lists
+    if _match_lists is None:
+        pool = get_candidate_pool()
+        _match_lists = MatchLists(pool) if pool is not None else False
+    return _match_lists or None
+
+
+if __name__ == "__main__":
+    import time
+
+    from app.services.ashtakoota_services.compact_profile import segment_profile
+    from app.services.lunar_segments import NUM_SEGMENTS
+
+    # Correctness (consistency after random updates, parity with calculate_ashtakoota) is tested in tests/test_match_lists.py
+    rng = np.random.default_rng(0)
+    pool = CandidatePool(db_path=None)
+    for side in SIDES:
+        pool.add_many(side, rng.integers(0, NUM_SEGMENTS, 100000))
+    lists = MatchLists(pool, k=10)
+    number = 2000
+    start = time.perf_counter()
+    for _ in range(number):
+        candidate_id = lists.add(SIDES[rng.integers(0, 2)], segment_profile(int(rng.integers(0, NUM_SEGMENTS))))
+        lists.remove(candidate_id)
+    print(f"{len(pool)} members: add + remove {1e6 * (time.perf_counter() - start) / number:.1f} us")
+    print("Member 1:", lists.matches(1))
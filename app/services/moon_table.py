@@ -0,0 +1,202 @@
+"""
+Moon Transition Table
+
+A precomputed table of the instants at which the Moon enters each lunar
+segment (pada, split at the Sagittarius/Capricorn Vashya boundaries) over the
+supported 1800-2399 range. Because the Moon never goes retrograde, the segment
+at any instant is found by a binary search over the ingress times, so Moon
+sign, nakshatra and pada can be resolved without calling the ephemeris.
+
+The table is generated once with scripts/build_moon_table.py and
+memory-mapped at runtime. If it has not been built, lookups fall back to a
+single Moon calculation via the ephemeris session.
+"""
+
+import json
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+from app.services.ephemeris import get_ephemeris_session
+from app.services.lunar_segments import (
+    NUM_SEGMENTS,
+    SEGMENT_END,
+    describe_segment,
+    segment_of_longitude,
+)
+
+# Directory holding the generated table
+MOON_TABLE_DIR = Path(__file__).parent.parent / "data" / "moon_table"
+
+# Supported range of the bundled ephemeris (sepl_18.se1)
+RANGE_START_JD = 2378496.5  # 1800-01-01 00:00 UT
+RANGE_END_JD = 2597641.5    # 2400-01-01 00:00 UT
+
+# Newton iteration stops when the correction is below ~1 ms
+_CONVERGENCE_DAYS = 1e-8
+_MAX_ITERATIONS = 20
+
+
+def _moon_longitude_speed(jd: float) -> Tuple[float, float]:
+    result = swe.calc_ut(jd, swe.MOON, swe.FLG_SIDEREAL | swe.FLG_SPEED)[0]
+    return result[0], result[3]
+
+
+def _crossing_time(jd: float, longitude: float, speed: float, boundary: float) -> float:
+    """Newton-iterate from (jd, longitude, speed) to the instant the Moon reaches boundary."""
+    for _ in range(_MAX_ITERATIONS):
+        delta = (boundary - longitude + 180) % 360 - 180
+        step = delta / speed
+        jd += step
+        if abs(step) < _CONVERGENCE_DAYS:
+            break
+        longitude, speed = _moon_longitude_speed(jd)
+    return jd
+
+
+def build_moon_table(start_jd: float = RANGE_START_JD, end_jd: float = RANGE_END_JD) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute Moon segment ingress times by root-finding against the ephemeris.
+
+    Args:
+        start_jd: First instant covered (UT Julian day)
+        end_jd: Last instant covered (UT Julian day)
+
+    Returns:
+        (times, segments): times[i] is the Julian day the Moon entered segments[i];
+        times[0] is start_jd itself
+    """
+    times = []
+    segments = []
+    with get_ephemeris_session():
+        longitude, speed = _moon_longitude_speed(start_jd)
+        segment = int(segment_of_longitude(longitude))
+        times.append(start_jd)
+        segments.append(segment)
+
+        jd = start_jd
+        while True:
+            jd = _crossing_time(jd, longitude, speed, SEGMENT_END[segment] % 360)
+            if jd > end_jd:
+                break
+            segment = (segment + 1) % NUM_SEGMENTS
+            times.append(jd)
+            segments.append(segment)
+            longitude, speed = _moon_longitude_speed(jd)
+
+    return np.array(times, dtype=np.float64), np.array(segments, dtype=np.uint8)
+
+
+def save_moon_table(times: np.ndarray, segments: np.ndarray, end_jd: float, directory: Path = MOON_TABLE_DIR) -> None:
+    """Write a table produced by build_moon_table to disk."""
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / "times.npy", times)
+    np.save(directory / "segments.npy", segments)
+    with open(directory / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({"start_jd": float(times[0]), "end_jd": float(end_jd), "entries": int(times.shape[0])}, f, indent=2)
+
+
+class MoonTable:
+    """Memory-mapped Moon segment ingress table."""
+
+    def __init__(self, directory: Path = MOON_TABLE_DIR):
+        """
+        Load the table.
+
+        Args:
+            directory: Directory written by save_moon_table
+        """
+        try:
+            with open(directory / "meta.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self.times = np.load(directory / "times.npy", mmap_mode="r")
+            self.segments = np.load(directory / "segments.npy", mmap_mode="r")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Moon table not found at {directory}, run scripts/build_moon_table.py")
+        self.start_jd = meta["start_jd"]
+        self.end_jd = meta["end_jd"]
+
+    def covers(self, jd: float) -> bool:
+        """Whether jd falls inside the table's range."""
+        return self.start_jd <= jd <= self.end_jd
+
+    def segment_at(self, jds):
+        """
+        Get the Moon's segment at one or many instants.
+
+        Args:
+            jds: UT Julian day(s) inside the table's range
+
+        Returns:
+            Segment id(s), same shape as the input
+        """
+        index = np.searchsorted(self.times, jds, side="right") - 1
+        return self.segments[index]
+
+
+# Global instance (False once a load has been attempted and failed)
+_moon_table = None
+
+
+def get_moon_table() -> Optional[MoonTable]:
+    """Get the global Moon table, or None if it has not been built."""
+    global _moon_table
+    if _moon_table is None:
+        try:
+            _moon_table = MoonTable()
+        except FileNotFoundError:
+            _moon_table = False
+    return _moon_table or None
+
+
+def moon_segment(jd: float) -> int:
+    """
+    Get the Moon's segment at an instant, from the table when possible.
+
+    Args:
+        jd: UT Julian day
+
+    Returns:
+        Segment id
+    """
+    table = get_moon_table()
+    if table is not None and table.covers(jd):
+        return int(table.segment_at(jd))
+    longitude = get_ephemeris_session().calc_ut(jd, swe.MOON, swe.FLG_SIDEREAL)[0][0]
+    return int(segment_of_longitude(longitude))
+
+
+def moon_segments(jds) -> np.ndarray:
+    """
+    Get the Moon's segment at many instants, from the table when possible.
+
+    Args:
+        jds: UT Julian days
+
+    Returns:
+        Int8 array of segment ids, same shape as the input
+    """
+    jds = np.asarray(jds, dtype=np.float64)
+    segments = np.empty(jds.shape, dtype=np.int8)
+    table = get_moon_table()
+    inside = (jds >= table.start_jd) & (jds <= table.end_jd) if table is not None else np.zeros(jds.shape, dtype=bool)
+    if inside.any():
+        segments[inside] = table.segment_at(jds[inside])
+    for index in zip(*np.nonzero(~inside)):
+        segments[index] = moon_segment(float(jds[index]))
+    return segments
+
+
+def moon_position(jd: float) -> dict:
+    """
+    Resolve Moon sign, nakshatra and pada at an instant without a full chart.
+
+    Args:
+        jd: UT Julian day
+
+    Returns:
+        Dictionary with keys zodiac, nakshatra, pada and deviation. deviation is
+        the middle of the segment, which is exact enough for the Vashya split.
+    """
+    return describe_segment(moon_segment(jd))
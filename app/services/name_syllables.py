@@ -0,0 +1,240 @@
+"""
+Name Syllable Index
+
+Reverse of rashi_nakshatra_combinations (see match_finder): resolves a
+person's name to the rashi/nakshatra/pada classes whose starting syllable it
+begins with, so long candidate name lists can be screened against a profile
+without birth details.
+
+    trie:     every pada's syllable (Chu, Che, ... Chi), lowercased, in a
+              character trie; a name resolves to the longest syllable it
+              starts with ("Chetan" is Che, not Cha or C); a name opening
+              with a consonant cluster no syllable spells falls back to part
+              of the cluster plus the vowel after it ("Krishna" is Ki,
+              "Shyam" is Sha)
+    classes:  one syllable can start several padas ("Na" is Ardra 3, Hasta 3
+              and Anuradha 1), so each syllable maps to every lunar segment
+              it names and therefore to a set of profile codes
+    scoring:  for a person's profile code, the best and worst total over each
+              syllable's codes is a small per-syllable table; a batch of names
+              is then one array lookup by syllable id
+
+Names are expected in Latin script; accents are stripped and anything other
+than a-z is ignored.
+"""
+
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+from app.models import AshtakootaProfile
+from app.services.ashtakoota_services.compact_profile import CompactProfile, from_model
+from app.services.ashtakoota_services.score_tensor import NUM_PROFILES, SCORE_TENSOR, SEGMENT_PROFILE_CODE, TOTAL
+from app.services.match_finder import SEGMENT_ROWS
+
+# Key of a trie node's payload (never a name character)
+_SYLLABLE = ""
+
+_VOWELS = "aeiou"
+
+# _TOTALS[type][person_code, partner_code]: total in half-points, oriented for the person's side
+_TOTALS = {
+    "groom": SCORE_TENSOR[:, :, TOTAL],
+    "bride": SCORE_TENSOR[:, :, TOTAL].T,
+}
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase a-z form of a name: accents stripped, other characters dropped."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    return "".join(char for char in decomposed.lower() if "a" <= char <= "z")
+
+
+class NameSyllableIndex:
+    """Longest-prefix index from names to their rashi/nakshatra/pada classes."""
+
+    def __init__(self, segment_rows: List[Dict] = SEGMENT_ROWS):
+        """
+        Build the trie from the spouse row of every lunar segment.
+
+        Args:
+            segment_rows: Rows with rashi, nakshatra, pada and letter, one per segment
+        """
+        self.syllables: List[str] = []
+        self._segments: List[List[int]] = []
+        self._root: Dict = {}
+        ids: Dict[str, int] = {}
+        for segment, row in enumerate(segment_rows):
+            syllable = normalize_name(row["letter"])
+            if syllable not in ids:
+                ids[syllable] = len(self.syllables)
+                self.syllables.append(syllable)
+                self._segments.append([])
+                node = self._root
+                for char in syllable:
+                    node = node.setdefault(char, {})
+                node[_SYLLABLE] = ids[syllable]
+            self._segments[ids[syllable]].append(segment)
+        self._rows = segment_rows
+
+        # _members[syllable, code]: whether the syllable names a segment with that profile code
+        self._members = np.zeros((len(self.syllables), NUM_PROFILES), dtype=bool)
+        for syllable_id, segments in enumerate(self._segments):
+            self._members[syllable_id, SEGMENT_PROFILE_CODE[segments]] = True
+
+    def _longest(self, name: str) -> int:
+        """Longest syllable a normalized name starts with, -1 if none."""
+        node, found = self._root, -1
+        for char in name:
+            node = node.get(char)
+            if node is None:
+                break
+            found = node.get(_SYLLABLE, found)
+        return found
+
+    def _cluster_syllable(self, name: str) -> int:
+        """Syllable of a normalized name whose leading consonant cluster no syllable spells."""
+        end = next((position for position, char in enumerate(name) if char in _VOWELS), len(name))
+        # Shorter parts of the cluster followed by the vowel: "Shreya" tries Sh-eya, then S-eya
+        for length in range(end - 1, 0, -1):
+            found = self._longest(name[:length] + name[end:])
+            if found >= 0:
+                return found
+        # Otherwise the first syllable starting with the longest part of the cluster any syllable starts with
+        node, found = self._root, -1
+        for char in name[:end]:
+            node = node.get(char)
+            if node is None:
+                break
+            pending = [node]
+            found = len(self.syllables)
+            while pending:
+                below = pending.pop()
+                found = min(found, below.get(_SYLLABLE, found))
+                pending.extend(child for key, child in below.items() if key != _SYLLABLE)
+        return found
+
+    def syllable_id(self, name: str) -> int:
+        """
+        Find the longest syllable a name starts with.
+
+        Names opening with a consonant cluster that no syllable spells (Krishna,
+        Priya, Shreya) resolve to part of the cluster plus the vowel after it
+        (Ki, Pi, Se), or failing that to a syllable starting with the longest
+        part of the cluster that any syllable starts with.
+
+        Args:
+            name: Person's name
+
+        Returns:
+            Index into syllables, or -1 if no syllable matches
+        """
+        name = normalize_name(name)
+        found = self._longest(name)
+        if found < 0 and name and name[0] not in _VOWELS:
+            found = self._cluster_syllable(name)
+        return found
+
+    def syllable_ids(self, names: Iterable[str]) -> np.ndarray:
+        """
+        Find the longest matching syllable of every name.
+
+        Args:
+            names: Person names
+
+        Returns:
+            Int16 array of indices into syllables, -1 where no syllable matches
+        """
+        return np.fromiter((self.syllable_id(name) for name in names), dtype=np.int16)
+
+    def classes(self, name: str) -> List[Dict]:
+        """
+        Resolve a name to its possible classes.
+
+        Args:
+            name: Person's name
+
+        Returns:
+            Rashi, nakshatra and pada of every pada starting with the name's
+            syllable (empty if none matches)
+        """
+        syllable_id = self.syllable_id(name)
+        if syllable_id < 0:
+            return []
+        classes = []
+        for segment in self._segments[syllable_id]:
+            row = self._rows[segment]
+            entry = {"rashi": row["rashi"], "nakshatra": row["nakshatra"], "pada": row["pada"]}
+            # The two padas split at a Vashya boundary are one class
+            if entry not in classes:
+                classes.append(entry)
+        return classes
+
+    def score_names(
+        self,
+        names: Iterable[str],
+        ashtakoota_profile: Union[AshtakootaProfile, CompactProfile],
+        type: str,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score a batch of names against a person.
+
+        Args:
+            names: Candidate names (the other side)
+            ashtakoota_profile: The person's profile
+            type: "groom" or "bride" (the person's side)
+
+        Returns:
+            Dictionary of arrays, one entry per name: syllable (index into
+            syllables, -1 if unmatched), min_score and max_score (worst and
+            best Ashtakoota total over the name's classes, NaN if unmatched)
+        """
+        if type not in _TOTALS:
+            raise ValueError(f"Unknown type: {type}, expected 'groom' or 'bride'")
+        if isinstance(ashtakoota_profile, AshtakootaProfile):
+            ashtakoota_profile = from_model(ashtakoota_profile)
+        totals = _TOTALS[type][ashtakoota_profile.code].astype(np.float64) / 2
+
+        # Per syllable, then per name by lookup; the extra last row is for unmatched names
+        min_scores = np.append(np.where(self._members, totals, np.inf).min(axis=1), np.nan)
+        max_scores = np.append(np.where(self._members, totals, -np.inf).max(axis=1), np.nan)
+        syllables = self.syllable_ids(names)
+        return {
+            "syllable": syllables,
+            "min_score": min_scores[syllables],
+            "max_score": max_scores[syllables],
+        }
+
+
+# Global instance
+_name_syllable_index: Optional[NameSyllableIndex] = None
+
+
+def get_name_syllable_index() -> NameSyllableIndex:
+    """Get the global name syllable index, building it on first use."""
+    global _name_syllable_index
+    if _name_syllable_index is None:
+        _name_syllable_index = NameSyllableIndex()
+    return _name_syllable_index
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from app.services.ashtakoota_services.compact_profile import SEGMENT_PROFILES
+
+    # Correctness (longest-prefix matching, consonant clusters, scoring) is tested in tests/test_name_syllables.py
+    index = get_name_syllable_index()
+    for name in ("Chetan", "Lakshmi", "Nandini", "Ānand", "Krishna", "Xavier"):
+        print(f"{name}: {index.syllables[index.syllable_id(name)] if index.syllable_id(name) >= 0 else None}", index.classes(name))
+
+    rng = random.Random(0)
+    letters = "abcdeghijklmnoprstuvy"
+    names = [index.syllables[rng.randrange(len(index.syllables))] + "".join(rng.choices(letters, k=rng.randint(0, 6)))
+             for _ in range(1000000)]
+    start = time.perf_counter()
+    result = index.score_names(names, SEGMENT_PROFILES[82], "groom")
+    elapsed = time.perf_counter() - start
+    print(f"{len(names):,} names scored in {elapsed:.2f}s ({len(names) / elapsed * 60:,.0f} names/minute), "
+          f"{np.count_nonzero(result['max_score'] > 22)} with a compatible class")
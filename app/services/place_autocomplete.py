@@ -0,0 +1,193 @@
+"""
+Place Autocomplete
+
+Suggests gazetteer places for a partially typed, possibly misspelled birth
+place. Two indexes over the gazetteer's normalized names answer each query:
+
+    prefix:   binary search for the range of names starting with the input
+    trigram:  names sharing enough character trigrams with the input
+              (Jaccard similarity), which tolerates typos anywhere in the name
+
+Prefix matches come first, ranked by population; typo-tolerant matches fill
+the remaining slots, ranked by similarity with a small population bonus.
+Each suggestion carries the place's place_id, which the API accepts instead
+of free text so the chart pipeline never has to geocode a typed name.
+
+The trigram index is built in memory from the gazetteer in a few vectorized
+passes (well under a second for 100k places).
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+from app.services.gazetteer import PRIMARY_NAME, Gazetteer, get_gazetteer, normalize_place_name
+
+# Normalized names only contain space, a-z and 0-9
+_ALPHABET = b" abcdefghijklmnopqrstuvwxyz0123456789"
+_RADIX = len(_ALPHABET)
+_CHAR_CODES = np.zeros(256, dtype=np.int32)
+_CHAR_CODES[np.frombuffer(_ALPHABET, dtype=np.uint8)] = np.arange(_RADIX)
+
+# Minimum trigram Jaccard similarity for a typo-tolerant match
+MIN_SIMILARITY = 0.3
+
+# Typo-tolerant matches rank by similarity + POPULATION_WEIGHT * log10(population),
+# so "londn" suggests London before the slightly closer Londa
+POPULATION_WEIGHT = 0.03
+
+DEFAULT_LIMIT = 10
+
+
+def _trigram_codes(padded: np.ndarray) -> np.ndarray:
+    """Integer trigram codes of each row of a (rows, width) array of character codes."""
+    return (padded[:, :-2] * _RADIX + padded[:, 1:-1]) * _RADIX + padded[:, 2:]
+
+
+def _query_trigrams(query: str) -> np.ndarray:
+    """Distinct trigram codes of one normalized query, padded like the index keys."""
+    codes = _CHAR_CODES[np.frombuffer(f"  {query} ".encode("ascii"), dtype=np.uint8)]
+    return np.unique(_trigram_codes(codes[None, :])[0])
+
+
+class PlaceAutocomplete:
+    """Prefix and trigram suggestion index over a Gazetteer."""
+
+    def __init__(self, gazetteer: Gazetteer):
+        """
+        Build the trigram index.
+
+        Args:
+            gazetteer: Loaded gazetteer whose keys are indexed
+        """
+        self.gazetteer = gazetteer
+        self._keys = gazetteer.keys
+        self._key_places = np.asarray(gazetteer.key_places)
+        self._key_primary = np.asarray(gazetteer.key_kinds) == PRIMARY_NAME
+        self._population = np.asarray(gazetteer.population)
+        self._country = np.asarray(gazetteer.country)
+        self._country_names = [normalize_place_name(name) for name in gazetteer.countries]
+
+        # Keys as character codes, padded "  key " like pg_trgm; bytes past the
+        # end of a key are NUL, which maps to the space code like the padding
+        count = self._keys.shape[0]
+        width = self._keys.dtype.itemsize
+        chars = np.ascontiguousarray(self._keys).view(np.uint8).reshape(count, width)
+        lengths = (chars != 0).sum(axis=1)
+        padded = np.zeros((count, width + 3), dtype=np.int32)
+        padded[:, 2:width + 2] = _CHAR_CODES[chars]
+        trigrams = _trigram_codes(padded)
+        # A key of length n has n + 1 trigrams
+        valid = np.arange(width + 1)[None, :] <= lengths[:, None]
+        key_ids = np.broadcast_to(np.arange(count)[:, None], trigrams.shape)[valid]
+        pairs = np.unique(key_ids.astype(np.int64) * _RADIX ** 3 + trigrams[valid])
+        key_ids, trigrams = pairs // _RADIX ** 3, pairs % _RADIX ** 3
+
+        # Postings in CSR layout: keys containing trigram t are
+        # _posting_keys[_posting_offsets[t]:_posting_offsets[t + 1]]
+        order = np.argsort(trigrams, kind="stable")
+        self._posting_keys = key_ids[order].astype(np.int32)
+        self._posting_offsets = np.zeros(_RADIX ** 3 + 1, dtype=np.int64)
+        np.cumsum(np.bincount(trigrams, minlength=_RADIX ** 3), out=self._posting_offsets[1:])
+        self._key_trigram_counts = np.bincount(key_ids, minlength=count).astype(np.int32)
+
+    def _prefix_keys(self, prefix: str) -> np.ndarray:
+        encoded = prefix.encode("ascii")
+        lo = np.searchsorted(self._keys, encoded, side="left")
+        hi = np.searchsorted(self._keys, encoded + b"\x7f", side="left")
+        return np.arange(lo, hi)
+
+    def _similar_keys(self, query: str):
+        """Keys with trigram similarity >= MIN_SIMILARITY, and their similarities."""
+        query_trigrams = _query_trigrams(query)
+        postings = [
+            self._posting_keys[self._posting_offsets[t]:self._posting_offsets[t + 1]]
+            for t in query_trigrams
+        ]
+        if not postings:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        keys, shared = np.unique(np.concatenate(postings), return_counts=True)
+        similarity = shared / (query_trigrams.shape[0] + self._key_trigram_counts[keys] - shared)
+        keep = similarity >= MIN_SIMILARITY
+        return keys[keep], similarity[keep]
+
+    def _rank(self, keys: np.ndarray, scores: np.ndarray, countries: Optional[np.ndarray], exclude: set, limit: int) -> List[int]:
+        """Distinct places of keys, best first by (country match, score, own name, population)."""
+        places = self._key_places[keys]
+        in_country = np.isin(self._country[places], countries) if countries is not None else np.ones(keys.shape[0], dtype=bool)
+        order = np.lexsort((-self._population[places], ~self._key_primary[keys], -scores, ~in_country))
+        ranked = []
+        for place in places[order].tolist():
+            if place not in exclude:
+                exclude.add(place)
+                ranked.append(place)
+                if len(ranked) == limit:
+                    break
+        return ranked
+
+    def suggest(self, text: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+        """
+        Suggest places for partially typed text such as "ahmed" or "mumbia, ind".
+
+        The first comma-separated part is matched against place names; later
+        parts prefer places whose country starts with them.
+
+        Args:
+            text: Text typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            List of place dictionaries (see Gazetteer.place) with an added label
+            such as "Mumbai, India", best first; places sharing a label get
+            their coordinates appended ("Jodhpur, India (21.90N, 70.03E)")
+        """
+        parts = [normalize_place_name(part) for part in text.split(",")]
+        parts = [part for part in parts if part]
+        if not parts or limit <= 0:
+            return []
+        query = parts[0]
+
+        countries = None
+        if len(parts) > 1:
+            matching = [i for i, name in enumerate(self._country_names) if any(name.startswith(part) for part in parts[1:])]
+            countries = np.array(matching, dtype=self._country.dtype) if matching else None
+
+        chosen = set()
+        prefix_keys = self._prefix_keys(query)
+        places = self._rank(prefix_keys, np.zeros(prefix_keys.shape[0]), countries, chosen, limit)
+        if len(places) < limit:
+            similar_keys, similarity = self._similar_keys(query)
+            scores = similarity + POPULATION_WEIGHT * np.log10(1 + self._population[self._key_places[similar_keys]])
+            places += self._rank(similar_keys, scores, countries, chosen, limit - len(places))
+
+        suggestions = []
+        for place_id in places:
+            place = self.gazetteer.place(place_id)
+            place["label"] = f"{place['name']}, {place['country']}"
+            suggestions.append(place)
+        labels = Counter(place["label"] for place in suggestions)
+        for place in suggestions:
+            if labels[place["label"]] > 1:
+                latitude, longitude = place["latitude"], place["longitude"]
+                place["label"] += (f" ({abs(latitude):.2f}{'N' if latitude >= 0 else 'S'}, "
+                                   f"{abs(longitude):.2f}{'E' if longitude >= 0 else 'W'})")
+        return suggestions
+
+
+# Global instance (False once a load has been attempted and failed)
+_place_autocomplete = None
+
+
+def get_place_autocomplete() -> Optional[PlaceAutocomplete]:
+    """Get the global autocomplete index, or None if the gazetteer is unavailable."""
+    global _place_autocomplete
+    if _place_autocomplete is None:
+        gazetteer = get_gazetteer()
+        _place_autocomplete = PlaceAutocomplete(gazetteer) if gazetteer is not None else False
+    return _place_autocomplete or None
+
+
+if __name__ == "__main__":
+    autocomplete = get_place_autocomplete()
+    for text in ["ahmed", "mumbia", "varansi", "paris, fr", "londn"]:
+        print(text, "->", [s["label"] for s in autocomplete.suggest(text, limit=5)])
@@ -0,0 +1,238 @@
+"""
+Sharded Matchmaking
+
+Runs bulk top-k matching (see bulk_matching) across a local process pool for
+cohorts too large for one core.
+
+A person's ranking depends only on their key (profile code, plus Manglik
+status under a dosha policy), so the work is at most 84 distinct rankings,
+each over the whole candidate cohort. That is what gets split:
+
+    shared memory:  the candidates' profile codes (and dosha flags) live in
+                    a shared memory block that every worker maps; tasks only
+                    carry shard bounds and the few distinct person keys, so
+                    no cohort-sized array is ever pickled
+    workers:        each task ranks every distinct key against one shard of
+                    candidates and returns its top k (global indices)
+    merge:          the per-shard top-k lists of each key are merged by the
+                    same order as top_matches (higher total, then lower
+                    partner index) and handed to every person with that key
+
+Because that order is total, the results are identical to a single process
+top_match_arrays run whatever the number of workers or shards.
+"""
+
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from app.config import MATCH_SCORE_THRESHOLD, MATCH_WORKERS
+from app.models import DoshaPolicy
+from app.services.ashtakoota_services.dosha import dosha_keys
+from app.services.bulk_matching import DEFAULT_BLOCK_ELEMENTS, DEFAULT_TOP_K, top_match_arrays
+
+# Candidate shards per worker, so faster workers pick up more of the work
+SHARDS_PER_WORKER = 4
+
+# name -> (shared memory name, shape, dtype)
+ArraySpec = Dict[str, Tuple[str, Tuple[int, ...], str]]
+
+# Worker side: the attached blocks of the current job
+_attached_job: Optional[str] = None
+_attached_blocks: List[shared_memory.SharedMemory] = []
+_attached_arrays: Dict[str, np.ndarray] = {}
+
+
+def _attach(job: str, spec: ArraySpec) -> Dict[str, np.ndarray]:
+    """Map a job's shared arrays in a worker, once per job."""
+    global _attached_job, _attached_arrays
+    if _attached_job != job:
+        _attached_arrays = {}
+        for block in _attached_blocks:
+            block.close()
+        _attached_blocks.clear()
+        for name, (shm_name, shape, dtype) in spec.items():
+            # Spawned workers share the parent's resource tracker, so the parent's unlink covers this too
+            block = shared_memory.SharedMemory(name=shm_name)
+            _attached_blocks.append(block)
+            _attached_arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        _attached_job = job
+    return _attached_arrays
+
+
+def _match_shard(
+    job: str,
+    spec: ArraySpec,
+    partners: Tuple[int, int],
+    person_codes: np.ndarray,
+    person_flags: Optional[np.ndarray],
+    side: str,
+    k: int,
+    threshold: float,
+    block_elements: int,
+    dosha_policy: Optional[DoshaPolicy],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Worker task: top k of each distinct person key within one shard of candidates."""
+    arrays = _attach(job, spec)
+    shard = slice(*partners)
+    shard_partners, shard_scores = top_match_arrays(
+        person_codes, arrays["partner_codes"][shard], side, k, threshold, block_elements,
+        person_flags, arrays["partner_flags"][shard] if "partner_flags" in arrays else None, dosha_policy,
+    )
+    shard_partners[shard_partners >= 0] += partners[0]
+    return shard_partners, shard_scores
+
+
+def merge_top_k(partners: np.ndarray, half_points: np.ndarray, k: int, num_partners: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge per-shard top-k lists into one top-k list per row.
+
+    Args:
+        partners: Rows x shards x k global partner indices, padded with -1
+        half_points: Rows x shards x k totals in half-points, padded with dosha.REJECTED
+        k: Partners kept per row
+        num_partners: Size of the partner cohort
+
+    Returns:
+        (partners, half_points) as rows x k arrays, best first
+    """
+    candidates = partners.reshape(partners.shape[0], -1)
+    scores = half_points.reshape(candidates.shape)
+    # Same order as top_matches: score first, then the lower partner index; padding sorts last
+    keys = scores.astype(np.int64) * (num_partners + 1) + (num_partners - candidates)
+    best = np.argsort(-keys, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(candidates, best, axis=1), np.take_along_axis(scores, best, axis=1)
+
+
+class ShardedMatcher:
+    """Process pool for sharded top-k matching; reuse one across jobs to pay worker startup once."""
+
+    def __init__(self, workers: int = MATCH_WORKERS):
+        """
+        Initialize the matcher. Worker processes are started on first use.
+
+        Args:
+            workers: Number of worker processes
+        """
+        self.workers = max(1, workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn like the chart executor: workers start clean and import only what they need
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def top_matches(
+        self,
+        person_codes: Sequence[int],
+        partner_codes: Sequence[int],
+        side: str = "groom",
+        k: int = DEFAULT_TOP_K,
+        threshold: float = MATCH_SCORE_THRESHOLD,
+        partner_shards: Optional[int] = None,
+        block_elements: int = DEFAULT_BLOCK_ELEMENTS,
+        person_flags: Optional[Sequence[int]] = None,
+        partner_flags: Optional[Sequence[int]] = None,
+        dosha_policy: Optional[DoshaPolicy] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Everyone's top-k partners, computed shard by shard in the worker processes.
+
+        Args:
+            person_codes: Profile codes of the people to find partners for
+            partner_codes: Profile codes of the candidate partners
+            side: "groom" if the people are grooms (partners are brides), "bride" otherwise
+            k: Maximum partners per person
+            threshold: Partners must score strictly above this total
+            partner_shards: Number of slices of the partner cohort (default SHARDS_PER_WORKER per worker)
+            block_elements: Approximate number of scores held per block in a worker
+            person_flags: Dosha flags of the people (needed with dosha_policy)
+            partner_flags: Dosha flags of the partners (needed with dosha_policy)
+            dosha_policy: Dosha screening to apply
+
+        Returns:
+            (partners, half_points) as in bulk_matching.top_match_arrays
+        """
+        person_codes = np.asarray(person_codes, dtype=np.int8)
+        shared = {"partner_codes": np.asarray(partner_codes, dtype=np.int8)}
+        if dosha_policy is not None:
+            if person_flags is None or partner_flags is None:
+                raise ValueError("Dosha screening needs the dosha flags of both cohorts")
+            person_flags = np.asarray(person_flags, dtype=np.uint8)
+            shared["partner_flags"] = np.asarray(partner_flags, dtype=np.uint8)
+            person_keys = dosha_keys(person_codes, person_flags, dosha_policy)
+        else:
+            person_flags = None
+            person_keys = person_codes
+
+        # One representative person per distinct key is all the workers need to see
+        _, representatives, person_rows = np.unique(person_keys, return_index=True, return_inverse=True)
+        key_codes = person_codes[representatives]
+        key_flags = person_flags[representatives] if person_flags is not None else None
+        num_partners = shared["partner_codes"].shape[0]
+        partner_shards = max(1, min(partner_shards or self.workers * SHARDS_PER_WORKER, num_partners))
+
+        blocks: List[shared_memory.SharedMemory] = []
+        try:
+            spec: ArraySpec = {}
+            for name, array in shared.items():
+                block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+                blocks.append(block)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+                spec[name] = (block.name, array.shape, array.dtype.str)
+
+            job = uuid.uuid4().hex
+            bounds = np.linspace(0, num_partners, partner_shards + 1).astype(int)
+            futures = [
+                self._get_pool().submit(
+                    _match_shard, job, spec, (int(bounds[shard]), int(bounds[shard + 1])),
+                    key_codes, key_flags, side, k, threshold, block_elements, dosha_policy,
+                )
+                for shard in range(partner_shards)
+            ]
+            results = [future.result() for future in futures]
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        key_partners, key_scores = merge_top_k(
+            np.stack([partners for partners, _ in results], axis=1),
+            np.stack([scores for _, scores in results], axis=1),
+            k, num_partners,
+        )
+        return key_partners[person_rows], key_scores[person_rows]
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "ShardedMatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    import time
+
+    from app.services.ashtakoota_services.score_tensor import SEGMENT_PROFILE_CODE
+
+    # Parity with top_match_arrays (shard counts, dosha screening) is tested in tests/test_sharded_matching.py;
+    # scripts/benchmark_sharded_matching.py measures the scaling
+    rng = np.random.default_rng(0)
+    grooms = SEGMENT_PROFILE_CODE[rng.integers(0, SEGMENT_PROFILE_CODE.shape[0], 20000)]
+    brides = SEGMENT_PROFILE_CODE[rng.integers(0, SEGMENT_PROFILE_CODE.shape[0], 30000)]
+    with ShardedMatcher(workers=2) as matcher:
+        matcher.top_matches(grooms[:10], brides[:10], "groom", k=5)  # start the workers
+        for partner_shards in (1, 3, 7):
+            start = time.perf_counter()
+            matcher.top_matches(grooms, brides, "groom", k=5, partner_shards=partner_shards)
+            print(f"{partner_shards} partner shard(s): {time.perf_counter() - start:.3f}s")
@@ -0,0 +1,490 @@
+"""
+Offline Timezones
+
+Resolves the UTC offset in force at a birth place at the moment of birth,
+without a network call:
+
+    coordinates -> IANA zone: nearest gazetteer place, found through a
+                              1-degree grid over the places' coordinates
+    zone + local time -> UTC offset: binary search in the zone's transition
+                              table, including DST and the local mean time
+                              used before standard time (e.g. +5:53:28 in
+                              Kolkata before 1854)
+
+Transition tables are parsed from the system's TZif files (or the tzdata
+package) once per zone and cached. Zones whose files only list transitions up
+to their last rule change are extended with their POSIX TZ footer rule up to
+2400, the end of the ephemeris range.
+
+Local times that are skipped or repeated by a transition resolve like
+zoneinfo's fold=0: to the offset in force before the transition.
+"""
+
+import calendar
+import re
+import struct
+import threading
+import zoneinfo
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from app.services.gazetteer import Gazetteer, get_gazetteer
+
+# Transition tables are extended with the zone's current rule up to this year
+RULES_END_YEAR = 2400
+
+# Grid cell size (degrees) and how far (in cells) to look for a place
+GRID_DEGREES = 1.0
+MAX_SEARCH_RINGS = 10
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _local_seconds(year: int, month: int, day: int, hour: int, minute: int, second: int) -> int:
+    """Wall-clock time as seconds since 1970-01-01T00:00 of the same (offset-less) clock."""
+    return calendar.timegm((year, month, day, hour, minute, second))
+
+
+# ---------------------------------------------------------------------------
+# TZif parsing
+# ---------------------------------------------------------------------------
+
+def _find_tzif(zone: str) -> Path:
+    """Locate the TZif file of a zone on the system tz path or in the tzdata package."""
+    if not re.fullmatch(r"[A-Za-z0-9_+\-]+(/[A-Za-z0-9_+\-]+)*", zone):
+        raise ValueError(f"Invalid timezone name: {zone}")
+    for directory in zoneinfo.TZPATH:
+        path = Path(directory) / zone
+        if path.is_file():
+            return path
+    try:
+        from importlib.resources import files
+        path = files("tzdata").joinpath("zoneinfo", *zone.split("/"))
+        if path.is_file():
+            return Path(str(path))
+    except ImportError:
+        pass
+    raise FileNotFoundError(f"Timezone data not found for {zone}")
+
+
+def _parse_tzif(data: bytes) -> Tuple[np.ndarray, np.ndarray, int, str]:
+    """
+    Parse TZif data (RFC 8536).
+
+    Returns:
+        (transition times in UTC seconds, offset in seconds after each transition,
+        offset before the first transition, POSIX TZ footer or "")
+    """
+    def header(offset: int):
+        if data[offset:offset + 4] != b"TZif":
+            raise ValueError("Not a TZif file")
+        return data[offset + 4:offset + 5], struct.unpack(">6l", data[offset + 20:offset + 44])
+
+    version, counts = header(0)
+    time_size = 4
+    offset = 44
+    if version >= b"2":
+        # Skip the 32-bit block and use the 64-bit one that follows it
+        isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = counts
+        offset += timecnt * 5 + typecnt * 6 + charcnt + leapcnt * 8 + isstdcnt + isutcnt
+        version, counts = header(offset)
+        offset += 44
+        time_size = 8
+    isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = counts
+
+    times = np.frombuffer(data, dtype=">i8" if time_size == 8 else ">i4", count=timecnt, offset=offset).astype(np.int64)
+    offset += timecnt * time_size
+    type_indices = np.frombuffer(data, dtype=np.uint8, count=timecnt, offset=offset)
+    offset += timecnt
+    utoffsets = [struct.unpack(">l", data[offset + 6 * i:offset + 6 * i + 4])[0] for i in range(typecnt)]
+    offset += typecnt * 6 + charcnt + leapcnt * (time_size + 4) + isstdcnt + isutcnt
+
+    footer = ""
+    if time_size == 8:
+        footer = data[offset:].strip(b"\n").split(b"\n")[0].decode("ascii")
+    offsets = np.array([utoffsets[i] for i in type_indices], dtype=np.int64)
+    # Time type 0 applies before the first transition
+    return times, offsets, utoffsets[0], footer
+
+
+# ---------------------------------------------------------------------------
+# POSIX TZ footer rules
+# ---------------------------------------------------------------------------
+
+_POSIX_TZ = re.compile(
+    r"^(?:<[^>]+>|[A-Za-z]+)(?P<std>[+-]?[\d:]+)"
+    r"(?:(?:<[^>]+>|[A-Za-z]+)(?P<dst>[+-]?[\d:]+)?"
+    r",(?P<start>[^,/]+)(?:/(?P<start_time>[+-]?[\d:]+))?"
+    r",(?P<end>[^,/]+)(?:/(?P<end_time>[+-]?[\d:]+))?)?$"
+)
+
+
+def _posix_seconds(text: Optional[str], default: int) -> int:
+    if text is None:
+        return default
+    sign = -1 if text.startswith("-") else 1
+    parts = [int(p) for p in text.lstrip("+-").split(":")]
+    parts += [0] * (3 - len(parts))
+    return sign * (parts[0] * 3600 + parts[1] * 60 + parts[2])
+
+
+def _rule_day(rule: str, year: int) -> Tuple[int, int]:
+    """(month, day) of a POSIX date rule (Mm.w.d, Jn or n) in a given year."""
+    if rule.startswith("M"):
+        month, week, weekday = (int(p) for p in rule[1:].split("."))
+        first_weekday = (calendar.weekday(year, month, 1) + 1) % 7  # Sunday = 0
+        day = 1 + (weekday - first_weekday) % 7 + (week - 1) * 7
+        days_in_month = calendar.monthrange(year, month)[1]
+        while day > days_in_month:
+            day -= 7
+        return month, day
+    if rule.startswith("J"):
+        # Julian day 1-365, February 29 is never counted (so use a common year)
+        date = datetime.fromordinal(datetime(2001, 1, 1).toordinal() + int(rule[1:]) - 1)
+    else:
+        # Zero-based day of year, February 29 counted in leap years
+        date = datetime.fromordinal(datetime(year, 1, 1).toordinal() + int(rule))
+    return date.month, date.day
+
+
+def _footer_transitions(footer: str, after: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Transitions generated by a POSIX TZ rule from the year of `after` up to RULES_END_YEAR."""
+    match = _POSIX_TZ.match(footer)
+    if not match or not match.group("start"):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    std = -_posix_seconds(match.group("std"), 0)
+    dst = -_posix_seconds(match.group("dst"), -(std + 3600))
+    start_time = _posix_seconds(match.group("start_time"), 7200)
+    end_time = _posix_seconds(match.group("end_time"), 7200)
+
+    times, offsets = [], []
+    # Rules before the last explicit transition are generated and then dropped
+    first_year = 1800 if after < 0 else (_EPOCH + timedelta(seconds=after)).year
+    for year in range(first_year, RULES_END_YEAR + 1):
+        month, day = _rule_day(match.group("start"), year)
+        # DST starts at a local standard time and ends at a local daylight time
+        times.append(_local_seconds(year, month, day, 0, 0, 0) + start_time - std)
+        offsets.append(dst)
+        month, day = _rule_day(match.group("end"), year)
+        times.append(_local_seconds(year, month, day, 0, 0, 0) + end_time - dst)
+        offsets.append(std)
+    times = np.array(times, dtype=np.int64)
+    offsets = np.array(offsets, dtype=np.int64)
+    order = np.argsort(times, kind="stable")
+    times, offsets = times[order], offsets[order]
+    keep = times > after
+    return times[keep], offsets[keep]
+
+
+# ---------------------------------------------------------------------------
+# Zone transition tables
+# ---------------------------------------------------------------------------
+
+class ZoneTransitions:
+    """UTC offsets of one IANA zone over time."""
+
+    def __init__(self, zone: str, utc_times: np.ndarray, offsets: np.ndarray, initial_offset: int):
+        """
+        Build the lookup table.
+
+        Args:
+            zone: IANA zone name
+            utc_times: Sorted transition instants (UTC seconds since 1970)
+            offsets: UTC offset (seconds) in force from each transition
+            initial_offset: UTC offset before the first transition
+        """
+        self.zone = zone
+        self.utc_times = utc_times
+        self.offsets = offsets
+        self.initial_offset = initial_offset
+        # Wall-clock boundary of each transition. Using the later of the two
+        # wall clocks sends skipped and repeated local times to the old offset
+        previous = np.concatenate(([initial_offset], offsets[:-1]))
+        self.local_times = utc_times + np.maximum(previous, offsets)
+
+    @classmethod
+    def load(cls, zone: str) -> "ZoneTransitions":
+        """Parse a zone's TZif file and extend it with its footer rule."""
+        utc_times, offsets, initial_offset, footer = _parse_tzif(_find_tzif(zone).read_bytes())
+        if footer:
+            last = int(utc_times[-1]) if utc_times.size else np.iinfo(np.int64).min
+            rule_times, rule_offsets = _footer_transitions(footer, last)
+            utc_times = np.concatenate((utc_times, rule_times))
+            offsets = np.concatenate((offsets, rule_offsets))
+        return cls(zone, utc_times, offsets, initial_offset)
+
+    def offset_seconds(self, local_seconds):
+        """
+        UTC offset in force at wall-clock time(s), by binary search.
+
+        Args:
+            local_seconds: Wall-clock time(s) as seconds since 1970-01-01T00:00 local
+
+        Returns:
+            Offset(s) in seconds, same shape as the input
+        """
+        if not self.offsets.size:
+            return np.full(np.shape(local_seconds), self.initial_offset)
+        index = np.searchsorted(self.local_times, local_seconds, side="right") - 1
+        return np.where(index >= 0, self.offsets[np.maximum(index, 0)], self.initial_offset)
+
+
+_zone_cache: Dict[str, ZoneTransitions] = {}
+_zone_cache_lock = threading.Lock()
+
+
+def get_zone_transitions(zone: str) -> ZoneTransitions:
+    """Get a zone's transition table, parsing it on first use."""
+    transitions = _zone_cache.get(zone)
+    if transitions is None:
+        transitions = ZoneTransitions.load(zone)
+        with _zone_cache_lock:
+            _zone_cache[zone] = transitions
+    return transitions
+
+
+def utc_offset_hours(zone: str, year: int, month: int, day: int, hour: int, minute: int, second: int = 0) -> float:
+    """
+    Get the UTC offset in force at a local date and time.
+
+    Args:
+        zone: IANA zone name (e.g. "Asia/Kolkata")
+        year, month, day, hour, minute, second: Local wall-clock time
+
+    Returns:
+        Offset in hours east of UTC (e.g. 5.5), as taken by julian_day
+    """
+    local = _local_seconds(year, month, day, hour, minute, second)
+    return float(get_zone_transitions(zone).offset_seconds(local)) / 3600
+
+
+def utc_offsets_hours(zones, local_datetimes: np.ndarray) -> np.ndarray:
+    """
+    Get the UTC offsets for many local times, vectorized per zone.
+
+    Args:
+        zones: One IANA zone name, or an array of zone names (one per time)
+        local_datetimes: Local wall-clock times (anything np.datetime64 accepts)
+
+    Returns:
+        Float64 array of offsets in hours, usable as julian_days' tz_offsets
+    """
+    local = (np.asarray(local_datetimes, dtype="datetime64[s]") - np.datetime64("1970-01-01T00:00:00", "s")).astype(np.int64)
+    if isinstance(zones, str):
+        return get_zone_transitions(zones).offset_seconds(local) / 3600
+
+    zones = np.asarray(zones)
+    offsets = np.empty(local.shape[0], dtype=np.float64)
+    names, groups = np.unique(zones, return_inverse=True)
+    order = np.argsort(groups, kind="stable")
+    bounds = np.searchsorted(groups[order], np.arange(names.shape[0] + 1))
+    for group, zone in enumerate(names):
+        rows = order[bounds[group]:bounds[group + 1]]
+        offsets[rows] = get_zone_transitions(str(zone)).offset_seconds(local[rows]) / 3600
+    return offsets
+
+
+# ---------------------------------------------------------------------------
+# Coordinates -> zone
+# ---------------------------------------------------------------------------
+
+def nautical_zone(longitude: float) -> str:
+    """Fixed-offset Etc/GMT zone for a longitude (used far from any known place)."""
+    hours = int(round(longitude / 15))
+    # Etc/GMT signs are inverted: Etc/GMT-5 is UTC+5
+    return "Etc/GMT" if hours == 0 else f"Etc/GMT{-hours:+d}"
+
+
+class TimezoneLocator:
+    """Nearest-place timezone lookup over a grid of gazetteer places."""
+
+    def __init__(self, gazetteer: Gazetteer):
+        """
+        Bucket the gazetteer's places into GRID_DEGREES cells.
+
+        Args:
+            gazetteer: Loaded gazetteer
+        """
+        self.gazetteer = gazetteer
+        self._latitude = np.radians(np.asarray(gazetteer.latitude))
+        self._longitude = np.radians(np.asarray(gazetteer.longitude))
+        self._rows = int(round(180 / GRID_DEGREES))
+        self._columns = int(round(360 / GRID_DEGREES))
+        cells = self._cell(np.asarray(gazetteer.latitude), np.asarray(gazetteer.longitude))
+        # Places of cell c are _cell_places[_cell_offsets[c]:_cell_offsets[c + 1]]
+        self._cell_places = np.argsort(cells, kind="stable").astype(np.int32)
+        self._cell_offsets = np.zeros(self._rows * self._columns + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=self._rows * self._columns), out=self._cell_offsets[1:])
+
+    def _row_column(self, latitude, longitude):
+        row = np.clip(((np.asarray(latitude) + 90) // GRID_DEGREES).astype(np.int64), 0, self._rows - 1)
+        column = ((np.asarray(longitude) + 180) // GRID_DEGREES).astype(np.int64) % self._columns
+        return row, column
+
+    def _cell(self, latitude, longitude):
+        row, column = self._row_column(latitude, longitude)
+        return row * self._columns + column
+
+    def _ring_places(self, row: int, column: int, ring: int) -> np.ndarray:
+        """Places in the cells exactly `ring` cells away from (row, column)."""
+        cells = []
+        for r in range(row - ring, row + ring + 1):
+            if not 0 <= r < self._rows:
+                continue
+            if abs(r - row) == ring:
+                columns = range(column - ring, column + ring + 1)
+            else:
+                columns = (column - ring, column + ring)
+            for c in set(c % self._columns for c in columns):
+                cell = r * self._columns + c
+                cells.append(self._cell_places[self._cell_offsets[cell]:self._cell_offsets[cell + 1]])
+        return np.concatenate(cells) if cells else np.empty(0, dtype=np.int32)
+
+    def _candidates(self, row: int, column: int) -> np.ndarray:
+        """Places that can be nearest to any point of a cell."""
+        found = []
+        for ring in range(MAX_SEARCH_RINGS + 1):
+            places = self._ring_places(row, column, ring)
+            if places.size:
+                found.append(places)
+            elif found:
+                break
+            # One extra ring after the first hit: a closer place can sit in a
+            # neighbouring cell of the ring that produced the hit
+            if len(found) == 2:
+                break
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int32)
+
+    def _nearest(self, places: np.ndarray, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """Nearest of `places` to each point (points in radians)."""
+        lat = latitudes[:, None]
+        # Haversine, without the constant factors
+        h = np.sin((self._latitude[places] - lat) / 2) ** 2 + \
+            np.cos(lat) * np.cos(self._latitude[places]) * np.sin((self._longitude[places] - longitudes[:, None]) / 2) ** 2
+        return places[np.argmin(h, axis=1)]
+
+    def nearest_place(self, latitude: float, longitude: float) -> Optional[int]:
+        """
+        Find the gazetteer place closest to a point.
+
+        Args:
+            latitude: Latitude in degrees
+            longitude: Longitude in degrees
+
+        Returns:
+            place_id, or None if no place lies within MAX_SEARCH_RINGS cells
+        """
+        row, column = (int(v) for v in self._row_column(latitude, longitude))
+        places = self._candidates(row, column)
+        if not places.size:
+            return None
+        return int(self._nearest(places, np.radians([latitude]), np.radians([longitude]))[0])
+
+    def timezone_at(self, latitude: float, longitude: float) -> str:
+        """
+        Get the IANA zone of a point: that of the nearest known place, else a nautical zone.
+
+        Args:
+            latitude: Latitude in degrees
+            longitude: Longitude in degrees
+
+        Returns:
+            IANA zone name
+        """
+        place = self.nearest_place(latitude, longitude)
+        if place is None:
+            return nautical_zone(longitude)
+        return self.gazetteer.timezones[self.gazetteer.timezone[place]]
+
+    def timezones_at(self, latitudes, longitudes) -> np.ndarray:
+        """
+        Get the IANA zones of many points, vectorized per grid cell.
+
+        Args:
+            latitudes: Latitudes in degrees
+            longitudes: Longitudes in degrees
+
+        Returns:
+            Array of IANA zone names
+        """
+        latitudes = np.atleast_1d(np.asarray(latitudes, dtype=np.float64))
+        longitudes = np.atleast_1d(np.asarray(longitudes, dtype=np.float64))
+        zones = np.empty(latitudes.shape[0], dtype=object)
+        cells, groups = np.unique(self._cell(latitudes, longitudes), return_inverse=True)
+        order = np.argsort(groups, kind="stable")
+        bounds = np.searchsorted(groups[order], np.arange(cells.shape[0] + 1))
+        timezone_names = np.array(self.gazetteer.timezones, dtype=object)
+        for group, cell in enumerate(cells.tolist()):
+            rows = order[bounds[group]:bounds[group + 1]]
+            places = self._candidates(cell // self._columns, cell % self._columns)
+            if places.size:
+                nearest = self._nearest(places, np.radians(latitudes[rows]), np.radians(longitudes[rows]))
+                zones[rows] = timezone_names[np.asarray(self.gazetteer.timezone)[nearest]]
+            else:
+                zones[rows] = [nautical_zone(lon) for lon in longitudes[rows].tolist()]
+        return zones
+
+
+# Global instance (False once a load has been attempted and failed)
+_timezone_locator = None
+
+
+def get_timezone_locator() -> Optional[TimezoneLocator]:
+    """Get the global timezone locator, or None if the gazetteer is unavailable."""
+    global _timezone_locator
+    if _timezone_locator is None:
+        gazetteer = get_gazetteer()
+        _timezone_locator = TimezoneLocator(gazetteer) if gazetteer is not None else False
+    return _timezone_locator or None
+
+
+def timezone_at(latitude: float, longitude: float) -> str:
+    """Get the IANA zone of a point (a nautical zone if no place index is available)."""
+    locator = get_timezone_locator()
+    return locator.timezone_at(latitude, longitude) if locator is not None else nautical_zone(longitude)
+
+
+def resolve_utc_offset(
+    latitude: float,
+    longitude: float,
+    year: int,
+    month: int,
+    day: int,
+    hour: int,
+    minute: int,
+    second: int = 0,
+    zone: Optional[str] = None,
+) -> float:
+    """
+    Get the UTC offset in force at a place and local time.
+
+    Args:
+        latitude: Latitude in degrees
+        longitude: Longitude in degrees
+        year, month, day, hour, minute, second: Local wall-clock time
+        zone: IANA zone if already known (e.g. from the gazetteer), else located from the coordinates
+
+    Returns:
+        Offset in hours east of UTC
+    """
+    zone = zone or timezone_at(latitude, longitude)
+    try:
+        return utc_offset_hours(zone, year, month, day, hour, minute, second)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Timezone lookup failed ({e}), using the nautical offset")
+        return float(round(longitude / 15))
+
+
+if __name__ == "__main__":
+    for lat, lon, when in [
+        (23.03, 72.62, (1990, 6, 15, 10, 30)),
+        (22.57, 88.36, (1850, 1, 1, 12, 0)),
+        (22.57, 88.36, (1943, 1, 1, 12, 0)),
+        (51.51, -0.13, (2024, 7, 1, 12, 0)),
+        (40.71, -74.01, (2350, 12, 1, 12, 0)),
+        (0.0, -140.0, (2000, 1, 1, 0, 0)),
+    ]:
+        zone = timezone_at(lat, lon)
+        print(f"({lat}, {lon}) {when} -> {zone} {resolve_utc_offset(lat, lon, *when, zone=zone):+.4f}h")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Batch Charts Export
+
+Computes natal charts for a cohort with batch_planets_calculation and writes
+them as a columnar table (one row per chart; signs and nakshatras as
+dictionary-encoded columns, see columnar_export). The input CSV has an
+optional id column and year, month, day, hour, minute, second, latitude,
+longitude and timezone (UTC offset in hours).
+
+    python scripts/batch_charts.py --input births.csv --output charts.parquet --format parquet
+    python scripts/batch_charts.py --random 100000 --mode fast --output charts.arrow
+"""
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.batch_kundali import batch_planets_calculation  # noqa: E402
+from app.services.columnar_export import FORMATS, chart_columns, write_columns  # noqa: E402
+
+
+def load_births(path: Path):
+    """Read a births CSV, return (ids, datetimes, latitudes, longitudes, timezones)."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    ids = [row.get("id") or str(index) for index, row in enumerate(rows)]
+    datetimes = np.array([
+        np.datetime64(f"{int(row['year']):04d}-{int(row['month']):02d}-{int(row['day']):02d}"
+                      f"T{int(row['hour']):02d}:{int(row['minute']):02d}:{int(row['second']):02d}")
+        for row in rows
+    ], dtype="datetime64[s]")
+    columns = [np.array([float(row[key]) for row in rows]) for key in ("latitude", "longitude", "timezone")]
+    return ids, datetimes, *columns
+
+
+def random_births(count: int, rng: np.random.Generator):
+    """Synthetic births between 1950 and 2010 in India."""
+    seconds = rng.integers(0, 60 * 365 * 86400, count)
+    datetimes = np.datetime64("1950-01-01T00:00:00", "s") + seconds.astype("timedelta64[s]")
+    return ([str(index) for index in range(count)], datetimes,
+            rng.uniform(8, 32, count), rng.uniform(68, 92, count), np.full(count, 5.5))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute charts for a cohort and export them as a columnar table")
+    parser.add_argument("--input", type=Path, help="Births CSV")
+    parser.add_argument("--random", type=int, metavar="CHARTS", help="Use random births instead")
+    parser.add_argument("--mode", choices=["exact", "fast"], default="exact", help="Planet positions from Swiss Ephemeris or the Chebyshev cache")
+    parser.add_argument("--format", choices=FORMATS, default="arrow", help="arrow/parquet need pyarrow")
+    parser.add_argument("--output", type=Path, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.random:
+        ids, datetimes, latitudes, longitudes, timezones = random_births(args.random, np.random.default_rng(args.seed))
+    elif args.input:
+        ids, datetimes, latitudes, longitudes, timezones = load_births(args.input)
+    else:
+        parser.error("pass --input or --random")
+
+    start = time.perf_counter()
+    charts = batch_planets_calculation(datetimes, latitudes, longitudes, timezones, mode=args.mode)
+    chart_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    write_columns(chart_columns(charts, ids), args.output, args.format)
+    write_time = time.perf_counter() - start
+    print(f"{len(ids):,} charts computed in {chart_time:.2f}s, {args.format} written in {write_time:.2f}s "
+          f"({args.output.stat().st_size / 1e6:.1f} MB)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
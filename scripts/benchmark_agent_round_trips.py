@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Agent Round Trip Benchmark
+
+Counts LLM calls per reading through the real agent graph (create_agent_graph
+with the real tools and knowledge base), with a scripted stub chat model in
+place of the LLM, so no API key or network is needed. Each reading asks a
+question about a topic, prefixed with the birth details note the Gradio
+interface adds, and needs the chart and the placements relevant to the topic
+(chart_queries). Strategies:
+
+    single:    one query_knowledge_base call per LLM turn, as the agent
+               did before the batch tool
+    parallel:  all query_knowledge_base calls in one LLM turn
+    batch:     one query_knowledge_base_batch call with the topic
+    prefetch:  the graph's prefetch node classifies the question and adds
+               the chart and interpretations before the first LLM call; the
+               stub falls back to the batch tool if anything it needs is missing
+
+Every strategy must retrieve at least the interpretations the batch strategy
+does; the script checks that and prints LLM calls and tool messages per
+reading, and for prefetch how many readings took one LLM call.
+tests/test_agent_round_trips.py asserts the counts with the same stub model
+(app/services/agent/scripted_model.py).
+
+    python scripts/benchmark_agent_round_trips.py
+    python scripts/benchmark_agent_round_trips.py --readings 50 --topics career relationships
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+from langchain_core.messages import HumanMessage, ToolMessage
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.agent.graph import create_agent_graph  # noqa: E402
+from app.services.agent.scripted_model import STRATEGIES, ScriptedChatModel, interpretations  # noqa: E402
+from app.services.agent.tools import (  # noqa: E402
+    generate_kundali_chart,
+    query_knowledge_base,
+    query_knowledge_base_batch,
+)
+from app.services.agent.tools.knowledge_base_batch_tool import TOPICS  # noqa: E402
+
+PLACES = ("Mumbai, Maharashtra, India", "Delhi, India", "Ahmedabad, Gujarat, India", "Chennai, Tamil Nadu, India")
+
+# Questions asked per topic
+QUESTIONS = {
+    "personality": ("What is my personality like?", "What are my strengths and weaknesses?"),
+    "career": ("How will my career go, should I change jobs?", "Is business or a salaried profession better for me?"),
+    "relationships": ("When will I get married?", "What kind of partner suits me in love?"),
+    "finance": ("Will my income and savings grow?", "Is this a good time to invest money?"),
+    "health": ("What should I watch for in my health?", "How can I handle stress better?"),
+    "education": ("Will I do well in my studies and exams?", "Should I go to university abroad for a degree?"),
+    "family": ("What does my chart say about my family and home life?", "How do I get along with my mother and father?"),
+    "spirituality": ("What is my spiritual path?", "What is my life purpose and karma?"),
+    "all": ("Give me a full reading.", "Tell me everything about my chart, a complete reading please."),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count LLM round trips per reading with a stub model")
+    parser.add_argument("--readings", type=int, default=20, help="Readings per topic")
+    parser.add_argument("--topics", nargs="+", default=list(TOPICS), choices=list(TOPICS))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tools = [generate_kundali_chart, query_knowledge_base_batch, query_knowledge_base]
+    totals = {strategy: {"llm_calls": 0, "tool_messages": 0, "seconds": 0.0} for strategy in STRATEGIES}
+    mismatches = readings = single_call = classified = 0
+
+    for topic in args.topics:
+        for _ in range(args.readings):
+            birth = {
+                "day": rng.randint(1, 28), "month": rng.randint(1, 12), "year": rng.randint(1950, 2005),
+                "hour": rng.randint(0, 23), "minute": rng.randint(0, 59), "birth_place": rng.choice(PLACES),
+            }
+            question = (f"Note: My birth details are - Date: {birth['day']}/{birth['month']}/{birth['year']}, "
+                        f"Time: {birth['hour']:02d}:{birth['minute']:02d}, Place: {birth['birth_place']}. "
+                        f"{rng.choice(QUESTIONS[topic])}")
+            found = {}
+            for strategy in STRATEGIES:
+                model = ScriptedChatModel(strategy=strategy, topic=topic, birth=birth)
+                graph = create_agent_graph(model, tools, prefetch=strategy == "prefetch")
+                start = time.perf_counter()
+                result = graph.invoke({"messages": [HumanMessage(content=question)], "kundali_data": None, "llm_calls": 0},
+                                      {"recursion_limit": 200})
+                totals[strategy]["seconds"] += time.perf_counter() - start
+                totals[strategy]["llm_calls"] += model.calls
+                totals[strategy]["tool_messages"] += sum(isinstance(message, ToolMessage) for message in result["messages"])
+                found[strategy] = interpretations(result["messages"])
+                if strategy == "prefetch":
+                    single_call += result["llm_calls"] == 1
+                    classified += topic in result.get("intent", [])
+            mismatches += any(not set(found["batch"]) <= set(found[strategy]) for strategy in STRATEGIES)
+            readings += 1
+
+    print(f"{readings} readings over topics: {', '.join(args.topics)}")
+    for strategy, total in totals.items():
+        print(f"{strategy:9s} {total['llm_calls'] / readings:5.1f} LLM calls/reading, "
+              f"{total['tool_messages'] / readings:5.1f} tool messages/reading, "
+              f"{total['seconds'] / readings * 1000:6.1f} ms/reading excluding model latency")
+    print(f"prefetch: {single_call / readings:.0%} of readings answered in one LLM call, "
+          f"question topic detected in {classified / readings:.0%}")
+    print(f"Readings where a strategy missed interpretations the batch strategy retrieved: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Candidate Pool Benchmark
+
+Fills candidate pools of growing size with random profiles and measures
+search latency (top 20 above the threshold) right after a mix of inserts and
+deletes, plus insert and delete throughput. Search latency should stay flat
+as the pool grows.
+
+    python scripts/benchmark_candidate_pool.py
+    python scripts/benchmark_candidate_pool.py --sizes 1000000 --db /tmp/pool.sqlite
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.ashtakoota_services.compact_profile import segment_profile  # noqa: E402
+from app.services.candidate_pool import CandidatePool  # noqa: E402
+from app.services.lunar_segments import NUM_SEGMENTS  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark candidate pool search latency and updates")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000], help="Candidates per side")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--updates", type=int, default=2000, help="Inserts and deletes between queries")
+    parser.add_argument("--db", type=Path, help="SQLite file (default: in-memory pool)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    for size in args.sizes:
+        if args.db and args.db.exists():
+            args.db.unlink()
+        pool = CandidatePool(db_path=args.db)
+        start = time.perf_counter()
+        for side in ("groom", "bride"):
+            pool.add_many(side, rng.integers(0, NUM_SEGMENTS, size))
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        added = [pool.add("bride", segment_profile(int(segment))) for segment in rng.integers(0, NUM_SEGMENTS, args.updates)]
+        insert_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for candidate_id in rng.choice(added, args.updates // 2, replace=False).tolist():
+            pool.remove(candidate_id)
+        delete_time = time.perf_counter() - start
+
+        latencies = []
+        for segment in rng.integers(0, NUM_SEGMENTS, args.queries).tolist():
+            start = time.perf_counter()
+            result = pool.search(segment_profile(segment), "groom", limit=20)
+            latencies.append(time.perf_counter() - start)
+            # Keep the pool changing so searches also pay for merging pending updates
+            pool.add("bride", segment_profile(segment))
+        latencies.sort()
+        print(f"{size:>9,} per side: loaded in {load_time:.2f}s, "
+              f"{args.updates / insert_time:,.0f} inserts/sec, {(args.updates // 2) / delete_time:,.0f} deletes/sec")
+        print(f"           search p50 {1000 * statistics.median(latencies):.3f} ms, "
+              f"p99 {1000 * latencies[int(0.99 * (len(latencies) - 1))]:.3f} ms, "
+              f"last query {result['total']:,} compatible")
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Chebyshev Ephemeris Benchmark
+
+Times "exact" (Swiss Ephemeris) against "fast" (Chebyshev cache) planetary
+longitudes and speeds for random timestamps, and reports the maximum
+difference between the two on the timestamps both modes computed.
+
+Exact mode is slow at this size, so it can run on a prefix of the timestamps
+and be extrapolated:
+
+    python scripts/benchmark_chebyshev_ephemeris.py
+    python scripts/benchmark_chebyshev_ephemeris.py --timestamps 1000000 --exact-timestamps 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.config import PLANETS  # noqa: E402
+from app.services.chebyshev_ephemeris import get_chebyshev_ephemeris, planetary_longitudes  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exact vs fast planetary longitudes")
+    parser.add_argument("--timestamps", type=int, default=1_000_000)
+    parser.add_argument("--exact-timestamps", type=int, default=100_000, help="Prefix of the timestamps timed in exact mode")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    cache = get_chebyshev_ephemeris()
+    if cache is None:
+        print("Chebyshev ephemeris not built, run scripts/build_chebyshev_ephemeris.py")
+        sys.exit(1)
+
+    rng = np.random.default_rng(args.seed)
+    jds = rng.uniform(cache.start_jd, cache.end_jd, args.timestamps)
+    exact_count = min(args.exact_timestamps, args.timestamps)
+
+    start = time.perf_counter()
+    fast_lon, fast_speed = planetary_longitudes(jds, mode="fast")
+    fast_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exact_lon, exact_speed = planetary_longitudes(jds[:exact_count], mode="exact")
+    exact_time = (time.perf_counter() - start) * args.timestamps / exact_count
+
+    estimated = " (extrapolated)" if exact_count < args.timestamps else ""
+    print(f"{args.timestamps} timestamps x {len(PLANETS)} planets")
+    print(f"  exact: {exact_time:8.2f}s  {args.timestamps / exact_time:12,.0f} timestamps/sec{estimated}")
+    print(f"  fast:  {fast_time:8.2f}s  {args.timestamps / fast_time:12,.0f} timestamps/sec")
+    print(f"  speedup: {exact_time / fast_time:.1f}x")
+
+    lon_error = np.abs((fast_lon[:exact_count] - exact_lon + 180) % 360 - 180).max(axis=0) * 3600
+    speed_error = np.abs(fast_speed[:exact_count] - exact_speed).max(axis=0)
+    print(f"Max difference over {exact_count} timestamps:")
+    for index, planet in enumerate(PLANETS):
+        print(f"  {planet:8s} longitude {lon_error[index]:.4f}\"  speed {speed_error[index]:.2e} deg/day")
+
+
+if __name__ == "__main__":
+    main()
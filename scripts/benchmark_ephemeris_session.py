@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Ephemeris Session Microbenchmark
+
+Measures charts/sec of planets_calculation before and after the persistent
+ephemeris session. "Before" replays the old call pattern, where julian_day,
+calculate_ascendant, calculate_planetary_positions and calculate_nakshatra each
+called swe.set_ephe_path / swe.set_sid_mode and then swe.close().
+
+    python scripts/benchmark_ephemeris_session.py --charts 2000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import swisseph as swe
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.config import EPHE_PATH, PLANETS  # noqa: E402
+from app.models import BirthChart  # noqa: E402
+from app.services.ephemeris import get_ephemeris_session  # noqa: E402
+from app.services.kundali_chart import julian_day, planets_calculation  # noqa: E402
+
+
+def _open_close(fn):
+    """Run fn the way every helper used to: open the ephemeris, compute, close it."""
+    swe.set_ephe_path(EPHE_PATH)
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+    result = fn()
+    swe.close()
+    return result
+
+
+def legacy_chart(birth_chart: BirthChart) -> None:
+    """Ephemeris work of one chart with the old per-call open/close pattern."""
+    jd = _open_close(lambda: julian_day(
+        birth_chart.year, birth_chart.month, birth_chart.day,
+        birth_chart.hour, birth_chart.minute, birth_chart.second, birth_chart.timezone
+    ))
+    flags = swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+    def positions():
+        for planet in PLANETS:
+            if planet == "rahu":
+                swe.calc_ut(jd, swe.MEAN_NODE, flags)
+            elif planet != "ketu":
+                swe.calc_ut(jd, getattr(swe, planet.upper()), flags)
+
+    _open_close(positions)
+    _open_close(lambda: swe.houses_ex(jd, birth_chart.latitude, birth_chart.longitude, b'W', swe.FLG_SIDEREAL))
+    _open_close(lambda: swe.calc_ut(jd, swe.MOON, swe.FLG_SIDEREAL))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-call ephemeris open/close against a persistent session")
+    parser.add_argument("--charts", type=int, default=2000)
+    args = parser.parse_args()
+
+    birth_chart = BirthChart(year=1990, month=6, day=15, hour=10, minute=30, second=0)
+
+    start = time.perf_counter()
+    for _ in range(args.charts):
+        legacy_chart(birth_chart)
+    before = args.charts / (time.perf_counter() - start)
+
+    # The legacy pattern closed the ephemeris behind the session's back
+    session = get_ephemeris_session()
+    session.reopen()
+
+    start = time.perf_counter()
+    for _ in range(args.charts):
+        planets_calculation(birth_chart)
+    after = args.charts / (time.perf_counter() - start)
+
+    print(f"before (open/close per call): {before:10.0f} charts/sec")
+    print(f"after  (persistent session):  {after:10.0f} charts/sec")
+    print(f"speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Knowledge Base Cold-Start Benchmark
+
+Starts N worker processes at once (like `uvicorn --workers 8`), each loading
+the knowledge base either with json.load or by mapping the compiled file,
+then answering a typical reading's lookups (nine planets in house and sign,
+ascendant, nakshatra, a few conjunctions). Reports per-worker cold-start time
+and the memory each worker adds: RSS growth and PSS, which splits the mapped
+file's shared pages between the workers.
+
+    python scripts/build_knowledge_base.py
+    python scripts/benchmark_knowledge_base_load.py --workers 8
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.compiled_knowledge_base import COMPILED_KNOWLEDGE_BASE_PATH  # noqa: E402
+
+WORKER = r"""
+import json, sys, time
+import numpy as np
+sys.path.insert(0, sys.argv[2])
+from app.services.compiled_knowledge_base import CompiledKnowledgeBase
+from app.services.knowledge_base_service import KNOWLEDGE_BASE_PATH
+
+def memory_kb(field, path="/proc/self/status"):
+    with open(path) as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+mode, compiled_path = sys.argv[1], sys.argv[3]
+rss_before = memory_kb("VmRSS")
+start = time.perf_counter()
+if mode == "json":
+    with open(KNOWLEDGE_BASE_PATH, "r", encoding="utf-8") as f:
+        knowledge_base = json.load(f)
+else:
+    knowledge_base = CompiledKnowledgeBase(compiled_path)
+load_time = time.perf_counter() - start
+planets = ["sun", "moon", "mercury", "venus", "mars", "jupiter", "saturn", "rahu", "ketu"]
+signs = ["aries", "taurus", "gemini", "cancer", "leo", "virgo", "libra", "scorpio", "sagittarius", "capricorn", "aquarius", "pisces"]
+keys = [f"{planet}_{index % 12 + 1}_house" for index, planet in enumerate(planets)]
+keys += [f"{planet}_{signs[(index * 5) % 12]}" for index, planet in enumerate(planets)]
+keys += ["ascendant_leo", "nakshatra_rohini", "conjunction_sun_mercury", "conjunction_moon_jupiter"]
+entries = [knowledge_base.get(key) for key in keys]
+first_reading = time.perf_counter() - start
+print(json.dumps({
+    "load": load_time,
+    "first_reading": first_reading,
+    "found": sum(entry is not None for entry in entries),
+    "rss_growth_kb": memory_kb("VmRSS") - rss_before,
+    "pss_kb": memory_kb("Pss", "/proc/self/smaps_rollup"),
+}))
+"""
+
+
+def run_workers(mode: str, workers: int, compiled_path: Path):
+    processes = [
+        subprocess.Popen([sys.executable, "-c", WORKER, mode, str(PROJECT_ROOT), str(compiled_path)], stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    return [json.loads(process.communicate()[0]) for process in processes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare knowledge base cold start and memory: json.load vs compiled file")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--compiled", type=Path, default=COMPILED_KNOWLEDGE_BASE_PATH)
+    args = parser.parse_args()
+    if not args.compiled.exists():
+        parser.error(f"{args.compiled} not found, run scripts/build_knowledge_base.py")
+
+    for mode in ("json", "compiled"):
+        results = run_workers(mode, args.workers, args.compiled)
+        print(f"{mode:8s} x{args.workers}: load {1000 * statistics.median(r['load'] for r in results):7.2f} ms, "
+              f"load + first reading {1000 * statistics.median(r['first_reading'] for r in results):7.2f} ms (median), "
+              f"RSS growth {statistics.mean(r['rss_growth_kb'] for r in results) / 1024:5.2f} MB/worker, "
+              f"PSS {statistics.mean(r['pss_kb'] for r in results) / 1024:6.2f} MB/worker, "
+              f"{results[0]['found']} entries found")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Match List Maintenance Benchmark
+
+Loads a pool of random members (half grooms, half brides), builds every
+member's top-k list, then applies a random mix of joins, profile edits and
+removals and reports updates/sec. The baseline is rerunning matching for the
+whole pool (bulk top_matches over both sides) after a change. The lists are
+checked against a full re-ranking at the end.
+
+    python scripts/benchmark_match_lists.py --members 1000000 --updates 20000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.ashtakoota_services.compact_profile import segment_profile  # noqa: E402
+from app.services.ashtakoota_services.score_tensor import SEGMENT_PROFILE_CODE  # noqa: E402
+from app.services.bulk_matching import top_matches  # noqa: E402
+from app.services.candidate_pool import SIDES, CandidatePool  # noqa: E402
+from app.services.lunar_segments import NUM_SEGMENTS  # noqa: E402
+from app.services.match_lists import DEFAULT_TOP_K, MatchLists  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental top-k match list updates")
+    parser.add_argument("--members", type=int, default=1000000, help="Initial pool size (both sides)")
+    parser.add_argument("--updates", type=int, default=20000)
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    pool = CandidatePool(db_path=None)
+    segments = {side: rng.integers(0, NUM_SEGMENTS, args.members // 2) for side in SIDES}
+    ids = {side: pool.add_many(side, segments[side]).tolist() for side in SIDES}
+
+    start = time.perf_counter()
+    lists = MatchLists(pool, k=args.top_k)
+    build_time = time.perf_counter() - start
+
+    # Baseline: rerun matching for every member of both sides
+    start = time.perf_counter()
+    codes = {side: SEGMENT_PROFILE_CODE[segments[side]] for side in SIDES}
+    for side, partner_side in (("groom", "bride"), ("bride", "groom")):
+        for _ in top_matches(codes[side], codes[partner_side], side, args.top_k):
+            pass
+    rerun_time = time.perf_counter() - start
+
+    counts = {"join": 0, "edit": 0, "remove": 0}
+    timings = {"join": 0.0, "edit": 0.0, "remove": 0.0}
+    members = {side: list(ids[side]) for side in SIDES}
+    for _ in range(args.updates):
+        side = SIDES[rng.integers(0, 2)]
+        action = ("join", "edit", "remove")[rng.integers(0, 3)]
+        profile = segment_profile(int(rng.integers(0, NUM_SEGMENTS)))
+        start = time.perf_counter()
+        if action == "join":
+            members[side].append(lists.add(side, profile))
+        else:
+            position = int(rng.integers(0, len(members[side])))
+            candidate_id = members[side][position]
+            if action == "edit":
+                lists.add(side, profile, candidate_id)
+            else:
+                lists.remove(candidate_id)
+                members[side][position] = members[side][-1]
+                members[side].pop()
+        timings[action] += time.perf_counter() - start
+        counts[action] += 1
+
+    total_time = sum(timings.values())
+    print(f"{len(pool):,} members, top-{args.top_k}: lists built in {build_time * 1000:.1f} ms")
+    print(f"Rerunning matching for the whole pool: {rerun_time:.3f}s per update")
+    print(f"{args.updates:,} updates: {args.updates / total_time:,.0f} updates/sec overall")
+    for action in counts:
+        if counts[action]:
+            print(f"  {action:6s} {counts[action]:6d}  {counts[action] / timings[action]:12,.0f}/sec")
+    print(f"Lists differing from a full re-ranking: {lists.check()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Place Autocomplete Benchmark
+
+Builds the autocomplete index over a gazetteer and measures top-10 suggestion
+latency for prefix, typo and qualified queries. The bundled places CSV has
+~10k places; pass a larger CSV with the same columns (e.g. a GeoNames
+cities1000 export, ~140k places) to check latency at scale:
+
+    python scripts/benchmark_place_autocomplete.py
+    python scripts/benchmark_place_autocomplete.py --source cities1000.csv --output /tmp/gazetteer_large
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.gazetteer import GAZETTEER_DIR, Gazetteer, build_gazetteer  # noqa: E402
+from app.services.place_autocomplete import PlaceAutocomplete  # noqa: E402
+
+QUERIES = [
+    "a", "ah", "ahmed", "ahmedabad", "mumbia", "bombay", "varansi", "banglore",
+    "chenai", "kolkatta", "hyderbad", "pune, ind", "londn", "new yrok", "san", "sao paulo",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark place autocomplete latency")
+    parser.add_argument("--source", type=Path, help="Places CSV to index (defaults to the existing gazetteer)")
+    parser.add_argument("--output", type=Path, default=GAZETTEER_DIR, help="Gazetteer directory")
+    parser.add_argument("--rounds", type=int, default=200, help="Passes over the query list")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.source:
+        build_gazetteer(args.source, args.output)
+    gazetteer = Gazetteer(args.output)
+
+    start = time.perf_counter()
+    autocomplete = PlaceAutocomplete(gazetteer)
+    print(f"Indexed {len(gazetteer)} places ({gazetteer.keys.shape[0]} names) in {time.perf_counter() - start:.2f}s")
+
+    latencies = {query: [] for query in QUERIES}
+    for _ in range(args.rounds):
+        for query in QUERIES:
+            start = time.perf_counter()
+            autocomplete.suggest(query, args.limit)
+            latencies[query].append(time.perf_counter() - start)
+
+    print(f"Top-{args.limit} latency over {args.rounds} rounds (ms):")
+    for query, values in latencies.items():
+        values.sort()
+        labels = [s["label"] for s in autocomplete.suggest(query, 3)]
+        print(f"  {query!r:14s} p50 {1000 * statistics.median(values):6.3f}  max {1000 * values[-1]:6.3f}  {labels}")
+    overall = sorted(v for values in latencies.values() for v in values)
+    print(f"Overall: p50 {1000 * statistics.median(overall):.3f} ms, p99 {1000 * overall[int(0.99 * (len(overall) - 1))]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Sharded Matching Scaling Benchmark
+
+Times everyone's top-k matching between two random cohorts in a single
+process (bulk_matching.top_match_arrays) and with ShardedMatcher at several
+worker counts, and checks that every run returns identical lists. Worker
+startup is excluded (each pool is warmed up with a small job first). Speedup
+is bounded by the cores actually available, which is printed first.
+
+    python scripts/benchmark_sharded_matching.py
+    python scripts/benchmark_sharded_matching.py --people 1000000 --partners 1000000 --workers 1 2 4 8 --doshas
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.models import DoshaPolicy  # noqa: E402
+from app.services.ashtakoota_services.score_tensor import SEGMENT_PROFILE_CODE  # noqa: E402
+from app.services.bulk_matching import DEFAULT_TOP_K, top_match_arrays  # noqa: E402
+from app.services.sharded_matching import ShardedMatcher  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sharded bulk matching across worker counts")
+    parser.add_argument("--people", type=int, default=1000000, help="Grooms to find partners for")
+    parser.add_argument("--partners", type=int, default=1000000, help="Candidate brides")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--partner-shards", type=int, help="Candidate shards (default: 4 per worker)")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--doshas", action="store_true", help="Apply the default dosha policy to random dosha flags")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    people = SEGMENT_PROFILE_CODE[rng.integers(0, SEGMENT_PROFILE_CODE.shape[0], args.people)]
+    partners = SEGMENT_PROFILE_CODE[rng.integers(0, SEGMENT_PROFILE_CODE.shape[0], args.partners)]
+    screening = {}
+    if args.doshas:
+        screening = {
+            "person_flags": rng.integers(0, 16, args.people).astype(np.uint8),
+            "partner_flags": rng.integers(0, 16, args.partners).astype(np.uint8),
+            "dosha_policy": DoshaPolicy(),
+        }
+
+    pairs = args.people * args.partners
+    print(f"{os.cpu_count()} CPU(s) available; {args.people:,} x {args.partners:,} pairs, top-{args.top_k}")
+    start = time.perf_counter()
+    reference = top_match_arrays(people, partners, "groom", args.top_k, **screening)
+    single_time = time.perf_counter() - start
+    print(f"single process: {single_time:7.3f}s  {pairs / single_time:,.0f} pairs/sec")
+
+    for workers in args.workers:
+        with ShardedMatcher(workers=workers) as matcher:
+            warm_up = {name: value[:1000] if name.endswith("flags") else value for name, value in screening.items()}
+            matcher.top_matches(people[:1000], partners[:1000], "groom", args.top_k, **warm_up)
+            start = time.perf_counter()
+            result = matcher.top_matches(people, partners, "groom", args.top_k, partner_shards=args.partner_shards, **screening)
+            elapsed = time.perf_counter() - start
+        same = np.array_equal(result[0], reference[0]) and np.array_equal(result[1], reference[1])
+        print(f"{workers} worker(s):    {elapsed:7.3f}s  {pairs / elapsed:,.0f} pairs/sec, "
+              f"speedup {single_time / elapsed:.2f}x, identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
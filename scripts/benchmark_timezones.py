@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Timezone Resolution Benchmark
+
+Simulates a bulk import of birth records (random gazetteer places, random
+local birth times over 1800-2399) and times each step of offline offset
+resolution against a per-record zoneinfo baseline:
+
+    coordinates -> IANA zone     (TimezoneLocator, per record and per grid cell)
+    zone + local time -> offset  (cached transition tables, vectorized per zone)
+
+It also checks the resolved offsets against zoneinfo (fold=0).
+
+    python scripts/benchmark_timezones.py --records 200000
+"""
+
+import argparse
+import sys
+import time
+import zoneinfo
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.gazetteer import get_gazetteer  # noqa: E402
+from app.services.timezones import get_timezone_locator, utc_offsets_hours  # noqa: E402
+
+
+def random_records(count: int, seed: int):
+    """Random (latitude, longitude, local datetime) records near gazetteer places."""
+    gazetteer = get_gazetteer()
+    rng = np.random.default_rng(seed)
+    places = rng.integers(0, len(gazetteer), count)
+    latitudes = np.asarray(gazetteer.latitude)[places] + rng.uniform(-0.05, 0.05, count)
+    longitudes = np.asarray(gazetteer.longitude)[places] + rng.uniform(-0.05, 0.05, count)
+    start = np.datetime64("1800-01-01T00:00:00", "s").astype(np.int64)
+    end = np.datetime64("2399-12-31T23:59:59", "s").astype(np.int64)
+    local = rng.integers(start, end, count).astype("datetime64[s]")
+    return latitudes, longitudes, local
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline timezone and UTC offset resolution")
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--baseline-records", type=int, default=20000, help="Records resolved with zoneinfo for the baseline and check")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    latitudes, longitudes, local = random_records(args.records, args.seed)
+    locator = get_timezone_locator()
+
+    count = min(args.baseline_records, args.records)
+    start = time.perf_counter()
+    single = [locator.timezone_at(lat, lon) for lat, lon in zip(latitudes[:count].tolist(), longitudes[:count].tolist())]
+    single_time = (time.perf_counter() - start) * args.records / count
+
+    start = time.perf_counter()
+    zones = locator.timezones_at(latitudes, longitudes)
+    locate_time = time.perf_counter() - start
+    if list(zones[:count]) != single:
+        print("Warning: bulk and per-record zone lookups disagree")
+
+    start = time.perf_counter()
+    offsets = utc_offsets_hours(zones, local)
+    cold_time = time.perf_counter() - start
+    start = time.perf_counter()
+    offsets = utc_offsets_hours(zones, local)
+    warm_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = np.array([
+        datetime.fromisoformat(str(t)).replace(tzinfo=zoneinfo.ZoneInfo(zone)).utcoffset().total_seconds() / 3600
+        for zone, t in zip(zones[:count].tolist(), local[:count])
+    ])
+    baseline_time = (time.perf_counter() - start) * args.records / count
+
+    print(f"{args.records} records, {np.unique(zones).shape[0]} distinct zones")
+    print(f"  coordinates -> zone (each):  {single_time:7.3f}s  {args.records / single_time:12,.0f} records/sec (extrapolated from {count})")
+    print(f"  coordinates -> zone (bulk):  {locate_time:7.3f}s  {args.records / locate_time:12,.0f} records/sec")
+    print(f"  offsets (cold, parse zones): {cold_time:7.3f}s  {args.records / cold_time:12,.0f} records/sec")
+    print(f"  offsets (cached tables):     {warm_time:7.3f}s  {args.records / warm_time:12,.0f} records/sec")
+    print(f"  zoneinfo per record:         {baseline_time:7.3f}s  {args.records / baseline_time:12,.0f} records/sec (extrapolated from {count})")
+    mismatches = int(np.count_nonzero(np.abs(offsets[:count] - expected) > 1e-9))
+    print(f"Offsets differing from zoneinfo: {mismatches} of {count}")
+
+
+if __name__ == "__main__":
+    main()
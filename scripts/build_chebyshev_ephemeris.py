@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Chebyshev Ephemeris Cache Builder
+
+Fits app/data/chebyshev_ephemeris (piecewise Chebyshev series of every
+planet's sidereal longitude for 1800-2399) against the Swiss Ephemeris, then
+measures the maximum longitude and speed error at random instants and records
+it in the cache's meta.json.
+
+    python scripts/build_chebyshev_ephemeris.py
+    python scripts/build_chebyshev_ephemeris.py --start-year 1990 --end-year 2000 --validate 5000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import swisseph as swe
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.config import PLANETS  # noqa: E402
+from app.services.chebyshev_ephemeris import (  # noqa: E402
+    CHEBYSHEV_DIR,
+    RANGE_END_JD,
+    RANGE_START_JD,
+    SEGMENT_LAYOUT,
+    ChebyshevEphemeris,
+    exact_longitudes,
+    fit_planet,
+    save_chebyshev_ephemeris,
+)
+
+
+def measure_errors(cache: ChebyshevEphemeris, samples: int, seed: int):
+    """Maximum |fast - exact| per planet at random instants: (longitude arcsec, speed deg/day)."""
+    rng = np.random.default_rng(seed)
+    jds = rng.uniform(cache.start_jd, cache.end_jd, samples)
+    exact_lon, exact_speed = exact_longitudes(jds)
+    fast_lon, fast_speed = cache.longitudes(jds)
+    lon_error = np.abs((fast_lon - exact_lon + 180) % 360 - 180).max(axis=0) * 3600
+    speed_error = np.abs(fast_speed - exact_speed).max(axis=0)
+    return (
+        {planet: float(lon_error[index]) for index, planet in enumerate(PLANETS)},
+        {planet: float(speed_error[index]) for index, planet in enumerate(PLANETS)},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Chebyshev ephemeris cache")
+    parser.add_argument("--start-year", type=int, default=1800)
+    parser.add_argument("--end-year", type=int, default=2399, help="Last year covered (inclusive)")
+    parser.add_argument("--output", type=Path, default=CHEBYSHEV_DIR)
+    parser.add_argument("--validate", type=int, default=200000, help="Random instants used to measure the error")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    start_jd = max(RANGE_START_JD, swe.julday(args.start_year, 1, 1, 0.0))
+    end_jd = min(RANGE_END_JD, swe.julday(args.end_year + 1, 1, 1, 0.0))
+
+    started = time.perf_counter()
+    coefficients = {}
+    for planet in SEGMENT_LAYOUT:
+        coefficients[planet] = fit_planet(planet, start_jd, end_jd)
+        print(f"  {planet}: {coefficients[planet].shape[0]} segments x {coefficients[planet].shape[1]} coefficients")
+    save_chebyshev_ephemeris(coefficients, start_jd, end_jd, {}, args.output)
+    size_mb = sum(c.nbytes for c in coefficients.values()) / 1e6
+    print(f"Built Chebyshev ephemeris ({size_mb:.1f} MB) in {time.perf_counter() - started:.1f}s -> {args.output}")
+
+    if args.validate:
+        lon_errors, speed_errors = measure_errors(ChebyshevEphemeris(args.output), args.validate, args.seed)
+        save_chebyshev_ephemeris(coefficients, start_jd, end_jd, lon_errors, args.output)
+        print(f"Max error over {args.validate} random instants:")
+        for planet in PLANETS:
+            print(f"  {planet:8s} longitude {lon_errors[planet]:.4f}\"  speed {speed_errors[planet]:.2e} deg/day")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Offline Gazetteer Builder
+
+Compiles a places CSV (the bundled app/data/places.csv by default) into the
+memory-mapped gazetteer index, then resolves a few sample names and times
+lookups. Any CSV with the same columns works, which makes it easy to build
+and inspect an index from a small fixture such as tests/fixtures/places.csv:
+
+    python scripts/build_gazetteer.py
+    python scripts/build_gazetteer.py --source tests/fixtures/places.csv --output /tmp/gazetteer --query "Springfield, US"
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.gazetteer import GAZETTEER_DIR, PLACES_CSV, Gazetteer, build_gazetteer  # noqa: E402
+
+SAMPLE_QUERIES = [
+    "Ahmedabad, India",
+    "Mumbai, Maharashtra, India",
+    "Bombay",
+    "Varanasi, Uttar Pradesh, India",
+    "London, United Kingdom",
+    "Nowhere Town",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline gazetteer index")
+    parser.add_argument("--source", type=Path, default=PLACES_CSV, help="Places CSV")
+    parser.add_argument("--output", type=Path, default=GAZETTEER_DIR)
+    parser.add_argument("--query", action="append", help="Place name to resolve (repeatable, defaults to a few samples)")
+    parser.add_argument("--lookups", type=int, default=100000, help="Lookups timed over the queries")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    places = build_gazetteer(args.source, args.output)
+    size_kb = sum(path.stat().st_size for path in args.output.glob("*.npy")) / 1e3
+    print(f"Indexed {places} places ({size_kb:.0f} KB) in {time.perf_counter() - started:.2f}s -> {args.output}")
+
+    gazetteer = Gazetteer(args.output)
+    queries = args.query or SAMPLE_QUERIES
+    for query in queries:
+        print(f"  {query!r} -> {gazetteer.lookup(query)}")
+
+    if args.lookups:
+        start = time.perf_counter()
+        for i in range(args.lookups):
+            gazetteer.lookup(queries[i % len(queries)])
+        elapsed = time.perf_counter() - start
+        print(f"{args.lookups} lookups in {elapsed:.2f}s -> {1e6 * elapsed / args.lookups:.1f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
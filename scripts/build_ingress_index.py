@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Planetary Sign-Ingress Index Builder
+
+Generates app/data/ingress_index (sign ingresses and retrograde stations of
+every planet for 1800-2399), then sweeps random instants and checks every
+planet's sign and retrograde flag against a direct Swiss Ephemeris calculation.
+
+    python scripts/build_ingress_index.py
+    python scripts/build_ingress_index.py --start-year 1990 --end-year 2000 --validate 5000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import swisseph as swe
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.config import PLANETS  # noqa: E402
+from app.services.kundali_chart import calculate_planetary_positions  # noqa: E402
+from app.services.ingress_index import (  # noqa: E402
+    INGRESS_INDEX_DIR,
+    RANGE_END_JD,
+    RANGE_START_JD,
+    IngressIndex,
+    build_ingress_index,
+)
+
+
+def validate(index: IngressIndex, samples: int, seed: int) -> int:
+    """Compare index lookups with the ephemeris at random instants, return the mismatch count."""
+    rng = np.random.default_rng(seed)
+    jds = rng.uniform(index.start_jd, index.end_jd, samples)
+    signs = {planet: index.sign_at(planet, jds) for planet in PLANETS}
+    retrograde = {planet: index.retrograde_at(planet, jds) for planet in PLANETS}
+
+    mismatches = 0
+    for row, jd in enumerate(jds):
+        positions, retrograde_status = calculate_planetary_positions(float(jd))
+        for planet in PLANETS:
+            if int(positions[planet] // 30) + 1 != signs[planet][row] or retrograde_status[planet] != retrograde[planet][row]:
+                mismatches += 1
+                print(f"Mismatch: {planet} at JD {jd:.6f}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the planetary sign-ingress index")
+    parser.add_argument("--start-year", type=int, default=1800)
+    parser.add_argument("--end-year", type=int, default=2399, help="Last year covered (inclusive)")
+    parser.add_argument("--output", type=Path, default=INGRESS_INDEX_DIR)
+    parser.add_argument("--validate", type=int, default=20000, help="Random instants to check against the ephemeris")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    start_jd = max(RANGE_START_JD, swe.julday(args.start_year, 1, 1, 0.0))
+    end_jd = min(RANGE_END_JD, swe.julday(args.end_year + 1, 1, 1, 0.0))
+
+    started = time.perf_counter()
+    build_ingress_index(start_jd, end_jd, args.output)
+    size_kb = sum(path.stat().st_size for path in args.output.glob("*.npy")) / 1e3
+    print(f"Built ingress index ({size_kb:.0f} KB) in {time.perf_counter() - started:.1f}s -> {args.output}")
+
+    if args.validate:
+        mismatches = validate(IngressIndex(args.output), args.validate, args.seed)
+        print(f"Validation: {mismatches} mismatches in {args.validate} instants x {len(PLANETS)} planets")
+        if mismatches:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
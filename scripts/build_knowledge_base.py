@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Compiled Knowledge Base Builder
+
+Compiles app/data/vedic_knowledge_base.json into the memory-mappable binary
+format read by KnowledgeBaseService (see compiled_knowledge_base), then
+checks every entry against the JSON. Rerun after the generate_*_knowledge_base
+scripts add entries; the service falls back to the JSON while the compiled
+file is older.
+
+    python scripts/build_knowledge_base.py
+    python scripts/build_knowledge_base.py --no-compress
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.compiled_knowledge_base import (  # noqa: E402
+    COMPILED_KNOWLEDGE_BASE_PATH,
+    CompiledKnowledgeBase,
+    compile_knowledge_base,
+)
+from app.services.knowledge_base_service import KNOWLEDGE_BASE_PATH  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the knowledge base JSON into the binary format")
+    parser.add_argument("--input", type=Path, default=KNOWLEDGE_BASE_PATH)
+    parser.add_argument("--output", type=Path, default=COMPILED_KNOWLEDGE_BASE_PATH)
+    parser.add_argument("--no-compress", action="store_true", help="Store records as raw JSON")
+    args = parser.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        knowledge_base = json.load(f)
+    stats = compile_knowledge_base(knowledge_base, args.output, compress=not args.no_compress)
+    print(f"Compiled {stats['entries']} entries ({stats['raw_bytes'] / 1000:.0f} KB of JSON) "
+          f"into {args.output} ({stats['file_bytes'] / 1000:.0f} KB)")
+
+    compiled = CompiledKnowledgeBase(args.output)
+    mismatches = sum(compiled.get(key) != value for key, value in knowledge_base.items())
+    print(f"Entries differing from the JSON: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Moon Transition Table Builder
+
+Generates app/data/moon_table (Moon segment ingress times for 1800-2399) by
+root-finding against the Swiss Ephemeris, then spot-checks random instants
+against a direct ephemeris calculation.
+
+    python scripts/build_moon_table.py
+    python scripts/build_moon_table.py --start-year 1990 --end-year 2000 --validate 5000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import swisseph as swe
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.services.ephemeris import get_ephemeris_session  # noqa: E402
+from app.services.lunar_segments import segment_of_longitude  # noqa: E402
+from app.services.moon_table import (  # noqa: E402
+    MOON_TABLE_DIR,
+    RANGE_END_JD,
+    RANGE_START_JD,
+    MoonTable,
+    build_moon_table,
+    save_moon_table,
+)
+
+
+def validate(table: MoonTable, samples: int, seed: int) -> int:
+    """Compare table lookups with the ephemeris at random instants, return the mismatch count."""
+    rng = np.random.default_rng(seed)
+    jds = rng.uniform(table.start_jd, table.end_jd, samples)
+    looked_up = table.segment_at(jds)
+    session = get_ephemeris_session()
+    mismatches = 0
+    for jd, segment in zip(jds, looked_up):
+        longitude = session.calc_ut(float(jd), swe.MOON, swe.FLG_SIDEREAL)[0][0]
+        if int(segment_of_longitude(longitude)) != int(segment):
+            mismatches += 1
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Moon segment transition table")
+    parser.add_argument("--start-year", type=int, default=1800)
+    parser.add_argument("--end-year", type=int, default=2399, help="Last year covered (inclusive)")
+    parser.add_argument("--output", type=Path, default=MOON_TABLE_DIR)
+    parser.add_argument("--validate", type=int, default=20000, help="Random instants to check against the ephemeris")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    start_jd = max(RANGE_START_JD, swe.julday(args.start_year, 1, 1, 0.0))
+    end_jd = min(RANGE_END_JD, swe.julday(args.end_year + 1, 1, 1, 0.0))
+
+    started = time.perf_counter()
+    times, segments = build_moon_table(start_jd, end_jd)
+    save_moon_table(times, segments, end_jd, args.output)
+    size_mb = (times.nbytes + segments.nbytes) / 1e6
+    print(f"Built {times.shape[0]} ingress entries ({size_mb:.1f} MB) in {time.perf_counter() - started:.1f}s -> {args.output}")
+
+    if args.validate:
+        mismatches = validate(MoonTable(args.output), args.validate, args.seed)
+        print(f"Validation: {mismatches} mismatches in {args.validate} random instants")
+        if mismatches:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Bulk Matchmaking
+
+Finds each person's top-k Ashtakoota matches between two cohorts and writes
+them as CSV (side, person_id, rank, partner_id, score), or with --format as
+an Arrow/Parquet/NDJSON table that also has every koota score and both
+sides' rashi and nakshatra (see columnar_export). Cohort CSVs have an
+optional id column and either a precomputed lunar segment column (segment,
+0-109, with an optional dosha_flags column, see dosha.dosha_flags) or birth
+details: year, month, day, hour, minute, second and birth_place or place_id.
+Dosha screening is applied when any of --manglik, --nadi or --bhakoota is
+given (the other doshas keep the DoshaPolicy defaults).
+
+    python scripts/bulk_match.py --grooms grooms.csv --brides brides.csv --output matches.csv
+    python scripts/bulk_match.py --random 50000 50000 --side both --output /dev/null
+    python scripts/bulk_match.py --random 50000 50000 --manglik reject --nadi penalize --output /dev/null
+    python scripts/bulk_match.py --random 1000000 1000000 --side groom --workers 8 --output matches.csv
+    python scripts/bulk_match.py --random 100000 100000 --format parquet --output matches.parquet
+
+Timing for each stage (profiles, matching, writing) and pairs/sec go to stderr.
+"""
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Setup paths
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.config import MATCH_SCORE_THRESHOLD  # noqa: E402
+from app.models import APIBirthDetails, DoshaPolicy  # noqa: E402
+from app.services.ashtakoota_services.score_tensor import SEGMENT_PROFILE_CODE  # noqa: E402
+from app.services.bulk_matching import DEFAULT_TOP_K, cohort_from_details, top_match_arrays  # noqa: E402
+from app.services.columnar_export import FORMATS, match_columns, write_columns  # noqa: E402
+from app.services.sharded_matching import ShardedMatcher  # noqa: E402
+
+
+def load_cohort(path: Path, doshas: bool):
+    """Read a cohort CSV, return (ids, profile codes, dosha flags or None)."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    ids = [row.get("id") or str(index) for index, row in enumerate(rows)]
+    if rows and "segment" in rows[0]:
+        codes = SEGMENT_PROFILE_CODE[np.array([int(row["segment"]) for row in rows], dtype=np.intp)]
+        flags = np.array([int(row.get("dosha_flags") or 0) for row in rows], dtype=np.uint8) if doshas else None
+        return ids, codes, flags
+    details = []
+    for row in rows:
+        fields = {key: int(row[key]) for key in ("year", "month", "day", "hour", "minute", "second")}
+        if row.get("birth_place"):
+            fields["birth_place"] = row["birth_place"]
+        if row.get("place_id"):
+            fields["place_id"] = int(row["place_id"])
+        details.append(APIBirthDetails(**fields))
+    return (ids, *cohort_from_details(details, doshas))
+
+
+def random_cohort(count: int, rng: np.random.Generator):
+    """Synthetic cohort of random Moon segments and dosha flags."""
+    segments = rng.integers(0, SEGMENT_PROFILE_CODE.shape[0], count)
+    flags = rng.integers(0, 16, count).astype(np.uint8)
+    return [str(index) for index in range(count)], SEGMENT_PROFILE_CODE[segments], flags
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find each person's top Ashtakoota matches between two cohorts")
+    parser.add_argument("--grooms", type=Path, help="Groom cohort CSV")
+    parser.add_argument("--brides", type=Path, help="Bride cohort CSV")
+    parser.add_argument("--random", type=int, nargs=2, metavar=("GROOMS", "BRIDES"), help="Use random cohorts of these sizes instead")
+    parser.add_argument("--side", choices=["groom", "bride", "both"], default="both", help="Whose partners to rank")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--threshold", type=float, default=MATCH_SCORE_THRESHOLD, help="Matches must score above this total")
+    for dosha in ("manglik", "nadi", "bhakoota"):
+        parser.add_argument(f"--{dosha}", choices=["ignore", "penalize", "reject"], help=f"Action for {dosha.capitalize()} dosha")
+    parser.add_argument("--workers", type=int, default=0, help="Match in this many worker processes (default: in this process)")
+    parser.add_argument("--format", choices=["csv", *FORMATS], default="csv",
+                        help="csv (default), or columnar arrow/parquet (need pyarrow) / ndjson with coded rashi, nakshatra and koota columns")
+    parser.add_argument("--output", type=Path, help="Output file (default: stdout, csv only)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    actions = {dosha: getattr(args, dosha) for dosha in ("manglik", "nadi", "bhakoota") if getattr(args, dosha)}
+    dosha_policy = DoshaPolicy(**actions) if actions else None
+
+    start = time.perf_counter()
+    if args.random:
+        rng = np.random.default_rng(args.seed)
+        groom_ids, groom_codes, groom_flags = random_cohort(args.random[0], rng)
+        bride_ids, bride_codes, bride_flags = random_cohort(args.random[1], rng)
+    elif args.grooms and args.brides:
+        groom_ids, groom_codes, groom_flags = load_cohort(args.grooms, dosha_policy is not None)
+        bride_ids, bride_codes, bride_flags = load_cohort(args.brides, dosha_policy is not None)
+    else:
+        parser.error("pass --grooms and --brides, or --random")
+    print(f"Profiles: {len(groom_ids)} grooms, {len(bride_ids)} brides in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+    sides = ["groom", "bride"] if args.side == "both" else [args.side]
+    if args.format != "csv" and not args.output:
+        parser.error(f"--format {args.format} needs --output")
+    output = open(args.output, "w", encoding="utf-8", newline="") if args.format == "csv" and args.output else sys.stdout
+    matcher = ShardedMatcher(args.workers) if args.workers else None
+    exported = []
+    try:
+        writer = csv.writer(output)
+        if args.format == "csv":
+            writer.writerow(["side", "person_id", "rank", "partner_id", "score"])
+        for side in sides:
+            people, partners = (groom_codes, bride_codes) if side == "groom" else (bride_codes, groom_codes)
+            person_ids, partner_ids = (groom_ids, bride_ids) if side == "groom" else (bride_ids, groom_ids)
+            person_flags, partner_flags = (groom_flags, bride_flags) if side == "groom" else (bride_flags, groom_flags)
+            start = time.perf_counter()
+            screening = {"person_flags": person_flags, "partner_flags": partner_flags, "dosha_policy": dosha_policy}
+            if matcher is not None:
+                partner_rows, half_points = matcher.top_matches(people, partners, side, args.top_k, args.threshold, **screening)
+            else:
+                partner_rows, half_points = top_match_arrays(people, partners, side, args.top_k, args.threshold, **screening)
+            match_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            matched = int(np.count_nonzero(partner_rows[:, 0] >= 0))
+            if args.format == "csv":
+                for person, rank in zip(*np.nonzero(partner_rows >= 0)):
+                    writer.writerow([side, person_ids[person], rank + 1, partner_ids[partner_rows[person, rank]],
+                                     half_points[person, rank] / 2])
+            else:
+                exported.append(match_columns(people, partners, partner_rows, half_points, side, person_ids, partner_ids))
+            write_time = time.perf_counter() - start
+
+            pairs = len(people) * len(partners)
+            print(f"{side}s: {pairs:,} pairs matched in {match_time:.3f}s ({pairs / max(match_time, 1e-9):,.0f} pairs/sec), "
+                  f"{matched} of {len(people)} with a match above {args.threshold}, written in {write_time:.2f}s", file=sys.stderr)
+
+        if exported:
+            start = time.perf_counter()
+            write_columns({name: np.concatenate([columns[name] for columns in exported]) for name in exported[0]},
+                          args.output, args.format)
+            print(f"{args.format} written in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    finally:
+        if matcher is not None:
+            matcher.close()
+        if output is not sys.stdout:
+            output.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+import os
+import sys
+from pathlib import Path
+
+# Setup paths
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# Keep LiteLLM (imported with the agent) from fetching its model cost map over the network
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from langchain_core.messages import HumanMessage, ToolMessage
+
+from app.services.agent.graph import create_agent_graph, extract_kundali_data
+from app.services.agent.scripted_model import ScriptedChatModel, interpretations
+from app.services.agent.tools import generate_kundali_chart, query_knowledge_base, query_knowledge_base_batch
+from app.services.agent.tools.knowledge_base_batch_tool import chart_queries
+
+BIRTH = {"day": 15, "month": 6, "year": 1990, "hour": 10, "minute": 30, "birth_place": "Mumbai, Maharashtra, India"}
+QUESTION = "Note: My birth details are - Date: 15/6/1990, Time: 10:30, Place: Mumbai, Maharashtra, India. How will my career go?"
+TOOLS = [generate_kundali_chart, query_knowledge_base_batch, query_knowledge_base]
+
+
+def run(strategy: str, topic: str = "career"):
+    """LLM calls and final messages of one reading with the scripted model."""
+    model = ScriptedChatModel(strategy=strategy, topic=topic, birth=BIRTH)
+    graph = create_agent_graph(model, TOOLS, prefetch=strategy == "prefetch")
+    result = graph.invoke({"messages": [HumanMessage(content=QUESTION)], "kundali_data": None, "llm_calls": 0},
+                          {"recursion_limit": 200})
+    assert result["llm_calls"] == model.calls
+    return model.calls, result["messages"]
+
+
+@pytest.fixture(scope="module")
+def chart():
+    return generate_kundali_chart.invoke(BIRTH)
+
+
+@pytest.fixture(scope="module")
+def readings():
+    return {strategy: run(strategy) for strategy in ("single", "batch", "prefetch")}
+
+
+def test_batch_tool_needs_fewer_llm_calls(chart, readings):
+    queries = len(chart_queries(chart, "career"))
+    # Chart, one call per query, then the answer
+    assert readings["single"][0] >= queries + 2
+    # Chart, one batch call, then the answer
+    assert readings["batch"][0] <= 3
+    assert readings["batch"][0] < readings["single"][0]
+
+
+def test_prefetch_answers_in_one_llm_call(readings):
+    calls, messages = readings["prefetch"]
+    assert calls == 1
+    assert [message.name for message in messages if isinstance(message, ToolMessage)] == [
+        "generate_kundali_chart", "query_knowledge_base_batch"]
+
+
+def test_strategies_retrieve_the_same_interpretations(readings):
+    batch = interpretations(readings["batch"][1])
+    assert batch
+    assert set(batch) <= set(interpretations(readings["single"][1]))
+    assert set(batch) <= set(interpretations(readings["prefetch"][1]))
+
+
+def test_latest_chart_replaces_the_prefetched_one(chart):
+    newer = {**chart, "ascendant_sign": "Libra"}
+    state = {
+        "kundali_data": {**chart, "ascendant_sign": "Aries"},
+        "messages": [ToolMessage(content=json.dumps(newer), tool_call_id="call_1", name="generate_kundali_chart")],
+    }
+    assert extract_kundali_data(state)["ascendant_sign"] == "Libra"
+    assert extract_kundali_data({"kundali_data": chart, "messages": []}) == chart
+    assert extract_kundali_data({"messages": []}) is None
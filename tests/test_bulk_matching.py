@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from app.config import MATCH_SCORE_THRESHOLD
+from app.models import DoshaPolicy
+from app.services.ashtakoota_services.dosha import REJECTED
+from app.services.ashtakoota_services.score_tensor import SEGMENT_PROFILE_CODE
+from app.services.bulk_matching import score_blocks, top_match_arrays, top_matches, top_matches_brute_force
+
+K = 5
+
+
+@pytest.fixture(scope="module")
+def cohorts():
+    rng = np.random.default_rng(0)
+    grooms = SEGMENT_PROFILE_CODE[rng.integers(0, SEGMENT_PROFILE_CODE.shape[0], 700)]
+    brides = SEGMENT_PROFILE_CODE[rng.integers(0, SEGMENT_PROFILE_CODE.shape[0], 500)]
+    groom_flags = rng.integers(0, 16, grooms.shape[0]).astype(np.uint8)
+    bride_flags = rng.integers(0, 16, brides.shape[0]).astype(np.uint8)
+    return grooms, brides, groom_flags, bride_flags
+
+
+def ranked(row, k=K, threshold=MATCH_SCORE_THRESHOLD):
+    """Best k entries above threshold by a full sort: higher total first, then the lower index."""
+    order = np.lexsort((np.arange(row.shape[0]), -row.astype(np.int64)))
+    order = order[row[order] > threshold * 2][:k]
+    return order, row[order] / 2
+
+
+def test_top_matches_agree_with_brute_force(cohorts):
+    grooms, brides, _, _ = cohorts
+    fast = list(top_matches(grooms, brides, "groom", k=K, block_elements=4096))
+    reference = list(top_matches_brute_force(grooms, brides, k=K, block_elements=4096))
+    assert len(fast) == len(reference) == grooms.shape[0]
+    for (person, partners, scores), (expected_person, expected_partners, expected_scores) in zip(fast, reference):
+        assert person == expected_person
+        assert np.array_equal(partners, expected_partners)
+        assert np.array_equal(scores, expected_scores)
+
+
+def test_top_matches_agree_with_a_full_sort(cohorts):
+    grooms, brides, _, _ = cohorts
+    full = np.concatenate([block for _, block in score_blocks(grooms, brides)])
+    for person, partners, scores in top_matches(brides, grooms, "bride", k=K):
+        expected_partners, expected_scores = ranked(full[:, person])
+        assert np.array_equal(partners, expected_partners)
+        assert np.array_equal(scores, expected_scores)
+
+
+def test_dosha_screening_agrees_with_the_screened_matrix(cohorts):
+    grooms, brides, groom_flags, bride_flags = cohorts
+    policy = DoshaPolicy(nadi="penalize", bhakoota="penalize")
+    full = np.concatenate([block for _, block in score_blocks(grooms, brides, groom_flags=groom_flags,
+                                                              bride_flags=bride_flags, dosha_policy=policy)])
+    assert np.count_nonzero(full == REJECTED)
+    screened = top_matches(brides, grooms, "bride", k=K, person_flags=bride_flags, partner_flags=groom_flags, dosha_policy=policy)
+    for person, partners, scores in screened:
+        expected_partners, expected_scores = ranked(full[:, person])
+        assert np.array_equal(partners, expected_partners)
+        assert np.array_equal(scores, expected_scores)
+
+
+def test_top_match_arrays_pad_the_streamed_matches(cohorts):
+    grooms, brides, _, _ = cohorts
+    partners, half_points = top_match_arrays(grooms, brides, "groom", k=K, threshold=27)
+    assert partners.shape == half_points.shape == (grooms.shape[0], K)
+    for person, row_partners, scores in top_matches(grooms, brides, "groom", k=K, threshold=27):
+        count = row_partners.shape[0]
+        assert np.array_equal(partners[person, :count], row_partners)
+        assert np.array_equal(half_points[person, :count] / 2, scores)
+        assert (partners[person, count:] == -1).all()
+        assert (half_points[person, count:] == REJECTED).all()
+
+
+def test_unknown_side_raises(cohorts):
+    grooms, brides, _, _ = cohorts
+    with pytest.raises(ValueError):
+        list(top_matches(grooms, brides, "partner"))
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from app.config import MATCH_SCORE_THRESHOLD
+from app.services.ashtakoota_services.calculate_score import calculate_ashtakoota
+from app.services.ashtakoota_services.compact_profile import segment_profile
+from app.services.candidate_pool import CandidatePool
+from app.services.lunar_segments import NUM_SEGMENTS
+
+
+def populate(pool):
+    """Bulk-load brides, remove some, then re-add and edit others one by one."""
+    rng = np.random.default_rng(0)
+    brides = pool.add_many("bride", rng.integers(0, NUM_SEGMENTS, 600))
+    pool.add_many("groom", rng.integers(0, NUM_SEGMENTS, 50))
+    for candidate_id in brides[:80].tolist():
+        pool.remove(candidate_id)
+    pool.add("bride", segment_profile(75), candidate_id=int(brides[0]))
+    for candidate_id in brides[100:130].tolist():
+        pool.add("bride", segment_profile(int(rng.integers(0, NUM_SEGMENTS))), candidate_id=candidate_id)
+    return brides
+
+
+def expected_matches(pool, groom, candidate_ids, threshold=MATCH_SCORE_THRESHOLD):
+    """Score every stored bride with calculate_ashtakoota."""
+    expected = []
+    for candidate_id in candidate_ids:
+        stored = pool.get(candidate_id)
+        if stored is not None and stored[0] == "bride":
+            score = calculate_ashtakoota(groom.to_model(), stored[1].to_model()).total
+            if score > threshold:
+                expected.append({"candidate_id": candidate_id, "score": score})
+    expected.sort(key=lambda match: (-match["score"], match["candidate_id"]))
+    return expected
+
+
+@pytest.mark.parametrize("segment", [0, 40, 77, 107])
+def test_search_agrees_with_calculate_ashtakoota(segment):
+    pool = CandidatePool(db_path=None)
+    brides = populate(pool)
+    groom = segment_profile(segment)
+    expected = expected_matches(pool, groom, brides.tolist())
+    result = pool.search(groom, "groom", limit=len(pool))
+    assert result["total"] == len(expected)
+    assert result["matches"] == expected
+
+
+def test_search_pages_through_the_same_ranking():
+    pool = CandidatePool(db_path=None)
+    brides = populate(pool)
+    groom = segment_profile(40)
+    expected = expected_matches(pool, groom, brides.tolist(), threshold=20)
+    pages = [pool.search(groom, "groom", threshold=20, limit=7, offset=offset) for offset in range(0, len(expected) + 7, 7)]
+    assert all(page["total"] == len(expected) for page in pages)
+    assert [match for page in pages for match in page["matches"]] == expected
+
+
+def test_pool_is_reloaded_from_sqlite(tmp_path):
+    pool = CandidatePool(db_path=tmp_path / "candidates.db")
+    brides = populate(pool)
+    groom = segment_profile(40)
+    before = pool.search(groom, "groom", limit=len(pool))
+    size = len(pool)
+    pool.close()
+
+    reopened = CandidatePool(db_path=tmp_path / "candidates.db")
+    assert len(reopened) == size
+    assert reopened.count("bride") == 600 - 80 + 1
+    assert reopened.get(int(brides[0])) == ("bride", segment_profile(75))
+    assert reopened.get(int(brides[1])) is None
+    assert reopened.search(groom, "groom", limit=len(reopened)) == before
+    assert reopened.add("groom", segment_profile(3)) > int(brides.max())
+    reopened.close()
+
+
+def test_invalid_requests_raise():
+    pool = CandidatePool(db_path=None)
+    ids = pool.add_many("groom", [1, 2, 3])
+    with pytest.raises(ValueError):
+        pool.add_many("groom", [4], candidate_ids=[int(ids[0])])
+    with pytest.raises(ValueError):
+        pool.add("partner", segment_profile(0))
+    with pytest.raises(ValueError):
+        pool.search(segment_profile(0), "partner")
+    assert not pool.remove(12345)
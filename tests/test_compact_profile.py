@@ -0,0 +1,46 @@
+import pickle
+
+import pytest
+
+from app.services.ashtakoota_services.compact_profile import (
+    SEGMENT_PROFILES,
+    SEGMENT_RECORDS,
+    compact_profile,
+    from_model,
+    segment_profile,
+)
+from app.services.ashtakoota_services.generate_profile import generate_ashtakoota_profile
+from app.services.ashtakoota_services.score_tensor import profile_code_of
+from app.services.lunar_segments import NUM_SEGMENTS, describe_segment
+
+
+@pytest.mark.parametrize("segment", range(NUM_SEGMENTS))
+def test_profiles_match_generate_ashtakoota_profile(segment):
+    details = describe_segment(segment)
+    model = generate_ashtakoota_profile(details["zodiac"], details["deviation"], details["nakshatra"])
+    profile = segment_profile(segment)
+    assert profile.to_model() == model
+    assert from_model(model, profile.pada) is profile
+    assert profile.code == profile_code_of(model)
+    assert SEGMENT_RECORDS[segment].tolist() == profile.record()
+
+
+def test_profiles_are_interned():
+    assert compact_profile(9, 20, 2, 16.0) is compact_profile(9, 20, 2, 16.0)
+    # Purva Ashadha pada 1 straddles 15° of Sagittarius, where the Vashya changes
+    assert compact_profile(9, 20, 1, 14.0).vashya != compact_profile(9, 20, 1, 16.0).vashya
+    assert pickle.loads(pickle.dumps(SEGMENT_PROFILES[42])) is SEGMENT_PROFILES[42]
+    assert pickle.loads(pickle.dumps(SEGMENT_PROFILES)) == SEGMENT_PROFILES
+
+
+def test_from_model_without_pada_picks_a_consistent_segment():
+    model = segment_profile(80).to_model()
+    assert from_model(model).to_model() == model
+
+
+def test_invalid_positions_raise():
+    with pytest.raises(ValueError):
+        compact_profile(1, 27, 1)
+    model = segment_profile(0).to_model().model_copy(update={"nakshatra": "Rohini"})
+    with pytest.raises(ValueError):
+        from_model(model)
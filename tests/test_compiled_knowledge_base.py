@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from app.services import compiled_knowledge_base
+from app.services.compiled_knowledge_base import CompiledKnowledgeBase, compile_knowledge_base
+from app.services.knowledge_base_service import KNOWLEDGE_BASE_PATH
+
+
+@pytest.fixture(scope="module")
+def source():
+    with open(KNOWLEDGE_BASE_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_round_trip_matches_the_json(tmp_path, source, compress):
+    path = tmp_path / "kb.kbc"
+    stats = compile_knowledge_base(source, path, compress=compress)
+    assert stats["entries"] == len(source)
+    assert stats["file_bytes"] == path.stat().st_size
+
+    compiled = CompiledKnowledgeBase(path)
+    assert compiled.decoded() == 0
+    assert len(compiled) == len(source)
+    assert list(compiled) == sorted(source)
+    for key, value in source.items():
+        assert key in compiled
+        assert compiled[key] == value
+    assert compiled.decoded() == len(source)
+    assert "no such key" not in compiled
+    assert compiled.get("no such key") is None
+
+
+def test_rebuild_replaces_the_file_atomically(tmp_path):
+    path = tmp_path / "kb.kbc"
+    compile_knowledge_base({"a": {"text": "old"}}, path)
+    old = CompiledKnowledgeBase(path)
+
+    compile_knowledge_base({"a": {"text": "new"}, "b": {"text": "Śani"}}, path)
+    assert list(tmp_path.iterdir()) == [path]
+    # A mapping opened before the rebuild keeps reading the file it opened
+    assert dict(old) == {"a": {"text": "old"}}
+    assert dict(CompiledKnowledgeBase(path)) == {"a": {"text": "new"}, "b": {"text": "Śani"}}
+
+
+def test_failed_write_leaves_the_previous_file(tmp_path, monkeypatch):
+    path = tmp_path / "kb.kbc"
+    compile_knowledge_base({"a": {"text": "old"}}, path)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(compiled_knowledge_base.os, "replace", fail)
+    with pytest.raises(OSError):
+        compile_knowledge_base({"a": {"text": "new"}}, path)
+    assert list(tmp_path.iterdir()) == [path]
+    assert dict(CompiledKnowledgeBase(path)) == {"a": {"text": "old"}}
+
+
+def test_invalid_files_raise(tmp_path):
+    with pytest.raises(ValueError):
+        compile_knowledge_base({"two\nlines": {}}, tmp_path / "kb.kbc")
+    not_compiled = tmp_path / "kb.json"
+    not_compiled.write_text(json.dumps({"a": {}}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        CompiledKnowledgeBase(not_compiled)
+    with pytest.raises(FileNotFoundError):
+        CompiledKnowledgeBase(tmp_path / "missing.kbc")
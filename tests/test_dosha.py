@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from app.models import DoshaPolicy
+from app.services.ashtakoota_services.calculate_score import calculate_ashtakoota
+from app.services.ashtakoota_services.dosha import (
+    BHAKOOTA_EXCEPTIONS,
+    MANGLIK_FROM_LAGNA,
+    MANGLIK_FROM_MOON,
+    MANGLIK_FROM_VENUS,
+    MARS_DIGNIFIED,
+    NADI_EXCEPTIONS,
+    PAIR_RULES,
+    REJECTED,
+    dosha_flags,
+    dosha_keys,
+    is_manglik,
+    pair_table,
+)
+from app.services.ashtakoota_services.score_tensor import PROFILES, profile_code_of
+
+
+def apply(total, action, penalty):
+    """Per-pair version of one dosha's action: the new total, or None if the pair is rejected."""
+    if total is None or action == "reject":
+        return None
+    return total - penalty if action == "penalize" else total
+
+
+def expected_entry(policy, groom, bride, groom_manglik, bride_manglik):
+    """Evaluate a policy for one pair with calculate_ashtakoota and PAIR_RULES."""
+    score = calculate_ashtakoota(groom, bride)
+    nadi_rules = NADI_EXCEPTIONS if policy.nadi_exceptions is None else policy.nadi_exceptions
+    bhakoota_rules = BHAKOOTA_EXCEPTIONS if policy.bhakoota_exceptions is None else policy.bhakoota_exceptions
+    total = score.total
+    if score.nadi == 0:
+        if any(PAIR_RULES[rule](groom, bride) for rule in nadi_rules):
+            total += 8 if policy.restore_cancelled_points else 0
+        else:
+            total = apply(total, policy.nadi, policy.nadi_penalty)
+    if score.bhakoota == 0 and total is not None:
+        if any(PAIR_RULES[rule](groom, bride) for rule in bhakoota_rules):
+            total += 7 if policy.restore_cancelled_points else 0
+        else:
+            total = apply(total, policy.bhakoota, policy.bhakoota_penalty)
+    if groom_manglik != bride_manglik:
+        total = apply(total, policy.manglik, policy.manglik_penalty)
+    return REJECTED if total is None else int(round(total * 2))
+
+
+@pytest.mark.parametrize("policy", [
+    DoshaPolicy(),
+    DoshaPolicy(nadi="penalize", bhakoota="penalize"),
+    DoshaPolicy(nadi="reject", bhakoota="penalize", manglik="penalize", bhakoota_penalty=3.5),
+    DoshaPolicy(nadi="penalize", bhakoota="reject", manglik="ignore", nadi_exceptions=["friendly_rashi_lords"],
+                bhakoota_exceptions=[], restore_cancelled_points=False),
+])
+def test_pair_table_agrees_with_per_pair_rules(policy):
+    table = pair_table(policy)
+    assert table.shape == (2 * len(PROFILES), 2 * len(PROFILES))
+    for groom in PROFILES:
+        for bride in PROFILES:
+            for groom_manglik in (False, True):
+                for bride_manglik in (False, True):
+                    key_groom = profile_code_of(groom) * 2 + groom_manglik
+                    key_bride = profile_code_of(bride) * 2 + bride_manglik
+                    assert table[key_groom, key_bride] == expected_entry(policy, groom, bride, groom_manglik, bride_manglik)
+
+
+def test_chart_flags():
+    # Mars in Aries: 1st from an Aries lagna, 12th from a Taurus Moon, 3rd from an Aquarius Venus
+    flags = dosha_flags([1, 4], {"lagna": [1, 4], "moon": [2, 9], "venus": [11, 4]})
+    assert flags.tolist() == [MANGLIK_FROM_LAGNA | MANGLIK_FROM_MOON | MARS_DIGNIFIED,
+                              MANGLIK_FROM_LAGNA | MANGLIK_FROM_MOON | MANGLIK_FROM_VENUS]
+    assert is_manglik(flags, DoshaPolicy()).tolist() == [False, True]
+    assert is_manglik(flags, DoshaPolicy(mars_dignity_cancels=False)).tolist() == [True, True]
+    assert is_manglik([MANGLIK_FROM_VENUS], DoshaPolicy(manglik_references=["lagna", "moon"])).tolist() == [False]
+    assert dosha_keys([3, 3], flags, DoshaPolicy()).tolist() == [6, 7]
+
+
+def test_unknown_rules_and_actions_raise():
+    with pytest.raises(ValueError):
+        pair_table(DoshaPolicy(nadi_exceptions=["same_birthday"]))
+    with pytest.raises(ValueError):
+        pair_table(DoshaPolicy.model_construct(**{**DoshaPolicy().model_dump(), "nadi": "forgive"}))
+    assert np.count_nonzero(pair_table(DoshaPolicy(manglik="ignore")) == REJECTED) == 0
@@ -0,0 +1,35 @@
+import threading
+
+import swisseph as swe
+
+from app.models import BirthChart
+from app.services.ephemeris import get_ephemeris_session
+from app.services.kundali_chart import planets_calculation
+
+BIRTH_CHART = BirthChart(day=15, month=6, year=1990, hour=10, minute=30, second=0, timezone=5.5, latitude=19.07, longitude=72.88)
+
+
+def in_new_thread(function):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=function()))
+    thread.start()
+    thread.join()
+    return result["value"]
+
+
+def ayanamsa():
+    with get_ephemeris_session():
+        return swe.get_ayanamsa_ut(2451545.0)
+
+
+def test_every_thread_uses_lahiri():
+    assert abs(ayanamsa() - 23.86) < 0.01
+    assert in_new_thread(ayanamsa) == ayanamsa()
+
+
+def test_charts_do_not_depend_on_the_thread():
+    chart = planets_calculation(BIRTH_CHART)
+    other = in_new_thread(lambda: planets_calculation(BIRTH_CHART))
+    assert other.ascendant == chart.ascendant
+    assert {name: planet.position for name, planet in other.planets.items()} == {
+        name: planet.position for name, planet in chart.planets.items()}
@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from app.services.gazetteer import Gazetteer, build_gazetteer, normalize_place_name
+
+FIXTURE_CSV = Path(__file__).parent / "fixtures" / "places.csv"
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    build_gazetteer(FIXTURE_CSV, tmp_path / "gazetteer")
+    return Gazetteer(tmp_path / "gazetteer")
+
+
+def test_normalize_place_name():
+    assert normalize_place_name("São Paulo") == "sao paulo"
+    assert normalize_place_name("  St. John's ") == "st john s"
+
+
+def test_lookup_prefers_own_name_then_population(gazetteer):
+    assert len(gazetteer) == 9
+    jodhpur = gazetteer.lookup("Jodhpur, Rajasthan, India")
+    assert jodhpur["population"] == 1056191
+    assert jodhpur["timezone"] == "Asia/Kolkata"
+    assert gazetteer.lookup("Bombay")["name"] == "Mumbai"
+    assert gazetteer.lookup("sao paulo")["country"] == "Brazil"
+
+
+def test_lookup_country_qualifier(gazetteer):
+    assert gazetteer.lookup("Paris")["country"] == "France"
+    assert gazetteer.lookup("Paris, US")["timezone"] == "America/Chicago"
+    assert gazetteer.lookup("Paris, United States")["population"] == 24782
+
+
+def test_lookup_joins_split_names(gazetteer):
+    assert gazetteer.lookup("Navi, Mumbai")["name"] == "Navi Mumbai"
+    assert gazetteer.lookup("Nowhere Town") is None
+    assert gazetteer.lookup(" , ") is None
+
+
+def test_place_ids_are_rows(gazetteer):
+    second = gazetteer.place(2)
+    assert (second["name"], second["population"]) == ("Jodhpur", 47329)
+    with pytest.raises(ValueError):
+        gazetteer.place(len(gazetteer))
+
+
+def test_concurrent_builds_never_expose_partial_index(tmp_path):
+    directory = tmp_path / "gazetteer"
+    build_gazetteer(FIXTURE_CSV, directory)
+
+    def rebuild_and_load(worker):
+        if worker % 2:
+            return build_gazetteer(FIXTURE_CSV, directory)
+        return Gazetteer(directory).lookup("Springfield, US")["population"]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(rebuild_and_load, range(32)))
+    assert set(results) == {9, 170188}
+    # Staging directories are cleaned up
+    assert [path.name for path in tmp_path.iterdir()] == ["gazetteer"]
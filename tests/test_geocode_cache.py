@@ -0,0 +1,110 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import pytest
+
+from app.services.geocode_cache import GeocodeCache
+
+
+class StandInGeocoder:
+    """Local stand-in for Nominatim that counts calls; optionally blocks until released."""
+
+    def __init__(self, block: bool = False):
+        self.calls: List[str] = []
+        self.fail = False
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self, place_name: str) -> Dict:
+        self.calls.append(place_name)
+        self.release.wait(timeout=5)
+        if self.fail:
+            raise ConnectionError("geocoder unavailable")
+        return {} if "nowhere" in place_name.lower() else {"latitude": 1.0, "longitude": 2.0}
+
+
+@pytest.fixture
+def geocoder():
+    return StandInGeocoder()
+
+
+def test_repeated_lookups_call_the_geocoder_once(geocoder):
+    cache = GeocodeCache(geocoder, db_path=None)
+    assert cache.get("Ahmedabad, India") == {"latitude": 1.0, "longitude": 2.0}
+    # Same normalized name
+    assert cache.get("ahmedabad  india") == {"latitude": 1.0, "longitude": 2.0}
+    assert len(geocoder.calls) == 1
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_concurrent_lookups_are_coalesced():
+    geocoder = StandInGeocoder(block=True)
+    cache = GeocodeCache(geocoder, db_path=None)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(cache.get, "Ahmedabad, India") for _ in range(8)]
+        # Let every request reach the cache before the leader's geocoder call returns
+        while cache.stats()["misses"] + cache.stats()["coalesced"] < 8:
+            time.sleep(0.001)
+        geocoder.release.set()
+        results = [future.result() for future in futures]
+    assert results == [{"latitude": 1.0, "longitude": 2.0}] * 8
+    assert len(geocoder.calls) == 1
+    assert cache.stats()["coalesced"] == 7
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_unknown_places_are_cached(geocoder):
+    cache = GeocodeCache(geocoder, db_path=None)
+    assert cache.get("Nowhere") == {}
+    assert cache.get("Nowhere") == {}
+    assert len(geocoder.calls) == 1
+    assert cache.stats()["negative_hits"] == 1
+
+
+def test_errors_are_not_cached(geocoder):
+    cache = GeocodeCache(geocoder, db_path=None)
+    geocoder.fail = True
+    assert cache.get("Pune") == {}
+    geocoder.fail = False
+    assert cache.get("Pune") == {"latitude": 1.0, "longitude": 2.0}
+    assert len(geocoder.calls) == 2
+    assert cache.stats()["errors"] == 1
+
+
+def test_disk_level_survives_a_new_cache(geocoder, tmp_path):
+    db_path = tmp_path / "geocode.sqlite"
+    first = GeocodeCache(geocoder, db_path=db_path)
+    first.get("Delhi, India")
+    first.close()
+
+    second = GeocodeCache(geocoder, db_path=db_path)
+    assert second.get("Delhi, India") == {"latitude": 1.0, "longitude": 2.0}
+    assert second.stats()["disk_hits"] == 1
+    assert len(geocoder.calls) == 1
+    second.close()
+
+
+def test_expired_entries_are_refetched(geocoder, tmp_path):
+    cache = GeocodeCache(geocoder, db_path=tmp_path / "geocode.sqlite", ttl_seconds=0)
+    cache.get("Delhi, India")
+    cache.get("Delhi, India")
+    assert len(geocoder.calls) == 2
+    cache.close()
+
+
+def test_non_latin_names_get_their_own_entries():
+    coordinates = {"मुंबई": {"latitude": 19.07, "longitude": 72.88}, "Москва": {"latitude": 55.75, "longitude": 37.62}}
+    calls = []
+
+    def geocoder(place_name):
+        calls.append(place_name)
+        return coordinates.get(place_name, {})
+
+    cache = GeocodeCache(geocoder, db_path=None)
+    assert cache.get("मुंबई") == coordinates["मुंबई"]
+    assert cache.get("Москва") == coordinates["Москва"]
+    assert cache.get("москва") == coordinates["Москва"]
+    assert calls == ["मुंबई", "Москва"]
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import swisseph as swe
+
+from app.config import PLANETS
+from app.services.ephemeris import get_ephemeris_session
+from app.services.ingress_index import IngressIndex, build_ingress_index
+
+START_JD = swe.julday(1999, 1, 1, 0.0)
+END_JD = swe.julday(2001, 1, 1, 0.0)
+
+
+def ephemeris_state(planet: str, jd: float):
+    """(sign id 1-12, retrograde) straight from swisseph."""
+    planet_id = swe.MEAN_NODE if planet in ("rahu", "ketu") else getattr(swe, planet.upper())
+    with get_ephemeris_session():
+        longitude, _, _, speed = swe.calc_ut(jd, planet_id, swe.FLG_SIDEREAL | swe.FLG_SPEED)[0][:4]
+    if planet == "ketu":
+        longitude = (longitude + 180) % 360
+    return int(longitude // 30) + 1, speed < 0
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("ingress_index")
+    build_ingress_index(START_JD, END_JD, directory)
+    return IngressIndex(directory)
+
+
+@pytest.mark.parametrize("planet", PLANETS)
+def test_lookups_match_swisseph(index, planet):
+    jds = np.random.default_rng(11).uniform(START_JD, END_JD, 300)
+    signs = index.sign_at(planet, jds)
+    retrograde = index.retrograde_at(planet, jds)
+    expected = [ephemeris_state(planet, float(jd)) for jd in jds]
+    assert list(zip(signs.tolist(), retrograde.tolist())) == expected
+
+
+def test_ingresses_change_sign(index):
+    ingresses = index.ingresses_between(START_JD, END_JD, ["sun", "mars"])
+    # The Sun changes sign every month; Mars several times over two years
+    assert sum(ingress["planet"] == "sun" for ingress in ingresses) == 24
+    for ingress in ingresses:
+        before, _ = ephemeris_state(ingress["planet"], ingress["jd"] - 1e-4)
+        after, _ = ephemeris_state(ingress["planet"], ingress["jd"] + 1e-4)
+        assert before != after
+
+
+def test_lookups_outside_the_range_raise(index):
+    assert not index.covers(START_JD - 1)
+    with pytest.raises(ValueError):
+        index.sign_at("moon", START_JD - 1)
+    with pytest.raises(ValueError):
+        index.retrograde_at("saturn", [START_JD + 1, END_JD + 1])
+    with pytest.raises(ValueError):
+        index.sign_at("pluto", START_JD + 1)
@@ -0,0 +1,49 @@
+import pytest
+
+from app.services.agent.intent import classify_intent, parse_birth_details, topic_scores
+
+
+@pytest.mark.parametrize("question, topics", [
+    ("How will my career develop, should I change my job?", ["career"]),
+    ("When will I get married and what will my wife be like?", ["relationships"]),
+    ("Will I have money problems? My salary is low.", ["finance"]),
+    ("Give me a full reading", ["all"]),
+    ("Is my love life or my job going to improve?", ["relationships", "career"]),
+    ("What kind of partner suits me in love?", ["relationships"]),
+    ("What does Rahu mean in astrology?", []),
+])
+def test_classify_intent(question, topics):
+    assert classify_intent(question) == topics
+
+
+@pytest.mark.parametrize("question, topic", [
+    ("Should I start a workout routine?", "career"),
+    ("Is Richard coming to the ceremony?", "finance"),
+    ("I love my job", "relationships"),
+    ("Can you illustrate it?", "health"),
+    ("Why do sonar waves matter?", "family"),
+])
+def test_words_only_match_whole_keywords(question, topic):
+    assert topic not in topic_scores(question)
+
+
+def test_birth_details_note_is_not_classified():
+    note = "Note: My birth details are - Date: 15/6/1990, Time: 10:30, Place: Homestead, United States. Hi"
+    assert classify_intent(note) == []
+
+
+@pytest.mark.parametrize("place, expected", [
+    ("St. Louis, USA (place_id 37)", {"birth_place": "St. Louis, USA", "place_id": 37}),
+    ("St. Louis, USA", {"birth_place": "St. Louis, USA"}),
+    ("Washington, D.C.", {"birth_place": "Washington, D.C."}),
+    ("Washington, D.C. (place_id 9)", {"birth_place": "Washington, D.C.", "place_id": 9}),
+    ("Mt. Abu, Rajasthan, India", {"birth_place": "Mt. Abu, Rajasthan, India"}),
+    ("Mumbai, Maharashtra, India", {"birth_place": "Mumbai, Maharashtra, India"}),
+])
+def test_birth_details_note_with_dotted_place_names(place, expected):
+    birth = {"day": 4, "month": 7, "year": 1976, "hour": 9, "minute": 15}
+    # The Gradio interface writes "Place: <place>. <message>"
+    note = f"Note: My birth details are - Date: 4/7/1976, Time: 09:15, Place: {place}. How will my career go? Thanks."
+    assert parse_birth_details(note) == {**birth, **expected}
+    assert classify_intent(note) == ["career"]
+    assert parse_birth_details(f"Note: My birth details are - Date: 4/7/1976, Time: 09:15, Place: {place}.") == {**birth, **expected}
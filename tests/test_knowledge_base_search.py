@@ -0,0 +1,56 @@
+import pytest
+
+from app.services.knowledge_base_search import KnowledgeBaseSearch, get_knowledge_base_search, stem, tokenize
+
+
+@pytest.mark.parametrize("first, second", [
+    ("family", "families"),
+    ("anxious", "anxiety"),
+    ("procrastinate", "procrastination"),
+    ("marry", "married"),
+    ("relationship", "relationships"),
+    ("marriage", "marriages"),
+    ("challenge", "challenges"),
+    ("house", "houses"),
+    ("match", "matches"),
+    ("class", "classes"),
+])
+def test_inflections_share_a_stem(first, second):
+    assert stem(first) == stem(second)
+
+
+def test_nouns_in_ly_keep_their_letters():
+    assert stem("family") == "family"
+    assert stem("assembly") == "assembly"
+    assert tokenize("Why do I feel anxious?") == ["feel", "anx"]
+
+
+@pytest.fixture
+def search():
+    return KnowledgeBaseSearch([
+        ("moon_4_house", {"archetype": "The Nurturer", "strengths": ["Close to family and home"]}),
+        ("saturn_3_house", {"archetype": "The Late Starter", "challenges": ["Procrastination and anxiety"]}),
+        ("mars_10_house", {"archetype": "The Commander", "key": "family"}),
+        ("venus_7_house", {"archetype": "The Partner", "strengths": ["A harmonious marriage"]}),
+    ])
+
+
+def test_search_ranks_matching_entries(search):
+    assert [key for key, _ in search.search("my families")] == ["moon_4_house"]
+    assert [key for key, _ in search.search("why am I so anxious and why do I procrastinate")] == ["saturn_3_house"]
+    assert [key for key, _ in search.search("marriages")] == ["venus_7_house"]
+    assert search.search("the") == []
+    assert search.search("family", top_k=0) == []
+
+
+def test_search_can_be_limited_to_keys(search):
+    allowed = search.mask(["saturn_3_house", "unknown_key"])
+    assert search.search("family", allowed=allowed) == []
+    assert [key for key, _ in search.search("anxiety", allowed=allowed)] == ["saturn_3_house"]
+
+
+def test_knowledge_base_index_finds_family_entries():
+    results = get_knowledge_base_search().search("family", top_k=5)
+    assert len(results) == 5
+    assert all(score > 0 for _, score in results)
+    assert get_knowledge_base_search().search("marriages")
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from app.config import MATCH_SCORE_THRESHOLD
+from app.services.ashtakoota_services.calculate_score import calculate_ashtakoota
+from app.services.ashtakoota_services.compact_profile import segment_profile
+from app.services.candidate_pool import SIDES, CandidatePool
+from app.services.lunar_segments import NUM_SEGMENTS
+from app.services.match_lists import MatchLists
+
+
+def random_updates(lists, updates, seed):
+    """Apply random adds, edits and removals, return {member id: side} of the remaining members."""
+    rng = np.random.default_rng(seed)
+    members = {}
+    for _ in range(updates):
+        action = rng.random()
+        if action < 0.6 or not members:
+            side = SIDES[rng.integers(0, 2)]
+            candidate_id = lists.add(side, segment_profile(int(rng.integers(0, NUM_SEGMENTS))))
+            members[candidate_id] = side
+        elif action < 0.8:
+            candidate_id = int(rng.choice(list(members)))
+            lists.add(members[candidate_id], segment_profile(int(rng.integers(0, NUM_SEGMENTS))), candidate_id)
+        else:
+            candidate_id = int(rng.choice(list(members)))
+            assert lists.remove(candidate_id)
+            del members[candidate_id]
+    return members
+
+
+@pytest.mark.parametrize("k", [1, 5])
+def test_incremental_lists_stay_consistent(k):
+    lists = MatchLists(CandidatePool(db_path=None), k=k)
+    for seed in range(4):
+        random_updates(lists, 500, seed)
+        assert lists.check() == 0
+
+
+def test_matches_agree_with_calculate_ashtakoota():
+    pool = CandidatePool(db_path=None)
+    lists = MatchLists(pool, k=5)
+    members = random_updates(lists, 600, seed=7)
+    for candidate_id, side in list(members.items())[:40]:
+        _, profile = pool.get(candidate_id)
+        expected = []
+        for partner_id, partner_side in members.items():
+            if partner_side == side:
+                continue
+            _, partner = pool.get(partner_id)
+            groom, bride = (profile, partner) if side == "groom" else (partner, profile)
+            score = calculate_ashtakoota(groom.to_model(), bride.to_model()).total
+            if score > MATCH_SCORE_THRESHOLD:
+                expected.append({"candidate_id": partner_id, "score": score})
+        expected.sort(key=lambda match: (-match["score"], match["candidate_id"]))
+        assert lists.matches(candidate_id) == expected[:5]
+
+
+def test_lists_built_over_an_existing_pool():
+    pool = CandidatePool(db_path=None)
+    rng = np.random.default_rng(3)
+    pool.add_many("groom", rng.integers(0, NUM_SEGMENTS, 300))
+    brides = pool.add_many("bride", rng.integers(0, NUM_SEGMENTS, 300))
+    lists = MatchLists(pool, k=3)
+    assert lists.check() == 0
+    assert len(lists.matches(int(brides[0]))) == 3
+    assert lists.matches(10**6) is None
+    assert not lists.remove(10**6)
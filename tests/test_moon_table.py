@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import swisseph as swe
+
+from app.services import moon_table
+from app.services.ephemeris import get_ephemeris_session
+from app.services.lunar_segments import NUM_SEGMENTS, segment_of_longitude
+from app.services.moon_table import MoonTable, build_moon_table, moon_position, moon_segment, moon_segments, save_moon_table
+
+START_JD = swe.julday(1990, 1, 1, 0.0)
+END_JD = swe.julday(1991, 1, 1, 0.0)
+
+
+def ephemeris_segment(jd: float) -> int:
+    return int(segment_of_longitude(get_ephemeris_session().calc_ut(jd, swe.MOON, swe.FLG_SIDEREAL)[0][0]))
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("moon_table")
+    times, segments = build_moon_table(START_JD, END_JD)
+    save_moon_table(times, segments, END_JD, directory)
+    return MoonTable(directory)
+
+
+def test_segments_advance_one_at_a_time(table):
+    assert table.times[0] == START_JD
+    assert np.all(np.diff(table.times) > 0)
+    assert np.all((np.diff(table.segments.astype(np.int64)) % NUM_SEGMENTS) == 1)
+
+
+def test_lookups_match_the_ephemeris(table):
+    jds = np.random.default_rng(7).uniform(START_JD, END_JD, 2000)
+    assert table.segment_at(jds).tolist() == [ephemeris_segment(float(jd)) for jd in jds]
+
+
+def test_ingress_times_are_exact(table):
+    # A second either side of each ingress
+    for jd, segment in list(zip(table.times[1:], table.segments[1:]))[:100]:
+        assert ephemeris_segment(float(jd) + 1e-5) == segment
+        assert ephemeris_segment(float(jd) - 1e-5) == (int(segment) - 1) % NUM_SEGMENTS
+
+
+def test_ephemeris_fallback_without_a_table(monkeypatch):
+    monkeypatch.setattr(moon_table, "_moon_table", False)
+    jds = np.random.default_rng(3).uniform(START_JD, END_JD, 50)
+    expected = [ephemeris_segment(float(jd)) for jd in jds]
+    assert [moon_segment(float(jd)) for jd in jds] == expected
+    assert moon_segments(jds).tolist() == expected
+    assert set(moon_position(float(jds[0]))) == {"zodiac", "nakshatra", "pada", "deviation"}
+
+
+def test_lookups_outside_the_table_use_the_ephemeris(monkeypatch, table):
+    monkeypatch.setattr(moon_table, "_moon_table", table)
+    jds = np.array([START_JD - 100.5, START_JD + 10.25, END_JD + 30.75])
+    assert moon_segments(jds).tolist() == [ephemeris_segment(float(jd)) for jd in jds]
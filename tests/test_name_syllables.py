@@ -0,0 +1,75 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.services.ashtakoota_services.compact_profile import SEGMENT_PROFILES
+from app.services.ashtakoota_services.score_tensor import SCORE_TENSOR, TOTAL
+from app.services.name_syllables import NameSyllableIndex, normalize_name
+
+
+@pytest.fixture(scope="module")
+def index():
+    return NameSyllableIndex()
+
+
+def syllable(index, name):
+    syllable_id = index.syllable_id(name)
+    return index.syllables[syllable_id] if syllable_id >= 0 else None
+
+
+def test_names_resolve_to_their_longest_syllable(index):
+    rng = random.Random(0)
+    letters = "abcdeghijklmnoprstuvy"
+    for _ in range(20000):
+        name = index.syllables[rng.randrange(len(index.syllables))] + "".join(rng.choices(letters, k=rng.randint(0, 6)))
+        matching = [syllable for syllable in index.syllables if name.startswith(syllable)]
+        assert index.syllable_id(name) == index.syllables.index(max(matching, key=len))
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Chetan", "che"),
+    ("Ānand", "a"),
+    ("Krishna", "ki"),
+    ("Priya", "pi"),
+    ("Pradeep", "pa"),
+    ("Shreya", "se"),
+    ("Shruti", "su"),
+    ("Jyoti", "jo"),
+    ("Trisha", "ti"),
+    ("Sneha", "se"),
+    ("Swati", "sa"),
+    ("Dhruv", "du"),
+    ("Shweta", "se"),
+    ("Shyam", "sha"),
+])
+def test_names_starting_with_consonant_clusters(index, name, expected):
+    assert syllable(index, name) == expected
+    assert index.classes(name)
+
+
+def test_cluster_without_a_vowel_match_uses_its_longest_known_part(index):
+    # No syllable continues B or Bh with i, but Bhe and Bhu start with Bh
+    assert syllable(index, "Bhrigu") in ("bhe", "bhu")
+    assert syllable(index, "Xavier") is None
+    assert syllable(index, "") is None
+    assert index.classes("Xavier") == []
+
+
+def test_score_names(index):
+    profile = SEGMENT_PROFILES[82]
+    names = ["Chetan", "Krishna", "Xavier"]
+    result = index.score_names(names, profile, "groom")
+    assert result["syllable"].tolist() == [index.syllable_id(name) for name in names]
+    for position, name in enumerate(names[:2]):
+        totals = [SCORE_TENSOR[profile.code, SEGMENT_PROFILES[segment].code, TOTAL] / 2
+                  for segment in index._segments[index.syllable_id(name)]]
+        assert result["min_score"][position] == min(totals)
+        assert result["max_score"][position] == max(totals)
+    assert np.isnan(result["min_score"][2]) and np.isnan(result["max_score"][2])
+    with pytest.raises(ValueError):
+        index.score_names(names, profile, "partner")
+
+
+def test_normalize_name():
+    assert normalize_name("Ānand-Kumar ") == "anandkumar"
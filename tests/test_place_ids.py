@@ -0,0 +1,41 @@
+from app.services.agent.intent import parse_birth_details
+from app.services.agent.tools.kundali_tool import generate_kundali_chart
+from app.services.birth_details import place_coordinates
+from app.services.gazetteer import get_gazetteer
+from app.services.place_autocomplete import get_place_autocomplete
+
+BIRTH = {"day": 2, "month": 1, "year": 1985, "hour": 6, "minute": 5}
+
+
+def jodhpurs():
+    """The two bundled places named Jodhpur in India, largest first."""
+    suggestions = get_place_autocomplete().suggest("jodhpur, india", limit=5)
+    places = [place for place in suggestions if place["name"] == "Jodhpur"]
+    assert len(places) == 2
+    return sorted(places, key=lambda place: -place["population"])
+
+
+def test_suggestions_tell_same_named_places_apart():
+    large, small = jodhpurs()
+    assert large["label"] != small["label"]
+    assert get_gazetteer().lookup("Jodhpur, India")["place_id"] == large["place_id"]
+
+
+def test_place_id_is_used_instead_of_the_name():
+    large, small = jodhpurs()
+    assert place_coordinates(small["place_id"])["latitude"] == small["latitude"]
+    assert place_coordinates(-1) == {}
+
+    by_name = generate_kundali_chart.invoke({**BIRTH, "birth_place": "Jodhpur, India"})
+    by_id = generate_kundali_chart.invoke({**BIRTH, "birth_place": "Jodhpur, India", "place_id": small["place_id"]})
+    large_by_id = generate_kundali_chart.invoke({**BIRTH, "birth_place": "Jodhpur, India", "place_id": large["place_id"]})
+    # The name resolves to the larger town; the id keeps the smaller one's coordinates
+    assert by_name == large_by_id
+    assert by_id["ascendant"] != by_name["ascendant"]
+
+
+def test_birth_note_carries_the_place_id():
+    note = "Note: My birth details are - Date: 2/1/1985, Time: 06:05, Place: Jodhpur, India (place_id 3740). Hello"
+    assert parse_birth_details(note) == {**BIRTH, "birth_place": "Jodhpur, India", "place_id": 3740}
+    note = "Note: My birth details are - Date: 2/1/1985, Time: 06:05, Place: Jodhpur, India. Hello"
+    assert parse_birth_details(note) == {**BIRTH, "birth_place": "Jodhpur, India"}
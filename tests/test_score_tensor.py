@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from app.config import ZODIACS
+from app.services.ashtakoota_services.calculate_score import calculate_ashtakoota
+from app.services.ashtakoota_services.generate_profile import generate_ashtakoota_profile
+from app.services.ashtakoota_services.score_tensor import (
+    KOOTAS,
+    NUM_PROFILES,
+    SEGMENT_PROFILE_CODE,
+    ashtakoota_score,
+    profile_code,
+    profile_code_of,
+    score_codes,
+)
+from app.services.lunar_segments import NUM_SEGMENTS, describe_segment, nakshatra_from_longitude, segment_of_longitude
+
+
+def moon_profile(longitude: float):
+    """Profile of a sidereal Moon longitude, computed without the segment tables."""
+    return generate_ashtakoota_profile(ZODIACS[int(longitude // 30) + 1]["name"], longitude % 30, nakshatra_from_longitude(longitude))
+
+
+@pytest.fixture(scope="module")
+def segment_profiles():
+    return [
+        generate_ashtakoota_profile(details["zodiac"], details["deviation"], details["nakshatra"])
+        for details in map(describe_segment, range(NUM_SEGMENTS))
+    ]
+
+
+def test_tensor_matches_calculate_ashtakoota_for_every_segment_pair(segment_profiles):
+    mismatches = [
+        (groom_segment, bride_segment)
+        for groom_segment, groom in enumerate(segment_profiles)
+        for bride_segment, bride in enumerate(segment_profiles)
+        if ashtakoota_score(groom, bride) != calculate_ashtakoota(groom_profile=groom, bride_profile=bride)
+    ]
+    assert mismatches == []
+
+
+def test_tensor_matches_calculate_ashtakoota_for_moon_longitudes():
+    rng = np.random.default_rng(0)
+    # Random longitudes plus both sides of the Vashya split at 15° of Sagittarius and Capricorn
+    longitudes = np.concatenate([rng.uniform(0, 360, 300), [254.999, 255.001, 284.999, 285.001]])
+    profiles = [moon_profile(float(longitude)) for longitude in longitudes]
+    grooms = rng.integers(0, len(profiles), 2000)
+    brides = rng.integers(0, len(profiles), 2000)
+    for groom, bride in zip(grooms, brides):
+        expected = calculate_ashtakoota(groom_profile=profiles[groom], bride_profile=profiles[bride])
+        assert ashtakoota_score(profiles[groom], profiles[bride]) == expected
+
+
+def test_segment_codes_agree_with_profile_codes():
+    longitudes = np.arange(0.05, 360, 0.1)
+    codes = SEGMENT_PROFILE_CODE[segment_of_longitude(longitudes)]
+    assert codes.tolist() == [profile_code_of(moon_profile(float(longitude))) for longitude in longitudes]
+    assert set(codes.tolist()) <= set(range(NUM_PROFILES))
+
+
+def test_vectorized_scores_match_scalar_scores(segment_profiles):
+    codes = np.array([profile_code_of(profile) for profile in segment_profiles])
+    scores = score_codes(codes[:, None], codes[None, :])
+    assert scores.shape == (NUM_SEGMENTS, NUM_SEGMENTS, len(KOOTAS) + 1)
+    groom, bride = segment_profiles[7], segment_profiles[93]
+    expected = calculate_ashtakoota(groom_profile=groom, bride_profile=bride)
+    assert scores[7, 93].tolist() == [getattr(expected, koota) for koota in KOOTAS] + [expected.total]
+
+
+def test_vashya_variants_get_distinct_codes():
+    assert profile_code("Sagittarius", 10.0, "Purva Ashadha") != profile_code("Sagittarius", 20.0, "Purva Ashadha")
+    assert profile_code("Aries", 10.0, "Ashwini") == profile_code("Aries", 11.0, "Ashwini")
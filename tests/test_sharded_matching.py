@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from app.models import DoshaPolicy
+from app.services.ashtakoota_services.dosha import REJECTED
+from app.services.ashtakoota_services.score_tensor import SEGMENT_PROFILE_CODE
+from app.services.bulk_matching import top_match_arrays
+from app.services.sharded_matching import ShardedMatcher, merge_top_k
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    with ShardedMatcher(workers=2) as matcher:
+        yield matcher
+
+
+@pytest.fixture(scope="module")
+def cohorts():
+    rng = np.random.default_rng(0)
+    grooms = SEGMENT_PROFILE_CODE[rng.integers(0, SEGMENT_PROFILE_CODE.shape[0], 3000)]
+    brides = SEGMENT_PROFILE_CODE[rng.integers(0, SEGMENT_PROFILE_CODE.shape[0], 4000)]
+    groom_flags = rng.integers(0, 16, grooms.shape[0]).astype(np.uint8)
+    bride_flags = rng.integers(0, 16, brides.shape[0]).astype(np.uint8)
+    return grooms, brides, groom_flags, bride_flags
+
+
+@pytest.mark.parametrize("partner_shards", [1, 3, 7])
+def test_sharded_matches_equal_a_single_process_run(matcher, cohorts, partner_shards):
+    grooms, brides, _, _ = cohorts
+    expected_partners, expected_scores = top_match_arrays(grooms, brides, "groom", k=5)
+    partners, scores = matcher.top_matches(grooms, brides, "groom", k=5, partner_shards=partner_shards)
+    assert np.array_equal(partners, expected_partners)
+    assert np.array_equal(scores, expected_scores)
+
+
+def test_sharded_dosha_screening_equals_a_single_process_run(matcher, cohorts):
+    grooms, brides, groom_flags, bride_flags = cohorts
+    policy = DoshaPolicy(nadi="penalize", bhakoota="reject")
+    expected_partners, expected_scores = top_match_arrays(brides, grooms, "bride", 5, person_flags=bride_flags,
+                                                          partner_flags=groom_flags, dosha_policy=policy)
+    partners, scores = matcher.top_matches(brides, grooms, "bride", k=5, partner_shards=3, person_flags=bride_flags,
+                                           partner_flags=groom_flags, dosha_policy=policy)
+    assert np.array_equal(partners, expected_partners)
+    assert np.array_equal(scores, expected_scores)
+
+
+def test_dosha_screening_needs_both_flags(matcher, cohorts):
+    grooms, brides, groom_flags, _ = cohorts
+    with pytest.raises(ValueError):
+        matcher.top_matches(grooms, brides, person_flags=groom_flags, dosha_policy=DoshaPolicy())
+
+
+def test_merge_top_k_breaks_ties_by_lower_partner_index():
+    # Two rows, two shards of k = 3; equal scores across shards must come out by partner index
+    partners = np.array([
+        [[5, 9, -1], [2, 7, -1]],
+        [[-1, -1, -1], [-1, -1, -1]],
+    ])
+    half_points = np.array([
+        [[40, 40, REJECTED], [40, 38, REJECTED]],
+        [[REJECTED] * 3, [REJECTED] * 3],
+    ], dtype=np.int16)
+    merged_partners, merged_scores = merge_top_k(partners, half_points, 3, num_partners=10)
+    assert merged_partners.tolist() == [[2, 5, 9], [-1, -1, -1]]
+    assert merged_scores.tolist() == [[40, 40, 40], [REJECTED] * 3]
+
+    merged_partners, merged_scores = merge_top_k(partners[:1], half_points[:1], 5, num_partners=10)
+    assert merged_partners.tolist() == [[2, 5, 9, 7, -1]]
+    assert merged_scores.tolist() == [[40, 40, 40, 38, REJECTED]]